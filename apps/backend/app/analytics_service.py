@@ -12,11 +12,18 @@ Features:
       to understand demand patterns.
     - Peak usage times analysis: Determine when resources are most in-demand
       by analyzing hourly and daily booking distributions.
+    - Weekly heatmap: Overlap-weighted occupancy for every hour of the week
+      (7 days x 24 hours), overall or for a single resource.
     - User booking patterns: Track user behavior including booking frequency
       and cancellation rates.
     - Exportable reports: Generate CSV exports for utilization and reservation
       data for external analysis or reporting.
 
+Whole hours of a window are read from the hourly utilization rollups (see
+app.utilization_rollups) when ``analytics_rollups_enabled`` is set; only
+the partial hours at either edge touch raw reservations, so an hour-aligned
+window never scans the reservations table.
+
 Example usage:
     >>> from sqlalchemy.orm import Session
     >>> from app.analytics_service import AnalyticsService
@@ -45,14 +52,131 @@ Author:
 """
 
 import csv
+from collections.abc import Iterator
 from datetime import UTC, datetime, timedelta
 from io import StringIO
 from typing import Any
 
-from sqlalchemy import func
+from sqlalchemy import (
+    Float,
+    Integer,
+    case,
+    cast,
+    extract,
+    func,
+    literal,
+    select,
+    union_all,
+)
 from sqlalchemy.orm import Session
 
 from app import models
+from app.config import get_settings
+from app.utilization_rollups import BOOKED_STATUSES as _BOOKED_STATUSES
+from app.utilization_rollups import bucket_filter, whole_hours
+from app.utils.streaming import FETCH_SIZE, iter_csv
+
+_DAY_NAMES = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+# Hours in a week; weekly slots are indexed weekday * 24 + hour (Monday = 0)
+_WEEK_SLOTS = 7 * 24
+
+# Julian day number of Monday 1970-01-05, the origin for week numbers
+_WEEK_ORIGIN_JULIAN_DAY = 2440591.5
+_WEEK_ORIGIN_EPOCH = 4 * 86400
+
+
+def _clipped_bounds(db: Session, start_date: datetime, end_date: datetime):
+    """SQL expressions for a reservation's interval clipped to the period.
+
+    Uses GREATEST/LEAST on PostgreSQL and the scalar MAX/MIN on SQLite.
+
+    Args:
+        db: Session whose dialect decides the SQL functions used.
+        start_date: Start of the analysis period (timezone-aware).
+        end_date: End of the analysis period (timezone-aware).
+
+    Returns:
+        tuple: (clipped start, clipped end) expressions.
+    """
+    start_col = models.Reservation.start_time
+    end_col = models.Reservation.end_time
+    lower = literal(start_date.astimezone(UTC), type_=start_col.type)
+    upper = literal(end_date.astimezone(UTC), type_=end_col.type)
+
+    if db.get_bind().dialect.name == "sqlite":
+        return func.max(start_col, lower), func.min(end_col, upper)
+    return func.greatest(start_col, lower), func.least(end_col, upper)
+
+
+def _clipped_seconds(db: Session, start_date: datetime, end_date: datetime):
+    """SQL expression for the seconds of a reservation inside the period.
+
+    The reservation interval is clipped to [start_date, end_date) so
+    booked time can be summed in a single aggregate.
+
+    Args:
+        db: Session whose dialect decides the SQL functions used.
+        start_date: Start of the analysis period (timezone-aware).
+        end_date: End of the analysis period (timezone-aware).
+
+    Returns:
+        A SQL expression yielding seconds as a number.
+    """
+    clipped_start, clipped_end = _clipped_bounds(db, start_date, end_date)
+    if db.get_bind().dialect.name == "sqlite":
+        return (func.julianday(clipped_end) - func.julianday(clipped_start)) * 86400.0
+    return extract("epoch", clipped_end - clipped_start)
+
+
+def _weekday(db: Session, column):
+    """SQL expression for the UTC weekday of a date or timestamp (Monday = 0)."""
+    if db.get_bind().dialect.name == "sqlite":
+        return (cast(func.strftime("%w", column), Integer) + 6) % 7
+    return cast(extract("isodow", column), Integer) - 1
+
+
+def _week_position(db: Session, column):
+    """SQL expressions locating a timestamp within its UTC week.
+
+    Args:
+        db: Session whose dialect decides the SQL functions used.
+        column: Timestamp expression.
+
+    Returns:
+        tuple: (week, slot, offset) where week counts whole weeks since
+        Monday 1970-01-05, slot is the hour of the week (0-167) and offset
+        is the number of seconds into that hour.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        day = func.julianday(func.date(column)) - _WEEK_ORIGIN_JULIAN_DAY
+        week = cast(day, Integer) // 7
+        slot = _weekday(db, column) * 24 + cast(func.strftime("%H", column), Integer)
+        offset = cast(func.strftime("%M", column), Integer) * 60 + cast(
+            func.strftime("%f", column), Float
+        )
+        return week, slot, offset
+
+    column = func.timezone("UTC", column)
+    week = func.floor((extract("epoch", column) - _WEEK_ORIGIN_EPOCH) / (7 * 86400))
+    slot = _weekday(db, column) * 24 + cast(extract("hour", column), Integer)
+    offset = extract("minute", column) * 60 + extract("second", column)
+    return week, slot, offset
+
+
+def _union(selects: list):
+    """Subquery over the UNION ALL of one or more selects."""
+    if len(selects) == 1:
+        return selects[0].subquery()
+    return union_all(*selects).subquery()
 
 
 class AnalyticsService:
@@ -69,6 +193,8 @@ class AnalyticsService:
         db (Session): The SQLAlchemy database session used for all database
             operations. This session should be managed externally and passed
             to the constructor.
+        use_rollups (bool): Whether whole hours are read from the hourly
+            utilization rollups instead of raw reservations.
 
     Example:
         >>> db = SessionLocal()
@@ -78,15 +204,158 @@ class AnalyticsService:
         ...     print(f"{resource['resource_name']}: {resource['reservation_count']} bookings")
     """
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Session, use_rollups: bool | None = None) -> None:
         """Initialize the AnalyticsService with a database session.
 
         Args:
             db: A SQLAlchemy Session object used for querying the database.
                 The session should be properly configured and connected to
                 the application database.
+            use_rollups: Read whole hours from the utilization rollups.
+                Defaults to the ``analytics_rollups_enabled`` setting.
         """
         self.db = db
+        if use_rollups is None:
+            use_rollups = get_settings().analytics_rollups_enabled
+        self.use_rollups = use_rollups
+
+    def _split_window(
+        self, start_date: datetime, end_date: datetime
+    ) -> tuple[tuple[datetime, datetime] | None, list[tuple[datetime, datetime]]]:
+        """Split a window into a rollup-served core and raw-served edges.
+
+        Args:
+            start_date: Start of the analysis period.
+            end_date: End of the analysis period.
+
+        Returns:
+            tuple: The whole-hour core (or None when rollups are disabled or
+            the window holds no whole hour) and the remaining sub-windows
+            that must be read from raw reservations.
+        """
+        start_date = (
+            start_date.replace(tzinfo=UTC) if start_date.tzinfo is None else start_date
+        )
+        end_date = end_date.replace(tzinfo=UTC) if end_date.tzinfo is None else end_date
+
+        core = whole_hours(start_date, end_date) if self.use_rollups else None
+        if core is None:
+            return None, [(start_date, end_date)]
+        edges = [
+            (lower, upper)
+            for lower, upper in ((start_date, core[0]), (core[1], end_date))
+            if lower < upper
+        ]
+        return core, edges
+
+    def _weekly_occupancy(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        resource_id: int | None = None,
+    ) -> tuple[list[float], list[int]]:
+        """Booked seconds and reservation starts per hour of the week.
+
+        Booked time is overlap-weighted: a reservation adds the part of
+        each hour it covers, not just one event at its start. Whole hours
+        come from the rollups. For the partial edge hours each clipped
+        reservation is reduced to its two endpoints, binned in SQL by week
+        number, hour of the week and offset into the hour; per slot the
+        occupancy then follows from the endpoint sums alone, so no
+        reservation row is transferred or visited in Python.
+
+        Args:
+            start_date: Start of the analysis period.
+            end_date: End of the analysis period.
+            resource_id: Optional resource to restrict the analysis to.
+
+        Returns:
+            tuple: Two lists of 168 entries indexed ``weekday * 24 + hour``
+            (Monday = 0, UTC): booked seconds and reservation starts.
+        """
+        booked_seconds = [0.0] * _WEEK_SLOTS
+        starts = [0] * _WEEK_SLOTS
+
+        core, edges = self._split_window(start_date, end_date)
+        if core:
+            rollup = models.UtilizationRollup
+            slot = _weekday(self.db, rollup.day) * 24 + rollup.hour
+            buckets = self.db.query(
+                slot,
+                func.sum(rollup.booked_minutes),
+                func.sum(rollup.reservation_count),
+            ).filter(bucket_filter(*core))
+            if resource_id:
+                buckets = buckets.filter(rollup.resource_id == resource_id)
+            for index, minutes, count in buckets.group_by(slot):
+                booked_seconds[int(index)] += float(minutes) * 60
+                starts[int(index)] += int(count)
+
+        reservation = models.Reservation
+        for lower, upper in edges:
+            clipped_start, clipped_end = _clipped_bounds(self.db, lower, upper)
+            filters = [
+                reservation.status.in_(_BOOKED_STATUSES),
+                reservation.start_time < upper,
+                reservation.end_time > lower,
+            ]
+            if resource_id:
+                filters.append(reservation.resource_id == resource_id)
+
+            # Start endpoints count negatively, end endpoints positively
+            endpoints = []
+            for column, sign, started in (
+                (
+                    clipped_start,
+                    -1,
+                    case(
+                        (
+                            reservation.start_time
+                            >= literal(lower, type_=reservation.start_time.type),
+                            1,
+                        ),
+                        else_=0,
+                    ),
+                ),
+                (clipped_end, 1, literal(0)),
+            ):
+                week, slot, offset = _week_position(self.db, column)
+                endpoints.append(
+                    select(
+                        slot.label("slot"),
+                        literal(sign).label("sign"),
+                        week.label("week"),
+                        offset.label("offset"),
+                        started.label("started"),
+                    ).where(*filters)
+                )
+            points = union_all(*endpoints).subquery()
+            rows = self.db.query(
+                points.c.slot,
+                points.c.sign,
+                func.count(),
+                func.sum(points.c.week),
+                func.sum(points.c.offset),
+                func.sum(points.c.started),
+            ).group_by(points.c.slot, points.c.sign)
+
+            # Seconds of slot b in [origin, t) are 3600 per whole week, 3600
+            # more if b precedes t's slot, plus t's offset if b is t's slot
+            weeks = 0
+            crossings = [0] * (_WEEK_SLOTS + 1)
+            for index, sign, count, week_sum, offset_sum, started in rows:
+                index = int(index)
+                weeks += sign * int(week_sum)
+                crossings[index] += sign * count
+                booked_seconds[index] += sign * float(offset_sum)
+                starts[index] += int(started)
+
+            later = 0
+            for index in range(_WEEK_SLOTS - 1, -1, -1):
+                later += crossings[index + 1]
+                booked_seconds[index] += 3600 * (weeks + later)
+
+        return booked_seconds, starts
 
     def get_resource_utilization(
         self,
@@ -99,7 +368,9 @@ class AnalyticsService:
         Computes the utilization percentage for each resource by comparing
         the total booked hours against the total available hours in the
         specified time period. Only reservations with 'active' or 'expired'
-        status are considered.
+        status are considered. Booked time is clipped to the period and
+        summed per resource in one grouped query, combining rollup buckets
+        for whole hours with raw reservations for the partial edge hours.
 
         Args:
             resource_id: Optional ID of a specific resource to analyze.
@@ -145,58 +416,68 @@ class AnalyticsService:
         )
         end_date = end_date.replace(tzinfo=UTC) if end_date.tzinfo is None else end_date
 
-        # Get resources
-        query = self.db.query(models.Resource)
+        # Booked seconds per resource: rollups for whole hours, raw
+        # reservations clipped to the partial hours at either edge
+        core, edges = self._split_window(start_date, end_date)
+        rollup = models.UtilizationRollup
+        parts = []
+        if core:
+            part = select(
+                rollup.resource_id.label("resource_id"),
+                (rollup.booked_minutes * 60).label("seconds"),
+            ).where(bucket_filter(*core))
+            if resource_id:
+                part = part.where(rollup.resource_id == resource_id)
+            parts.append(part)
+        for lower, upper in edges:
+            part = select(
+                models.Reservation.resource_id.label("resource_id"),
+                _clipped_seconds(self.db, lower, upper).label("seconds"),
+            ).where(
+                models.Reservation.status.in_(_BOOKED_STATUSES),
+                models.Reservation.start_time < upper,
+                models.Reservation.end_time > lower,
+            )
+            if resource_id:
+                part = part.where(models.Reservation.resource_id == resource_id)
+            parts.append(part)
+
+        booked_parts = _union(parts)
+        booked = (
+            self.db.query(
+                booked_parts.c.resource_id,
+                func.sum(booked_parts.c.seconds).label("booked_seconds"),
+            )
+            .group_by(booked_parts.c.resource_id)
+            .subquery()
+        )
+
+        query = self.db.query(
+            models.Resource.id,
+            models.Resource.name,
+            models.Resource.status,
+            func.coalesce(booked.c.booked_seconds, 0).label("booked_seconds"),
+        ).outerjoin(booked, booked.c.resource_id == models.Resource.id)
         if resource_id:
             query = query.filter(models.Resource.id == resource_id)
-        resources = query.all()
 
         utilization_data = []
         total_hours = (end_date - start_date).total_seconds() / 3600
 
-        for resource in resources:
-            # Get completed/active reservations for this resource in the period
-            reservations = (
-                self.db.query(models.Reservation)
-                .filter(
-                    models.Reservation.resource_id == resource.id,
-                    models.Reservation.status.in_(["active", "expired"]),
-                    models.Reservation.start_time < end_date,
-                    models.Reservation.end_time > start_date,
-                )
-                .all()
-            )
-
-            # Calculate total booked hours
-            booked_hours = 0.0
-            for res in reservations:
-                # Clip to analysis period with timezone-aware datetimes
-                res_start = (
-                    res.start_time.replace(tzinfo=UTC)
-                    if res.start_time.tzinfo is None
-                    else res.start_time
-                )
-                res_end = (
-                    res.end_time.replace(tzinfo=UTC)
-                    if res.end_time.tzinfo is None
-                    else res.end_time
-                )
-                res_start = max(res_start, start_date)
-                res_end = min(res_end, end_date)
-                booked_hours += (res_end - res_start).total_seconds() / 3600
-
+        for row in query.order_by(models.Resource.id):
+            booked_hours = float(row.booked_seconds) / 3600
             utilization_pct = (
                 (booked_hours / total_hours * 100) if total_hours > 0 else 0
             )
 
             utilization_data.append(
                 {
-                    "resource_id": resource.id,
-                    "resource_name": resource.name,
+                    "resource_id": row.id,
+                    "resource_name": row.name,
                     "total_hours_available": round(total_hours, 2),
                     "booked_hours": round(booked_hours, 2),
                     "utilization_percent": round(utilization_pct, 2),
-                    "status": resource.status,
+                    "status": row.status,
                 }
             )
 
@@ -214,7 +495,9 @@ class AnalyticsService:
 
         Queries the database to find resources with the highest number of
         reservations within the specified time period. Only reservations
-        with 'active' or 'expired' status are counted.
+        with 'active' or 'expired' status are counted, by start time.
+        Whole hours are counted from the rollups and the partial edge hours
+        from raw reservations, ranked in one grouped query.
 
         Args:
             limit: Maximum number of resources to return. Defaults to 10.
@@ -243,23 +526,40 @@ class AnalyticsService:
         if not end_date:
             end_date = datetime.now(UTC)
 
+        core, edges = self._split_window(start_date, end_date)
+        rollup = models.UtilizationRollup
+        parts = []
+        if core:
+            parts.append(
+                select(
+                    rollup.resource_id.label("resource_id"),
+                    rollup.reservation_count.label("reservation_count"),
+                ).where(bucket_filter(*core))
+            )
+        for lower, upper in edges:
+            parts.append(
+                select(
+                    models.Reservation.resource_id.label("resource_id"),
+                    literal(1).label("reservation_count"),
+                ).where(
+                    models.Reservation.start_time >= lower,
+                    models.Reservation.start_time < upper,
+                    models.Reservation.status.in_(_BOOKED_STATUSES),
+                )
+            )
+
+        counts = _union(parts)
+        reservation_count = func.sum(counts.c.reservation_count)
         results = (
             self.db.query(
                 models.Resource.id,
                 models.Resource.name,
-                func.count(models.Reservation.id).label("reservation_count"),
-            )
-            .join(
-                models.Reservation,
-                models.Resource.id == models.Reservation.resource_id,
-            )
-            .filter(
-                models.Reservation.start_time >= start_date,
-                models.Reservation.start_time < end_date,
-                models.Reservation.status.in_(["active", "expired"]),
+                reservation_count.label("reservation_count"),
             )
+            .join(counts, counts.c.resource_id == models.Resource.id)
             .group_by(models.Resource.id, models.Resource.name)
-            .order_by(func.count(models.Reservation.id).desc())
+            .having(reservation_count > 0)
+            .order_by(reservation_count.desc(), models.Resource.id)
             .limit(limit)
             .all()
         )
@@ -268,7 +568,7 @@ class AnalyticsService:
             {
                 "resource_id": r.id,
                 "resource_name": r.name,
-                "reservation_count": r.reservation_count,
+                "reservation_count": int(r.reservation_count),
                 "rank": idx + 1,
             }
             for idx, r in enumerate(results)
@@ -283,7 +583,9 @@ class AnalyticsService:
 
         Aggregates reservation data to identify when resources are most
         frequently booked. This helps in understanding usage patterns
-        and planning for high-demand periods.
+        and planning for high-demand periods. Peaks are ranked by
+        overlap-weighted occupancy, so a long booking weighs on every hour
+        it covers; start counts are reported alongside.
 
         Args:
             start_date: The beginning of the analysis period. If None,
@@ -295,14 +597,18 @@ class AnalyticsService:
             A dictionary containing comprehensive peak usage analysis:
                 - period (dict): Contains 'start' and 'end' ISO format strings.
                 - total_reservations (int): Total reservation count analyzed.
-                - hourly_distribution (list): List of dicts with 'hour' (0-23)
-                  and 'count' for each hour of the day.
+                - hourly_distribution (list): List of dicts with 'hour' (0-23),
+                  'count' of reservations starting in that hour and
+                  'occupied_hours' booked during that hour of the day.
                 - daily_distribution (list): List of dicts with 'day' (name),
-                  'day_number' (0=Monday, 6=Sunday), and 'count'.
-                - peak_hour (int): Hour with highest reservation count (0-23).
-                - peak_hour_count (int): Number of reservations at peak hour.
-                - peak_day (str): Day name with highest reservation count.
-                - peak_day_count (int): Number of reservations on peak day.
+                  'day_number' (0=Monday, 6=Sunday), 'count' and
+                  'occupied_hours'.
+                - peak_hour (int): Hour with the most booked time (0-23).
+                - peak_hour_count (int): Number of reservations starting in
+                  the peak hour.
+                - peak_day (str): Day name with the most booked time.
+                - peak_day_count (int): Number of reservations starting on
+                  the peak day.
 
         Example:
             >>> analytics = AnalyticsService(db)
@@ -315,59 +621,109 @@ class AnalyticsService:
         if not end_date:
             end_date = datetime.now(UTC)
 
-        reservations = (
-            self.db.query(models.Reservation)
-            .filter(
-                models.Reservation.start_time >= start_date,
-                models.Reservation.start_time < end_date,
-                models.Reservation.status.in_(["active", "expired"]),
-            )
-            .all()
-        )
+        booked_seconds, starts = self._weekly_occupancy(start_date, end_date)
 
         # Aggregate by hour of day and day of week
-        hourly_counts = [0] * 24
-        daily_counts = [0] * 7  # 0 = Monday, 6 = Sunday
-
-        for res in reservations:
-            hour = res.start_time.hour
-            day = res.start_time.weekday()
-            hourly_counts[hour] += 1
-            daily_counts[day] += 1
+        hourly_counts = [sum(starts[hour::24]) for hour in range(24)]
+        daily_counts = [sum(starts[day * 24 : day * 24 + 24]) for day in range(7)]
+        hourly_booked = [sum(booked_seconds[hour::24]) / 3600 for hour in range(24)]
+        daily_booked = [
+            sum(booked_seconds[day * 24 : day * 24 + 24]) / 3600 for day in range(7)
+        ]
 
         # Find peaks
-        peak_hour = hourly_counts.index(max(hourly_counts))
-        peak_day = daily_counts.index(max(daily_counts))
-
-        days = [
-            "Monday",
-            "Tuesday",
-            "Wednesday",
-            "Thursday",
-            "Friday",
-            "Saturday",
-            "Sunday",
-        ]
+        peak_hour = hourly_booked.index(max(hourly_booked))
+        peak_day = daily_booked.index(max(daily_booked))
 
         return {
             "period": {
                 "start": start_date.isoformat(),
                 "end": end_date.isoformat(),
             },
-            "total_reservations": len(reservations),
+            "total_reservations": sum(hourly_counts),
             "hourly_distribution": [
-                {"hour": h, "count": c} for h, c in enumerate(hourly_counts)
+                {"hour": h, "count": c, "occupied_hours": round(hourly_booked[h], 2)}
+                for h, c in enumerate(hourly_counts)
             ],
             "daily_distribution": [
-                {"day": days[d], "day_number": d, "count": c}
+                {
+                    "day": _DAY_NAMES[d],
+                    "day_number": d,
+                    "count": c,
+                    "occupied_hours": round(daily_booked[d], 2),
+                }
                 for d, c in enumerate(daily_counts)
             ],
             "peak_hour": peak_hour,
             "peak_hour_count": hourly_counts[peak_hour],
-            "peak_day": days[peak_day],
+            "peak_day": _DAY_NAMES[peak_day],
             "peak_day_count": daily_counts[peak_day],
         }
 
+    def get_usage_heatmap(
+        self,
+        resource_id: int | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> dict[str, Any]:
+        """Build a weekday-by-hour occupancy heatmap.
+
+        Each cell holds the hours booked during that hour of that weekday
+        across the period (UTC), overlap-weighted like
+        :meth:`get_peak_usage_times`.
+
+        Args:
+            resource_id: Optional ID of a single resource to map. If None,
+                all resources are combined.
+            start_date: The beginning of the analysis period. If None,
+                defaults to 30 days before the current time.
+            end_date: The end of the analysis period. If None, defaults
+                to the current time.
+
+        Returns:
+            A dictionary containing:
+                - period (dict): Contains 'start' and 'end' ISO format strings.
+                - resource_id (int | None): The mapped resource, if any.
+                - days (list): The 7 row labels, Monday first.
+                - hours (list): The 24 column labels (0-23).
+                - occupied_hours (list): 7 rows of 24 booked-hour values,
+                  rounded to 2 decimal places.
+                - reservation_starts (list): 7 rows of 24 start counts.
+                - max_occupied_hours (float): Largest cell value.
+
+        Example:
+            >>> analytics = AnalyticsService(db)
+            >>> heatmap = analytics.get_usage_heatmap(resource_id=3)
+            >>> monday_9am = heatmap['occupied_hours'][0][9]
+        """
+        if not start_date:
+            start_date = datetime.now(UTC) - timedelta(days=30)
+        if not end_date:
+            end_date = datetime.now(UTC)
+
+        booked_seconds, starts = self._weekly_occupancy(
+            start_date, end_date, resource_id=resource_id
+        )
+        occupied = [
+            [round(booked_seconds[day * 24 + hour] / 3600, 2) for hour in range(24)]
+            for day in range(7)
+        ]
+
+        return {
+            "period": {
+                "start": start_date.isoformat(),
+                "end": end_date.isoformat(),
+            },
+            "resource_id": resource_id,
+            "days": list(_DAY_NAMES),
+            "hours": list(range(24)),
+            "occupied_hours": occupied,
+            "reservation_starts": [
+                starts[day * 24 : day * 24 + 24] for day in range(7)
+            ],
+            "max_occupied_hours": max(max(row) for row in occupied),
+        }
+
     def get_user_booking_patterns(
         self,
         user_id: int | None = None,
@@ -380,6 +736,8 @@ class AnalyticsService:
         Analyzes user behavior by aggregating their reservation activity,
         including total bookings and cancellation rates. This data can be
         used to identify power users or detect unusual booking patterns.
+        Both counts come from one aggregate grouped by user ID; usernames
+        are joined onto the selected rows only.
 
         Args:
             user_id: Optional ID of a specific user to analyze. If None,
@@ -414,33 +772,41 @@ class AnalyticsService:
         if not end_date:
             end_date = datetime.now(UTC)
 
-        query = (
+        total_reservations = func.count(models.Reservation.id)
+        counts = (
             self.db.query(
-                models.User.id,
-                models.User.username,
-                func.count(models.Reservation.id).label("total_reservations"),
+                models.Reservation.user_id.label("user_id"),
+                total_reservations.label("total_reservations"),
                 func.count(models.Reservation.id)
                 .filter(models.Reservation.status == "cancelled")
                 .label("cancelled_count"),
             )
-            .join(
-                models.Reservation,
-                models.User.id == models.Reservation.user_id,
-            )
+            .join(models.User, models.User.id == models.Reservation.user_id)
             .filter(
                 models.Reservation.created_at >= start_date,
                 models.Reservation.created_at < end_date,
             )
-            .group_by(models.User.id, models.User.username)
-            .order_by(func.count(models.Reservation.id).desc())
+            .group_by(models.Reservation.user_id)
+            .order_by(total_reservations.desc(), models.Reservation.user_id)
         )
 
         if user_id:
-            query = query.filter(models.User.id == user_id)
+            counts = counts.filter(models.Reservation.user_id == user_id)
         else:
-            query = query.limit(limit)
+            counts = counts.limit(limit)
 
-        results = query.all()
+        counts = counts.subquery()
+        results = (
+            self.db.query(
+                models.User.id,
+                models.User.username,
+                counts.c.total_reservations,
+                counts.c.cancelled_count,
+            )
+            .join(counts, counts.c.user_id == models.User.id)
+            .order_by(counts.c.total_reservations.desc(), models.User.id)
+            .all()
+        )
 
         patterns = []
         for r in results:
@@ -510,20 +876,25 @@ class AnalyticsService:
         total_resources = self.db.query(func.count(models.Resource.id)).scalar()
         total_users = self.db.query(func.count(models.User.id)).scalar()
 
-        # Reservation counts for the period
-        reservations_query = self.db.query(models.Reservation).filter(
-            models.Reservation.created_at >= start_date,
-            models.Reservation.created_at < end_date,
+        # Reservation counts for the period, in one pass
+        reservation_id = models.Reservation.id
+        total_reservations, active_reservations, cancelled_reservations = (
+            self.db.query(
+                func.count(reservation_id),
+                func.count(reservation_id).filter(
+                    models.Reservation.status == "active"
+                ),
+                func.count(reservation_id).filter(
+                    models.Reservation.status == "cancelled"
+                ),
+            )
+            .filter(
+                models.Reservation.created_at >= start_date,
+                models.Reservation.created_at < end_date,
+            )
+            .one()
         )
 
-        total_reservations = reservations_query.count()
-        active_reservations = reservations_query.filter(
-            models.Reservation.status == "active"
-        ).count()
-        cancelled_reservations = reservations_query.filter(
-            models.Reservation.status == "cancelled"
-        ).count()
-
         # Average utilization
         utilization = self.get_resource_utilization(
             start_date=start_date, end_date=end_date
@@ -617,16 +988,17 @@ class AnalyticsService:
 
         return output.getvalue()
 
-    def export_reservations_csv(
+    def stream_reservations_csv(
         self,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
-    ) -> str:
-        """Export reservations data to CSV format.
+    ) -> Iterator[str]:
+        """Export reservations data to CSV format, chunk by chunk.
 
-        Generates a CSV-formatted string containing detailed reservation
-        records including resource and user information. This provides
-        a complete audit trail of booking activity.
+        Selects only the exported columns and fetches rows in batches as
+        the chunks are consumed, so memory use does not depend on the size
+        of the export period. The rows and columns are those of
+        :meth:`export_reservations_csv`, ordered by creation time.
 
         Args:
             start_date: The beginning of the export period. If None,
@@ -635,40 +1007,61 @@ class AnalyticsService:
                 to the current time.
 
         Returns:
-            A CSV-formatted string with headers and data rows. The columns
-            are: reservation_id, resource_name, username, start_time,
-            end_time, status, and created_at. Missing relationships
-            (resource or user) are represented as 'N/A'.
+            An iterator of CSV text chunks, header first.
 
         Example:
             >>> analytics = AnalyticsService(db)
-            >>> csv_content = analytics.export_reservations_csv(
-            ...     start_date=datetime(2024, 1, 1, tzinfo=UTC),
-            ...     end_date=datetime(2024, 1, 31, tzinfo=UTC)
-            ... )
-            >>> with open('january_reservations.csv', 'w') as f:
-            ...     f.write(csv_content)
+            >>> with open('reservations.csv', 'w') as f:
+            ...     f.writelines(analytics.stream_reservations_csv())
         """
         if not start_date:
             start_date = datetime.now(UTC) - timedelta(days=30)
         if not end_date:
             end_date = datetime.now(UTC)
 
-        reservations = (
-            self.db.query(models.Reservation)
+        rows = (
+            self.db.query(
+                models.Reservation.id,
+                models.Resource.name,
+                models.User.username,
+                models.Reservation.start_time,
+                models.Reservation.end_time,
+                models.Reservation.status,
+                models.Reservation.created_at,
+            )
+            .select_from(models.Reservation)
             .join(models.Resource)
             .join(models.User)
             .filter(
                 models.Reservation.created_at >= start_date,
                 models.Reservation.created_at < end_date,
             )
-            .all()
+            .order_by(models.Reservation.created_at, models.Reservation.id)
+            .yield_per(FETCH_SIZE)
         )
 
-        output = StringIO()
-        writer = csv.writer(output)
-        writer.writerow(
-            [
+        return iter_csv(
+            (
+                [
+                    res_id,
+                    resource_name or "N/A",
+                    username or "N/A",
+                    start_time.isoformat(),
+                    end_time.isoformat(),
+                    status,
+                    created_at.isoformat() if created_at else "N/A",
+                ]
+                for (
+                    res_id,
+                    resource_name,
+                    username,
+                    start_time,
+                    end_time,
+                    status,
+                    created_at,
+                ) in rows
+            ),
+            header=[
                 "reservation_id",
                 "resource_name",
                 "username",
@@ -676,20 +1069,40 @@ class AnalyticsService:
                 "end_time",
                 "status",
                 "created_at",
-            ]
+            ],
         )
 
-        for res in reservations:
-            writer.writerow(
-                [
-                    res.id,
-                    res.resource.name if res.resource else "N/A",
-                    res.user.username if res.user else "N/A",
-                    res.start_time.isoformat(),
-                    res.end_time.isoformat(),
-                    res.status,
-                    res.created_at.isoformat() if res.created_at else "N/A",
-                ]
-            )
+    def export_reservations_csv(
+        self,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> str:
+        """Export reservations data to CSV format.
 
-        return output.getvalue()
+        Generates a CSV-formatted string containing detailed reservation
+        records including resource and user information. This provides
+        a complete audit trail of booking activity. Large exports should
+        use :meth:`stream_reservations_csv` instead.
+
+        Args:
+            start_date: The beginning of the export period. If None,
+                defaults to 30 days before the current time.
+            end_date: The end of the export period. If None, defaults
+                to the current time.
+
+        Returns:
+            A CSV-formatted string with headers and data rows. The columns
+            are: reservation_id, resource_name, username, start_time,
+            end_time, status, and created_at. Missing relationships
+            (resource or user) are represented as 'N/A'.
+
+        Example:
+            >>> analytics = AnalyticsService(db)
+            >>> csv_content = analytics.export_reservations_csv(
+            ...     start_date=datetime(2024, 1, 1, tzinfo=UTC),
+            ...     end_date=datetime(2024, 1, 31, tzinfo=UTC)
+            ... )
+            >>> with open('january_reservations.csv', 'w') as f:
+            ...     f.write(csv_content)
+        """
+        return "".join(self.stream_reservations_csv(start_date, end_date))
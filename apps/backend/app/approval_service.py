@@ -13,7 +13,7 @@ import anyio
 from sqlalchemy.orm import Session, joinedload
 
 from app import models, schemas
-from app.services import NotificationService
+from app.services import NotificationService, _invalidate_cache_sync
 from app.websocket import manager as ws_manager
 
 logger = logging.getLogger(__name__)
@@ -165,6 +165,7 @@ class ApprovalService:
         reservation.status = "active"
 
         self.db.commit()
+        _invalidate_cache_sync()  # Invalidate resource cache
         self.db.refresh(approval_request)
 
         # Notify requester
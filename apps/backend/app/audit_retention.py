@@ -0,0 +1,434 @@
+"""Batched retention and archival of audit log entries.
+
+A single ``DELETE ... WHERE timestamp < cutoff`` over a large audit table
+holds its locks for the whole statement and writes one huge transaction.
+Retention here removes expired entries in bounded batches instead, each
+in its own short transaction, pausing between batches so regular traffic
+keeps flowing.
+
+Features:
+    - Optional archival: every batch is written to a gzip-compressed NDJSON
+      file in ``audit_archive_dir`` before it is deleted
+    - Resumable: a batch is archived and deleted atomically from the
+      retention point of view (the archive file is named after the first
+      entry of the batch and rewritten identically on a retry), so an
+      interrupted run loses nothing and the next run continues from the
+      oldest remaining entry
+    - Progress of the current or last run is available through
+      :func:`get_retention_progress`
+    - PostgreSQL monthly partitioning (see scripts/partition_audit_logs.py):
+      when ``audit_logs`` is partitioned, months entirely older than the
+      cutoff are archived and dropped with ``DROP TABLE`` on the partition,
+      and partitions for the coming months are created ahead of time
+
+Example Usage:
+    The application lifespan runs :func:`run_audit_retention` on a schedule
+    when ``audit_retention_enabled`` is set; the admin endpoint runs
+    :func:`purge_expired` directly::
+
+        progress = purge_expired(db, cutoff)
+        print(progress.deleted, progress.batches)
+
+Author: Sylvester-Francis
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import get_settings
+from app.database import SessionLocal
+from app.utils.streaming import FETCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Name prefix of the monthly partitions, e.g. audit_logs_p202401
+PARTITION_PREFIX = "audit_logs_p"
+
+# Only one retention run at a time per process
+_run_lock = threading.Lock()
+
+
+def utcnow() -> datetime:
+    """Get current UTC datetime."""
+    return datetime.now(UTC)
+
+
+class RetentionInProgressError(RuntimeError):
+    """Raised when a retention run is started while another is running."""
+
+
+@dataclass
+class RetentionProgress:
+    """Progress of a retention run.
+
+    Attributes:
+        cutoff: Entries older than this are removed.
+        started_at: When the run started.
+        finished_at: When the run ended, None while running.
+        deleted: Entries deleted so far, including dropped partitions.
+        archived: Entries written to archive files so far.
+        batches: Delete batches committed so far.
+        partitions_dropped: Names of the partitions dropped.
+        archive_files: Number of archive files written.
+        last_archive: Path of the most recent archive file.
+        interrupted: Whether the run was stopped before it was done.
+        error: Error message if the run failed.
+    """
+
+    cutoff: datetime
+    started_at: datetime = field(default_factory=utcnow)
+    finished_at: datetime | None = None
+    deleted: int = 0
+    archived: int = 0
+    batches: int = 0
+    partitions_dropped: list[str] = field(default_factory=list)
+    archive_files: int = 0
+    last_archive: str | None = None
+    interrupted: bool = False
+    error: str | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the run is still in progress."""
+        return self.finished_at is None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the progress as a JSON-serializable dict."""
+        data = asdict(self)
+        data["running"] = self.running
+        for key in ("cutoff", "started_at", "finished_at"):
+            if data[key] is not None:
+                data[key] = data[key].isoformat()
+        return data
+
+
+_progress: RetentionProgress | None = None
+
+
+def get_retention_progress() -> RetentionProgress | None:
+    """Get the progress of the current or last retention run.
+
+    Returns:
+        RetentionProgress | None: None if no run happened in this process.
+    """
+    return _progress
+
+
+def _json_default(value: Any) -> str:
+    """Serialize datetimes as ISO 8601 and anything else as a string."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def archive_rows(archive_dir: str, name: str, rows: Iterable[Any]) -> tuple[str, int]:
+    """Write audit rows to a gzip-compressed NDJSON file.
+
+    The file is written under a temporary name and renamed when complete,
+    so a partial archive never replaces a complete one.
+
+    Args:
+        archive_dir: Directory of the archive files, created if missing.
+        name: File name without extension.
+        rows: Result rows of the audit_logs table, consumed lazily.
+
+    Returns:
+        tuple[str, int]: Path of the archive file and rows written.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.ndjson.gz")
+    partial = f"{path}.partial"
+    count = 0
+    with gzip.open(partial, "wt", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(dict(row._mapping), default=_json_default))
+            f.write("\n")
+            count += 1
+    os.replace(partial, path)
+    return path, count
+
+
+def purge_batch(
+    db: Session,
+    cutoff: datetime,
+    batch_size: int,
+    archive_dir: str | None = None,
+    progress: RetentionProgress | None = None,
+) -> int:
+    """Archive and delete the oldest batch of expired entries.
+
+    Args:
+        db: Database session.
+        cutoff: Entries with an older timestamp are expired.
+        batch_size: Maximum entries per batch.
+        archive_dir: Archive the batch here before deleting it.
+        progress: Progress to update.
+
+    Returns:
+        int: Number of entries deleted; less than batch_size when done.
+    """
+    table = models.AuditLog.__table__
+    columns = [table] if archive_dir else [table.c.id]
+    rows = db.execute(
+        select(*columns)
+        .where(table.c.timestamp < cutoff)
+        .order_by(table.c.timestamp, table.c.id)
+        .limit(batch_size)
+    ).all()
+    if not rows:
+        return 0
+
+    if archive_dir:
+        first = rows[0]
+        name = f"audit_logs_{first.timestamp:%Y%m%dT%H%M%S}_{first.id}"
+        path, _ = archive_rows(archive_dir, name, rows)
+        if progress:
+            progress.archived += len(rows)
+            progress.archive_files += 1
+            progress.last_archive = path
+
+    db.execute(delete(table).where(table.c.id.in_([row.id for row in rows])))
+    db.commit()
+
+    if progress:
+        progress.deleted += len(rows)
+        progress.batches += 1
+    return len(rows)
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant of the month containing ``moment``, in UTC."""
+    return datetime(moment.year, moment.month, 1, tzinfo=UTC)
+
+
+def next_month(month: datetime) -> datetime:
+    """First instant of the month after ``month``."""
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1)
+    return month.replace(month=month.month + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the monthly partition starting at ``month``."""
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def is_partitioned(db: Session) -> bool:
+    """Whether audit_logs is a partitioned table (PostgreSQL only)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(
+        db.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = 'audit_logs' "
+                "AND c.relnamespace = to_regnamespace(current_schema())"
+            )
+        ).first()
+    )
+
+
+def create_partition_sql(month: datetime) -> str:
+    """DDL creating the monthly partition starting at ``month``."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF audit_logs FOR VALUES "
+        f"FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+    )
+
+
+def ensure_partitions(db: Session, months_ahead: int) -> None:
+    """Create the partitions of the current and the next months.
+
+    Args:
+        db: Database session on a partitioned audit_logs table.
+        months_ahead: Months after the current one to create.
+    """
+    month = month_start(utcnow())
+    for _ in range(months_ahead + 1):
+        db.execute(text(create_partition_sql(month)))
+        month = next_month(month)
+    db.commit()
+
+
+def drop_expired_partitions(
+    db: Session,
+    cutoff: datetime,
+    archive_dir: str | None = None,
+    progress: RetentionProgress | None = None,
+) -> list[str]:
+    """Archive and drop monthly partitions entirely older than the cutoff.
+
+    Args:
+        db: Database session on a partitioned audit_logs table.
+        cutoff: Entries with an older timestamp are expired.
+        archive_dir: Archive each partition here before dropping it.
+        progress: Progress to update.
+
+    Returns:
+        list[str]: Names of the dropped partitions.
+    """
+    names = db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'audit_logs' AND c.relname LIKE :prefix "
+            "ORDER BY c.relname"
+        ),
+        {"prefix": f"{PARTITION_PREFIX}%"},
+    ).scalars()
+
+    dropped = []
+    for name in list(names):
+        try:
+            month = datetime.strptime(name[len(PARTITION_PREFIX) :], "%Y%m")
+        except ValueError:
+            continue
+        if next_month(month.replace(tzinfo=UTC)) > cutoff:
+            break
+
+        if archive_dir:
+            rows = db.execute(
+                text(f"SELECT * FROM {name} ORDER BY timestamp, id"),  # nosec B608
+                execution_options={"yield_per": FETCH_SIZE},
+            )
+            path, count = archive_rows(archive_dir, name, rows)
+            if progress:
+                progress.archived += count
+                progress.archive_files += 1
+            progress.last_archive = path
+        else:
+            count = db.execute(
+                text(f"SELECT count(*) FROM {name}")  # nosec B608
+            ).scalar()
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+
+        dropped.append(name)
+        if progress:
+            progress.deleted += count
+            progress.partitions_dropped.append(name)
+        logger.info(f"Dropped audit log partition {name} ({count} entries)")
+    return dropped
+
+
+def purge_expired(
+    db: Session,
+    cutoff: datetime,
+    batch_size: int | None = None,
+    archive_dir: str | None = None,
+    pause: float = 0.0,
+    stop: threading.Event | None = None,
+) -> RetentionProgress:
+    """Remove all entries older than the cutoff, batch by batch.
+
+    Unset options come from settings; an empty ``audit_archive_dir``
+    disables archival.
+
+    Args:
+        db: Database session.
+        cutoff: Entries with an older timestamp are removed.
+        batch_size: Maximum entries per delete transaction.
+        archive_dir: Archive entries here before deleting them.
+        pause: Seconds to wait between batches.
+        stop: Set to end the run after the current batch.
+
+    Returns:
+        RetentionProgress: Final progress of the run.
+
+    Raises:
+        RetentionInProgressError: If another run is in progress.
+    """
+    global _progress
+    if not _run_lock.acquire(blocking=False):
+        raise RetentionInProgressError("Audit log retention is already running")
+
+    settings = get_settings()
+    batch_size = batch_size or settings.audit_retention_batch_size
+    if archive_dir is None:
+        archive_dir = settings.audit_archive_dir or None
+    stop = stop or threading.Event()
+    progress = _progress = RetentionProgress(cutoff=cutoff)
+
+    try:
+        if is_partitioned(db):
+            ensure_partitions(db, settings.audit_partition_months_ahead)
+            drop_expired_partitions(db, cutoff, archive_dir, progress)
+
+        while not stop.is_set():
+            deleted = purge_batch(db, cutoff, batch_size, archive_dir, progress)
+            logger.debug(
+                f"Audit retention batch {progress.batches}: deleted {deleted}, "
+                f"{progress.deleted} so far"
+            )
+            if deleted < batch_size:
+                break
+            if pause:
+                stop.wait(pause)
+        progress.interrupted = stop.is_set()
+    except Exception as e:
+        db.rollback()
+        progress.error = str(e)
+        raise
+    finally:
+        progress.finished_at = utcnow()
+        _run_lock.release()
+
+    logger.info(
+        f"Audit log retention: deleted {progress.deleted} entries older than "
+        f"{cutoff.isoformat()} in {progress.batches} batches"
+        + (f", archived {progress.archived}" if archive_dir else "")
+        + (" (interrupted)" if progress.interrupted else "")
+    )
+    return progress
+
+
+async def run_audit_retention(
+    retention_days: int | None = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> RetentionProgress:
+    """Run :func:`purge_expired` in a worker thread with settings' pacing.
+
+    Cancelling the awaiting task stops the run after the current batch.
+
+    Args:
+        retention_days: Days of entries to keep. Defaults to
+            ``audit_retention_days``.
+        session_factory: Callable returning a new database session.
+
+    Returns:
+        RetentionProgress: Final progress of the run.
+    """
+    settings = get_settings()
+    days = retention_days or settings.audit_retention_days
+    cutoff = utcnow() - timedelta(days=days)
+    stop = threading.Event()
+
+    def run() -> RetentionProgress:
+        db = session_factory()
+        try:
+            return purge_expired(
+                db, cutoff, pause=settings.audit_retention_pause, stop=stop
+            )
+        finally:
+            db.close()
+
+    try:
+        return await asyncio.to_thread(run)
+    except asyncio.CancelledError:
+        stop.set()
+        raise
@@ -1,29 +1,61 @@
 """Audit logging service for tracking system actions.
 
 Provides functionality for:
-- Logging user actions with context
-- Querying audit logs with filters
-- Exporting audit logs (CSV, JSON)
-- Retention policy management
+- Logging user actions with context, synchronously or through the batched
+  background writer (see app.audit_writer)
+- Querying audit logs with filters, keyset pagination and full-text search
+- Exporting audit logs (CSV, JSON, NDJSON) as streams of chunks
+- Retention policy management, in batches with optional archival
 
 Author: Sylvester-Francis
 """
 
-import csv
 import json
 import logging
+import re
+from collections.abc import Iterator
 from datetime import UTC, datetime, timedelta
-from io import StringIO
 from typing import Any
 
 from fastapi import Request
-from sqlalchemy import and_, func
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, and_, column, func, literal_column, text, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Query, Session
 
 from app import models
+from app.audit_retention import purge_expired
+from app.audit_writer import get_audit_writer, write_entries
+from app.services import _decode_cursor, _encode_cursor
+from app.utils.streaming import CHUNK_SIZE, FETCH_SIZE, iter_csv, iter_ndjson
 
 logger = logging.getLogger(__name__)
 
+# Row cap of the string exports (export_to_csv / export_to_json)
+MAX_STRING_EXPORT = 10000
+
+# Total count modes of get_logs_page
+COUNT_MODES = ("exact", "estimate", "none")
+
+# Estimated totals without a query planner are exact up to this many rows
+ESTIMATE_COUNT_CAP = 10000
+
+_CSV_HEADER = [
+    "id",
+    "timestamp",
+    "user_id",
+    "username",
+    "action",
+    "entity_type",
+    "entity_id",
+    "entity_name",
+    "ip_address",
+    "request_method",
+    "request_path",
+    "success",
+    "details",
+    "error_message",
+]
+
 
 def utcnow():
     """Get current UTC datetime."""
@@ -36,8 +68,8 @@ class AuditService:
     def __init__(self, db: Session):
         self.db = db
 
-    def log_action(
-        self,
+    @staticmethod
+    def build_entry(
         action: str,
         entity_type: str,
         entity_id: int | None = None,
@@ -50,8 +82,11 @@ class AuditService:
         details: str | None = None,
         success: bool = True,
         error_message: str | None = None,
-    ) -> models.AuditLog:
-        """Log an action to the audit log.
+    ) -> dict[str, Any]:
+        """Build the column values of an audit log entry.
+
+        The request context is read immediately and the entry is
+        timestamped now, so the entry can be written later.
 
         Args:
             action: Action type (create, update, delete, login, etc.)
@@ -68,7 +103,7 @@ class AuditService:
             error_message: Error message if action failed
 
         Returns:
-            The created AuditLog entry
+            Column values for an AuditLog row
         """
         # Extract request context
         ip_address = None
@@ -88,35 +123,107 @@ class AuditService:
             request_method = request.method
             request_path = str(request.url.path)[:500]
 
-        audit_log = models.AuditLog(
-            user_id=user_id,
-            username=username,
-            action=action,
-            entity_type=entity_type,
+        return {
+            "timestamp": utcnow(),
+            "user_id": user_id,
+            "username": username,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "entity_name": entity_name,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "request_method": request_method,
+            "request_path": request_path,
+            "old_values": old_values,
+            "new_values": new_values,
+            "details": details,
+            "success": success,
+            "error_message": error_message,
+        }
+
+    def log_action(
+        self,
+        action: str,
+        entity_type: str,
+        entity_id: int | None = None,
+        entity_name: str | None = None,
+        user_id: int | None = None,
+        username: str | None = None,
+        request: Request | None = None,
+        old_values: dict | None = None,
+        new_values: dict | None = None,
+        details: str | None = None,
+        success: bool = True,
+        error_message: str | None = None,
+    ) -> models.AuditLog:
+        """Log an action to the audit log, committing it immediately.
+
+        Args:
+            action: Action type (create, update, delete, login, etc.)
+            entity_type: Type of entity (reservation, resource, user, etc.)
+            entity_id: ID of the affected entity
+            entity_name: Human-readable name of the entity
+            user_id: ID of the user performing the action
+            username: Username (denormalized for history)
+            request: FastAPI request object for context
+            old_values: Previous state of the entity
+            new_values: New state of the entity
+            details: Human-readable description
+            success: Whether the action was successful
+            error_message: Error message if action failed
+
+        Returns:
+            The created AuditLog entry
+        """
+        entry = self.build_entry(
+            action,
+            entity_type,
             entity_id=entity_id,
             entity_name=entity_name,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            request_method=request_method,
-            request_path=request_path,
+            user_id=user_id,
+            username=username,
+            request=request,
             old_values=old_values,
             new_values=new_values,
             details=details,
             success=success,
             error_message=error_message,
         )
+        audit_log = models.AuditLog(**entry)
 
         self.db.add(audit_log)
         self.db.commit()
         self.db.refresh(audit_log)
 
-        logger.info(
-            f"Audit: {action} on {entity_type}:{entity_id} by user:{user_id} - "
-            f"{'success' if success else 'failed'}"
-        )
+        _log_summary(entry)
 
         return audit_log
 
+    def enqueue_action(self, action: str, entity_type: str, **context) -> bool:
+        """Log an action through the batched background writer.
+
+        The request does not wait for a commit of its own. If the writer is
+        not running or its queue is full, the entry is inserted on this
+        session and committed right away instead (backpressure).
+
+        Args:
+            action: Action type (create, update, delete, login, etc.)
+            entity_type: Type of entity (reservation, resource, user, etc.)
+            **context: The remaining :meth:`log_action` arguments
+
+        Returns:
+            True if the entry was queued, False if it was written directly
+        """
+        entry = self.build_entry(action, entity_type, **context)
+        queued = get_audit_writer().submit(entry)
+        if not queued:
+            write_entries(self.db, [entry])
+
+        _log_summary(entry)
+
+        return queued
+
     def get_logs(
         self,
         user_id: int | None = None,
@@ -142,13 +249,191 @@ class AuditService:
             end_date: Filter by end timestamp
             success: Filter by success status
             ip_address: Filter by IP address
-            search: Full-text search in details/entity_name
+            search: Full-text search in details/entity name/username
             skip: Pagination offset
             limit: Pagination limit
 
         Returns:
             Tuple of (logs list, total count)
         """
+        logs, _, _, total = self.get_logs_page(
+            user_id=user_id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            start_date=start_date,
+            end_date=end_date,
+            success=success,
+            ip_address=ip_address,
+            search=search,
+            skip=skip,
+            limit=limit,
+        )
+
+        return logs, total
+
+    def get_logs_page(
+        self,
+        user_id: int | None = None,
+        action: str | None = None,
+        entity_type: str | None = None,
+        entity_id: int | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        success: bool | None = None,
+        ip_address: str | None = None,
+        search: str | None = None,
+        cursor: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        count: str = "exact",
+    ) -> tuple[list[models.AuditLog], str | None, bool, int | None]:
+        """Query one page of audit logs, newest first.
+
+        With a cursor the page starts after the entry the cursor points to
+        (``WHERE (timestamp, id) < cursor``), so its cost does not depend on
+        how deep the page is. Without one, ``skip`` entries are skipped.
+
+        Args:
+            user_id: Filter by user ID
+            action: Filter by action type
+            entity_type: Filter by entity type
+            entity_id: Filter by entity ID
+            start_date: Filter by start timestamp
+            end_date: Filter by end timestamp
+            success: Filter by success status
+            ip_address: Filter by IP address
+            search: Full-text search in details/entity name/username
+            cursor: Cursor returned with the previous page
+            skip: Pagination offset, ignored with a cursor
+            limit: Pagination limit
+            count: "exact" counts all matches, "estimate" returns the query
+                planner's estimate on PostgreSQL (elsewhere an exact count
+                capped at ESTIMATE_COUNT_CAP), "none" skips counting
+
+        Returns:
+            Tuple of (logs list, next cursor, has_more, total count or None)
+
+        Raises:
+            ValueError: If the cursor or the count mode is invalid
+        """
+        if count not in COUNT_MODES:
+            raise ValueError(f"Invalid count mode: {count}")
+
+        query = self._filtered_query(
+            user_id=user_id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            start_date=start_date,
+            end_date=end_date,
+            success=success,
+            ip_address=ip_address,
+            search=search,
+        )
+        total = self._count(query, count)
+
+        if cursor:
+            value, record_id = _decode_cursor(cursor)
+            try:
+                after = datetime.fromisoformat(value)
+            except (TypeError, ValueError) as exc:
+                raise ValueError("Invalid cursor") from exc
+            query = query.filter(
+                tuple_(models.AuditLog.timestamp, models.AuditLog.id)
+                < tuple_(after, record_id)
+            )
+
+        query = query.order_by(
+            models.AuditLog.timestamp.desc(), models.AuditLog.id.desc()
+        )
+        if skip and not cursor:
+            query = query.offset(skip)
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        logs = rows[:limit]
+        next_cursor = (
+            _encode_cursor(logs[-1].timestamp, logs[-1].id)
+            if has_more and logs
+            else None
+        )
+
+        return logs, next_cursor, has_more, total
+
+    def _count(self, query: Query, mode: str) -> int | None:
+        """Count the entries matching a filtered query (see get_logs_page)."""
+        if mode == "none":
+            return None
+        if mode == "exact":
+            return query.order_by(None).count()
+
+        ids = query.with_entities(models.AuditLog.id).order_by(None)
+        if self.db.get_bind().dialect.name == "postgresql":
+            try:
+                return self._planner_estimate(ids)
+            except SQLAlchemyError as e:
+                logger.warning(f"Audit log count estimate failed: {e}")
+                self.db.rollback()
+        capped = ids.limit(ESTIMATE_COUNT_CAP).subquery()
+        return self.db.query(func.count()).select_from(capped).scalar()
+
+    def _planner_estimate(self, query: Query) -> int:
+        """Row estimate of the PostgreSQL planner for a query."""
+        compiled = query.statement.compile(dialect=self.db.get_bind().dialect)
+        plan = (
+            self.db.connection()
+            .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+            .scalar()
+        )
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _search_filter(self, search: str):
+        """Full-text match of all words of ``search``, as prefixes.
+
+        Uses the FTS5 table on SQLite and the tsvector GIN index on
+        PostgreSQL; other databases fall back to substring matching.
+        """
+        words = re.findall(r"\w+", search.lower())
+        dialect = self.db.get_bind().dialect.name
+
+        if words and dialect == "sqlite":
+            match = " ".join(f'"{word}"*' for word in words)
+            matches = (
+                text(
+                    "SELECT rowid FROM audit_logs_fts WHERE audit_logs_fts MATCH :match"
+                )
+                .bindparams(match=match)
+                .columns(column("rowid", Integer))
+            )
+            return models.AuditLog.id.in_(matches)
+
+        if words and dialect == "postgresql":
+            terms = " & ".join(f"{word}:*" for word in words)
+            tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), terms)
+            return models.audit_log_search_vector().op("@@")(tsquery)
+
+        search_pattern = f"%{search}%"
+        return (
+            (models.AuditLog.details.ilike(search_pattern))
+            | (models.AuditLog.entity_name.ilike(search_pattern))
+            | (models.AuditLog.username.ilike(search_pattern))
+        )
+
+    def _filtered_query(
+        self,
+        user_id: int | None = None,
+        action: str | None = None,
+        entity_type: str | None = None,
+        entity_id: int | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        success: bool | None = None,
+        ip_address: str | None = None,
+        search: str | None = None,
+    ):
+        """Build an AuditLog query with the get_logs filters applied."""
         query = self.db.query(models.AuditLog)
         filters = []
 
@@ -177,25 +462,12 @@ class AuditService:
             filters.append(models.AuditLog.ip_address == ip_address)
 
         if search:
-            search_pattern = f"%{search}%"
-            filters.append(
-                (models.AuditLog.details.ilike(search_pattern))
-                | (models.AuditLog.entity_name.ilike(search_pattern))
-                | (models.AuditLog.username.ilike(search_pattern))
-            )
+            filters.append(self._search_filter(search))
 
         if filters:
             query = query.filter(and_(*filters))
 
-        total = query.count()
-        logs = (
-            query.order_by(models.AuditLog.timestamp.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-
-        return logs, total
+        return query
 
     def get_log_by_id(self, log_id: int) -> models.AuditLog | None:
         """Get a single audit log entry by ID."""
@@ -294,68 +566,124 @@ class AuditService:
             "total_entries": query.count(),
         }
 
-    def export_to_csv(
+    def _export_logs(
         self,
         user_id: int | None = None,
         action: str | None = None,
         entity_type: str | None = None,
         start_date: datetime | None = None,
         end_date: datetime | None = None,
-    ) -> str:
-        """Export audit logs to CSV format."""
-        logs, _ = self.get_logs(
+        limit: int | None = None,
+    ) -> Iterator[models.AuditLog]:
+        """Iterate matching logs, newest first, fetching in batches."""
+        query = self._filtered_query(
             user_id=user_id,
             action=action,
             entity_type=entity_type,
             start_date=start_date,
             end_date=end_date,
-            limit=10000,  # Max export limit
-        )
+        ).order_by(models.AuditLog.timestamp.desc(), models.AuditLog.id.desc())
+        if limit:
+            query = query.limit(limit)
+        return query.yield_per(FETCH_SIZE)
 
-        output = StringIO()
-        writer = csv.writer(output)
-        writer.writerow(
+    def stream_csv(
+        self,
+        user_id: int | None = None,
+        action: str | None = None,
+        entity_type: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        limit: int | None = None,
+    ) -> Iterator[str]:
+        """Export audit logs as CSV, chunk by chunk.
+
+        Rows are fetched in batches as the chunks are consumed, so memory
+        does not grow with the number of exported entries.
+
+        Returns:
+            Iterator of CSV text chunks, header first
+        """
+        rows = (
             [
-                "id",
-                "timestamp",
-                "user_id",
-                "username",
-                "action",
-                "entity_type",
-                "entity_id",
-                "entity_name",
-                "ip_address",
-                "request_method",
-                "request_path",
-                "success",
-                "details",
-                "error_message",
+                log.id,
+                log.timestamp.isoformat() if log.timestamp else "",
+                log.user_id or "",
+                log.username or "",
+                log.action,
+                log.entity_type,
+                log.entity_id or "",
+                log.entity_name or "",
+                log.ip_address or "",
+                log.request_method or "",
+                log.request_path or "",
+                log.success,
+                log.details or "",
+                log.error_message or "",
             ]
+            for log in self._export_logs(
+                user_id, action, entity_type, start_date, end_date, limit
+            )
         )
+        return iter_csv(rows, header=_CSV_HEADER)
 
-        for log in logs:
-            writer.writerow(
-                [
-                    log.id,
-                    log.timestamp.isoformat() if log.timestamp else "",
-                    log.user_id or "",
-                    log.username or "",
-                    log.action,
-                    log.entity_type,
-                    log.entity_id or "",
-                    log.entity_name or "",
-                    log.ip_address or "",
-                    log.request_method or "",
-                    log.request_path or "",
-                    log.success,
-                    log.details or "",
-                    log.error_message or "",
-                ]
+    def stream_ndjson(
+        self,
+        user_id: int | None = None,
+        action: str | None = None,
+        entity_type: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        limit: int | None = None,
+    ) -> Iterator[str]:
+        """Export audit logs as newline-delimited JSON, one entry per line.
+
+        Returns:
+            Iterator of NDJSON text chunks
+        """
+        return iter_ndjson(
+            _export_record(log)
+            for log in self._export_logs(
+                user_id, action, entity_type, start_date, end_date, limit
             )
+        )
+
+    def stream_json(
+        self,
+        user_id: int | None = None,
+        action: str | None = None,
+        entity_type: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        limit: int | None = None,
+    ) -> Iterator[str]:
+        """Export audit logs as one JSON document, chunk by chunk.
 
-        return output.getvalue()
+        The document has the keys ``exported_at``, ``logs`` and ``total``
+        (the number of exported entries), written in that order so the
+        count can follow the streamed entries.
 
-    def export_to_json(
+        Returns:
+            Iterator of JSON text chunks
+        """
+        yield f'{{"exported_at": {json.dumps(utcnow().isoformat())}, "logs": ['
+        total = 0
+        parts: list[str] = []
+        size = 0
+        for log in self._export_logs(
+            user_id, action, entity_type, start_date, end_date, limit
+        ):
+            part = ("," if total else "") + "\n  " + json.dumps(_export_record(log))
+            parts.append(part)
+            size += len(part)
+            total += 1
+            if size >= CHUNK_SIZE:
+                yield "".join(parts)
+                parts, size = [], 0
+        parts.append(f'\n], "total": {total}}}\n')
+        yield "".join(parts)
+
+    def export_to_csv(
         self,
         user_id: int | None = None,
         action: str | None = None,
@@ -363,70 +691,59 @@ class AuditService:
         start_date: datetime | None = None,
         end_date: datetime | None = None,
     ) -> str:
-        """Export audit logs to JSON format."""
-        logs, total = self.get_logs(
-            user_id=user_id,
-            action=action,
-            entity_type=entity_type,
-            start_date=start_date,
-            end_date=end_date,
-            limit=10000,
+        """Export up to MAX_STRING_EXPORT audit logs to a CSV string."""
+        return "".join(
+            self.stream_csv(
+                user_id=user_id,
+                action=action,
+                entity_type=entity_type,
+                start_date=start_date,
+                end_date=end_date,
+                limit=MAX_STRING_EXPORT,
+            )
         )
 
-        data = {
-            "total": total,
-            "exported_at": utcnow().isoformat(),
-            "logs": [
-                {
-                    "id": log.id,
-                    "timestamp": log.timestamp.isoformat() if log.timestamp else None,
-                    "user_id": log.user_id,
-                    "username": log.username,
-                    "action": log.action,
-                    "entity_type": log.entity_type,
-                    "entity_id": log.entity_id,
-                    "entity_name": log.entity_name,
-                    "ip_address": log.ip_address,
-                    "user_agent": log.user_agent,
-                    "request_method": log.request_method,
-                    "request_path": log.request_path,
-                    "old_values": log.old_values,
-                    "new_values": log.new_values,
-                    "details": log.details,
-                    "success": log.success,
-                    "error_message": log.error_message,
-                }
-                for log in logs
-            ],
-        }
-
-        return json.dumps(data, indent=2)
+    def export_to_json(
+        self,
+        user_id: int | None = None,
+        action: str | None = None,
+        entity_type: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> str:
+        """Export up to MAX_STRING_EXPORT audit logs to a JSON string."""
+        return "".join(
+            self.stream_json(
+                user_id=user_id,
+                action=action,
+                entity_type=entity_type,
+                start_date=start_date,
+                end_date=end_date,
+                limit=MAX_STRING_EXPORT,
+            )
+        )
 
     def apply_retention_policy(self, retention_days: int = 90) -> int:
         """Delete audit logs older than retention period.
 
+        Entries are removed in batches of ``audit_retention_batch_size``,
+        each committed on its own, and archived first when
+        ``audit_archive_dir`` is set (see app.audit_retention).
+
         Args:
             retention_days: Number of days to retain logs
 
         Returns:
             Number of deleted entries
+
+        Raises:
+            RetentionInProgressError: If a retention run is in progress
         """
         cutoff_date = utcnow() - timedelta(days=retention_days)
 
-        deleted_count = (
-            self.db.query(models.AuditLog)
-            .filter(models.AuditLog.timestamp < cutoff_date)
-            .delete(synchronize_session=False)
-        )
+        progress = purge_expired(self.db, cutoff_date)
 
-        self.db.commit()
-
-        logger.info(
-            f"Audit log retention policy applied: deleted {deleted_count} entries "
-            f"older than {retention_days} days"
-        )
-
-        return deleted_count
+        return progress.deleted
 
     def get_available_actions(self) -> list[str]:
         """Get list of all unique actions in audit logs."""
@@ -449,6 +766,38 @@ class AuditService:
         return [r[0] for r in results]
 
 
+def _export_record(log: models.AuditLog) -> dict[str, Any]:
+    """JSON-serializable representation of an audit log for exports."""
+    return {
+        "id": log.id,
+        "timestamp": log.timestamp.isoformat() if log.timestamp else None,
+        "user_id": log.user_id,
+        "username": log.username,
+        "action": log.action,
+        "entity_type": log.entity_type,
+        "entity_id": log.entity_id,
+        "entity_name": log.entity_name,
+        "ip_address": log.ip_address,
+        "user_agent": log.user_agent,
+        "request_method": log.request_method,
+        "request_path": log.request_path,
+        "old_values": log.old_values,
+        "new_values": log.new_values,
+        "details": log.details,
+        "success": log.success,
+        "error_message": log.error_message,
+    }
+
+
+def _log_summary(entry: dict[str, Any]) -> None:
+    """Write a one-line summary of an audit entry to the app log."""
+    logger.info(
+        f"Audit: {entry['action']} on {entry['entity_type']}:{entry['entity_id']} "
+        f"by user:{entry['user_id']} - "
+        f"{'success' if entry['success'] else 'failed'}"
+    )
+
+
 def get_audit_context(request: Request, user: models.User | None = None) -> dict:
     """Helper to extract audit context from request."""
     context = {
@@ -0,0 +1,232 @@
+"""Batched background writer for audit log entries.
+
+Audited requests hand their entries to a bounded in-memory queue instead
+of committing one transaction each. A writer thread drains the queue and
+inserts entries in bulk, one INSERT and one commit per batch.
+
+Features:
+    - Flushes every ``batch_size`` entries or ``flush_interval`` seconds,
+      whichever comes first
+    - Backpressure: when the queue is full the caller writes its entry
+      synchronously, so a stalled database slows producers down instead of
+      growing memory
+    - Entries are timestamped when they are queued, not when written
+    - Everything still queued is written on shutdown
+    - A thread rather than an event loop task, because entries come from
+      sync endpoints running in the threadpool and are written with sync
+      sessions
+
+Example Usage:
+    Started and stopped from the application lifespan::
+
+        get_audit_writer().start()
+        get_audit_writer().submit(entry)  # False -> write it yourself
+        await asyncio.to_thread(close_audit_writer)
+
+Author: Sylvester-Francis
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import get_settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Queue marker that tells the writer thread to exit
+_STOP = object()
+
+
+def write_entries(db: Session, entries: list[dict[str, Any]]) -> None:
+    """Insert audit entries with one bulk INSERT and commit.
+
+    Args:
+        db: Database session to write with.
+        entries: Column values of the AuditLog rows.
+    """
+    if not entries:
+        return
+    db.execute(insert(models.AuditLog), entries)
+    db.commit()
+
+
+class AuditLogWriter:
+    """Bounded queue of audit entries drained by a background thread.
+
+    Attributes:
+        queue_size: Maximum entries waiting to be written.
+        batch_size: Entries that trigger a write before the interval ends.
+        flush_interval: Maximum seconds an entry waits in the queue.
+        sync_fallbacks: Entries refused because the queue was full.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        queue_size: int | None = None,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+    ) -> None:
+        """Initialize the writer. Unset limits come from settings.
+
+        Args:
+            session_factory: Callable returning a new database session.
+            queue_size: Maximum entries waiting to be written.
+            batch_size: Entries per bulk insert.
+            flush_interval: Seconds between writes of a partial batch.
+        """
+        settings = get_settings()
+        self.queue_size = queue_size or settings.audit_queue_size
+        self.batch_size = batch_size or settings.audit_batch_size
+        self.flush_interval = flush_interval or settings.audit_flush_interval
+        self.sync_fallbacks = 0
+        self._session_factory = session_factory
+        self._queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the writer thread is accepting entries."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        """Number of entries waiting to be written."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start the writer thread if it is not running."""
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="audit-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Write everything queued and stop the writer thread.
+
+        Args:
+            timeout: Seconds to wait for the writer thread to finish.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Audit log writer did not stop in time")
+            return
+        # Entries that raced with shutdown
+        self.flush()
+
+    def submit(self, entry: dict[str, Any]) -> bool:
+        """Queue an entry without waiting for it to be written.
+
+        Args:
+            entry: Column values of the AuditLog row.
+
+        Returns:
+            bool: False if the writer is not running or the queue is full;
+            the caller must then write the entry itself.
+        """
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.sync_fallbacks += 1
+            return False
+        return True
+
+    def flush(self) -> int:
+        """Write all queued entries from the calling thread.
+
+        Returns:
+            int: Number of entries written.
+        """
+        batch = []
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not _STOP:
+                batch.append(entry)
+        for offset in range(0, len(batch), self.batch_size):
+            self._write(batch[offset : offset + self.batch_size])
+        return len(batch)
+
+    def _run(self) -> None:
+        """Collect entries into batches and write them until stopped."""
+        while True:
+            try:
+                entry = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if entry is _STOP:
+                return
+
+            batch = [entry]
+            deadline = time.monotonic() + self.flush_interval
+            stopping = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            self._write(batch)
+            if stopping:
+                return
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        """Insert a batch with a short-lived session, logging failures."""
+        db = self._session_factory()
+        try:
+            write_entries(db, batch)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to write {len(batch)} audit log entries: {e}")
+        finally:
+            db.close()
+
+
+_writer: AuditLogWriter | None = None
+
+
+def get_audit_writer() -> AuditLogWriter:
+    """Get the global audit writer, creating it on first use.
+
+    Returns:
+        AuditLogWriter: The process-wide writer.
+    """
+    global _writer
+    if _writer is None:
+        _writer = AuditLogWriter()
+    return _writer
+
+
+def close_audit_writer() -> None:
+    """Flush and stop the global audit writer if it was started."""
+    if _writer is not None:
+        _writer.stop()
@@ -0,0 +1,728 @@
+"""Set-based availability engine for resource searches.
+
+Provides functionality for:
+- Finding resources that are free in a [from, until) window with a single
+  ``NOT EXISTS`` query instead of one conflict query per resource
+- Pushing status and name filters into SQL
+- Annotating a page of resources with live availability and the current
+  user name in one bulk lookup, without writing to the database
+- Reconciling stored resource status in one batched UPDATE per tick
+
+Example:
+    >>> engine = AvailabilityEngine(db)
+    >>> free = engine.find_resources(
+    ...     status_filter="available",
+    ...     available_from=start,
+    ...     available_until=end,
+    ...     tags=["projector"],
+    ... )
+
+Author: Sylvester-Francis
+"""
+
+import json
+import logging
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from sqlalchemy import String, and_, case, cast, exists, func, or_, update
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import models
+from app.conflicts import conflict_exists
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    """Get current UTC datetime that's timezone-aware."""
+    return datetime.now(UTC)
+
+
+def ensure_timezone_aware(dt: datetime | None) -> datetime | None:
+    """Ensure datetime is timezone-aware (convert to UTC if naive)."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    return dt
+
+
+def resolve_status(
+    resource, in_use_now: bool, now: datetime | None = None
+) -> tuple[str, datetime | None]:
+    """Compute the live status of a resource without touching the database.
+
+    Mirrors ``ResourceService._update_resource_status``: an expired
+    maintenance window resets to available, a running reservation marks an
+    enabled resource in_use, and an in_use resource with nothing running
+    goes back to available. Manual "unavailable" status is never overridden
+    by reservations.
+
+    Args:
+        resource: A Resource (or row) with status, available,
+            unavailable_since and auto_reset_hours.
+        in_use_now: Whether an active reservation is running at ``now``.
+        now: Reference time. Defaults to the current UTC time.
+
+    Returns:
+        A tuple of (status, unavailable_since) as they should be stored.
+    """
+    now = now or utcnow()
+    status = resource.status
+    unavailable_since = resource.unavailable_since
+
+    if status == "unavailable" and unavailable_since:
+        elapsed = now - ensure_timezone_aware(unavailable_since)
+        if elapsed.total_seconds() / 3600 >= (resource.auto_reset_hours or 8):
+            status, unavailable_since = "available", None
+
+    if resource.available:
+        if in_use_now and status not in ("unavailable", "in_use"):
+            status = "in_use"
+        elif not in_use_now and status == "in_use":
+            status, unavailable_since = "available", None
+
+    return status, unavailable_since
+
+
+def _matches_tags(resource: models.Resource, tag_set: set[str]) -> bool:
+    """Check that a resource carries every tag in ``tag_set`` (case-insensitive)."""
+    resource_tags = {tag.lower() for tag in (resource.tags or [])}
+    return tag_set.issubset(resource_tags)
+
+
+def _matches_text(
+    resource: models.Resource, query_lower: str, include_tags: bool
+) -> bool:
+    """Check a resource name (and optionally tags) against a search string."""
+    if query_lower in resource.name.lower():
+        return True
+    if include_tags:
+        return any(query_lower in tag.lower() for tag in (resource.tags or []))
+    return False
+
+
+def _json_fragment(value: str) -> str:
+    """Encode a string the way it appears inside the stored JSON tags array."""
+    return json.dumps(value)[1:-1]
+
+
+class AvailabilityEngine:
+    """Answer availability questions for many resources in O(1) queries.
+
+    SQL does the heavy lifting (status, time-window anti-join, keyset
+    ordering) while tag and text predicates are prefiltered in SQL and then
+    confirmed in Python, because SQL ``lower()`` is ASCII-only on SQLite and
+    tags are stored as a JSON array.
+
+    Attributes:
+        db: The SQLAlchemy database session for database operations.
+    """
+
+    # Sort fields accepted by paginate(); created_at maps to id because
+    # resources have no creation timestamp column.
+    SORT_FIELDS = ("id", "name", "status", "created_at")
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def build_query(
+        self,
+        query: str | None = None,
+        status_filter: str = "available",
+        available_from: datetime | None = None,
+        available_until: datetime | None = None,
+        tags: list[str] | None = None,
+        columns: tuple | None = None,
+    ) -> Query:
+        """Build the SQL side of a resource search.
+
+        Status, base availability, text and tag prefilters and the
+        time-window anti-join are compiled into one unordered SELECT.
+        Prefilters never drop a row that ``matches`` would accept.
+
+        Args:
+            query: Optional text to search for in resource names (and tags
+                when no time window is given).
+            status_filter: One of "all", "available", "unavailable", "in_use".
+            available_from: Optional start of the requested window.
+            available_until: Optional end of the requested window.
+            tags: Optional list of tags; resources must carry all of them.
+            columns: Optional columns to select instead of the entity.
+
+        Returns:
+            A Query over ``models.Resource``.
+        """
+        available_from = ensure_timezone_aware(available_from)
+        available_until = ensure_timezone_aware(available_until)
+        time_window = bool(available_from and available_until)
+
+        db_query = self.db.query(*(columns or (models.Resource,)))
+
+        if time_window:
+            # Only enabled resources can be booked in a window
+            db_query = db_query.filter(models.Resource.available.is_(True))
+
+        if status_filter == "available":
+            db_query = db_query.filter(models.Resource.available.is_(True))
+        elif status_filter == "unavailable":
+            db_query = db_query.filter(models.Resource.available.is_(False))
+        elif status_filter == "in_use":
+            # Match the status annotate() reports, not the stored one
+            db_query = db_query.filter(
+                or_(
+                    and_(
+                        models.Resource.available.is_(True),
+                        models.Resource.status != "unavailable",
+                        self._running_reservation_exists(utcnow()),
+                    ),
+                    and_(
+                        models.Resource.available.is_(False),
+                        models.Resource.status == "in_use",
+                    ),
+                )
+            )
+
+        tags_text = func.lower(cast(models.Resource.tags, String))
+
+        # ASCII needles lower-case identically in SQL and Python; anything
+        # else is left to the Python pass in matches()
+        for tag in tags or []:
+            if tag.isascii():
+                db_query = db_query.filter(
+                    tags_text.contains(json.dumps(tag.lower()), autoescape=True)
+                )
+
+        if query and query.isascii():
+            needle = query.lower()
+            name_match = func.lower(models.Resource.name).contains(
+                needle, autoescape=True
+            )
+            if time_window:
+                db_query = db_query.filter(name_match)
+            else:
+                db_query = db_query.filter(
+                    or_(
+                        name_match,
+                        tags_text.contains(_json_fragment(needle), autoescape=True),
+                    )
+                )
+
+        if time_window:
+            db_query = db_query.filter(
+                ~conflict_exists(available_from, available_until)
+            )
+
+        return db_query
+
+    @staticmethod
+    def matches(
+        resource: models.Resource,
+        query: str | None = None,
+        tags: list[str] | None = None,
+        time_window: bool = False,
+    ) -> bool:
+        """Confirm the tag and text predicates for a prefiltered row.
+
+        Args:
+            resource: A row returned by ``build_query``.
+            query: The search text, if any.
+            tags: The required tags, if any.
+            time_window: Whether the search has a time window, in which case
+                the text only matches names.
+
+        Returns:
+            True if the resource satisfies the tag and text filters.
+        """
+        if tags and not _matches_tags(resource, {tag.lower() for tag in tags}):
+            return False
+        if query and not _matches_text(
+            resource, query.lower(), include_tags=not time_window
+        ):
+            return False
+        return True
+
+    def find_resources(
+        self,
+        query: str | None = None,
+        status_filter: str = "available",
+        available_from: datetime | None = None,
+        available_until: datetime | None = None,
+        tags: list[str] | None = None,
+    ) -> list[models.Resource]:
+        """Find matching resources and annotate them with live availability.
+
+        Issues a fixed number of queries regardless of how many resources
+        exist: one SELECT for the candidates and, outside a time window,
+        one bulk lookup of current reservations.
+
+        Args:
+            query: Optional text to search for in resource names (and tags
+                when no time window is given).
+            status_filter: One of "all", "available", "unavailable", "in_use".
+            available_from: Optional start of the requested window.
+            available_until: Optional end of the requested window.
+            tags: Optional list of tags; resources must carry all of them.
+
+        Returns:
+            A list of matching Resource instances with ``current_availability``
+            (and ``current_user_name`` where applicable) populated.
+        """
+        time_window = bool(available_from and available_until)
+        candidates = (
+            self.build_query(
+                query=query,
+                status_filter=status_filter,
+                available_from=available_from,
+                available_until=available_until,
+                tags=tags,
+            )
+            .order_by(models.Resource.id)
+            .all()
+        )
+        resources = [r for r in candidates if self.matches(r, query, tags, time_window)]
+
+        return self._finish(resources, time_window)
+
+    def paginate(
+        self,
+        sort_by: str,
+        sort_order: str,
+        limit: int,
+        cursor: str | None = None,
+        query: str | None = None,
+        status_filter: str = "available",
+        available_from: datetime | None = None,
+        available_until: datetime | None = None,
+        tags: list[str] | None = None,
+    ) -> tuple[list[models.Resource], str | None, bool]:
+        """Return one keyset page of a resource search.
+
+        Compiles the sort and cursor into ``ORDER BY key, id`` plus
+        ``WHERE (key, id) > (cursor)`` and ``LIMIT limit + 1``, so the cost
+        of a page does not depend on how deep it is. Cursors use the same
+        format as ``_encode_cursor``/``_decode_cursor`` in app.services.
+
+        Args:
+            sort_by: One of SORT_FIELDS.
+            sort_order: "asc" or "desc".
+            limit: Page size.
+            cursor: Cursor returned with the previous page, if any.
+            query: Optional search text.
+            status_filter: One of "all", "available", "unavailable", "in_use".
+            available_from: Optional start of the requested window.
+            available_until: Optional end of the requested window.
+            tags: Optional list of tags; resources must carry all of them.
+
+        Returns:
+            A tuple of (page items, next cursor, has_more).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        # Imported lazily: app.services imports this module
+        from app.services import _decode_cursor, _encode_cursor
+
+        time_window = bool(available_from and available_until)
+        sort_key = self._sort_expression(sort_by)
+        descending = sort_order == "desc"
+
+        base = self.build_query(
+            query=query,
+            status_filter=status_filter,
+            available_from=available_from,
+            available_until=available_until,
+            tags=tags,
+            columns=(models.Resource, sort_key.label("sort_key")),
+        ).order_by(
+            sort_key.desc() if descending else sort_key.asc(),
+            models.Resource.id.desc() if descending else models.Resource.id.asc(),
+        )
+
+        after = None
+        if cursor:
+            value, record_id = _decode_cursor(cursor)
+            after = (self._parse_cursor_value(sort_by, value), record_id)
+
+        page: list[tuple[models.Resource, object]] = []
+        while len(page) <= limit:
+            batch = self._after(base, sort_key, after, descending).limit(limit + 1)
+            rows = batch.all()
+            page.extend(
+                (resource, key)
+                for resource, key in rows
+                if self.matches(resource, query, tags, time_window)
+            )
+            if len(rows) <= limit:
+                break
+            last_resource, last_key = rows[-1]
+            after = (last_key, last_resource.id)
+
+        has_more = len(page) > limit
+        page = page[:limit]
+        next_cursor = (
+            _encode_cursor(page[-1][1], page[-1][0].id) if has_more and page else None
+        )
+
+        resources = self._finish([resource for resource, _ in page], time_window)
+        return resources, next_cursor, has_more
+
+    def count_resources(
+        self,
+        query: str | None = None,
+        status_filter: str = "available",
+        available_from: datetime | None = None,
+        available_until: datetime | None = None,
+        tags: list[str] | None = None,
+    ) -> int:
+        """Count matching resources with a single query.
+
+        Without tag or text filters this is a plain ``COUNT(*)``. Otherwise
+        only (name, tags) are fetched so the Python confirmation pass stays
+        exact without loading full entities.
+
+        Args:
+            query: Optional search text.
+            status_filter: One of "all", "available", "unavailable", "in_use".
+            available_from: Optional start of the requested window.
+            available_until: Optional end of the requested window.
+            tags: Optional list of tags; resources must carry all of them.
+
+        Returns:
+            The number of resources matching the filters.
+        """
+        time_window = bool(available_from and available_until)
+        filters = {
+            "query": query,
+            "status_filter": status_filter,
+            "available_from": available_from,
+            "available_until": available_until,
+            "tags": tags,
+        }
+
+        if not query and not tags:
+            return self.build_query(**filters).order_by(None).count()
+
+        rows = self.build_query(
+            **filters, columns=(models.Resource.name, models.Resource.tags)
+        ).all()
+        return sum(1 for row in rows if self.matches(row, query, tags, time_window))
+
+    def _finish(
+        self, resources: list[models.Resource], time_window: bool
+    ) -> list[models.Resource]:
+        """Attach availability fields to a final result list."""
+        if time_window:
+            # Every row survived the anti-join, so it is free for the window
+            for resource in resources:
+                resource.current_availability = True
+            return resources
+        return self.annotate(resources)
+
+    @staticmethod
+    def _sort_expression(sort_by: str):
+        """Map a public sort field to its SQL expression."""
+        if sort_by == "name":
+            return func.lower(models.Resource.name)
+        if sort_by == "status":
+            return models.Resource.status
+        return models.Resource.id
+
+    @staticmethod
+    def _parse_cursor_value(sort_by: str, value):
+        """Coerce a decoded cursor value to the type of its sort column."""
+        if sort_by in ("id", "created_at"):
+            try:
+                return int(value)
+            except (TypeError, ValueError) as exc:
+                raise ValueError("Invalid cursor") from exc
+        if not isinstance(value, str):
+            raise ValueError("Invalid cursor")
+        return value
+
+    @staticmethod
+    def _after(base: Query, sort_key, after: tuple | None, descending: bool) -> Query:
+        """Apply a keyset predicate ``(key, id) > after`` (or ``<`` for desc)."""
+        if after is None:
+            return base
+        value, record_id = after
+        if descending:
+            return base.filter(
+                or_(
+                    sort_key < value,
+                    and_(sort_key == value, models.Resource.id < record_id),
+                )
+            )
+        return base.filter(
+            or_(
+                sort_key > value,
+                and_(sort_key == value, models.Resource.id > record_id),
+            )
+        )
+
+    def current_users(
+        self, resource_ids: list[int], now: datetime | None = None
+    ) -> dict[int, str]:
+        """Look up who is using each resource right now in a single query.
+
+        Args:
+            resource_ids: IDs of the resources to check.
+            now: Reference time. Defaults to the current UTC time.
+
+        Returns:
+            A mapping of resource ID to the username holding the active
+            reservation at ``now``. Resources not in use are omitted.
+        """
+        if not resource_ids:
+            return {}
+
+        now = now or utcnow()
+        rows = (
+            self.db.query(models.Reservation.resource_id, models.User.username)
+            .join(models.User, models.Reservation.user_id == models.User.id)
+            .filter(
+                models.Reservation.resource_id.in_(resource_ids),
+                models.Reservation.status == "active",
+                models.Reservation.start_time <= now,
+                models.Reservation.end_time > now,
+            )
+            .order_by(models.Reservation.start_time)
+            .all()
+        )
+
+        users: dict[int, str] = {}
+        for resource_id, username in rows:
+            users.setdefault(resource_id, username)
+        return users
+
+    def annotate(
+        self, resources: list[models.Resource], now: datetime | None = None
+    ) -> list[models.Resource]:
+        """Populate live availability for a batch of resources.
+
+        Status is computed at read time with ``resolve_status`` and written
+        back as the *committed* attribute value, so the response reflects
+        the live state without dirtying the session. Nothing is flushed or
+        committed; persisting transitions is left to ``reconcile``.
+
+        Args:
+            resources: The resources to annotate, typically one page.
+            now: Reference time. Defaults to the current UTC time.
+
+        Returns:
+            The same list, with ``status``, ``current_availability`` and
+            ``current_user_name`` reflecting the state at ``now``.
+        """
+        if not resources:
+            return resources
+
+        now = now or utcnow()
+        users = self.current_users([r.id for r in resources], now)
+
+        for resource in resources:
+            status, unavailable_since = resolve_status(
+                resource, resource.id in users, now
+            )
+            if status != resource.status:
+                set_committed_value(resource, "status", status)
+                set_committed_value(resource, "unavailable_since", unavailable_since)
+
+            resource.current_availability = (
+                resource.available and resource.status == "available"
+            )
+            resource.current_user_name = (
+                users.get(resource.id) if resource.status == "in_use" else None
+            )
+
+        return resources
+
+    def reconcile(self, now: datetime | None = None) -> int:
+        """Persist pending status transitions and return how many were written.
+
+        See ``reconcile_transitions``.
+
+        Args:
+            now: Reference time. Defaults to the current UTC time.
+
+        Returns:
+            The number of resources whose status was changed.
+        """
+        return self._reconcile(now)[0]
+
+    def reconcile_transitions(self, now: datetime | None = None) -> list[dict]:
+        """Persist pending status transitions and describe them.
+
+        Args:
+            now: Reference time. Defaults to the current UTC time.
+
+        Returns:
+            list[dict]: One entry per transition with ``resource_id``,
+                ``group_id``, ``status``, ``previous_status``, ``available``
+                and ``reason`` ("reservation_started", "reservation_ended"
+                or "auto_reset"). A transition lost to a concurrent manual
+                change is still listed.
+        """
+        return self._reconcile(now)[1]
+
+    def _reconcile(self, now: datetime | None = None) -> tuple[int, list[dict]]:
+        """Persist pending status transitions for all resources in one UPDATE.
+
+        Finds resources whose stored status differs from ``resolve_status``
+        (auto-reset due, reservation started or ended) and writes them with
+        a single ``UPDATE ... CASE``. Each row is only updated if its status
+        is still the one that was read, so a concurrent manual change wins;
+        transitions that lost such a race are not reported. Updated rows
+        are read back with ``RETURNING`` where the dialect supports it and
+        re-selected otherwise.
+
+        Args:
+            now: Reference time. Defaults to the current UTC time.
+
+        Returns:
+            A tuple of (rows updated, transitions applied).
+        """
+        now = now or utcnow()
+        running = self._running_reservation_exists(now)
+
+        rows = (
+            self.db.query(
+                models.Resource.id,
+                models.Resource.status,
+                models.Resource.available,
+                models.Resource.unavailable_since,
+                models.Resource.auto_reset_hours,
+                models.Resource.group_id,
+            )
+            .filter(
+                or_(
+                    models.Resource.status == "in_use",
+                    and_(
+                        models.Resource.status == "unavailable",
+                        models.Resource.unavailable_since.isnot(None),
+                    ),
+                    and_(
+                        models.Resource.status == "available",
+                        models.Resource.available.is_(True),
+                        running,
+                    ),
+                )
+            )
+            .all()
+        )
+        if not rows:
+            return 0, []
+
+        busy = {
+            resource_id
+            for (resource_id,) in self.db.query(models.Reservation.resource_id)
+            .filter(
+                models.Reservation.resource_id.in_([row.id for row in rows]),
+                models.Reservation.status == "active",
+                models.Reservation.start_time <= now,
+                models.Reservation.end_time > now,
+            )
+            .distinct()
+        }
+
+        to_in_use: list[int] = []
+        by_old_status: dict[str, list[int]] = {}
+        transitions: list[dict] = []
+        for row in rows:
+            status, _ = resolve_status(row, row.id in busy, now)
+            if status == row.status:
+                continue
+            by_old_status.setdefault(row.status, []).append(row.id)
+            if status == "in_use":
+                to_in_use.append(row.id)
+                reason = "reservation_started"
+            elif row.status == "in_use":
+                reason = "reservation_ended"
+            else:
+                reason = "auto_reset"
+            transitions.append(
+                {
+                    "resource_id": row.id,
+                    "group_id": row.group_id,
+                    "status": status,
+                    "previous_status": row.status,
+                    "available": bool(row.available),
+                    "reason": reason,
+                }
+            )
+
+        if not by_old_status:
+            return 0, []
+
+        going_in_use = models.Resource.id.in_(to_in_use)
+        stmt = (
+            update(models.Resource)
+            .where(
+                or_(
+                    *(
+                        and_(
+                            models.Resource.status == old_status,
+                            models.Resource.id.in_(ids),
+                        )
+                        for old_status, ids in by_old_status.items()
+                    )
+                )
+            )
+            .values(
+                status=case((going_in_use, "in_use"), else_="available"),
+                unavailable_since=case(
+                    (going_in_use, models.Resource.unavailable_since), else_=None
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if self.db.get_bind().dialect.update_returning:
+            updated = set(self.db.execute(stmt.returning(models.Resource.id)).scalars())
+        else:
+            self.db.execute(stmt)
+            attempted = {t["resource_id"]: t["status"] for t in transitions}
+            updated = {
+                resource_id
+                for resource_id, status in self.db.query(
+                    models.Resource.id, models.Resource.status
+                ).filter(models.Resource.id.in_(list(attempted)))
+                if status == attempted[resource_id]
+            }
+        self.db.commit()
+        applied = [t for t in transitions if t["resource_id"] in updated]
+        return len(applied), applied
+
+    @staticmethod
+    def _running_reservation_exists(now: datetime):
+        """EXISTS clause for an active reservation running at ``now``."""
+        return exists().where(
+            and_(
+                models.Reservation.resource_id == models.Resource.id,
+                models.Reservation.status == "active",
+                models.Reservation.start_time <= now,
+                models.Reservation.end_time > now,
+            )
+        )
+
+
+def run_reconcile(
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> list[dict]:
+    """Run :meth:`AvailabilityEngine.reconcile_transitions` in its own session.
+
+    Meant for ``asyncio.to_thread`` so the blocking query and UPDATE stay
+    off the event loop.
+
+    Args:
+        session_factory: Factory of the session used for the run
+
+    Returns:
+        One dict per resource whose stored status changed
+    """
+    db = session_factory()
+    try:
+        return AvailabilityEngine(db).reconcile_transitions()
+    finally:
+        db.close()
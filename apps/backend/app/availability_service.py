@@ -12,23 +12,19 @@ Author: Sylvester-Francis
 import logging
 from datetime import UTC, date, datetime, time, timedelta
 
-import anyio
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.config import get_settings
-from app.core.cache import invalidate_resource_cache
+from app.conflicts import IntervalIndex
+from app.core.cache import CacheScopes, invalidate_scopes_sync
 
 logger = logging.getLogger(__name__)
 
 
 def _invalidate_cache_sync() -> None:
-    """Invalidate resource cache from a synchronous context."""
-    try:
-        anyio.from_thread.run(invalidate_resource_cache)
-        logger.debug("Resource cache invalidated")
-    except Exception as e:
-        logger.debug(f"Cache invalidation skipped: {e}")
+    """Invalidate cached resource reads from a synchronous context."""
+    invalidate_scopes_sync(CacheScopes.RESOURCES)
 
 
 def utcnow() -> datetime:
@@ -391,7 +387,7 @@ class AvailabilityService:
         current_slot_start = datetime.combine(target_date, open_time, tzinfo=UTC)
         day_end = datetime.combine(target_date, close_time, tzinfo=UTC)
 
-        # Get existing reservations for this day
+        # Load existing reservations for this day into an interval index
         existing_reservations = self._get_reservations_for_date(
             resource_id, target_date
         )
@@ -404,8 +400,8 @@ class AvailabilityService:
                 available = False
             else:
                 # Check for conflicts with existing reservations
-                available = not self._has_conflict(
-                    existing_reservations, current_slot_start, slot_end
+                available = not existing_reservations.overlaps(
+                    resource_id, current_slot_start, slot_end
                 )
 
             slots.append(
@@ -422,43 +418,12 @@ class AvailabilityService:
 
     def _get_reservations_for_date(
         self, resource_id: int, target_date: date
-    ) -> list[models.Reservation]:
-        """Get all active reservations for a resource on a specific date."""
+    ) -> IntervalIndex:
+        """Index all active reservations for a resource on a specific date."""
         day_start = datetime.combine(target_date, time(0, 0), tzinfo=UTC)
         day_end = datetime.combine(target_date, time(23, 59, 59), tzinfo=UTC)
 
-        return (
-            self.db.query(models.Reservation)
-            .filter(
-                models.Reservation.resource_id == resource_id,
-                models.Reservation.status == "active",
-                models.Reservation.start_time < day_end,
-                models.Reservation.end_time > day_start,
-            )
-            .all()
-        )
-
-    def _has_conflict(
-        self,
-        reservations: list[models.Reservation],
-        start: datetime,
-        end: datetime,
-    ) -> bool:
-        """Check if a time range conflicts with any reservations."""
-        for res in reservations:
-            res_start = (
-                res.start_time.replace(tzinfo=UTC)
-                if res.start_time.tzinfo is None
-                else res.start_time
-            )
-            res_end = (
-                res.end_time.replace(tzinfo=UTC)
-                if res.end_time.tzinfo is None
-                else res.end_time
-            )
-            if res_start < end and res_end > start:
-                return True
-        return False
+        return IntervalIndex.load(self.db, [resource_id], day_start, day_end)
 
     def is_within_business_hours(
         self, resource_id: int, start_time: datetime, end_time: datetime
@@ -4,13 +4,17 @@ Provides functionality for:
 - Bulk create reservations
 - Bulk cancel reservations
 - CSV import with validation
+- Streaming CSV export
 - Dry-run mode for validation
+- Webhook events for created and cancelled reservations, dispatched once
+  per operation so batching subscribers receive them as a few arrays
 
 Author: Sylvester-Francis
 """
 
 import csv
 import logging
+from collections.abc import Iterator
 from datetime import UTC, datetime, timedelta
 from io import StringIO
 from typing import Any
@@ -18,6 +22,10 @@ from typing import Any
 from sqlalchemy.orm import Session
 
 from app import models
+from app.conflicts import IntervalIndex
+from app.core.cache import CacheScopes, invalidate_scopes_sync
+from app.utils.streaming import FETCH_SIZE, iter_csv
+from app.webhook_service import WebhookEventType, dispatch_events_sync
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +85,8 @@ class BulkReservationService:
             return results
 
         now = utcnow()
+        index = self._load_conflict_index(reservations_data)
+        events: list[dict[str, Any]] = []
 
         for idx, data in enumerate(reservations_data):
             try:
@@ -121,20 +131,12 @@ class BulkReservationService:
                 if not resource.available:
                     raise ValueError(f"Resource {resource.name} is not available")
 
-                # Check for conflicts
-                conflict = (
-                    self.db.query(models.Reservation)
-                    .filter(
-                        models.Reservation.resource_id == resource_id,
-                        models.Reservation.status == "active",
-                        models.Reservation.end_time > start_time,
-                        models.Reservation.start_time < end_time,
-                    )
-                    .first()
-                )
-                if conflict:
+                # Check for conflicts, including earlier rows of this batch
+                conflicts = index.conflicts(resource.id, start_time, end_time)
+                if conflicts:
                     raise ValueError(
-                        f"Time slot conflicts with existing reservation {conflict.id}"
+                        "Time slot conflicts with existing reservation "
+                        f"{conflicts[0][2]}"
                     )
 
                 # Create reservation if not dry run
@@ -148,6 +150,16 @@ class BulkReservationService:
                     )
                     self.db.add(reservation)
                     self.db.flush()  # Get ID without committing
+                    index.add(resource.id, start_time, end_time, reservation.id)
+                    events.append(
+                        {
+                            "reservation_id": reservation.id,
+                            "resource_id": resource.id,
+                            "user_id": user_id,
+                            "start_time": start_time.isoformat(),
+                            "end_time": end_time.isoformat(),
+                        }
+                    )
 
                     results["created"].append(
                         {
@@ -184,6 +196,9 @@ class BulkReservationService:
         # Commit if not dry run and no errors
         if not dry_run and results["failed"] == 0:
             self.db.commit()
+            if results["success"]:
+                invalidate_scopes_sync(CacheScopes.RESOURCES)
+                self._dispatch_webhooks(WebhookEventType.RESERVATION_CREATED, events)
         elif not dry_run:
             # Rollback if any errors
             self.db.rollback()
@@ -193,6 +208,39 @@ class BulkReservationService:
 
         return results
 
+    def _load_conflict_index(
+        self, reservations_data: list[dict[str, Any]]
+    ) -> IntervalIndex:
+        """Load existing reservations for every resource in a batch at once.
+
+        Rows that fail to parse are skipped here; they are reported by the
+        per-row validation in ``bulk_create_reservations``.
+
+        Args:
+            reservations_data: The raw reservation rows of the batch.
+
+        Returns:
+            An IntervalIndex covering all resources and times in the batch.
+        """
+        resource_ids: set[int] = set()
+        starts: list[datetime] = []
+        ends: list[datetime] = []
+        for data in reservations_data:
+            try:
+                start_time = self._parse_datetime(data.get("start_time"))
+                end_time = self._parse_datetime(data.get("end_time"))
+                resource_id = int(data.get("resource_id"))
+            except (ValueError, TypeError):
+                continue
+            if start_time and end_time:
+                resource_ids.add(resource_id)
+                starts.append(ensure_timezone_aware(start_time))
+                ends.append(ensure_timezone_aware(end_time))
+
+        if not resource_ids:
+            return IntervalIndex()
+        return IntervalIndex.load(self.db, resource_ids, min(starts), max(ends))
+
     def bulk_cancel_reservations(
         self,
         reservation_ids: list[int],
@@ -220,6 +268,7 @@ class BulkReservationService:
         }
 
         now = utcnow()
+        events: list[dict[str, Any]] = []
 
         for reservation_id in reservation_ids:
             try:
@@ -249,6 +298,15 @@ class BulkReservationService:
                         "resource_id": reservation.resource_id,
                     }
                 )
+                events.append(
+                    {
+                        "reservation_id": reservation_id,
+                        "resource_id": reservation.resource_id,
+                        "user_id": reservation.user_id,
+                        "cancelled_by": user_id,
+                        "reason": reason,
+                    }
+                )
                 results["success"] += 1
 
             except ValueError as e:
@@ -261,8 +319,28 @@ class BulkReservationService:
                 )
 
         self.db.commit()
+        if results["success"]:
+            invalidate_scopes_sync(CacheScopes.RESOURCES)
+            self._dispatch_webhooks(WebhookEventType.RESERVATION_CANCELLED, events)
         return results
 
+    def _dispatch_webhooks(
+        self, event_type: WebhookEventType, events: list[dict[str, Any]]
+    ) -> None:
+        """Send committed bulk changes to webhook subscribers.
+
+        Failures are logged and never undo the bulk operation.
+
+        Args:
+            event_type: The webhook event type.
+            events: One payload per affected reservation.
+        """
+        try:
+            dispatch_events_sync(self.db, event_type.value, events)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to dispatch {event_type.value} webhooks: {e}")
+
     def import_from_csv(
         self,
         csv_content: str,
@@ -371,15 +449,18 @@ class BulkReservationService:
 
         return results
 
-    def export_to_csv(
+    def stream_csv(
         self,
         user_id: int | None = None,
         resource_id: int | None = None,
         start_from: datetime | None = None,
         start_until: datetime | None = None,
         status: str | None = None,
-    ) -> str:
-        """Export reservations to CSV format.
+    ) -> Iterator[str]:
+        """Export reservations to CSV format, chunk by chunk.
+
+        Only the exported columns are selected and rows are fetched in
+        batches as the chunks are consumed, so memory stays flat.
 
         Args:
             user_id: Filter by user
@@ -389,10 +470,23 @@ class BulkReservationService:
             status: Filter by status
 
         Returns:
-            CSV content as string
+            Iterator of CSV text chunks, header first
         """
         query = (
-            self.db.query(models.Reservation).join(models.Resource).join(models.User)
+            self.db.query(
+                models.Reservation.id,
+                models.Reservation.resource_id,
+                models.Resource.name,
+                models.Reservation.user_id,
+                models.User.username,
+                models.Reservation.start_time,
+                models.Reservation.end_time,
+                models.Reservation.status,
+                models.Reservation.created_at,
+            )
+            .select_from(models.Reservation)
+            .join(models.Resource)
+            .join(models.User)
         )
 
         if user_id is not None:
@@ -412,12 +506,36 @@ class BulkReservationService:
             start_until = ensure_timezone_aware(start_until)
             query = query.filter(models.Reservation.start_time <= start_until)
 
-        reservations = query.order_by(models.Reservation.start_time).all()
+        rows = query.order_by(
+            models.Reservation.start_time, models.Reservation.id
+        ).yield_per(FETCH_SIZE)
 
-        output = StringIO()
-        writer = csv.writer(output)
-        writer.writerow(
-            [
+        return iter_csv(
+            (
+                [
+                    res_id,
+                    resource_id,
+                    resource_name or "N/A",
+                    res_user_id,
+                    username or "N/A",
+                    start_time.isoformat(),
+                    end_time.isoformat(),
+                    res_status,
+                    created_at.isoformat() if created_at else "N/A",
+                ]
+                for (
+                    res_id,
+                    resource_id,
+                    resource_name,
+                    res_user_id,
+                    username,
+                    start_time,
+                    end_time,
+                    res_status,
+                    created_at,
+                ) in rows
+            ),
+            header=[
                 "reservation_id",
                 "resource_id",
                 "resource_name",
@@ -427,25 +545,27 @@ class BulkReservationService:
                 "end_time",
                 "status",
                 "created_at",
-            ]
+            ],
         )
 
-        for res in reservations:
-            writer.writerow(
-                [
-                    res.id,
-                    res.resource_id,
-                    res.resource.name if res.resource else "N/A",
-                    res.user_id,
-                    res.user.username if res.user else "N/A",
-                    res.start_time.isoformat(),
-                    res.end_time.isoformat(),
-                    res.status,
-                    res.created_at.isoformat() if res.created_at else "N/A",
-                ]
+    def export_to_csv(
+        self,
+        user_id: int | None = None,
+        resource_id: int | None = None,
+        start_from: datetime | None = None,
+        start_until: datetime | None = None,
+        status: str | None = None,
+    ) -> str:
+        """Export reservations to a CSV string (see :meth:`stream_csv`)."""
+        return "".join(
+            self.stream_csv(
+                user_id=user_id,
+                resource_id=resource_id,
+                start_from=start_from,
+                start_until=start_until,
+                status=status,
             )
-
-        return output.getvalue()
+        )
 
     def _parse_datetime(self, value: Any) -> datetime | None:
         """Parse datetime from various formats."""
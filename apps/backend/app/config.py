@@ -57,6 +57,10 @@ class Settings(BaseSettings):
         rate_limit_admin: Rate limit string for admin users.
         rate_limit_auth: Rate limit for authentication endpoints.
         rate_limit_heavy: Rate limit for resource-intensive endpoints.
+        rate_limit_backend: Storage for rate limit counters, "memory"
+            (per process) or "redis" (shared across workers).
+        rate_limit_redis_url: Redis URL for the "redis" backend. Defaults
+            to REDIS_URL.
 
         cors_origins: List of allowed CORS origins.
 
@@ -65,6 +69,72 @@ class Settings(BaseSettings):
         cache_ttl_resources: TTL in seconds for resource cache entries.
         cache_ttl_stats: TTL in seconds for statistics cache entries.
         cache_ttl_user_session: TTL in seconds for user session cache.
+        cache_l1_enabled: Enable the in-process L1 cache in front of Redis.
+            Also serves as a standalone cache when Redis is unavailable.
+        cache_l1_max_bytes: Memory budget of the L1 cache, measured as the
+            size of the cached JSON payloads.
+        cache_l1_ttl: TTL in seconds for L1 entries and for scope versions
+            learned from Redis; bounds staleness if an invalidation message
+            is missed.
+        resource_count_cache_ttl: TTL in seconds for cached resource listing
+            totals (include_total). 0 disables the cache.
+
+        status_reconcile_interval_seconds: Seconds between runs of the
+            background task that persists resource status transitions.
+
+        analytics_rollups_enabled: Serve whole hours of analytics windows
+            from the hourly utilization rollups instead of scanning raw
+            reservations.
+
+        webhook_max_concurrency: Maximum webhook deliveries in flight across
+            all endpoints; also the size of the shared connection pool.
+        webhook_max_per_endpoint: Maximum deliveries in flight to a single
+            endpoint (scheme and host).
+        webhook_timeout_seconds: HTTP timeout for a webhook delivery.
+        webhook_status_flush_interval: Seconds between batched writes of
+            delivery outcomes.
+        webhook_status_batch_size: Number of buffered outcomes that
+            triggers an early batch write.
+        webhook_retry_batch_size: Maximum due deliveries the retry worker
+            claims per cycle.
+        webhook_retry_max_sleep: Upper bound in seconds on the retry
+            worker's sleep, so retries scheduled by other processes are
+            picked up.
+
+        audit_queue_size: Audit entries buffered for the background writer
+            before callers fall back to writing synchronously.
+        audit_batch_size: Queued audit entries that trigger an early bulk
+            insert.
+        audit_flush_interval: Maximum seconds a queued audit entry waits
+            before it is written.
+        audit_retention_enabled: Run audit log retention as a scheduled
+            background job.
+        audit_retention_days: Days of audit log entries the scheduled job
+            keeps.
+        audit_retention_interval_seconds: Seconds between scheduled
+            retention runs.
+        audit_retention_batch_size: Audit entries deleted per retention
+            transaction.
+        audit_retention_pause: Seconds the scheduled job waits between
+            retention batches.
+        audit_archive_dir: Directory where expired audit entries are
+            archived as gzip-compressed NDJSON before deletion. Empty
+            disables archival.
+        audit_partition_months_ahead: Monthly audit_logs partitions created
+            ahead of time when the table is partitioned (PostgreSQL).
+        expiry_batch_size: Reservations marked as expired per expiry
+            sweeper transaction.
+
+        ws_send_queue_size: Messages buffered per WebSocket connection
+            before the client counts as lagging. A client lagging for
+            longer than ws_send_timeout_seconds, or buffering four times
+            this many messages, is dropped as a slow consumer.
+        ws_send_timeout_seconds: Seconds a single WebSocket send may take
+            before the socket is considered dead.
+        ws_broadcast_backend: Transport for WebSocket broadcasts, "memory"
+            (single process) or "redis" (pub/sub across workers).
+        ws_broadcast_redis_url: Redis URL for the "redis" broadcast
+            backend. Defaults to REDIS_URL.
 
         smtp_host: SMTP server hostname.
         smtp_port: SMTP server port.
@@ -120,6 +190,12 @@ class Settings(BaseSettings):
     rate_limit_auth: str = os.getenv("RATE_LIMIT_AUTH", "30/minute")
     rate_limit_heavy: str = os.getenv("RATE_LIMIT_HEAVY", "20/minute")
 
+    # Rate limit counter storage
+    rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+    rate_limit_redis_url: str = os.getenv(
+        "RATE_LIMIT_REDIS_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    )
+
     # CORS
     cors_origins: list[str] = [
         "http://localhost:3000",
@@ -133,6 +209,64 @@ class Settings(BaseSettings):
     cache_ttl_resources: int = int(os.getenv("CACHE_TTL_RESOURCES", "30"))
     cache_ttl_stats: int = int(os.getenv("CACHE_TTL_STATS", "60"))
     cache_ttl_user_session: int = int(os.getenv("CACHE_TTL_USER_SESSION", "300"))
+    cache_l1_enabled: bool = os.getenv("CACHE_L1_ENABLED", "false").lower() == "true"
+    cache_l1_max_bytes: int = int(os.getenv("CACHE_L1_MAX_BYTES", "16777216"))
+    cache_l1_ttl: int = int(os.getenv("CACHE_L1_TTL", "5"))
+    resource_count_cache_ttl: int = int(os.getenv("RESOURCE_COUNT_CACHE_TTL", "0"))
+
+    # Background tasks
+    status_reconcile_interval_seconds: int = int(
+        os.getenv("STATUS_RECONCILE_INTERVAL_SECONDS", "60")
+    )
+
+    # Analytics
+    analytics_rollups_enabled: bool = (
+        os.getenv("ANALYTICS_ROLLUPS_ENABLED", "true").lower() == "true"
+    )
+
+    # Webhook delivery
+    webhook_max_concurrency: int = int(os.getenv("WEBHOOK_MAX_CONCURRENCY", "50"))
+    webhook_max_per_endpoint: int = int(os.getenv("WEBHOOK_MAX_PER_ENDPOINT", "4"))
+    webhook_timeout_seconds: float = float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", "30"))
+    webhook_status_flush_interval: float = float(
+        os.getenv("WEBHOOK_STATUS_FLUSH_INTERVAL", "0.5")
+    )
+    webhook_status_batch_size: int = int(os.getenv("WEBHOOK_STATUS_BATCH_SIZE", "100"))
+    webhook_retry_batch_size: int = int(os.getenv("WEBHOOK_RETRY_BATCH_SIZE", "100"))
+    webhook_retry_max_sleep: float = float(os.getenv("WEBHOOK_RETRY_MAX_SLEEP", "30"))
+
+    # Audit log writer
+    audit_queue_size: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    audit_batch_size: int = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+    audit_flush_interval: float = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.25"))
+
+    # Audit log retention
+    audit_retention_enabled: bool = (
+        os.getenv("AUDIT_RETENTION_ENABLED", "false").lower() == "true"
+    )
+    audit_retention_days: int = int(os.getenv("AUDIT_RETENTION_DAYS", "90"))
+    audit_retention_interval_seconds: int = int(
+        os.getenv("AUDIT_RETENTION_INTERVAL_SECONDS", "86400")
+    )
+    audit_retention_batch_size: int = int(
+        os.getenv("AUDIT_RETENTION_BATCH_SIZE", "1000")
+    )
+    audit_retention_pause: float = float(os.getenv("AUDIT_RETENTION_PAUSE", "0.5"))
+    audit_archive_dir: str = os.getenv("AUDIT_ARCHIVE_DIR", "")
+    audit_partition_months_ahead: int = int(
+        os.getenv("AUDIT_PARTITION_MONTHS_AHEAD", "3")
+    )
+
+    # Reservation expiry sweeper
+    expiry_batch_size: int = int(os.getenv("EXPIRY_BATCH_SIZE", "1000"))
+
+    # WebSocket fan-out
+    ws_send_queue_size: int = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+    ws_send_timeout_seconds: float = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+    ws_broadcast_backend: str = os.getenv("WS_BROADCAST_BACKEND", "memory").lower()
+    ws_broadcast_redis_url: str = os.getenv(
+        "WS_BROADCAST_REDIS_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    )
 
     # Email Configuration (SMTP)
     smtp_host: str = os.getenv("SMTP_HOST", "localhost")
@@ -0,0 +1,267 @@
+"""Shared reservation conflict detection.
+
+Provides functionality for:
+- A single definition of "overlaps an active reservation" used by every
+  booking path, backed by the ``ix_reservations_conflict`` composite index
+  on (resource_id, status, start_time, end_time)
+- Point checks (``has_conflict`` / ``find_conflicts``) and a correlated
+  ``conflict_exists`` clause for set-based resource searches
+- ``IntervalIndex``, an in-process per-resource sorted interval list for
+  checking many candidate slots against one bulk-loaded snapshot
+
+Example:
+    >>> if has_conflict(db, resource_id, start, end):
+    ...     raise ValueError("Time slot is already booked")
+    >>> index = IntervalIndex.load(db, [resource_id], first_start, last_end)
+    >>> clashes = [slot for slot in slots if index.overlaps(resource_id, *slot)]
+
+Author: Sylvester-Francis
+"""
+
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, exists
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Only active reservations block a time slot
+BLOCKING_STATUS = "active"
+
+
+def ensure_timezone_aware(dt: datetime | None) -> datetime | None:
+    """Ensure datetime is timezone-aware (convert to UTC if naive)."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    return dt
+
+
+def overlap_criteria(start_time: datetime, end_time: datetime) -> list:
+    """Build the filter criteria for active reservations overlapping a window.
+
+    The column order matches ``ix_reservations_conflict`` so the planner can
+    seek on (resource_id, status) and range-scan start_time.
+
+    Args:
+        start_time: Start of the window (inclusive).
+        end_time: End of the window (exclusive).
+
+    Returns:
+        A list of SQLAlchemy criteria (resource_id not included).
+    """
+    return [
+        models.Reservation.status == BLOCKING_STATUS,
+        models.Reservation.start_time < ensure_timezone_aware(end_time),
+        models.Reservation.end_time > ensure_timezone_aware(start_time),
+    ]
+
+
+def find_conflicts(
+    db: Session, resource_id: int, start_time: datetime, end_time: datetime
+) -> list[models.Reservation]:
+    """Get all active reservations of a resource overlapping a window.
+
+    Args:
+        db: The database session.
+        resource_id: The ID of the resource to check.
+        start_time: Start of the window.
+        end_time: End of the window.
+
+    Returns:
+        The conflicting reservations ordered by start time.
+    """
+    return (
+        db.query(models.Reservation)
+        .filter(
+            models.Reservation.resource_id == resource_id,
+            *overlap_criteria(start_time, end_time),
+        )
+        .order_by(models.Reservation.start_time)
+        .all()
+    )
+
+
+def has_conflict(
+    db: Session, resource_id: int, start_time: datetime, end_time: datetime
+) -> bool:
+    """Check whether any active reservation overlaps a window.
+
+    Args:
+        db: The database session.
+        resource_id: The ID of the resource to check.
+        start_time: Start of the window.
+        end_time: End of the window.
+
+    Returns:
+        True if at least one active reservation overlaps the window.
+    """
+    return db.query(
+        exists().where(
+            models.Reservation.resource_id == resource_id,
+            *overlap_criteria(start_time, end_time),
+        )
+    ).scalar()
+
+
+def conflict_exists(start_time: datetime, end_time: datetime):
+    """Build a correlated EXISTS clause for overlapping active reservations.
+
+    The clause is correlated against ``models.Resource.id`` so it can be used
+    as an anti-join (``~conflict_exists(...)``) in a resource query.
+
+    Args:
+        start_time: Start of the window (inclusive).
+        end_time: End of the window (exclusive).
+
+    Returns:
+        A SQLAlchemy EXISTS clause.
+    """
+    return exists().where(
+        and_(
+            models.Reservation.resource_id == models.Resource.id,
+            *overlap_criteria(start_time, end_time),
+        )
+    )
+
+
+@dataclass
+class _ResourceIntervals:
+    """Sorted intervals of one resource."""
+
+    starts: list[datetime] = field(default_factory=list)
+    entries: list[tuple[datetime, datetime, int | None]] = field(default_factory=list)
+    max_duration: timedelta = timedelta(0)
+
+    def add(self, start: datetime, end: datetime, ref: int | None) -> None:
+        """Insert an interval keeping both lists sorted by start."""
+        position = bisect_left(self.starts, start)
+        self.starts.insert(position, start)
+        self.entries.insert(position, (start, end, ref))
+        self.max_duration = max(self.max_duration, end - start)
+
+
+class IntervalIndex:
+    """In-process per-resource interval index for batch conflict checks.
+
+    Intervals are kept sorted by start time per resource. A query only
+    scans entries whose start lies in ``(start - max_duration, end)``,
+    located with two bisections, so checking N candidate slots against M
+    existing reservations costs O(N log M) after a single bulk load
+    instead of N queries.
+
+    The index is a snapshot: callers that create reservations while
+    iterating should ``add`` them so later candidates see them.
+
+    Example:
+        >>> index = IntervalIndex.load(db, [1, 2], window_start, window_end)
+        >>> index.overlaps(1, start, end)
+        True
+    """
+
+    def __init__(self):
+        self._resources: dict[int, _ResourceIntervals] = {}
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        resource_ids: Iterable[int],
+        window_start: datetime,
+        window_end: datetime,
+    ) -> "IntervalIndex":
+        """Load active reservations of several resources in one query.
+
+        Args:
+            db: The database session.
+            resource_ids: The resources that will be queried.
+            window_start: Earliest start of any slot that will be checked.
+            window_end: Latest end of any slot that will be checked.
+
+        Returns:
+            A populated IntervalIndex.
+        """
+        index = cls()
+        resource_ids = list(set(resource_ids))
+        if not resource_ids:
+            return index
+
+        rows = (
+            db.query(
+                models.Reservation.id,
+                models.Reservation.resource_id,
+                models.Reservation.start_time,
+                models.Reservation.end_time,
+            )
+            .filter(
+                models.Reservation.resource_id.in_(resource_ids),
+                *overlap_criteria(window_start, window_end),
+            )
+            .all()
+        )
+        for reservation_id, resource_id, start, end in rows:
+            index.add(resource_id, start, end, reservation_id)
+        return index
+
+    def add(
+        self,
+        resource_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        ref: int | None = None,
+    ) -> None:
+        """Register an interval, e.g. a reservation created in this batch.
+
+        Args:
+            resource_id: The resource the interval belongs to.
+            start_time: Interval start.
+            end_time: Interval end.
+            ref: Optional reservation ID returned by ``conflicts``.
+        """
+        intervals = self._resources.setdefault(resource_id, _ResourceIntervals())
+        intervals.add(
+            ensure_timezone_aware(start_time), ensure_timezone_aware(end_time), ref
+        )
+
+    def conflicts(
+        self, resource_id: int, start_time: datetime, end_time: datetime
+    ) -> list[tuple[datetime, datetime, int | None]]:
+        """Return every stored interval overlapping ``[start_time, end_time)``.
+
+        Args:
+            resource_id: The resource to check.
+            start_time: Candidate start.
+            end_time: Candidate end.
+
+        Returns:
+            A list of (start, end, ref) tuples ordered by start.
+        """
+        intervals = self._resources.get(resource_id)
+        if intervals is None:
+            return []
+
+        start_time = ensure_timezone_aware(start_time)
+        end_time = ensure_timezone_aware(end_time)
+
+        low = bisect_left(intervals.starts, start_time - intervals.max_duration)
+        high = bisect_left(intervals.starts, end_time)
+        return [entry for entry in intervals.entries[low:high] if entry[1] > start_time]
+
+    def overlaps(
+        self, resource_id: int, start_time: datetime, end_time: datetime
+    ) -> bool:
+        """Check whether any stored interval overlaps ``[start_time, end_time)``.
+
+        Args:
+            resource_id: The resource to check.
+            start_time: Candidate start.
+            end_time: Candidate end.
+
+        Returns:
+            True if the candidate clashes with an indexed interval.
+        """
+        return bool(self.conflicts(resource_id, start_time, end_time))
@@ -8,8 +8,15 @@ Features:
     - Async Redis client with connection pooling for efficient resource usage
     - Graceful fallback when Redis is unavailable (fail-open design)
     - Cache decorators for common patterns with automatic key generation
+    - Single-flight recomputation (asyncio futures in-process, a short Redis
+      lock across workers) and optional stale-while-revalidate
     - Configurable TTL (Time-To-Live) per cache type
-    - Pattern-based cache invalidation helpers
+    - O(1) namespace invalidation through generation counters embedded in
+      every key (no keyspace scans)
+    - Read-through caching with versioned keys and per-scope invalidation
+    - Optional in-process L1 tier (see ``app.core.local_cache``) kept coherent
+      across workers through a Redis pub/sub invalidation channel, and usable
+      standalone when Redis is down
     - Thread-safe singleton cache manager instance
     - JSON serialization for complex data types
 
@@ -25,9 +32,9 @@ Example Usage:
         await cache_manager.set("my_key", {"data": "value"}, ttl=300)
         result = await cache_manager.get("my_key")
 
-        # Delete specific keys or patterns
+        # Delete a specific key, or invalidate a whole namespace
         await cache_manager.delete("my_key")
-        await cache_manager.delete_pattern("resources:*")
+        await invalidate_cache("resources")
 
     Using the cache decorator::
 
@@ -37,6 +44,17 @@ Example Usage:
         async def get_resource(resource_id: int):
             return await db.fetch_resource(resource_id)
 
+    Read-through caching from a sync endpoint::
+
+        from app.core.cache import CacheKeys, CacheScopes, read_through_sync
+
+        tags = read_through_sync(
+            CacheKeys.RESOURCE_TAGS, [CacheScopes.TAGS], load_tags
+        )
+
+        # After a write, bump only the affected scopes
+        invalidate_scopes_sync(CacheScopes.TAGS)
+
     Convenience functions for common operations::
 
         from app.core.cache import (
@@ -58,23 +76,49 @@ Author:
     Sylvester-Francis
 """
 
+import asyncio
+import contextlib
 import functools
 import hashlib
 import json
 import logging
-from collections.abc import Callable
+import secrets
+import threading
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
 from typing import Any, TypeVar
 
+import anyio
 import redis.asyncio as redis
 from redis.asyncio import ConnectionPool
 from redis.exceptions import RedisError
 
 from app.config import get_settings
+from app.core.local_cache import LocalCache
+from app.core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Pub/sub channel carrying scope version bumps to every worker's L1 tier
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+L2_TIER_NAME = "l2"
+
+# Single-flight lock lifetime and how often waiting workers poll for the result
+SINGLE_FLIGHT_LOCK_SECONDS = 5.0
+_LOCK_POLL_INTERVAL = 0.05
+
+# Compare-and-delete so a worker never releases a lock it no longer owns
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 class CacheManager:
     """Manages Redis cache connections and operations.
@@ -87,11 +131,18 @@ class CacheManager:
     returning None or False for operations rather than raising exceptions.
     This ensures the application continues to function even without caching.
 
+    When ``cache_l1_enabled`` is set, ``get`` and ``set`` go through an
+    in-process L1 tier first. Scope version bumps are published on
+    ``INVALIDATION_CHANNEL`` and applied to every worker's L1 tier by a
+    listener task started in ``connect``.
+
     Attributes:
         _pool: Redis connection pool for efficient connection reuse.
         _client: Redis async client instance.
         _connected: Boolean flag indicating current connection status.
         _settings: Application settings containing Redis configuration.
+        _local: The in-process L1 tier, or None when disabled.
+        _listener_task: Background task applying pub/sub invalidations.
 
     Example:
         Typical usage in an application::
@@ -118,6 +169,13 @@ class CacheManager:
         self._client: redis.Redis | None = None
         self._connected: bool = False
         self._settings = get_settings()
+        self._local: LocalCache | None = None
+        if self._settings.cache_enabled and self._settings.cache_l1_enabled:
+            self._local = LocalCache(
+                max_bytes=self._settings.cache_l1_max_bytes,
+                ttl=self._settings.cache_l1_ttl,
+            )
+        self._listener_task: asyncio.Task | None = None
 
     @property
     def enabled(self) -> bool:
@@ -128,6 +186,11 @@ class CacheManager:
         """
         return self._settings.cache_enabled
 
+    @property
+    def local(self) -> LocalCache | None:
+        """The in-process L1 tier, or None when disabled."""
+        return self._local
+
     async def connect(self) -> bool:
         """Initialize the Redis connection pool and establish a connection.
 
@@ -161,6 +224,10 @@ class CacheManager:
             # Test connection
             await self._client.ping()
             self._connected = True
+            if self._local is not None:
+                self._listener_task = asyncio.create_task(
+                    self._listen_for_invalidations()
+                )
             logger.info("Redis cache connected successfully")
             return True
 
@@ -176,6 +243,11 @@ class CacheManager:
         After calling this method, connect() must be called again before
         performing any cache operations.
         """
+        if self._listener_task:
+            self._listener_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener_task
+            self._listener_task = None
         if self._client:
             await self._client.aclose()
             self._client = None
@@ -185,6 +257,45 @@ class CacheManager:
         self._connected = False
         logger.info("Redis cache disconnected")
 
+    async def _listen_for_invalidations(self) -> None:
+        """Apply scope version bumps published by other workers to L1.
+
+        Runs until cancelled. On a subscription error the locally known
+        versions are dropped (so they are re-read from Redis) and the
+        subscription is retried.
+        """
+        while True:
+            try:
+                pubsub = self._client.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                try:
+                    async for message in pubsub.listen():
+                        self.handle_invalidation_message(message)
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error: {e}")
+                if self._local is not None:
+                    self._local.clear()
+                await asyncio.sleep(1)
+
+    def handle_invalidation_message(self, message: dict[str, Any]) -> None:
+        """Apply one pub/sub message of the form ``{"scope": .., "version": ..}``.
+
+        Args:
+            message: A message as yielded by ``PubSub.listen``. Subscription
+                confirmations and malformed payloads are ignored.
+        """
+        if self._local is None or message.get("type") != "message":
+            return
+        try:
+            payload = json.loads(message["data"])
+            self._local.set_version(str(payload["scope"]), int(payload["version"]))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Ignoring malformed invalidation message: {e}")
+
     async def get(self, key: str) -> Any | None:
         """Retrieve a value from the cache by its key.
 
@@ -198,14 +309,37 @@ class CacheManager:
             The deserialized cached value if found and valid,
             None if the key doesn't exist, cache is not connected,
             or an error occurs during retrieval/deserialization.
+
+        Note:
+            With the L1 tier enabled, local hits skip Redis entirely and
+            Redis hits are copied into L1.
+        """
+        if self._local is not None:
+            value = self._local.get(key)
+            if value is not None:
+                return value
+        return await self.get_remote(key)
+
+    async def get_remote(self, key: str) -> Any | None:
+        """Retrieve a value from Redis only, filling the L1 tier on a hit.
+
+        Args:
+            key: The cache key to look up.
+
+        Returns:
+            The deserialized value, or None on a miss or error.
         """
         if not self._connected or not self._client:
             return None
 
         try:
-            value = await self._client.get(key)
-            if value:
-                return json.loads(value)
+            raw = await self._client.get(key)
+            metrics.record_cache_tier(L2_TIER_NAME, hit=bool(raw))
+            if raw:
+                value = json.loads(raw)
+                if self._local is not None:
+                    self._local.set(key, value, len(raw))
+                return value
             return None
         except (RedisError, json.JSONDecodeError) as e:
             logger.debug(f"Cache get error for key {key}: {e}")
@@ -227,22 +361,40 @@ class CacheManager:
                 the key will persist indefinitely.
 
         Returns:
-            bool: True if the value was successfully stored,
+            bool: True if the value was successfully stored in any tier,
                 False if cache is not connected or an error occurred.
+
+        Note:
+            The L1 tier stores the JSON round-tripped value so local and
+            Redis hits return identical data.
         """
-        if not self._connected or not self._client:
+        if self._local is None and (not self._connected or not self._client):
             return False
 
         try:
             serialized = json.dumps(value, default=str)
+        except TypeError as e:
+            logger.debug(f"Cache set error for key {key}: {e}")
+            return False
+
+        stored_locally = False
+        if self._local is not None:
+            stored_locally = self._local.set(
+                key, json.loads(serialized), len(serialized)
+            )
+
+        if not self._connected or not self._client:
+            return stored_locally
+
+        try:
             if ttl:
                 await self._client.setex(key, ttl, serialized)
             else:
                 await self._client.set(key, serialized)
             return True
-        except (RedisError, TypeError) as e:
+        except RedisError as e:
             logger.debug(f"Cache set error for key {key}: {e}")
-            return False
+            return stored_locally
 
     async def delete(self, key: str) -> bool:
         """Remove a value from the cache by its key.
@@ -258,6 +410,9 @@ class CacheManager:
             Returns True even if the key did not exist, as the operation
             itself was successful.
         """
+        if self._local is not None:
+            self._local.delete(key)
+
         if not self._connected or not self._client:
             return False
 
@@ -282,6 +437,10 @@ class CacheManager:
         Returns:
             int: The number of keys that were deleted. Returns 0 if
                 cache is not connected, no keys matched, or an error occurred.
+
+        Note:
+            The scan cost grows with the keyspace. Prefer ``invalidate_cache``
+            (a single generation bump) for invalidating groups of entries.
         """
         if not self._connected or not self._client:
             return 0
@@ -350,6 +509,69 @@ class CacheManager:
             logger.debug(f"Cache incr error for key {key}: {e}")
             return None
 
+    async def get_counters(self, keys: list[str]) -> list[int] | None:
+        """Read several integer counters in a single round trip.
+
+        Args:
+            keys: The counter keys to read.
+
+        Returns:
+            list: The counter values in key order, 0 for missing keys.
+            None: If cache is not connected or an error occurred.
+        """
+        if not self._connected or not self._client:
+            return None
+
+        try:
+            values = await self._client.mget(keys)
+            return [int(value or 0) for value in values]
+        except (RedisError, ValueError) as e:
+            logger.debug(f"Cache mget error for keys {keys}: {e}")
+            return None
+
+    async def incr_many(self, keys: list[str]) -> list[int] | None:
+        """Increment several counters in one pipelined round trip.
+
+        Args:
+            keys: The counter keys to increment.
+
+        Returns:
+            list: The new counter values in key order.
+            None: If cache is not connected or an error occurred.
+        """
+        if not self._connected or not self._client:
+            return None
+
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.incr(key)
+                return [int(value) for value in await pipe.execute()]
+        except RedisError as e:
+            logger.debug(f"Cache incr_many error for keys {keys}: {e}")
+            return None
+
+    async def publish(self, channel: str, message: dict[str, Any]) -> bool:
+        """Publish a JSON message on a Redis pub/sub channel.
+
+        Args:
+            channel: The channel name.
+            message: A JSON-serializable payload.
+
+        Returns:
+            bool: True if the message was published,
+                False if cache is not connected or an error occurred.
+        """
+        if not self._connected or not self._client:
+            return False
+
+        try:
+            await self._client.publish(channel, json.dumps(message))
+            return True
+        except RedisError as e:
+            logger.debug(f"Cache publish error on {channel}: {e}")
+            return False
+
     def is_connected(self) -> bool:
         """Check if the cache manager has an active Redis connection.
 
@@ -359,6 +581,78 @@ class CacheManager:
         """
         return self._connected
 
+    async def acquire_lock(self, key: str, ttl: float) -> str | None:
+        """Try to take a short-lived Redis lock.
+
+        Args:
+            key: The lock key.
+            ttl: Seconds after which the lock expires on its own.
+
+        Returns:
+            str: A token to pass to ``release_lock`` if the lock was taken.
+                A token is also returned when Redis errors, so callers fail
+                open and do the work themselves.
+            None: If another holder owns the lock or cache is not connected.
+        """
+        if not self._connected or not self._client:
+            return None
+
+        token = secrets.token_hex(8)
+        try:
+            acquired = await self._client.set(
+                key, token, nx=True, px=max(1, int(ttl * 1000))
+            )
+            return token if acquired else None
+        except RedisError as e:
+            logger.debug(f"Cache lock error for key {key}: {e}")
+            return token
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock taken with ``acquire_lock`` if still owned.
+
+        Args:
+            key: The lock key.
+            token: The token returned by ``acquire_lock``.
+
+        Returns:
+            bool: True if the lock was released.
+        """
+        if not self._connected or not self._client:
+            return False
+
+        try:
+            return bool(await self._client.eval(_RELEASE_LOCK_SCRIPT, 1, key, token))
+        except RedisError as e:
+            logger.debug(f"Cache unlock error for key {key}: {e}")
+            return False
+
+    def set_local(self, key: str, value: Any) -> bool:
+        """Store a value in the L1 tier only.
+
+        Args:
+            key: The cache key.
+            value: A JSON-serializable value.
+
+        Returns:
+            bool: True if the value was stored, False if the L1 tier is
+                disabled, the value is not serializable or exceeds the budget.
+        """
+        if self._local is None:
+            return False
+        try:
+            serialized = json.dumps(value, default=str)
+        except TypeError:
+            return False
+        return self._local.set(key, json.loads(serialized), len(serialized))
+
+    def is_available(self) -> bool:
+        """Check if any cache tier can serve requests.
+
+        Returns:
+            bool: True if Redis is connected or the L1 tier is enabled.
+        """
+        return self._connected or self._local is not None
+
 
 # Global cache manager instance
 cache_manager = CacheManager()
@@ -409,10 +703,131 @@ def _make_cache_key(prefix: str, *args: Any, **kwargs: Any) -> str:
     return key_data
 
 
+# In-flight computations per cache key, shared by concurrent callers
+_inflight: dict[str, asyncio.Future] = {}
+
+# Background stale-while-revalidate refreshes (kept referenced until done)
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def _lock_key(cache_key: str) -> str:
+    """Return the Redis key of the single-flight lock for a cache key."""
+    return f"lock:{cache_key}"
+
+
+async def _single_flight(
+    cache_key: str,
+    compute: Callable[[], Awaitable[Any]],
+    peek: Callable[[], Awaitable[Any | None]],
+    lock_timeout: float,
+    wait_for_peers: bool = True,
+) -> Any | None:
+    """Run ``compute`` at most once per key across callers and workers.
+
+    In-process callers for the same key await one shared future. Across
+    workers a short Redis lock elects the computing worker; the others poll
+    ``peek`` until the result is cached or the lock times out, then compute
+    themselves rather than fail.
+
+    Args:
+        cache_key: The cache key being computed.
+        compute: Coroutine function producing (and caching) the value.
+        peek: Coroutine function returning the cached value, or None.
+        lock_timeout: Lifetime of the cross-worker lock in seconds.
+        wait_for_peers: If False, return None instead of waiting when
+            another worker holds the lock (used by background refreshes).
+
+    Returns:
+        The computed or peer-computed value.
+    """
+    future = _inflight.get(cache_key)
+    if future is not None:
+        return await asyncio.shield(future)
+
+    future = asyncio.get_running_loop().create_future()
+    # Avoid "exception was never retrieved" when nobody else was waiting
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _inflight[cache_key] = future
+    try:
+        result = await _compute_with_lock(
+            cache_key, compute, peek, lock_timeout, wait_for_peers
+        )
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(cache_key, None)
+
+
+async def _compute_with_lock(
+    cache_key: str,
+    compute: Callable[[], Awaitable[Any]],
+    peek: Callable[[], Awaitable[Any | None]],
+    lock_timeout: float,
+    wait_for_peers: bool,
+) -> Any | None:
+    """Compute under the cross-worker lock (see ``_single_flight``)."""
+    if not cache_manager.is_connected():
+        return await compute()
+
+    lock_key = _lock_key(cache_key)
+    token = await cache_manager.acquire_lock(lock_key, lock_timeout)
+    if token is None:
+        if not wait_for_peers:
+            return None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + lock_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(_LOCK_POLL_INTERVAL)
+            value = await peek()
+            if value is not None:
+                return value
+        logger.debug(f"Single-flight lock wait timed out: {cache_key}")
+        return await compute()
+
+    try:
+        # Another worker may have finished just before we took the lock
+        value = await peek()
+        if value is not None:
+            return value
+        return await compute()
+    finally:
+        await cache_manager.release_lock(lock_key, token)
+
+
+def _schedule_refresh(
+    cache_key: str,
+    compute: Callable[[], Awaitable[Any]],
+    peek: Callable[[], Awaitable[Any | None]],
+    lock_timeout: float,
+) -> None:
+    """Refresh a stale entry in the background unless already refreshing."""
+    if cache_key in _inflight:
+        return
+
+    async def refresh() -> None:
+        try:
+            await _single_flight(
+                cache_key, compute, peek, lock_timeout, wait_for_peers=False
+            )
+        except Exception as e:
+            logger.warning(f"Background cache refresh failed for {cache_key}: {e}")
+
+    task = asyncio.create_task(refresh())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
 def cached(
     prefix: str,
     ttl: int | None = None,
     key_builder: Callable[..., str] | None = None,
+    single_flight: bool = True,
+    stale_ttl: int = 0,
+    lock_timeout: float = SINGLE_FLIGHT_LOCK_SECONDS,
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator to automatically cache async function results.
 
@@ -429,6 +844,14 @@ def cached(
         key_builder: Optional custom function to generate cache keys.
             If provided, it receives the same arguments as the decorated
             function and should return a string cache key.
+        single_flight: If True, concurrent misses for the same key are
+            coalesced so the function runs once per key, in-process via a
+            shared future and across workers via a short Redis lock.
+        stale_ttl: Seconds an expired value may still be served while a
+            single background refresh recomputes it (stale-while-revalidate).
+            0 disables it.
+        lock_timeout: Lifetime in seconds of the cross-worker lock, and how
+            long other workers wait for its holder before computing anyway.
 
     Returns:
         Callable: A decorator function that wraps async functions
@@ -455,6 +878,11 @@ def cached(
         - None return values are not cached
         - Object arguments (those with __dict__) are filtered from
           automatic key generation to avoid including db sessions, etc.
+        - Keys embed the generation of their namespace (the first key
+          segment), so ``invalidate_cache(prefix)`` drops every entry
+        - Background refreshes re-run the function with the original
+          arguments, so only use ``stale_ttl`` with functions that do not
+          depend on request-scoped objects such as a db session
     """
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
@@ -480,7 +908,7 @@ def cached(
                 of calling the wrapped function.
             """
             # Skip cache if disabled
-            if not cache_manager.is_connected():
+            if not cache_manager.is_available():
                 return await func(*args, **kwargs)
 
             # Build cache key
@@ -494,41 +922,112 @@ def cached(
                         filtered_args.append(arg)
                 cache_key = _make_cache_key(prefix, *filtered_args, **kwargs)
 
-            # Try to get from cache
-            cached_value = await cache_manager.get(cache_key)
-            if cached_value is not None:
-                logger.debug(f"Cache hit: {cache_key}")
-                return cached_value
-
-            # Call function and cache result
-            result = await func(*args, **kwargs)
+            cache_key = await namespaced_key(cache_key)
+            if cache_key is None:
+                return await func(*args, **kwargs)
 
-            if result is not None:
-                effective_ttl = ttl or get_settings().cache_ttl_resources
-                await cache_manager.set(cache_key, result, effective_ttl)
-                logger.debug(f"Cache set: {cache_key} (TTL: {effective_ttl}s)")
+            effective_ttl = ttl or get_settings().cache_ttl_resources
+
+            def unwrap(stored: Any) -> tuple[Any | None, bool]:
+                """Return (value, is_fresh) for a stored entry."""
+                if not stale_ttl:
+                    return stored, True
+                if not isinstance(stored, dict) or "value" not in stored:
+                    return None, False
+                return stored["value"], time.time() < stored["fresh_until"]
+
+            async def peek() -> Any | None:
+                """Return the cached value only if it is fresh."""
+                stored = await cache_manager.get(cache_key)
+                if stored is None:
+                    return None
+                value, fresh = unwrap(stored)
+                return value if fresh else None
+
+            async def compute() -> Any:
+                """Call the function and cache its result."""
+                result = await func(*args, **kwargs)
+                if result is not None:
+                    stored, store_ttl = result, effective_ttl
+                    if stale_ttl:
+                        stored = {
+                            "value": result,
+                            "fresh_until": time.time() + effective_ttl,
+                        }
+                        store_ttl = effective_ttl + stale_ttl
+                    if await cache_manager.set(cache_key, stored, store_ttl):
+                        metrics.record_cache_set()
+                    logger.debug(f"Cache set: {cache_key} (TTL: {store_ttl}s)")
+                return result
 
-            return result
+            # Try to get from cache
+            stored = await cache_manager.get(cache_key)
+            if stored is not None:
+                value, fresh = unwrap(stored)
+                if value is not None:
+                    metrics.record_cache_hit()
+                    if not fresh:
+                        logger.debug(f"Cache stale hit: {cache_key}")
+                        _schedule_refresh(cache_key, compute, peek, lock_timeout)
+                    return value
+            metrics.record_cache_miss()
+
+            if not single_flight:
+                return await compute()
+            return await _single_flight(cache_key, compute, peek, lock_timeout)
 
         return wrapper
 
     return decorator
 
 
-async def invalidate_cache(pattern: str) -> int:
-    """Invalidate all cache entries matching a specified pattern.
+def _namespace_of(key: str) -> str:
+    """Return the namespace of a key or legacy glob pattern.
+
+    The namespace is the first ``:``-separated segment, so
+    ``resources:list:active`` and ``resources:*`` both map to ``resources``.
+    """
+    return key.rstrip("*").split(":", 1)[0]
 
-    Convenience function that wraps cache_manager.delete_pattern()
-    for invalidating groups of related cache entries.
+
+async def namespaced_key(key: str) -> str | None:
+    """Embed the current generation of the key's namespace into the key.
+
+    ``resources:list:active`` becomes ``resources:g<N>:list:active``. Bumping
+    the namespace generation makes every older key unreachable at once.
 
     Args:
-        pattern: Redis glob-style pattern to match keys for deletion.
-            Examples: 'resources:*', 'user:123:*'
+        key: A cache key whose first segment names its namespace.
 
     Returns:
-        int: The number of cache keys that were invalidated.
+        str: The generation-qualified key.
+        None: If the generation could not be read.
     """
-    return await cache_manager.delete_pattern(pattern)
+    namespace, _, rest = key.partition(":")
+    versions = await _scope_versions([namespace])
+    if versions is None:
+        return None
+    return f"{namespace}:g{versions[0]}:{rest}" if rest else f"{key}:g{versions[0]}"
+
+
+async def invalidate_cache(namespace: str) -> int:
+    """Invalidate every cache entry of a namespace.
+
+    Bumps the namespace generation with a single INCR (or an in-process
+    counter when the L1 tier runs without Redis). Entries written under the
+    previous generation are never read again and expire through their TTL,
+    so the cost does not depend on how many keys are cached.
+
+    Args:
+        namespace: The namespace to invalidate, e.g. ``'resources'``.
+            Legacy glob patterns such as ``'resources:*'`` are accepted and
+            mapped to their namespace.
+
+    Returns:
+        int: 1 if the namespace was invalidated, 0 if the cache is
+            unavailable.
+    """
+    return int(await invalidate_scopes(_namespace_of(namespace)))
 
 
 class CacheKeys:
@@ -556,7 +1055,7 @@ class CacheKeys:
 
         Manual cache key construction::
 
-            cache_key = f"{CacheKeys.STATS}:daily_summary"
+            cache_key = await namespaced_key(f"{CacheKeys.STATS}:daily_summary")
             await cache_manager.set(cache_key, stats_data)
     """
 
@@ -564,11 +1063,307 @@ class CacheKeys:
     RESOURCES_LIST = "resources:list"
     RESOURCES_SEARCH = "resources:search"
     RESOURCE_AVAILABILITY = "resources:availability"
+    RESOURCE_TAGS = "resources:tags"
+    RESOURCE_GROUP_TREE = "groups:tree"
     STATS = "stats"
     USER_SESSION = "user:session"
     DASHBOARD = "dashboard"
 
 
+class CacheScopes:
+    """Invalidation scopes for versioned read-through cache entries.
+
+    Every read-through entry declares the scopes it depends on, and its key
+    embeds the current version of each of them. A write bumps only the
+    scopes it affects, so e.g. a reservation does not evict the tag list or
+    the resource-group tree.
+
+    Scopes share their generation counters with key namespaces (the first
+    segment of a CacheKeys prefix), so bumping ``RESOURCES`` also
+    invalidates entries stored with ``cached`` under ``resources:*``.
+
+    Attributes:
+        RESOURCES: Resource rows and their live status (listings, search,
+            availability summary). Bumped by resource and reservation writes.
+        TAGS: Tag listings. Bumped when resource tags change.
+        GROUPS: The resource-group tree. Bumped by group writes and when
+            resources join, leave or are added to the system.
+    """
+
+    RESOURCES = "resources"
+    TAGS = "tags"
+    GROUPS = "groups"
+
+
+# Bump when the shape of cached payloads changes so old entries are ignored
+CACHE_KEY_VERSION = 1
+
+_SCOPE_VERSION_PREFIX = "cache:scope"
+
+
+def _scope_version_key(scope: str) -> str:
+    """Return the Redis key holding the version counter of a scope."""
+    return f"{_SCOPE_VERSION_PREFIX}:{scope}"
+
+
+def _local_scope_versions(scopes: Sequence[str]) -> list[int] | None:
+    """Return scope versions known to the L1 tier without a round trip.
+
+    Without Redis the local versions are authoritative; with Redis they are
+    trusted for up to ``cache_l1_ttl`` seconds after being read or received
+    over pub/sub.
+    """
+    local = cache_manager.local
+    if local is None:
+        return None
+    return local.get_versions(scopes, authoritative=not cache_manager.is_connected())
+
+
+async def _scope_versions(scopes: Sequence[str]) -> list[int] | None:
+    """Return the current version of each scope, preferring the L1 copy."""
+    versions = _local_scope_versions(scopes)
+    if versions is not None:
+        return versions
+
+    versions = await cache_manager.get_counters(
+        [_scope_version_key(scope) for scope in scopes]
+    )
+    if versions is not None and cache_manager.local is not None:
+        for scope, version in zip(scopes, versions, strict=True):
+            cache_manager.local.set_version(scope, version)
+    return versions
+
+
+def _format_versioned_key(
+    prefix: str, scopes: Sequence[str], versions: Sequence[int], params: dict
+) -> str:
+    """Assemble a versioned key from already-resolved scope versions."""
+    scope_part = ",".join(
+        f"{scope}={version}" for scope, version in zip(scopes, versions, strict=True)
+    )
+    params_hash = hashlib.md5(
+        json.dumps(params, sort_keys=True, default=str).encode(),
+        usedforsecurity=False,
+    ).hexdigest()[:16]
+    return f"{prefix}:v{CACHE_KEY_VERSION}:{scope_part}:{params_hash}"
+
+
+async def build_versioned_key(
+    prefix: str, scopes: Sequence[str], params: dict[str, Any]
+) -> str | None:
+    """Build a cache key embedding the current version of each scope.
+
+    The request parameters are hashed so arbitrary user input cannot
+    produce ambiguous keys.
+
+    Args:
+        prefix: The CacheKeys prefix of the entry.
+        scopes: The CacheScopes the entry depends on.
+        params: The parameters that identify the entry.
+
+    Returns:
+        str: The versioned key, e.g. ``resources:list:v1:resources=4:ab12..``.
+        None: If the scope versions could not be read.
+    """
+    versions = await _scope_versions(scopes)
+    if versions is None:
+        return None
+    return _format_versioned_key(prefix, scopes, versions, params)
+
+
+async def invalidate_scopes(*scopes: str) -> bool:
+    """Invalidate every read-through entry depending on the given scopes.
+
+    Bumps one version counter per scope; entries built with the old
+    version are never read again and expire through their TTL. The new
+    versions are published so every worker's L1 tier switches over
+    immediately. Without Redis the L1 tier's own versions are bumped.
+
+    Args:
+        *scopes: The CacheScopes to invalidate.
+
+    Returns:
+        bool: True if the versions were bumped, False if the cache is
+            unavailable.
+    """
+    if not scopes:
+        return False
+
+    local = cache_manager.local
+    bumped = False
+    if cache_manager.is_connected():
+        versions = await cache_manager.incr_many(
+            [_scope_version_key(scope) for scope in scopes]
+        )
+        if versions is not None:
+            bumped = True
+            for scope, version in zip(scopes, versions, strict=True):
+                if local is not None:
+                    local.set_version(scope, version)
+                    await cache_manager.publish(
+                        INVALIDATION_CHANNEL, {"scope": scope, "version": version}
+                    )
+    elif local is not None:
+        for scope in scopes:
+            local.bump_version(scope)
+        bumped = True
+
+    if bumped:
+        metrics.record_cache_delete()
+        logger.debug(f"Invalidated cache scopes: {', '.join(scopes)}")
+    return bumped
+
+
+def invalidate_scopes_sync(*scopes: str) -> None:
+    """Invalidate cache scopes from a synchronous (worker thread) context.
+
+    Skips the thread hop entirely when Redis is not connected; a
+    standalone L1 tier is bumped in place.
+
+    Args:
+        *scopes: The CacheScopes to invalidate.
+
+    Note:
+        Failures are logged but never raised so cache issues cannot break
+        the write that triggered them.
+    """
+    if not cache_manager.is_connected():
+        if cache_manager.local is not None:
+            for scope in scopes:
+                cache_manager.local.bump_version(scope)
+            metrics.record_cache_delete()
+        return
+    try:
+        anyio.from_thread.run(functools.partial(invalidate_scopes, *scopes))
+    except Exception as e:
+        logger.debug(f"Cache invalidation skipped: {e}")
+
+
+@dataclass
+class _SyncFlight:
+    """A loader call shared by threads requesting the same key."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    failed: bool = False
+
+
+_sync_flights: dict[str, _SyncFlight] = {}
+_sync_flights_lock = threading.Lock()
+
+
+def _load_once(
+    key: str, loader: Callable[[], T], timeout: float = SINGLE_FLIGHT_LOCK_SECONDS
+) -> T:
+    """Call ``loader`` once for concurrent worker threads missing ``key``.
+
+    Followers block until the leading thread's loader finishes and share its
+    result. If the leader fails or takes longer than ``timeout``, followers
+    fall back to their own loader call.
+    """
+    with _sync_flights_lock:
+        flight = _sync_flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _sync_flights[key] = _SyncFlight()
+
+    if not leader:
+        if flight.done.wait(timeout) and not flight.failed:
+            return flight.result
+        return loader()
+
+    try:
+        flight.result = loader()
+        return flight.result
+    except BaseException:
+        flight.failed = True
+        raise
+    finally:
+        with _sync_flights_lock:
+            _sync_flights.pop(key, None)
+        flight.done.set()
+
+
+async def _lookup(
+    prefix: str, scopes: Sequence[str], params: dict[str, Any]
+) -> tuple[str | None, Any | None]:
+    """Resolve a versioned key and fetch its value in one call."""
+    key = await build_versioned_key(prefix, scopes, params)
+    if key is None:
+        return None, None
+    return key, await cache_manager.get(key)
+
+
+def read_through_sync(
+    prefix: str,
+    scopes: Sequence[str],
+    loader: Callable[[], T],
+    ttl: int | None = None,
+    **params: Any,
+) -> T:
+    """Serve a value through the versioned cache from a sync endpoint.
+
+    Sync FastAPI endpoints run in a worker thread, so Redis calls are made
+    on the event loop via ``anyio.from_thread`` while ``loader`` (which
+    typically uses the request's database session) runs in the calling
+    thread. L1 hits whose scope versions are known locally are served
+    without leaving the calling thread, and a standalone L1 tier is used
+    when Redis is down. Concurrent misses for the same key within a worker
+    share one loader call. Without any cache tier the loader is called
+    directly.
+
+    Args:
+        prefix: The CacheKeys prefix of the entry.
+        scopes: The CacheScopes the entry depends on.
+        loader: Zero-argument callable producing a JSON-serializable value.
+        ttl: Time-to-live in seconds. Defaults to cache_ttl_resources.
+        **params: The parameters that identify the entry.
+
+    Returns:
+        The cached value on a hit, otherwise the loader's result.
+
+    Example:
+        >>> read_through_sync(
+        ...     CacheKeys.RESOURCE_TAGS, [CacheScopes.TAGS], load_tags
+        ... )
+    """
+    if not cache_manager.is_available():
+        return loader()
+
+    local = cache_manager.local
+    versions = _local_scope_versions(scopes)
+    try:
+        if local is not None and versions is not None:
+            key = _format_versioned_key(prefix, scopes, versions, params)
+            value = local.get(key)
+            if value is None and cache_manager.is_connected():
+                value = anyio.from_thread.run(cache_manager.get_remote, key)
+        else:
+            key, value = anyio.from_thread.run(_lookup, prefix, scopes, params)
+    except Exception as e:
+        logger.debug(f"Cache lookup skipped for {prefix}: {e}")
+        return loader()
+
+    if value is not None:
+        metrics.record_cache_hit()
+        return value
+    metrics.record_cache_miss()
+
+    result = _load_once(key, loader) if key is not None else loader()
+    if key is not None and result is not None:
+        effective_ttl = ttl or get_settings().cache_ttl_resources
+        if not cache_manager.is_connected():
+            if cache_manager.set_local(key, result):
+                metrics.record_cache_set()
+            return result
+        try:
+            if anyio.from_thread.run(cache_manager.set, key, result, effective_ttl):
+                metrics.record_cache_set()
+        except Exception as e:
+            logger.debug(f"Cache set skipped for {key}: {e}")
+    return result
+
+
 # Convenience functions for common cache operations
 async def cache_resource_list(
     key_suffix: str, data: list[dict[str, Any]], ttl: int | None = None
@@ -595,7 +1390,9 @@ async def cache_resource_list(
         True
     """
     settings = get_settings()
-    cache_key = f"{CacheKeys.RESOURCES_LIST}:{key_suffix}"
+    cache_key = await namespaced_key(f"{CacheKeys.RESOURCES_LIST}:{key_suffix}")
+    if cache_key is None:
+        return False
     return await cache_manager.set(cache_key, data, ttl or settings.cache_ttl_resources)
 
 
@@ -615,28 +1412,29 @@ async def get_cached_resource_list(key_suffix: str) -> list[dict[str, Any]] | No
         ...     return cached_resources
         >>> # Fallback to database query
     """
-    cache_key = f"{CacheKeys.RESOURCES_LIST}:{key_suffix}"
+    cache_key = await namespaced_key(f"{CacheKeys.RESOURCES_LIST}:{key_suffix}")
+    if cache_key is None:
+        return None
     return await cache_manager.get(cache_key)
 
 
 async def invalidate_resource_cache() -> int:
     """Invalidate all resource-related cache entries.
 
-    Clears all cached data under the resources and dashboard prefixes.
-    This should be called whenever resources are created, updated,
-    or deleted to ensure cache consistency.
+    Bumps the generations of the resources and dashboard namespaces in one
+    pipelined round trip. This should be called whenever resources are
+    created, updated, or deleted to ensure cache consistency.
 
     Returns:
-        int: Total number of cache keys that were invalidated.
+        int: Number of namespaces that were invalidated.
 
     Note:
         This invalidates both resource caches and dashboard caches,
         as dashboard data typically depends on resource state.
     """
-    count = 0
-    count += await cache_manager.delete_pattern(f"{CacheKeys.RESOURCES}:*")
-    count += await cache_manager.delete_pattern(f"{CacheKeys.DASHBOARD}:*")
-    logger.info(f"Invalidated {count} resource cache entries")
+    namespaces = (CacheKeys.RESOURCES, CacheKeys.DASHBOARD)
+    count = len(namespaces) if await invalidate_scopes(*namespaces) else 0
+    logger.debug(f"Invalidated {count} resource cache namespaces")
     return count
 
 
@@ -663,7 +1461,9 @@ async def cache_stats(key: str, data: dict[str, Any], ttl: int | None = None) ->
         True
     """
     settings = get_settings()
-    cache_key = f"{CacheKeys.STATS}:{key}"
+    cache_key = await namespaced_key(f"{CacheKeys.STATS}:{key}")
+    if cache_key is None:
+        return False
     return await cache_manager.set(cache_key, data, ttl or settings.cache_ttl_stats)
 
 
@@ -683,5 +1483,7 @@ async def get_cached_stats(key: str) -> dict[str, Any] | None:
         ...     return cached_stats
         >>> # Fallback to computing stats from database
     """
-    cache_key = f"{CacheKeys.STATS}:{key}"
+    cache_key = await namespaced_key(f"{CacheKeys.STATS}:{key}")
+    if cache_key is None:
+        return None
     return await cache_manager.get(cache_key)
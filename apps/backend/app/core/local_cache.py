@@ -0,0 +1,169 @@
+"""In-process L1 cache tier for Resource-Reserver.
+
+This module provides the process-local tier that sits in front of Redis in
+``CacheManager``. It keeps recently read values deserialized in memory so a
+hit costs neither a network round trip nor a ``json.loads``.
+
+Features:
+    - TTL + LRU eviction bounded by an approximate memory budget in bytes
+      (the size of each entry's JSON encoding)
+    - Local copy of cache scope versions, refreshed from Redis or from the
+      pub/sub invalidation channel, so versioned keys can be built without
+      a round trip
+    - Standalone mode for single-node deployments without Redis, where the
+      local scope versions are authoritative
+
+Example Usage:
+    Typically owned by the global cache manager::
+
+        local = LocalCache(max_bytes=16 * 1024 * 1024, ttl=5)
+        local.set("resources:list:v1:...", payload, size=len(serialized))
+        local.get("resources:list:v1:...")
+
+Note:
+    Values are shared between callers. Treat anything returned by ``get``
+    as read-only.
+
+Author:
+    Sylvester-Francis
+"""
+
+import logging
+import time
+from collections.abc import Sequence
+from threading import Lock
+from typing import Any
+
+from cachetools import TTLCache
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+TIER_NAME = "l1"
+
+
+class LocalCache:
+    """Thread-safe in-process TTL/LRU cache with a byte budget.
+
+    Attributes:
+        max_bytes: Approximate upper bound on the summed size of entries.
+        ttl: Time-to-live in seconds for entries and for scope versions
+            learned from Redis.
+    """
+
+    def __init__(self, max_bytes: int, ttl: int) -> None:
+        """Initialize an empty local cache.
+
+        Args:
+            max_bytes: Memory budget in bytes, measured as the length of each
+                entry's JSON encoding.
+            ttl: Time-to-live in seconds.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = Lock()
+        self._entries: TTLCache = TTLCache(
+            maxsize=max_bytes, ttl=ttl, getsizeof=lambda entry: entry[1]
+        )
+        self._versions: dict[str, tuple[int, float]] = {}
+
+    def get(self, key: str) -> Any | None:
+        """Return a cached value, recording an L1 hit or miss.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The cached value, or None if absent or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        metrics.record_cache_tier(TIER_NAME, hit=entry is not None)
+        return entry[0] if entry is not None else None
+
+    def set(self, key: str, value: Any, size: int) -> bool:
+        """Store a value, evicting least recently used entries as needed.
+
+        Args:
+            key: The cache key.
+            value: The (already JSON round-tripped) value to store.
+            size: The entry size in bytes counted against the budget.
+
+        Returns:
+            bool: False if the entry alone exceeds the budget.
+        """
+        try:
+            with self._lock:
+                self._entries[key] = (value, size)
+            return True
+        except ValueError:
+            logger.debug(f"Local cache entry too large for budget: {key}")
+            return False
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry and known scope version."""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    @property
+    def current_bytes(self) -> int:
+        """Approximate number of bytes currently held."""
+        with self._lock:
+            return int(self._entries.currsize)
+
+    def get_versions(
+        self, scopes: Sequence[str], authoritative: bool
+    ) -> list[int] | None:
+        """Return locally known versions for the given scopes.
+
+        Args:
+            scopes: The cache scopes to look up.
+            authoritative: True when there is no Redis, in which case unknown
+                scopes start at version 0 and versions never go stale.
+
+        Returns:
+            The versions in scope order, or None if any scope is unknown or
+            older than ``ttl`` and must be fetched from Redis.
+        """
+        now = time.monotonic()
+        versions = []
+        with self._lock:
+            for scope in scopes:
+                known = self._versions.get(scope)
+                if authoritative:
+                    versions.append(known[0] if known else 0)
+                elif known is None or now - known[1] > self.ttl:
+                    return None
+                else:
+                    versions.append(known[0])
+        return versions
+
+    def set_version(self, scope: str, version: int) -> None:
+        """Record a scope version learned from Redis or pub/sub.
+
+        Versions only move forward, so replayed or out-of-order messages
+        are harmless.
+        """
+        with self._lock:
+            known = self._versions.get(scope)
+            if known is None or version >= known[0]:
+                self._versions[scope] = (version, time.monotonic())
+
+    def bump_version(self, scope: str) -> int:
+        """Increment a scope version locally (standalone mode).
+
+        Returns:
+            The new version.
+        """
+        with self._lock:
+            known = self._versions.get(scope)
+            version = (known[0] if known else 0) + 1
+            self._versions[scope] = (version, time.monotonic())
+            return version
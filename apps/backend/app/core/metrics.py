@@ -12,6 +12,8 @@ Features:
     - Database query performance and connection pool monitoring
     - WebSocket connection lifecycle and message tracking
     - Cache operation statistics with hit rate calculations
+    - Webhook retry queue depth and delivery lag
+    - Reservation expiry sweeper runs, rows expired and run duration
     - Prometheus-compatible metrics export format
     - Component health status reporting for readiness/liveness probes
 
@@ -100,6 +102,9 @@ class CacheMetrics:
         deletes: Count of cache invalidation/deletion operations.
         errors: Count of cache operation failures due to connection issues
             or other errors.
+        tier_hits: Dictionary mapping cache tier names ("l1", "l2") to their
+            hit counts.
+        tier_misses: Dictionary mapping cache tier names to their miss counts.
     """
 
     hits: int = 0
@@ -107,6 +112,17 @@ class CacheMetrics:
     sets: int = 0
     deletes: int = 0
     errors: int = 0
+    tier_hits: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    tier_misses: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def tier_hit_ratio(self, tier: str) -> float:
+        """Return the hit ratio (0-1) of a single cache tier."""
+        lookups = self.tier_hits[tier] + self.tier_misses[tier]
+        return self.tier_hits[tier] / lookups if lookups > 0 else 0.0
+
+    def tiers(self) -> list[str]:
+        """Return every tier that has recorded a lookup, sorted by name."""
+        return sorted(set(self.tier_hits) | set(self.tier_misses))
 
 
 @dataclass
@@ -145,12 +161,53 @@ class WebSocketMetrics:
             established since application start.
         messages_sent: Total count of messages sent to WebSocket clients.
         messages_received: Total count of messages received from WebSocket clients.
+        queued_messages: Messages waiting in per-connection send queues.
+        slow_consumers_dropped: Connections closed because their send queue
+            was full.
     """
 
     active_connections: int = 0
     total_connections: int = 0
     messages_sent: int = 0
     messages_received: int = 0
+    queued_messages: int = 0
+    slow_consumers_dropped: int = 0
+
+
+@dataclass
+class WebhookMetrics:
+    """Tracks the webhook retry queue.
+
+    Attributes:
+        retry_queue_depth: Deliveries waiting for a retry attempt, as of the
+            last retry worker poll.
+        retry_lag_seconds: How far past its ``next_retry_at`` the oldest due
+            delivery was at the last poll.
+        retries_claimed: Total retry attempts claimed by the retry worker.
+    """
+
+    retry_queue_depth: int = 0
+    retry_lag_seconds: float = 0.0
+    retries_claimed: int = 0
+
+
+@dataclass
+class ExpiryMetrics:
+    """Tracks runs of the reservation expiry sweeper.
+
+    Attributes:
+        runs: Total sweeper runs, including runs with nothing to expire.
+        expired: Total reservations marked as expired.
+        last_run_expired: Reservations expired by the last run.
+        last_run_batches: Update batches committed by the last run.
+        last_run_duration_seconds: Wall-clock duration of the last run.
+    """
+
+    runs: int = 0
+    expired: int = 0
+    last_run_expired: int = 0
+    last_run_batches: int = 0
+    last_run_duration_seconds: float = 0.0
 
 
 class MetricsCollector:
@@ -166,6 +223,8 @@ class MetricsCollector:
         cache: CacheMetrics instance tracking cache operation statistics.
         database: DatabaseMetrics instance tracking database query statistics.
         websocket: WebSocketMetrics instance tracking WebSocket statistics.
+        webhooks: WebhookMetrics instance tracking the webhook retry queue.
+        expiry: ExpiryMetrics instance tracking reservation expiry runs.
 
     Example:
         Create and use a metrics collector::
@@ -190,6 +249,8 @@ class MetricsCollector:
         self.cache = CacheMetrics()
         self.database = DatabaseMetrics()
         self.websocket = WebSocketMetrics()
+        self.webhooks = WebhookMetrics()
+        self.expiry = ExpiryMetrics()
 
     def record_request(
         self,
@@ -251,6 +312,20 @@ class MetricsCollector:
         with self._lock:
             self.cache.deletes += 1
 
+    def record_cache_tier(self, tier: str, hit: bool) -> None:
+        """Record a lookup against a single cache tier.
+
+        Args:
+            tier: The tier name, "l1" for the in-process cache or "l2" for
+                Redis.
+            hit: Whether the tier held the key.
+        """
+        with self._lock:
+            if hit:
+                self.cache.tier_hits[tier] += 1
+            else:
+                self.cache.tier_misses[tier] += 1
+
     def record_cache_error(self) -> None:
         """Record a cache operation error.
 
@@ -327,6 +402,56 @@ class MetricsCollector:
         with self._lock:
             self.websocket.messages_received += 1
 
+    def update_ws_queue_depth(self, depth: int) -> None:
+        """Update the number of messages waiting in WebSocket send queues.
+
+        Args:
+            depth: Messages queued across all connections.
+        """
+        with self._lock:
+            self.websocket.queued_messages = depth
+
+    def record_ws_slow_consumer(self) -> None:
+        """Record a WebSocket client dropped for not keeping up."""
+        with self._lock:
+            self.websocket.slow_consumers_dropped += 1
+
+    def update_webhook_queue(self, depth: int, lag_seconds: float) -> None:
+        """Update the webhook retry queue gauges.
+
+        Args:
+            depth: Deliveries waiting for a retry attempt.
+            lag_seconds: Seconds the oldest due delivery is past its
+                scheduled retry time (0 if none is due).
+        """
+        with self._lock:
+            self.webhooks.retry_queue_depth = depth
+            self.webhooks.retry_lag_seconds = max(0.0, lag_seconds)
+
+    def record_webhook_retries_claimed(self, count: int) -> None:
+        """Record retry attempts claimed by the retry worker.
+
+        Args:
+            count: Number of deliveries claimed.
+        """
+        with self._lock:
+            self.webhooks.retries_claimed += count
+
+    def record_expiry_run(self, expired: int, batches: int, duration: float) -> None:
+        """Record a run of the reservation expiry sweeper.
+
+        Args:
+            expired: Reservations marked as expired.
+            batches: Update batches committed.
+            duration: Run duration in seconds.
+        """
+        with self._lock:
+            self.expiry.runs += 1
+            self.expiry.expired += expired
+            self.expiry.last_run_expired = expired
+            self.expiry.last_run_batches = batches
+            self.expiry.last_run_duration_seconds = duration
+
     def get_uptime_seconds(self) -> float:
         """Calculate the application uptime.
 
@@ -348,11 +473,16 @@ class MetricsCollector:
                 - requests: HTTP request statistics including total, errors,
                   avg_duration_ms, and error_rate percentage.
                 - cache: Cache statistics including hits, misses, hit_rate
-                  percentage, sets, deletes, and errors.
+                  percentage, sets, deletes, errors, and per-tier hit rates.
                 - database: Database statistics including queries,
                   avg_query_duration_ms, errors, pool_size, and pool_checked_out.
                 - websocket: WebSocket statistics including active_connections,
-                  total_connections, messages_sent, and messages_received.
+                  total_connections, messages_sent, messages_received,
+                  queued_messages, and slow_consumers_dropped.
+                - webhooks: Webhook retry queue depth, lag in seconds, and
+                  claimed retry count.
+                - expiry: Expiry sweeper runs, reservations expired, and the
+                  size and duration of the last run.
         """
         with self._lock:
             avg_request_duration = (
@@ -396,6 +526,14 @@ class MetricsCollector:
                     "sets": self.cache.sets,
                     "deletes": self.cache.deletes,
                     "errors": self.cache.errors,
+                    "tiers": {
+                        tier: {
+                            "hits": self.cache.tier_hits[tier],
+                            "misses": self.cache.tier_misses[tier],
+                            "hit_rate": round(self.cache.tier_hit_ratio(tier) * 100, 2),
+                        }
+                        for tier in self.cache.tiers()
+                    },
                 },
                 "database": {
                     "queries": self.database.queries,
@@ -409,6 +547,22 @@ class MetricsCollector:
                     "total_connections": self.websocket.total_connections,
                     "messages_sent": self.websocket.messages_sent,
                     "messages_received": self.websocket.messages_received,
+                    "queued_messages": self.websocket.queued_messages,
+                    "slow_consumers_dropped": self.websocket.slow_consumers_dropped,
+                },
+                "webhooks": {
+                    "retry_queue_depth": self.webhooks.retry_queue_depth,
+                    "retry_lag_seconds": round(self.webhooks.retry_lag_seconds, 2),
+                    "retries_claimed": self.webhooks.retries_claimed,
+                },
+                "expiry": {
+                    "runs": self.expiry.runs,
+                    "expired": self.expiry.expired,
+                    "last_run_expired": self.expiry.last_run_expired,
+                    "last_run_batches": self.expiry.last_run_batches,
+                    "last_run_duration_ms": round(
+                        self.expiry.last_run_duration_seconds * 1000, 2
+                    ),
                 },
             }
 
@@ -479,6 +633,31 @@ class MetricsCollector:
             lines.append("# TYPE cache_misses_total counter")
             lines.append(f"cache_misses_total {self.cache.misses}")
 
+            tiers = self.cache.tiers()
+            lines.append("# HELP cache_tier_hits_total Cache hits by tier")
+            lines.append("# TYPE cache_tier_hits_total counter")
+            for tier in tiers:
+                lines.append(
+                    f'cache_tier_hits_total{{tier="{tier}"}} '
+                    f"{self.cache.tier_hits[tier]}"
+                )
+
+            lines.append("# HELP cache_tier_misses_total Cache misses by tier")
+            lines.append("# TYPE cache_tier_misses_total counter")
+            for tier in tiers:
+                lines.append(
+                    f'cache_tier_misses_total{{tier="{tier}"}} '
+                    f"{self.cache.tier_misses[tier]}"
+                )
+
+            lines.append("# HELP cache_tier_hit_ratio Cache hit ratio by tier")
+            lines.append("# TYPE cache_tier_hit_ratio gauge")
+            for tier in tiers:
+                lines.append(
+                    f'cache_tier_hit_ratio{{tier="{tier}"}} '
+                    f"{self.cache.tier_hit_ratio(tier):.4f}"
+                )
+
             # Database metrics
             lines.append("# HELP db_queries_total Total database queries")
             lines.append("# TYPE db_queries_total counter")
@@ -521,6 +700,70 @@ class MetricsCollector:
                 f"websocket_messages_sent_total {self.websocket.messages_sent}"
             )
 
+            lines.append(
+                "# HELP websocket_send_queue_depth Messages waiting to be sent"
+            )
+            lines.append("# TYPE websocket_send_queue_depth gauge")
+            lines.append(f"websocket_send_queue_depth {self.websocket.queued_messages}")
+
+            lines.append(
+                "# HELP websocket_slow_consumers_dropped_total Slow clients dropped"
+            )
+            lines.append("# TYPE websocket_slow_consumers_dropped_total counter")
+            lines.append(
+                "websocket_slow_consumers_dropped_total "
+                f"{self.websocket.slow_consumers_dropped}"
+            )
+
+            # Webhook retry queue metrics
+            lines.append(
+                "# HELP webhook_retry_queue_depth Webhook deliveries awaiting retry"
+            )
+            lines.append("# TYPE webhook_retry_queue_depth gauge")
+            lines.append(f"webhook_retry_queue_depth {self.webhooks.retry_queue_depth}")
+
+            lines.append(
+                "# HELP webhook_retry_lag_seconds Delay of the oldest due retry"
+            )
+            lines.append("# TYPE webhook_retry_lag_seconds gauge")
+            lines.append(
+                f"webhook_retry_lag_seconds {self.webhooks.retry_lag_seconds:.2f}"
+            )
+
+            lines.append("# HELP webhook_retries_claimed_total Webhook retries claimed")
+            lines.append("# TYPE webhook_retries_claimed_total counter")
+            lines.append(
+                f"webhook_retries_claimed_total {self.webhooks.retries_claimed}"
+            )
+
+            # Reservation expiry sweeper metrics
+            lines.append("# HELP reservation_expiry_runs_total Expiry sweeper runs")
+            lines.append("# TYPE reservation_expiry_runs_total counter")
+            lines.append(f"reservation_expiry_runs_total {self.expiry.runs}")
+
+            lines.append("# HELP reservations_expired_total Reservations expired")
+            lines.append("# TYPE reservations_expired_total counter")
+            lines.append(f"reservations_expired_total {self.expiry.expired}")
+
+            lines.append(
+                "# HELP reservation_expiry_last_run_expired "
+                "Reservations expired by the last sweeper run"
+            )
+            lines.append("# TYPE reservation_expiry_last_run_expired gauge")
+            lines.append(
+                f"reservation_expiry_last_run_expired {self.expiry.last_run_expired}"
+            )
+
+            lines.append(
+                "# HELP reservation_expiry_last_run_duration_seconds "
+                "Duration of the last sweeper run"
+            )
+            lines.append("# TYPE reservation_expiry_last_run_duration_seconds gauge")
+            lines.append(
+                "reservation_expiry_last_run_duration_seconds "
+                f"{self.expiry.last_run_duration_seconds:.3f}"
+            )
+
         return "\n".join(lines) + "\n"
 
     def reset(self) -> None:
@@ -536,6 +779,8 @@ class MetricsCollector:
             self.cache = CacheMetrics()
             self.database = DatabaseMetrics()
             self.websocket = WebSocketMetrics()
+            self.webhooks = WebhookMetrics()
+        self.expiry = ExpiryMetrics()
 
 
 # Global metrics collector instance
@@ -607,7 +852,10 @@ def get_component_status(
         components["cache"] = {
             "status": "connected" if cache_manager.is_connected() else "disconnected",
             "enabled": True,
+            "l1_enabled": cache_manager.local is not None,
         }
+        if cache_manager.local is not None:
+            components["cache"]["l1_bytes"] = cache_manager.local.current_bytes
     else:
         components["cache"] = {
             "status": "disabled",
@@ -620,7 +868,7 @@ def get_component_status(
 
         components["websocket"] = {
             "status": "healthy",
-            "active_connections": len(ws_manager.active_connections),
+            "active_connections": ws_manager.connection_count,
         }
     except Exception as e:
         components["websocket"] = {
@@ -11,6 +11,8 @@ Features:
     - Rate limit headers in HTTP responses (X-RateLimit-*)
     - Configurable limits per endpoint pattern
     - Testing mode with higher limits for E2E testing
+    - Pluggable storage: in-process (tests, single worker) or Redis with
+      atomic Lua scripts so limits hold across workers and instances
 
 Example:
     The rate limiter is automatically applied via middleware::
@@ -22,13 +24,20 @@ Author:
     Sylvester-Francis
 """
 
+import hashlib
 import logging
+import math
 import time
-from datetime import UTC, datetime, timedelta
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
 
+import redis.asyncio as redis
 from fastapi import Request, Response
+from redis.exceptions import RedisError
 from slowapi.util import get_remote_address
 from starlette.middleware.base import BaseHTTPMiddleware
 
@@ -164,21 +173,103 @@ class RateLimitInfo:
         return headers
 
 
-class InMemoryRateLimiter:
+class RateLimiterBackend(ABC):
+    """Storage backend interface used by ``RateLimitMiddleware``.
+
+    Backends implement an atomic check-and-record (``hit``) so concurrent
+    requests cannot both take the last slot, and an atomic daily quota
+    counter.
+    """
+
+    @abstractmethod
+    async def hit(
+        self, key: str, limit: int, window_seconds: int = 60
+    ) -> tuple[bool, RateLimitInfo]:
+        """Record a request if it fits within the limit.
+
+        Args:
+            key: The rate limit key.
+            limit: Maximum number of requests allowed in the window.
+            window_seconds: Size of the sliding window in seconds.
+
+        Returns:
+            A tuple of (allowed, info). The request is only recorded when
+            allowed; info reflects the state after recording.
+        """
+
+    @abstractmethod
+    async def peek(
+        self, key: str, limit: int, window_seconds: int = 60
+    ) -> RateLimitInfo:
+        """Return the rate limit state without recording a request."""
+
+    @abstractmethod
+    async def consume_daily_quota(
+        self, user_id: str, date: str, limit: int | None
+    ) -> tuple[bool, int]:
+        """Count a request against a daily quota if it is not exhausted.
+
+        Args:
+            user_id: The user identifier.
+            date: The date string in YYYY-MM-DD format.
+            limit: The daily quota, or None for unlimited.
+
+        Returns:
+            A tuple of (allowed, count) where count is the number of requests
+            counted today after this call.
+        """
+
+    @abstractmethod
+    async def daily_count(self, user_id: str, date: str) -> int:
+        """Return the number of requests counted for a user on a date."""
+
+    async def close(self) -> None:  # noqa: B027 - optional hook, no-op default
+        """Release any connections held by the backend."""
+
+
+class _WindowCounter:
+    """Sliding-window counter state of one key (constant size)."""
+
+    __slots__ = ("window", "index", "current", "previous")
+
+    def __init__(self, window: int, index: int) -> None:
+        self.window = window
+        self.index = index
+        self.current = 0
+        self.previous = 0
+
+    def advance(self, index: int) -> None:
+        """Roll the counter forward to the window containing ``now``."""
+        if index != self.index:
+            self.previous = self.current if index == self.index + 1 else 0
+            self.current = 0
+            self.index = index
+
+
+class InMemoryRateLimiter(RateLimiterBackend):
     """Simple in-memory rate limiter for tracking request counts.
 
-    This rate limiter uses in-memory dictionaries to track request counts
-    per key within sliding time windows. It also tracks daily request
-    counts for quota enforcement.
+    Each key uses a sliding-window counter: the counts of the current and
+    previous fixed windows, with the previous count weighted by how much of
+    it still overlaps the sliding window. Checks and records are O(1) in
+    time and memory regardless of request volume, and match the Redis
+    backend's algorithm.
+
+    Idle keys (untouched for two windows, when their estimate is zero) and
+    daily counts from previous days are evicted in least-recently-used
+    order on every call, at amortized O(1) cost. Eviction assumes keys
+    share one window size, as they do in ``RateLimitMiddleware``.
 
     Note:
-        For production deployments with multiple server instances, this
-        should be replaced with Redis-based storage to share state across
+        For production deployments with multiple server instances, use the
+        Redis backend (``RATE_LIMIT_BACKEND=redis``) to share state across
         instances.
 
     Attributes:
-        _requests: Mapping of rate limit keys to lists of request timestamps.
-        _daily_counts: Nested mapping of user_id -> date -> request count.
+        _requests: Mapping of rate limit keys to window counters, ordered
+            from least to most recently used.
+        _daily_counts: Mapping of (user_id, date) to request count, ordered
+            from least to most recently used.
 
     Example:
         >>> limiter = InMemoryRateLimiter()
@@ -188,25 +279,75 @@ class InMemoryRateLimiter:
         99
     """
 
-    def __init__(self) -> None:
-        """Initialize the in-memory rate limiter with empty tracking stores."""
-        self._requests: dict[str, list[float]] = {}
-        self._daily_counts: dict[str, dict[str, int]] = {}
-
-    def _cleanup_old_requests(self, key: str, window_seconds: int = 60) -> None:
-        """Remove requests older than the sliding window.
-
-        Filters out request timestamps that are older than the specified
-        window duration to maintain accurate rate limit counting.
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        """Initialize the in-memory rate limiter with empty tracking stores.
 
         Args:
-            key: The rate limit key to clean up.
-            window_seconds: Size of the sliding window in seconds. Defaults to 60.
+            clock: Source of the current Unix time, injectable for tests.
         """
-        if key not in self._requests:
-            return
-        cutoff = time.time() - window_seconds
-        self._requests[key] = [t for t in self._requests[key] if t > cutoff]
+        self._clock = clock
+        self._requests: OrderedDict[str, _WindowCounter] = OrderedDict()
+        self._daily_counts: OrderedDict[tuple[str, str], int] = OrderedDict()
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop idle keys and stale daily counts from the LRU front."""
+        while self._requests:
+            key, counter = next(iter(self._requests.items()))
+            if now - (counter.index + 1) * counter.window < counter.window:
+                break
+            del self._requests[key]
+
+        today = datetime.fromtimestamp(now, tz=UTC).strftime("%Y-%m-%d")
+        while self._daily_counts:
+            user_id, date = next(iter(self._daily_counts))
+            if date >= today:
+                break
+            del self._daily_counts[(user_id, date)]
+
+    def _counter(self, key: str, window_seconds: int, now: float) -> _WindowCounter:
+        """Return the up-to-date counter of a key, creating it if needed."""
+        index = int(now // window_seconds)
+        counter = self._requests.get(key)
+        if counter is None or counter.window != window_seconds:
+            counter = _WindowCounter(window_seconds, index)
+            self._requests[key] = counter
+        else:
+            counter.advance(index)
+        self._requests.move_to_end(key)
+        return counter
+
+    def _info(
+        self, counter: _WindowCounter, limit: int, now: float, cost: int = 0
+    ) -> tuple[bool, RateLimitInfo]:
+        """Evaluate a counter against a limit, recording ``cost`` if allowed."""
+        window = counter.window
+        elapsed = now - counter.index * window
+        estimated = counter.previous * (window - elapsed) / window + counter.current
+
+        allowed = estimated + cost <= limit
+        if allowed and cost:
+            counter.current += cost
+            estimated += cost
+
+        remaining = math.floor(limit - estimated)
+        retry_after = None
+        if not allowed or remaining <= 0:
+            excess = estimated + cost - limit
+            if (
+                counter.previous
+                and excess * window / counter.previous <= window - elapsed
+            ):
+                wait = excess * window / counter.previous
+            else:
+                wait = window - elapsed
+            retry_after = max(1, math.ceil(wait))
+
+        return allowed, RateLimitInfo(
+            limit=limit,
+            remaining=remaining,
+            reset_at=datetime.fromtimestamp(now + window - elapsed, tz=UTC),
+            retry_after=retry_after,
+        )
 
     def check_rate_limit(
         self, key: str, limit: int, window_seconds: int = 60
@@ -225,45 +366,22 @@ class InMemoryRateLimiter:
             RateLimitInfo containing the current rate limit state including
             remaining requests and when the limit resets.
         """
-        self._cleanup_old_requests(key, window_seconds)
-
-        if key not in self._requests:
-            self._requests[key] = []
-
-        current_count = len(self._requests[key])
-        remaining = limit - current_count
-
-        # Calculate reset time
-        if self._requests[key]:
-            oldest_request = min(self._requests[key])
-            reset_at = datetime.fromtimestamp(oldest_request + window_seconds, tz=UTC)
-        else:
-            reset_at = datetime.now(UTC) + timedelta(seconds=window_seconds)
-
-        retry_after = None
-        if remaining <= 0:
-            retry_after = int(reset_at.timestamp() - time.time())
-            if retry_after < 0:
-                retry_after = 1
+        now = self._clock()
+        self._evict_idle(now)
+        return self._info(self._counter(key, window_seconds, now), limit, now)[1]
 
-        return RateLimitInfo(
-            limit=limit,
-            remaining=remaining,
-            reset_at=reset_at,
-            retry_after=retry_after,
-        )
-
-    def record_request(self, key: str) -> None:
+    def record_request(self, key: str, window_seconds: int = 60) -> None:
         """Record a request for rate limiting.
 
-        Adds the current timestamp to the request history for the given key.
+        Increments the current window count for the given key.
 
         Args:
             key: The rate limit key to record the request against.
+            window_seconds: Size of the sliding window in seconds. Defaults to 60.
         """
-        if key not in self._requests:
-            self._requests[key] = []
-        self._requests[key].append(time.time())
+        now = self._clock()
+        self._evict_idle(now)
+        self._counter(key, window_seconds, now).current += 1
 
     def get_daily_count(self, user_id: str, date: str) -> int:
         """Get daily request count for a user.
@@ -275,9 +393,7 @@ class InMemoryRateLimiter:
         Returns:
             The number of requests made by the user on the specified date.
         """
-        if user_id not in self._daily_counts:
-            return 0
-        return self._daily_counts.get(user_id, {}).get(date, 0)
+        return self._daily_counts.get((user_id, date), 0)
 
     def increment_daily_count(self, user_id: str, date: str) -> None:
         """Increment daily request count for a user.
@@ -286,11 +402,9 @@ class InMemoryRateLimiter:
             user_id: The user identifier.
             date: The date string in YYYY-MM-DD format.
         """
-        if user_id not in self._daily_counts:
-            self._daily_counts[user_id] = {}
-        if date not in self._daily_counts[user_id]:
-            self._daily_counts[user_id][date] = 0
-        self._daily_counts[user_id][date] += 1
+        entry = (user_id, date)
+        self._daily_counts[entry] = self._daily_counts.get(entry, 0) + 1
+        self._daily_counts.move_to_end(entry)
 
     def get_usage_stats(self, user_id: str) -> dict[str, Any]:
         """Get usage statistics for a user.
@@ -303,16 +417,258 @@ class InMemoryRateLimiter:
                 - daily_count: Number of requests made today
                 - date: Today's date in YYYY-MM-DD format
         """
-        today = datetime.now(UTC).strftime("%Y-%m-%d")
+        today = datetime.fromtimestamp(self._clock(), tz=UTC).strftime("%Y-%m-%d")
         return {
             "daily_count": self.get_daily_count(user_id, today),
             "date": today,
         }
 
+    def __len__(self) -> int:
+        """Return the number of rate limit keys currently tracked."""
+        return len(self._requests)
+
+    async def hit(
+        self, key: str, limit: int, window_seconds: int = 60
+    ) -> tuple[bool, RateLimitInfo]:
+        """Record a request if it fits within the limit (see base class)."""
+        now = self._clock()
+        self._evict_idle(now)
+        counter = self._counter(key, window_seconds, now)
+        return self._info(counter, limit, now, cost=1)
+
+    async def peek(
+        self, key: str, limit: int, window_seconds: int = 60
+    ) -> RateLimitInfo:
+        """Return the rate limit state without recording a request."""
+        return self.check_rate_limit(key, limit, window_seconds)
+
+    async def consume_daily_quota(
+        self, user_id: str, date: str, limit: int | None
+    ) -> tuple[bool, int]:
+        """Count a request against a daily quota (see base class)."""
+        count = self.get_daily_count(user_id, date)
+        if limit is not None and count >= limit:
+            return False, count
+        self.increment_daily_count(user_id, date)
+        return True, count + 1
+
+    async def daily_count(self, user_id: str, date: str) -> int:
+        """Return the number of requests counted for a user on a date."""
+        return self.get_daily_count(user_id, date)
+
+
+# Sliding-window counter kept in one hash per key: the current window index
+# (w), its count (c) and the previous window's count (p). The previous count
+# is weighted by how much of it still overlaps the sliding window. Time comes
+# from the Redis server so workers with skewed clocks agree.
+# ARGV: limit, window seconds, cost (1 to record, 0 to peek)
+# Returns: allowed, remaining, seconds until reset, seconds until retry
+_SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local index = math.floor(now / window)
+
+local state = redis.call("HMGET", key, "w", "c", "p")
+local stored = tonumber(state[1]) or index
+local current = tonumber(state[2]) or 0
+local previous = tonumber(state[3]) or 0
+if stored ~= index then
+    if stored == index - 1 then
+        previous = current
+    else
+        previous = 0
+    end
+    current = 0
+end
+
+local elapsed = now - index * window
+local estimated = previous * (window - elapsed) / window + current
+local allowed = 0
+local retry = 0
+if estimated + cost <= limit then
+    allowed = 1
+    if cost > 0 then
+        current = current + cost
+        estimated = estimated + cost
+        redis.call("HSET", key, "w", index, "c", current, "p", previous)
+        redis.call("EXPIRE", key, window * 2)
+    end
+else
+    local excess = estimated + cost - limit
+    if previous > 0 and excess * window / previous <= window - elapsed then
+        retry = excess * window / previous
+    else
+        retry = window - elapsed
+    end
+end
+
+return {allowed, tostring(limit - estimated), tostring(window - elapsed), tostring(retry)}
+"""
+
+# Atomic daily quota counter. ARGV: limit (-1 for unlimited), ttl seconds
+# Returns: allowed, count
+_DAILY_QUOTA_SCRIPT = """
+local count = tonumber(redis.call("GET", KEYS[1]) or "0")
+local limit = tonumber(ARGV[1])
+if limit >= 0 and count >= limit then
+    return {0, count}
+end
+count = redis.call("INCR", KEYS[1])
+if count == 1 then
+    redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+return {1, count}
+"""
+
+# Daily counters outlive their day so late requests near midnight still count
+_DAILY_QUOTA_TTL_SECONDS = 2 * 24 * 60 * 60
+
+
+class RedisRateLimiter(RateLimiterBackend):
+    """Distributed rate limiter backed by Redis.
+
+    Each check is a single Lua script call, so the check and the record are
+    atomic and every worker shares the same counters. Memory per key is
+    constant (one small hash) regardless of request volume.
+
+    If Redis is unreachable the limiter fails over to a per-process
+    in-memory limiter rather than rejecting or blindly admitting traffic.
+
+    Attributes:
+        _client: Redis async client instance.
+        _fallback: In-memory limiter used while Redis errors.
+
+    Example:
+        >>> limiter = RedisRateLimiter(redis_url="redis://localhost:6379/0")
+        >>> allowed, info = await limiter.hit("user:123", limit=100)
+    """
+
+    KEY_PREFIX = "ratelimit"
+    QUOTA_PREFIX = "quota"
+
+    def __init__(
+        self, redis_url: str | None = None, client: redis.Redis | None = None
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            redis_url: Redis connection URL. Connections are opened lazily.
+            client: An existing async client to use instead of ``redis_url``.
+        """
+        if client is None:
+            client = redis.Redis.from_url(redis_url, decode_responses=True)
+        self._client = client
+        self._window_script = client.register_script(_SLIDING_WINDOW_SCRIPT)
+        self._quota_script = client.register_script(_DAILY_QUOTA_SCRIPT)
+        self._fallback = InMemoryRateLimiter()
+
+    def _quota_key(self, user_id: str, date: str) -> str:
+        """Return the Redis key of a user's daily quota counter."""
+        return f"{self.QUOTA_PREFIX}:{user_id}:{date}"
+
+    async def _run_window(
+        self, key: str, limit: int, window_seconds: int, cost: int
+    ) -> tuple[bool, RateLimitInfo]:
+        """Run the sliding-window script and build the RateLimitInfo."""
+        allowed, remaining, reset_after, retry = await self._window_script(
+            keys=[f"{self.KEY_PREFIX}:{key}"], args=[limit, window_seconds, cost]
+        )
+        now = time.time()
+        allowed = bool(int(allowed))
+        remaining = math.floor(float(remaining))
+        retry_after = None
+        if not allowed or remaining <= 0:
+            retry_after = max(1, math.ceil(float(retry) or float(reset_after)))
+        return allowed, RateLimitInfo(
+            limit=limit,
+            remaining=remaining,
+            reset_at=datetime.fromtimestamp(now + float(reset_after), tz=UTC),
+            retry_after=retry_after,
+        )
+
+    async def hit(
+        self, key: str, limit: int, window_seconds: int = 60
+    ) -> tuple[bool, RateLimitInfo]:
+        """Record a request if it fits within the limit (see base class)."""
+        try:
+            return await self._run_window(key, limit, window_seconds, 1)
+        except RedisError as e:
+            logger.warning(f"Redis rate limiter unavailable, using fallback: {e}")
+            return await self._fallback.hit(key, limit, window_seconds)
+
+    async def peek(
+        self, key: str, limit: int, window_seconds: int = 60
+    ) -> RateLimitInfo:
+        """Return the rate limit state without recording a request."""
+        try:
+            _, info = await self._run_window(key, limit, window_seconds, 0)
+            return info
+        except RedisError as e:
+            logger.warning(f"Redis rate limiter unavailable, using fallback: {e}")
+            return await self._fallback.peek(key, limit, window_seconds)
+
+    async def consume_daily_quota(
+        self, user_id: str, date: str, limit: int | None
+    ) -> tuple[bool, int]:
+        """Count a request against a daily quota (see base class)."""
+        try:
+            allowed, count = await self._quota_script(
+                keys=[self._quota_key(user_id, date)],
+                args=[-1 if limit is None else limit, _DAILY_QUOTA_TTL_SECONDS],
+            )
+            return bool(int(allowed)), int(count)
+        except RedisError as e:
+            logger.warning(f"Redis quota counter unavailable, using fallback: {e}")
+            return await self._fallback.consume_daily_quota(user_id, date, limit)
+
+    async def daily_count(self, user_id: str, date: str) -> int:
+        """Return the number of requests counted for a user on a date."""
+        try:
+            return int(await self._client.get(self._quota_key(user_id, date)) or 0)
+        except RedisError as e:
+            logger.warning(f"Redis quota counter unavailable, using fallback: {e}")
+            return await self._fallback.daily_count(user_id, date)
+
+    async def close(self) -> None:
+        """Close the Redis client."""
+        await self._client.aclose()
+
 
 # Global rate limiter instance
 rate_limiter = InMemoryRateLimiter()
 
+# Lazily created when the Redis backend is selected
+_redis_rate_limiter: RedisRateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiterBackend:
+    """Return the backend selected by ``rate_limit_backend`` in settings.
+
+    Returns:
+        The shared RedisRateLimiter when the backend is "redis", otherwise
+        the global in-memory limiter.
+    """
+    global _redis_rate_limiter
+    settings = get_settings()
+    if settings.rate_limit_backend == "redis":
+        if _redis_rate_limiter is None:
+            _redis_rate_limiter = RedisRateLimiter(settings.rate_limit_redis_url)
+        return _redis_rate_limiter
+    return rate_limiter
+
+
+async def close_rate_limiter() -> None:
+    """Close the Redis backend connection, if one was opened."""
+    global _redis_rate_limiter
+    if _redis_rate_limiter is not None:
+        await _redis_rate_limiter.close()
+        _redis_rate_limiter = None
+
 
 def reset_rate_limiter() -> None:
     """Reset the rate limiter state.
@@ -365,8 +721,10 @@ def get_rate_limit_key(request: Request) -> str:
     """Generate rate limit key based on user or IP.
 
     Creates a unique key for rate limiting based on the request's
-    authentication status. Authenticated requests use a hash of the
-    token, while unauthenticated requests use the client IP address.
+    authentication status. Authenticated requests use a SHA-256 digest of
+    the token, stable across workers and restarts so a shared backend sees
+    one key per user, while unauthenticated requests use the client IP
+    address.
 
     Args:
         request: The FastAPI request object.
@@ -378,7 +736,7 @@ def get_rate_limit_key(request: Request) -> str:
     auth_header = request.headers.get("Authorization", "")
     if auth_header.startswith("Bearer "):
         token = auth_header.split(" ")[1]
-        return f"user:{hash(token)}"
+        return f"user:{hashlib.sha256(token.encode()).hexdigest()[:32]}"
     return f"ip:{get_remote_address(request)}"
 
 
@@ -419,6 +777,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         - Daily quota tracking for authenticated users
         - Testing mode with higher limits for E2E testing
         - Skip paths for health checks and WebSocket connections
+        - In-memory or Redis storage selected by ``rate_limit_backend``
 
     Example:
         Add to FastAPI application::
@@ -479,10 +838,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         tier_limit = tier_limits.get(tier, tier_limits[UserTier.ANONYMOUS])
         limit = endpoint_limit if endpoint_limit else tier_limit
 
-        # Check rate limit
-        rate_info = rate_limiter.check_rate_limit(key, limit)
+        limiter = get_rate_limiter()
+
+        # Check and record in one atomic step
+        allowed, rate_info = await limiter.hit(key, limit)
 
-        if rate_info.remaining <= 0:
+        if not allowed:
             logger.warning(f"Rate limit exceeded for {key} on {request.url.path}")
             response = Response(
                 content='{"detail": "Rate limit exceeded. Please try again later."}',
@@ -493,49 +854,41 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 response.headers[header] = value
             return response
 
-        # Record the request
-        rate_limiter.record_request(key)
-
         # Track daily quota
+        daily_limit = None
+        daily_count = 0
         if tier != UserTier.ANONYMOUS:
             user_id = key.replace("user:", "")
             today = datetime.now(UTC).strftime("%Y-%m-%d")
             daily_limit = DAILY_QUOTA_LIMITS.get(tier)
 
-            if daily_limit is not None:
-                daily_count = rate_limiter.get_daily_count(user_id, today)
-                if daily_count >= daily_limit:
-                    logger.warning(f"Daily quota exceeded for {key}")
-                    response = Response(
-                        content='{"detail": "Daily API quota exceeded. Resets at midnight UTC."}',
-                        status_code=429,
-                        media_type="application/json",
-                    )
-                    response.headers["X-Quota-Limit"] = str(daily_limit)
-                    response.headers["X-Quota-Remaining"] = "0"
-                    return response
-
-            rate_limiter.increment_daily_count(user_id, today)
+            within_quota, daily_count = await limiter.consume_daily_quota(
+                user_id, today, daily_limit
+            )
+            if not within_quota:
+                logger.warning(f"Daily quota exceeded for {key}")
+                response = Response(
+                    content='{"detail": "Daily API quota exceeded. Resets at midnight UTC."}',
+                    status_code=429,
+                    media_type="application/json",
+                )
+                response.headers["X-Quota-Limit"] = str(daily_limit)
+                response.headers["X-Quota-Remaining"] = "0"
+                return response
 
         # Process request
         response = await call_next(request)
 
         # Add rate limit headers
-        rate_info = rate_limiter.check_rate_limit(key, limit)
         for header, value in rate_info.to_headers().items():
             response.headers[header] = value
 
         # Add quota headers for authenticated users
-        if tier != UserTier.ANONYMOUS:
-            daily_limit = DAILY_QUOTA_LIMITS.get(tier)
-            if daily_limit is not None:
-                user_id = key.replace("user:", "")
-                today = datetime.now(UTC).strftime("%Y-%m-%d")
-                daily_count = rate_limiter.get_daily_count(user_id, today)
-                response.headers["X-Quota-Limit"] = str(daily_limit)
-                response.headers["X-Quota-Remaining"] = str(
-                    max(0, daily_limit - daily_count)
-                )
+        if daily_limit is not None:
+            response.headers["X-Quota-Limit"] = str(daily_limit)
+            response.headers["X-Quota-Remaining"] = str(
+                max(0, daily_limit - daily_count)
+            )
 
         return response
 
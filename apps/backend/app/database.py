@@ -53,6 +53,8 @@ from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import sessionmaker
 
+from app.utilization_rollups import register_rollup_upkeep
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/db/resource_reserver_dev.db")
@@ -78,18 +80,34 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Maintain utilization rollups on every reservation flush
+register_rollup_upkeep()
+
 
 def ensure_sqlite_schema() -> None:
     """Patch legacy SQLite schemas to include newer user fields.
 
     This keeps pre-seeded SQLite databases compatible with newer models by
-    adding missing columns and indexes. It is a no-op for non-SQLite databases.
+    adding missing columns and indexes, and the audit log full-text search
+    table. It is a no-op for non-SQLite databases.
     """
     if not DATABASE_URL.startswith("sqlite"):
         return
 
     inspector = inspect(engine)
-    if "users" not in inspector.get_table_names():
+    table_names = inspector.get_table_names()
+
+    if "audit_logs" in table_names and "audit_logs_fts" not in table_names:
+        from app.models import AUDIT_LOG_FTS_DDL
+
+        with engine.begin() as conn:
+            for statement in AUDIT_LOG_FTS_DDL:
+                conn.execute(text(statement))
+            conn.execute(
+                text("INSERT INTO audit_logs_fts (audit_logs_fts) VALUES ('rebuild')")
+            )
+
+    if "users" not in table_names:
         return
 
     existing_columns = {col["name"] for col in inspector.get_columns("users")}
@@ -36,6 +36,7 @@ Version:
 
 import asyncio
 import csv
+import hashlib
 import logging
 from contextlib import asynccontextmanager
 from datetime import UTC, datetime
@@ -64,6 +65,8 @@ from slowapi.util import get_remote_address
 from sqlalchemy.orm import Session
 
 from app import models, rbac, schemas, setup
+from app.audit_retention import run_audit_retention
+from app.audit_writer import close_audit_writer, get_audit_writer
 from app.auth import (
     authenticate_user_with_lockout,
     create_access_token,
@@ -75,12 +78,19 @@ from app.auth import (
 )
 from app.auth_routes import auth_router, mfa_router, oauth_router, roles_router
 from app.config import get_settings
-from app.core.cache import cache_manager
+from app.core.cache import (
+    CacheKeys,
+    CacheScopes,
+    cache_manager,
+    invalidate_scopes,
+    read_through_sync,
+)
 from app.core.metrics import check_liveness, check_readiness, metrics
-from app.core.rate_limiter import RateLimitMiddleware
+from app.core.rate_limiter import RateLimitMiddleware, close_rate_limiter
 from app.core.versioning import VersioningMiddleware, get_version_info
 from app.database import SessionLocal, engine, ensure_sqlite_schema, get_db
 from app.rbac import is_admin
+from app.reservation_expiry import expire_reservations, run_expiry
 from app.routers.analytics import router as analytics_router
 from app.routers.approvals import router as approvals_router
 from app.routers.audit import router as audit_router
@@ -100,6 +110,11 @@ from app.services import (
     UserService,
 )
 from app.setup_routes import setup_router
+from app.webhook_delivery import (
+    close_delivery_engine,
+    get_delivery_engine,
+    get_retry_worker,
+)
 from app.websocket import manager as ws_manager
 
 # Set up logging
@@ -109,8 +124,9 @@ logger = logging.getLogger(__name__)
 # Get settings
 settings = get_settings()
 
-# Global variable to control the cleanup task
+# Global variables to control the cleanup and status reconciler tasks
 cleanup_task = None
+reconcile_task = None
 
 
 def get_rate_limit_key(request: Request) -> str:
@@ -130,7 +146,7 @@ def get_rate_limit_key(request: Request) -> str:
 
     Example:
         >>> key = get_rate_limit_key(request)
-        >>> # Returns 'user:12345678' for authenticated users
+        >>> # Returns 'user:<token digest>' for authenticated users
         >>> # Returns '192.168.1.1' for anonymous users
     """
     # Try to get user from token if present
@@ -138,7 +154,7 @@ def get_rate_limit_key(request: Request) -> str:
     if auth_header.startswith("Bearer "):
         # Use token hash as key for authenticated users
         token = auth_header.split(" ")[1]
-        return f"user:{hash(token)}"
+        return f"user:{hashlib.sha256(token.encode()).hexdigest()[:32]}"
     # Fall back to IP for anonymous users
     return get_remote_address(request)
 
@@ -266,17 +282,16 @@ def convert_reservation_timezone(reservation, tz: ZoneInfo):
 
 
 async def cleanup_expired_reservations():
-    """Background task to clean up expired reservations and auto-reset resources.
-
-    This coroutine runs continuously as a background task, performing two
-    main cleanup operations every 5 minutes:
+    """Background task to clean up expired reservations.
 
-    1. Expired Reservations: Finds active reservations whose end_time has passed
-       and marks them as 'expired', creating history entries for audit purposes.
+    This coroutine runs continuously as a background task, checking every
+    5 minutes for active reservations whose end_time has passed and marking
+    them as 'expired', creating history entries for audit purposes. The
+    work is done by ``app.reservation_expiry.run_expiry`` in a worker
+    thread, as set-based UPDATEs in bounded batches.
 
-    2. Unavailable Resources: Checks resources marked as 'unavailable' and
-       automatically resets them to 'available' if their auto-reset timeout
-       has elapsed.
+    Auto-resetting unavailable resources is handled by
+    ``reconcile_resource_statuses``.
 
     The task handles database errors gracefully and continues running even
     if individual cleanup operations fail.
@@ -290,89 +305,53 @@ async def cleanup_expired_reservations():
         and is cancelled during shutdown. It uses its own database session
         to avoid conflicts with request-scoped sessions.
     """
-    from app.database import SessionLocal
-
-    logger.info("Starting cleanup task for expired reservations and resource status")
+    logger.info("Starting cleanup task for expired reservations")
 
     while True:
         try:
-            db = SessionLocal()
-            now = utcnow()
+            await asyncio.to_thread(run_expiry)
+        except Exception as e:
+            logger.error(f"Error in cleanup task: {e}")
 
-            # Find expired reservations that are still marked as active
-            expired_reservations = (
-                db.query(models.Reservation)
-                .filter(
-                    models.Reservation.status == "active",
-                    models.Reservation.end_time < now,
-                )
-                .all()
-            )
+        await asyncio.sleep(300)
 
-            # Process expired reservations
-            if expired_reservations:
-                logger.info(
-                    f"Cleaning up {len(expired_reservations)} expired reservations"
-                )
 
-                for reservation in expired_reservations:
-                    history = models.ReservationHistory(
-                        reservation_id=reservation.id,
-                        action="expired",
-                        user_id=reservation.user_id,
-                        details=f"Reservation automatically expired at {now.isoformat()}",
-                    )
-                    db.add(history)
-                    reservation.status = "expired"
-
-                    logger.info(
-                        f"Expired reservation {reservation.id} for resource "
-                        f"{reservation.resource_id}"
-                    )
+async def reconcile_resource_statuses():
+    """Background task to persist resource status transitions.
 
-                db.commit()
-                logger.info("Expired reservations cleanup completed")
-            else:
-                logger.debug("No expired reservations found")
+    Read endpoints compute resource status on the fly and never write it.
+    This coroutine brings the stored status in line on a fixed interval:
+    resources whose reservation started become 'in_use', finished ones
+    return to 'available', and unavailable resources past their auto-reset
+    timeout are reset. All transitions of a tick are written with a single
+    UPDATE and pushed to WebSocket topic subscribers. The database work
+    runs in a worker thread so it never blocks the event loop.
 
-            # Auto-reset unavailable resources that have exceeded their timeout
-            unavailable_resources = (
-                db.query(models.Resource)
-                .filter(
-                    models.Resource.status == "unavailable",
-                    models.Resource.unavailable_since.isnot(None),
-                )
-                .all()
-            )
+    Raises:
+        asyncio.CancelledError: When the task is cancelled during application
+            shutdown.
+    """
+    from app.availability_engine import run_reconcile
+    from app.services import clear_resource_count_cache
 
-            reset_count = 0
-            for resource in unavailable_resources:
-                if resource.should_auto_reset():
-                    logger.info(
-                        f"Auto-resetting resource {resource.id} ({resource.name}) "
-                        f"after {resource.auto_reset_hours} hours"
-                    )
-                    resource.set_available()
-                    reset_count += 1
-
-            if reset_count > 0:
-                db.commit()
-                logger.info(
-                    f"Auto-reset {reset_count} unavailable resources to available"
-                )
-            else:
-                logger.debug("No resources ready for auto-reset")
+    logger.info("Starting resource status reconciler")
 
-            db.close()
+    while True:
+        try:
+            transitions = await asyncio.to_thread(run_reconcile)
+
+            if transitions:
+                logger.info(f"Reconciled status of {len(transitions)} resources")
+                clear_resource_count_cache()
+                await invalidate_scopes(CacheScopes.RESOURCES)
+                await ws_manager.publish_availability(transitions)
+            else:
+                logger.debug("No resource status transitions pending")
 
         except Exception as e:
-            logger.error(f"Error in cleanup task: {e}")
-            try:
-                db.close()
-            except Exception:  # nosec B110 - intentionally ignoring close errors
-                pass
+            logger.error(f"Error in status reconciler: {e}")
 
-        await asyncio.sleep(300)
+        await asyncio.sleep(settings.status_reconcile_interval_seconds)
 
 
 async def send_reservation_reminders():
@@ -486,8 +465,36 @@ async def send_reservation_reminders():
         await asyncio.sleep(900)  # Check every 15 minutes
 
 
-# Global variable to control the reminder task
+async def apply_audit_retention():
+    """Background task to apply the audit log retention policy.
+
+    When ``audit_retention_enabled`` is set, this coroutine removes audit
+    log entries older than ``audit_retention_days`` every
+    ``audit_retention_interval_seconds``. Entries are archived and deleted
+    in small batches with pauses in between (see app.audit_retention), so
+    a large backlog does not lock the audit table.
+
+    Raises:
+        asyncio.CancelledError: When the task is cancelled during application
+            shutdown. A run in progress stops after its current batch.
+    """
+    logger.info("Starting audit log retention task")
+
+    while True:
+        if settings.audit_retention_enabled:
+            try:
+                await run_audit_retention()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in audit retention task: {e}")
+
+        await asyncio.sleep(settings.audit_retention_interval_seconds)
+
+
+# Global variables to control the reminder and retention tasks
 reminder_task = None
+retention_task = None
 
 
 @asynccontextmanager
@@ -502,10 +509,12 @@ async def lifespan(app: FastAPI):
         - Initializing default RBAC roles
         - Ensuring setup state is configured
         - Connecting to Redis cache (if enabled)
-        - Starting background tasks for cleanup and reminders
+        - Starting background tasks for cleanup, status reconciliation,
+          reminders and audit retention, and the batched audit log writer
 
     Shutdown:
         - Cancelling background tasks gracefully
+        - Writing queued audit log entries
         - Disconnecting from Redis cache
         - Logging shutdown completion
 
@@ -522,7 +531,7 @@ async def lifespan(app: FastAPI):
 
             app = FastAPI(lifespan=lifespan)
     """
-    global cleanup_task, reminder_task
+    global cleanup_task, reconcile_task, reminder_task, retention_task
 
     logger.info("Starting FastAPI application...")
 
@@ -560,10 +569,29 @@ async def lifespan(app: FastAPI):
     cleanup_task = asyncio.create_task(cleanup_expired_reservations())
     logger.info("Background cleanup task started")
 
+    reconcile_task = asyncio.create_task(reconcile_resource_statuses())
+    logger.info("Background status reconciler started")
+
     # Start email reminder task
     reminder_task = asyncio.create_task(send_reservation_reminders())
     logger.info("Background email reminder task started")
 
+    retention_task = asyncio.create_task(apply_audit_retention())
+    logger.info("Background audit retention task started")
+
+    get_delivery_engine().start()
+    get_retry_worker().start()
+    logger.info("Webhook delivery engine and retry worker started")
+
+    get_audit_writer().start()
+    logger.info("Audit log writer started")
+
+    try:
+        await ws_manager.start()
+        logger.info("WebSocket broadcast bus started")
+    except Exception as e:
+        logger.warning(f"Failed to start WebSocket broadcast bus: {e}")
+
     yield
 
     logger.info("Shutting down FastAPI application...")
@@ -577,6 +605,15 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error during cleanup task shutdown: {e}")
 
+    if reconcile_task:
+        reconcile_task.cancel()
+        try:
+            await reconcile_task
+        except asyncio.CancelledError:
+            logger.info("Background status reconciler cancelled")
+        except Exception as e:
+            logger.error(f"Error during status reconciler shutdown: {e}")
+
     if reminder_task:
         reminder_task.cancel()
         try:
@@ -586,6 +623,32 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error during reminder task shutdown: {e}")
 
+    if retention_task:
+        retention_task.cancel()
+        try:
+            await retention_task
+        except asyncio.CancelledError:
+            logger.info("Background audit retention task cancelled")
+        except Exception as e:
+            logger.error(f"Error during audit retention task shutdown: {e}")
+
+    try:
+        await close_delivery_engine()
+        logger.info("Webhook delivery engine stopped")
+    except Exception as e:
+        logger.warning(f"Error stopping webhook delivery engine: {e}")
+
+    try:
+        await ws_manager.close()
+    except Exception as e:
+        logger.warning(f"Error closing WebSocket broadcast bus: {e}")
+
+    try:
+        await asyncio.to_thread(close_audit_writer)
+        logger.info("Audit log writer flushed and stopped")
+    except Exception as e:
+        logger.warning(f"Error stopping audit log writer: {e}")
+
     # Disconnect Redis cache
     try:
         await cache_manager.disconnect()
@@ -593,6 +656,11 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error disconnecting Redis cache: {e}")
 
+    try:
+        await close_rate_limiter()
+    except Exception as e:
+        logger.warning(f"Error closing rate limiter: {e}")
+
     logger.info("Application shutdown complete")
 
 
@@ -708,6 +776,9 @@ async def websocket_endpoint(websocket: WebSocket, db: Session = Depends(get_db)
 
     Authenticates WebSocket connections using a JWT token passed as a query
     parameter, then maintains the connection for real-time event streaming.
+    Besides per-user events, clients can subscribe to ``resource:{id}``,
+    ``group:{id}`` and ``availability:summary`` topics to receive
+    availability deltas instead of polling.
 
     Args:
         websocket: The WebSocket connection instance.
@@ -722,6 +793,11 @@ async def websocket_endpoint(websocket: WebSocket, db: Session = Depends(get_db)
         Invalid or missing tokens result in immediate connection closure
         with policy violation code (1008).
 
+        Topic subscriptions are managed with JSON messages::
+
+            {"action": "subscribe", "topics": ["resource:12"]}
+            {"action": "unsubscribe", "topics": ["resource:12"]}
+
     Example:
         Client connection URL::
 
@@ -756,7 +832,9 @@ async def websocket_endpoint(websocket: WebSocket, db: Session = Depends(get_db)
     try:
         await ws_manager.connect(websocket, user.id)
         while True:
-            await websocket.receive_text()  # Keep alive; ignore messages for now
+            text = await websocket.receive_text()
+            metrics.record_ws_message_received()
+            ws_manager.handle_client_message(websocket, user.id, text)
     except Exception as exc:  # noqa: BLE001 - broad catch to ensure clean disconnects
         logger.warning("WebSocket connection closed unexpectedly: %s", exc)
     finally:
@@ -1217,6 +1295,32 @@ def create_resource(
     return resource_service.create_resource(resource_data)
 
 
+def _resource_page_payload(
+    resources: list[models.Resource],
+    next_cursor: str | None,
+    has_more: bool,
+    total_count: int | None,
+) -> dict:
+    """Serialize one page of resources into a cacheable JSON payload.
+
+    Args:
+        resources: The annotated resources of the page.
+        next_cursor: Cursor for the following page, if any.
+        has_more: Whether more items exist.
+        total_count: Total number of matches, if requested.
+
+    Returns:
+        dict: The PaginatedResponse as JSON-compatible data.
+    """
+    return schemas.PaginatedResponse[schemas.ResourceResponse](
+        data=[schemas.ResourceResponse.model_validate(r) for r in resources],
+        next_cursor=next_cursor,
+        prev_cursor=None,
+        has_more=has_more,
+        total_count=total_count,
+    ).model_dump(mode="json")
+
+
 @app.get(
     "/api/v1/resources",
     response_model=schemas.PaginatedResponse[schemas.ResourceResponse],
@@ -1254,25 +1358,29 @@ def list_resources(
         cursor=cursor, limit=limit, sort_by=sort_by, sort_order=sort_order
     )
 
-    try:
-        resources, next_cursor, has_more, total_count = (
-            resource_service.get_resources_paginated(
+    def load_page() -> dict:
+        return _resource_page_payload(
+            *resource_service.get_resources_paginated(
                 pagination=pagination, include_total=include_total
             )
         )
+
+    try:
+        return read_through_sync(
+            CacheKeys.RESOURCES_LIST,
+            [CacheScopes.RESOURCES],
+            load_page,
+            cursor=cursor,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            include_total=include_total,
+        )
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
         ) from exc
 
-    return schemas.PaginatedResponse(
-        data=resources,
-        next_cursor=next_cursor,
-        prev_cursor=None,
-        has_more=has_more,
-        total_count=total_count,
-    )
-
 
 @app.get(
     "/api/v1/resources/tags",
@@ -1295,13 +1403,14 @@ def get_all_tags(
     Returns:
         list[str]: Sorted list of unique tags.
     """
-    resources = db.query(models.Resource).all()
-    tags_set = set()
-    for resource in resources:
-        if resource.tags:
-            for tag in resource.tags:
-                tags_set.add(tag)
-    return sorted(tags_set)
+
+    def load_tags() -> list[str]:
+        tags_set = set()
+        for (tags,) in db.query(models.Resource.tags):
+            tags_set.update(tags or [])
+        return sorted(tags_set)
+
+    return read_through_sync(CacheKeys.RESOURCE_TAGS, [CacheScopes.TAGS], load_tags)
 
 
 @app.get(
@@ -1334,7 +1443,12 @@ def get_all_tags_with_details(
         )
 
     resource_service = ResourceService(db)
-    return resource_service.get_all_tags_with_counts()
+    return read_through_sync(
+        CacheKeys.RESOURCE_TAGS,
+        [CacheScopes.TAGS],
+        resource_service.get_all_tags_with_counts,
+        details=True,
+    )
 
 
 @app.put(
@@ -1529,9 +1643,10 @@ def search_resources(
     pagination = schemas.PaginationParams(
         cursor=cursor, limit=limit, sort_by=sort_by, sort_order=sort_order
     )
-    try:
-        resources, next_cursor, has_more, total_count = (
-            resource_service.get_resources_paginated(
+
+    def load_page() -> dict:
+        return _resource_page_payload(
+            *resource_service.get_resources_paginated(
                 pagination=pagination,
                 query=q,
                 status_filter=final_status_filter,
@@ -1541,19 +1656,28 @@ def search_resources(
                 include_total=include_total,
             )
         )
+
+    try:
+        return read_through_sync(
+            CacheKeys.RESOURCES_SEARCH,
+            [CacheScopes.RESOURCES],
+            load_page,
+            q=q,
+            status=final_status_filter,
+            available_from=available_from,
+            available_until=available_until,
+            tags=tags,
+            cursor=cursor,
+            limit=limit,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            include_total=include_total,
+        )
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
         ) from exc
 
-    return schemas.PaginatedResponse(
-        data=resources,
-        next_cursor=next_cursor,
-        prev_cursor=None,
-        has_more=has_more,
-        total_count=total_count,
-    )
-
 
 @app.post("/api/v1/resources/upload", tags=["Resources"])
 @limiter.limit(settings.rate_limit_heavy)
@@ -1970,32 +2094,36 @@ def get_availability_summary(request: Request, db: Session = Depends(get_db)):
             - currently_in_use: Resources with active reservations
             - timestamp: Time of the summary
     """
-    resource_service = ResourceService(db)
 
-    resources = resource_service.get_all_resources()
+    def load_summary() -> dict:
+        resources = ResourceService(db).get_all_resources()
 
-    total_resources = len(resources)
-    available_now = sum(1 for r in resources if r.available)
-    unavailable_now = total_resources - available_now
+        total_resources = len(resources)
+        available_now = sum(1 for r in resources if r.available)
+        unavailable_now = total_resources - available_now
 
-    now = utcnow()
-    in_use = (
-        db.query(models.Reservation)
-        .filter(
-            models.Reservation.status == "active",
-            models.Reservation.start_time <= now,
-            models.Reservation.end_time > now,
+        now = utcnow()
+        in_use = (
+            db.query(models.Reservation)
+            .filter(
+                models.Reservation.status == "active",
+                models.Reservation.start_time <= now,
+                models.Reservation.end_time > now,
+            )
+            .count()
         )
-        .count()
-    )
 
-    return {
-        "total_resources": total_resources,
-        "available_now": available_now,
-        "unavailable_now": unavailable_now,
-        "currently_in_use": in_use,
-        "timestamp": now,
-    }
+        return {
+            "total_resources": total_resources,
+            "available_now": available_now,
+            "unavailable_now": unavailable_now,
+            "currently_in_use": in_use,
+            "timestamp": now.isoformat(),
+        }
+
+    return read_through_sync(
+        CacheKeys.RESOURCE_AVAILABILITY, [CacheScopes.RESOURCES], load_summary
+    )
 
 
 # Reservation endpoints
@@ -2308,29 +2436,13 @@ def manual_cleanup_expired_reservations(
     try:
         now = utcnow()
 
-        expired_reservations = (
-            db.query(models.Reservation)
-            .filter(
-                models.Reservation.status == "active",
-                models.Reservation.end_time < now,
-            )
-            .all()
+        run = expire_reservations(
+            db,
+            now,
+            details=f"Reservation manually expired by user {current_user.id} "
+            f"at {now.isoformat()}",
         )
-
-        cleanup_count = 0
-        for reservation in expired_reservations:
-            history = models.ReservationHistory(
-                reservation_id=reservation.id,
-                action="expired",
-                user_id=reservation.user_id,
-                details=f"Reservation manually expired by user {current_user.id} "
-                f"at {now.isoformat()}",
-            )
-            db.add(history)
-            reservation.status = "expired"
-            cleanup_count += 1
-
-        db.commit()
+        cleanup_count = run.expired
 
         return {
             "message": f"Successfully cleaned up {cleanup_count} expired reservations",
@@ -46,18 +46,25 @@ Author:
 from datetime import UTC, datetime
 
 from sqlalchemy import (
+    DDL,
     JSON,
     Boolean,
     Column,
     Date,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     Time,
+    UniqueConstraint,
+    event,
+    func,
+    literal_column,
 )
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, relationship, validates
 
 Base = declarative_base()
 
@@ -411,6 +418,19 @@ class Reservation(Base):
         "ApprovalRequest", back_populates="reservation", uselist=False
     )
 
+    # Composite indexes backing app.conflicts overlap checks and the
+    # app.reservation_expiry sweeper
+    __table_args__ = (
+        Index(
+            "ix_reservations_conflict",
+            "resource_id",
+            "status",
+            "start_time",
+            "end_time",
+        ),
+        Index("ix_reservations_expiry", "status", "end_time"),
+    )
+
     @property
     def duration_hours(self) -> float:
         """Calculate the reservation duration in hours.
@@ -455,6 +475,36 @@ class ReservationHistory(Base):
     details = Column(Text)
 
 
+class UtilizationRollup(Base):
+    """Booked time of one resource in one UTC hour.
+
+    Maintained incrementally from reservation writes by
+    ``app.utilization_rollups`` and read by ``AnalyticsService`` in place of
+    raw reservations for whole-hour windows.
+
+    Attributes:
+        resource_id (int): Foreign key to the resource.
+        day (date): UTC date of the bucket.
+        hour (int): UTC hour of the bucket (0-23).
+        booked_minutes (float): Minutes of the hour covered by active or
+            expired reservations.
+        reservation_count (int): Active or expired reservations starting in
+            the hour.
+    """
+
+    __tablename__ = "utilization_rollups"
+
+    resource_id = Column(
+        Integer, ForeignKey("resources.id", ondelete="CASCADE"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    hour = Column(Integer, primary_key=True)
+    booked_minutes = Column(Float, nullable=False, default=0.0)
+    reservation_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_utilization_rollups_day_hour", "day", "hour"),)
+
+
 class RecurrenceRule(Base):
     """Recurrence pattern definition for recurring reservations.
 
@@ -1026,7 +1076,7 @@ class AuditLog(Base):
     __tablename__ = "audit_logs"
 
     id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime(timezone=True), default=utcnow, index=True)
+    timestamp = Column(DateTime(timezone=True), default=utcnow)
 
     # User information
     user_id = Column(
@@ -1036,10 +1086,10 @@ class AuditLog(Base):
 
     # Action details
     action = Column(
-        String(50), nullable=False, index=True
+        String(50), nullable=False
     )  # e.g., "create", "update", "delete", "login"
     entity_type = Column(
-        String(50), nullable=False, index=True
+        String(50), nullable=False
     )  # e.g., "reservation", "resource", "user"
     entity_id = Column(Integer, nullable=True)  # ID of affected entity
     entity_name = Column(String(255), nullable=True)  # Name/description for context
@@ -1062,6 +1112,76 @@ class AuditLog(Base):
     # Relationships
     user = relationship("User", backref="audit_logs")
 
+    # Composite indexes matching the newest-first (timestamp, id) keyset
+    # order of AuditService, alone and after the common equality filters
+    __table_args__ = (
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+        Index("ix_audit_logs_user_timestamp", "user_id", "timestamp", "id"),
+        Index("ix_audit_logs_action_timestamp", "action", "timestamp", "id"),
+        Index(
+            "ix_audit_logs_entity",
+            "entity_type",
+            "entity_id",
+            "timestamp",
+            "id",
+        ),
+    )
+
+
+def audit_log_search_vector():
+    """Full-text document of an audit log entry (PostgreSQL).
+
+    Covers details, entity_name and username. Queries must use this exact
+    expression for the planner to pick the ix_audit_logs_search GIN index.
+    """
+    blank = literal_column("''")
+    document = (
+        func.coalesce(AuditLog.details, blank)
+        + literal_column("' '")
+        + func.coalesce(AuditLog.entity_name, blank)
+        + literal_column("' '")
+        + func.coalesce(AuditLog.username, blank)
+    )
+    return func.to_tsvector(literal_column("'simple'::regconfig"), document)
+
+
+Index("ix_audit_logs_search", audit_log_search_vector(), postgresql_using="gin").ddl_if(
+    dialect="postgresql"
+)
+
+# SQLite searches an external-content FTS5 table kept in sync by triggers
+AUDIT_LOG_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS audit_logs_fts USING fts5("
+    "details, entity_name, username, content='audit_logs', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS audit_logs_fts_insert AFTER INSERT ON audit_logs "
+    "BEGIN "
+    "INSERT INTO audit_logs_fts (rowid, details, entity_name, username) "
+    "VALUES (new.id, new.details, new.entity_name, new.username); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS audit_logs_fts_delete AFTER DELETE ON audit_logs "
+    "BEGIN "
+    "INSERT INTO audit_logs_fts "
+    "(audit_logs_fts, rowid, details, entity_name, username) "
+    "VALUES ('delete', old.id, old.details, old.entity_name, old.username); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS audit_logs_fts_update "
+    "AFTER UPDATE OF details, entity_name, username ON audit_logs "
+    "BEGIN "
+    "INSERT INTO audit_logs_fts "
+    "(audit_logs_fts, rowid, details, entity_name, username) "
+    "VALUES ('delete', old.id, old.details, old.entity_name, old.username); "
+    "INSERT INTO audit_logs_fts (rowid, details, entity_name, username) "
+    "VALUES (new.id, new.details, new.entity_name, new.username); "
+    "END",
+)
+
+for _statement in AUDIT_LOG_FTS_DDL:
+    event.listen(
+        AuditLog.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+
 
 # ============================================================================
 # API Quota Models
@@ -1179,10 +1299,16 @@ class Webhook(Base):
         events (list): JSON list of subscribed event types.
         description (str): Optional description, max 255 characters.
         is_active (bool): Whether the webhook is active.
+        batch_max_items (int): When set, events are delivered as signed
+            arrays of up to this many events instead of one POST each.
+        batch_window_ms (int): Longest time an event waits for its batch to
+            fill, in milliseconds.
         created_at (datetime): When the webhook was created.
         updated_at (datetime): When the webhook was last modified.
         user (User): Webhook owner.
         deliveries (list[WebhookDelivery]): Delivery attempt records.
+        subscriptions (list[WebhookSubscription]): One row per subscribed
+            event type, kept in sync with ``events`` for indexed lookup.
     """
 
     __tablename__ = "webhooks"
@@ -1201,11 +1327,72 @@ class Webhook(Base):
     created_at = Column(DateTime(timezone=True), default=utcnow)
     updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
+    # Opt-in batched delivery (NULL = one delivery per event)
+    batch_max_items = Column(Integer, nullable=True)
+    batch_window_ms = Column(Integer, nullable=True)
+
     # Relationships
     user = relationship("User", backref="webhooks")
     deliveries = relationship(
         "WebhookDelivery", back_populates="webhook", cascade="all, delete-orphan"
     )
+    subscriptions = relationship(
+        "WebhookSubscription", back_populates="webhook", cascade="all, delete-orphan"
+    )
+
+    @validates("events")
+    def _sync_subscriptions(self, key, events):
+        """Mirror the ``events`` list into ``subscriptions`` rows.
+
+        Existing rows for event types that are still subscribed are kept, so
+        an update only inserts and deletes the difference.
+
+        Args:
+            key: The attribute name being set.
+            events: The new list of subscribed event types.
+
+        Returns:
+            list: The events list, unchanged.
+        """
+        wanted = set(events or [])
+        current = {sub.event_type: sub for sub in self.subscriptions}
+        for event_type, sub in current.items():
+            if event_type not in wanted:
+                self.subscriptions.remove(sub)
+        for event_type in sorted(wanted - current.keys()):
+            self.subscriptions.append(WebhookSubscription(event_type=event_type))
+        return events
+
+
+class WebhookSubscription(Base):
+    """Normalized webhook event subscription.
+
+    Mirrors ``Webhook.events`` so subscribers of an event type can be found
+    with a single indexed query instead of scanning every webhook's JSON
+    list.
+
+    Attributes:
+        id (int): Primary key identifier.
+        webhook_id (int): Foreign key to the subscribed webhook.
+        event_type (str): The subscribed event type, max 50 characters.
+        webhook (Webhook): The subscribed webhook.
+    """
+
+    __tablename__ = "webhook_event_subscriptions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    webhook_id = Column(
+        Integer, ForeignKey("webhooks.id", ondelete="CASCADE"), nullable=False
+    )
+    event_type = Column(String(50), nullable=False)
+
+    # Relationships
+    webhook = relationship("Webhook", back_populates="subscriptions")
+
+    __table_args__ = (
+        UniqueConstraint("webhook_id", "event_type", name="uq_webhook_event"),
+        Index("ix_webhook_subscriptions_event", "event_type", "webhook_id"),
+    )
 
 
 class WebhookDelivery(Base):
@@ -1227,6 +1414,9 @@ class WebhookDelivery(Base):
         delivered_at (datetime): When successful delivery occurred.
         next_retry_at (datetime): When to retry if failed.
         retry_count (int): Number of retry attempts made.
+        claimed_at (datetime): When a sender claimed the delivery; claims
+            older than the lease are considered abandoned.
+        claim_token (str): Identifies the claim batch of the retry worker.
         webhook (Webhook): Associated webhook configuration.
     """
 
@@ -1253,9 +1443,16 @@ class WebhookDelivery(Base):
     next_retry_at = Column(DateTime(timezone=True), nullable=True)
     retry_count = Column(Integer, default=0, nullable=False)
 
+    # Retry worker claim
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    claim_token = Column(String(32), nullable=True, index=True)
+
     # Relationships
     webhook = relationship("Webhook", back_populates="deliveries")
 
+    # Composite index backing the retry worker's due-delivery scan
+    __table_args__ = (Index("ix_webhook_deliveries_due", "status", "next_retry_at"),)
+
 
 # ============================================================================
 # Label Models
@@ -1296,8 +1493,6 @@ class Label(Base):
     )
 
     # Unique constraint on category + value
-    from sqlalchemy import UniqueConstraint
-
     __table_args__ = (
         UniqueConstraint("category", "value", name="uq_label_category_value"),
     )
@@ -1343,8 +1538,6 @@ class ResourceLabel(Base):
     label = relationship("Label", back_populates="resource_labels")
 
     # Unique constraint to prevent duplicate assignments
-    from sqlalchemy import UniqueConstraint
-
     __table_args__ = (
         UniqueConstraint("resource_id", "label_id", name="uq_resource_label"),
     )
@@ -0,0 +1,198 @@
+"""Set-based expiry of finished reservations.
+
+Active reservations whose end time has passed are marked as 'expired' in
+bounded batches. Each batch is one short transaction made of a single
+UPDATE and a single multi-row INSERT of the matching reservation history
+entries, instead of loading every reservation and its history entry as
+ORM objects and flushing them one row at a time.
+
+On PostgreSQL (and SQLite 3.35+) the batch is an ``UPDATE ... RETURNING``
+over a ``LIMIT``-ed subquery; the subquery takes ``FOR UPDATE SKIP
+LOCKED`` row locks on PostgreSQL so concurrent sweepers split the work
+instead of blocking on each other. Other databases select a batch of ids
+first and update them by primary key.
+
+The bulk UPDATE bypasses the ORM flush events that maintain utilization
+rollups. That is safe: 'active' and 'expired' both count as booked
+(``app.utilization_rollups.BOOKED_STATUSES``), so expiry never changes a
+rollup.
+
+Example Usage:
+    The application lifespan runs :func:`run_expiry` every five minutes;
+    the admin endpoint runs :func:`expire_reservations` directly::
+
+        run = expire_reservations(db)
+        print(run.expired, run.batches, run.duration_seconds)
+
+Author: Sylvester-Francis
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import get_settings
+from app.core.metrics import metrics
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    """Get current UTC datetime."""
+    return datetime.now(UTC)
+
+
+@dataclass
+class ExpiryRun:
+    """Outcome of one expiry run.
+
+    Attributes:
+        expired: Reservations marked as expired.
+        batches: Batches committed, the last one smaller than the batch size.
+        duration_seconds: Wall-clock duration of the run.
+    """
+
+    expired: int = 0
+    batches: int = 0
+    duration_seconds: float = 0.0
+
+
+def expire_batch(db: Session, now: datetime, batch_size: int, details: str) -> int:
+    """Expire up to ``batch_size`` finished reservations and commit.
+
+    Args:
+        db: Database session
+        now: Reservations ending before this time are expired
+        batch_size: Maximum reservations expired by this batch
+        details: Details of the history entries written for the batch
+
+    Returns:
+        Number of reservations expired
+    """
+    reservation = models.Reservation
+    due = (
+        select(reservation.id)
+        .where(reservation.status == "active", reservation.end_time < now)
+        .order_by(reservation.end_time)
+        .limit(batch_size)
+    )
+    dialect = db.get_bind().dialect
+
+    if dialect.update_returning:
+        if dialect.name == "postgresql":
+            due = due.with_for_update(skip_locked=True)
+        rows = db.execute(
+            update(reservation)
+            .where(reservation.id.in_(due.scalar_subquery()))
+            .values(status="expired")
+            .returning(reservation.id, reservation.user_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+    else:
+        rows = db.execute(
+            select(reservation.id, reservation.user_id).where(
+                reservation.id.in_(due.scalar_subquery())
+            )
+        ).all()
+        if rows:
+            db.execute(
+                update(reservation)
+                .where(
+                    reservation.id.in_([row.id for row in rows]),
+                    reservation.status == "active",
+                )
+                .values(status="expired")
+                .execution_options(synchronize_session=False)
+            )
+
+    if rows:
+        db.execute(
+            insert(models.ReservationHistory),
+            [
+                {
+                    "reservation_id": row.id,
+                    "action": "expired",
+                    "user_id": row.user_id,
+                    "timestamp": now,
+                    "details": details,
+                }
+                for row in rows
+            ],
+        )
+    db.commit()
+    return len(rows)
+
+
+def expire_reservations(
+    db: Session,
+    now: datetime | None = None,
+    batch_size: int | None = None,
+    details: str | None = None,
+) -> ExpiryRun:
+    """Expire all active reservations that ended before ``now``.
+
+    Batches are committed one by one until a batch comes back smaller than
+    ``batch_size``. The run is recorded in the application metrics.
+
+    Args:
+        db: Database session
+        now: Cutoff time (defaults to the current time)
+        batch_size: Reservations per batch (defaults to
+            ``expiry_batch_size``)
+        details: Details of the history entries (defaults to an automatic
+            expiry note)
+
+    Returns:
+        ExpiryRun with the number of reservations expired
+    """
+    now = now or utcnow()
+    batch_size = batch_size or get_settings().expiry_batch_size
+    if details is None:
+        details = f"Reservation automatically expired at {now.isoformat()}"
+
+    run = ExpiryRun()
+    started = time.perf_counter()
+    while True:
+        count = expire_batch(db, now, batch_size, details)
+        run.batches += 1
+        run.expired += count
+        logger.debug(f"Expiry batch {run.batches}: {count} reservations")
+        if count < batch_size:
+            break
+    run.duration_seconds = time.perf_counter() - started
+
+    metrics.record_expiry_run(run.expired, run.batches, run.duration_seconds)
+    if run.expired:
+        logger.info(
+            f"Expired {run.expired} reservations in {run.batches} batches "
+            f"({run.duration_seconds * 1000:.0f}ms)"
+        )
+    else:
+        logger.debug("No expired reservations found")
+    return run
+
+
+def run_expiry(session_factory: Callable[[], Session] = SessionLocal) -> ExpiryRun:
+    """Run :func:`expire_reservations` in a session of its own.
+
+    Args:
+        session_factory: Factory of the session used for the run
+
+    Returns:
+        ExpiryRun with the number of reservations expired
+    """
+    db = session_factory()
+    try:
+        return expire_reservations(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
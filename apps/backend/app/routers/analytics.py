@@ -10,8 +10,10 @@ Features:
     - Resource utilization metrics with percentage calculations
     - Popular resources ranking by reservation count
     - Peak usage times analysis (hourly and daily distributions)
+    - Weekday-by-hour occupancy heatmap, overall or per resource
     - User booking pattern analysis with cancellation rates
-    - CSV export functionality for utilization and reservation data
+    - CSV export functionality for utilization and reservation data, with
+      reservations streamed in chunks and optionally gzip-compressed
 
 Example Usage:
     The endpoints are accessible via the /api/v1/analytics prefix::
@@ -22,9 +24,15 @@ Example Usage:
         # Get utilization for a specific resource
         GET /api/v1/analytics/utilization?resource_id=5&days=60
 
+        # Get the 7x24 occupancy heatmap of a resource
+        GET /api/v1/analytics/heatmap?resource_id=5&days=90
+
         # Export utilization data as CSV
         GET /api/v1/analytics/export/utilization.csv?days=90
 
+        # Export a year of reservations as gzip-compressed CSV
+        GET /api/v1/analytics/export/reservations.csv?days=365&gzip=true
+
 Note:
     All endpoints require authentication. The current user must be logged in
     to access analytics data.
@@ -44,6 +52,7 @@ from app.analytics_service import AnalyticsService
 from app.auth import get_current_user
 from app.config import get_settings
 from app.database import get_db
+from app.utils.streaming import export_response
 
 router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
 
@@ -232,6 +241,51 @@ def get_peak_usage_times(
     return service.get_peak_usage_times(start_date=start_date, end_date=end_date)
 
 
+@router.get("/heatmap")
+def get_usage_heatmap(
+    request: Request,
+    resource_id: int | None = Query(None, description="Filter by resource ID"),
+    days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Retrieve a weekday-by-hour occupancy heatmap.
+
+    Returns a 7x24 grid (Monday first, UTC hours) of the hours booked
+    during each hour of the week, weighted by how much of the hour each
+    reservation covers.
+
+    Args:
+        request: The incoming FastAPI request object.
+        resource_id: Optional filter to map a single resource. If None,
+            all resources are combined.
+        days: Number of days to include in the analysis. Must be between 1 and 365.
+            Defaults to 30 days.
+        db: Database session dependency for querying reservation timing data.
+        current_user: The authenticated user making the request.
+
+    Returns:
+        dict: A dictionary containing:
+            - period: Object with start and end dates.
+            - resource_id: The mapped resource, or null for all resources.
+            - days: Row labels (Monday-Sunday).
+            - hours: Column labels (0-23).
+            - occupied_hours: 7 rows of 24 booked-hour values.
+            - reservation_starts: 7 rows of 24 reservation start counts.
+            - max_occupied_hours: The largest cell value, for color scaling.
+
+    Raises:
+        HTTPException: 401 if the user is not authenticated.
+    """
+    end_date = datetime.now(UTC)
+    start_date = end_date - timedelta(days=days)
+
+    service = AnalyticsService(db)
+    return service.get_usage_heatmap(
+        resource_id=resource_id, start_date=start_date, end_date=end_date
+    )
+
+
 @router.get("/user-patterns")
 def get_user_booking_patterns(
     request: Request,
@@ -343,6 +397,7 @@ def export_utilization_csv(
 def export_reservations_csv(
     request: Request,
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
+    gzip: bool = Query(False, description="Gzip-compress the download"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -350,18 +405,23 @@ def export_reservations_csv(
 
     Generates and downloads a CSV file containing detailed reservation
     records for the specified time period. The file includes all booking
-    information and is suitable for auditing or external analysis.
+    information and is suitable for auditing or external analysis. Rows
+    are read in batches while the file is sent, so memory use does not
+    grow with the export period.
 
     Args:
         request: The incoming FastAPI request object.
         days: Number of days to include in the export. Must be between 1 and 365.
             Defaults to 30 days.
-        db: Database session dependency for querying reservation data.
+        gzip: If True, the body is gzip-compressed on the fly and sent with
+            ``Content-Encoding: gzip``.
+        db: Database session dependency for querying reservation data. It is
+            closed once the body has been sent.
         current_user: The authenticated user making the request.
 
     Returns:
-        Response: A FastAPI Response object with:
-            - content: CSV-formatted string containing reservation data.
+        StreamingResponse: A streamed download with:
+            - content: CSV-formatted reservation data, sent in chunks.
             - media_type: Set to "text/csv" for proper browser handling.
             - headers: Content-Disposition header for file download with
                 filename format "reservations_{days}days.csv".
@@ -377,14 +437,12 @@ def export_reservations_csv(
     start_date = end_date - timedelta(days=days)
 
     service = AnalyticsService(db)
-    csv_content = service.export_reservations_csv(
-        start_date=start_date, end_date=end_date
-    )
+    chunks = service.stream_reservations_csv(start_date=start_date, end_date=end_date)
 
-    return Response(
-        content=csv_content,
+    return export_response(
+        chunks,
         media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=reservations_{days}days.csv"
-        },
+        filename=f"reservations_{days}days.csv",
+        compress=gzip,
+        on_close=db.close,
     )
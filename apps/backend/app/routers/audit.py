@@ -3,9 +3,9 @@
 Provides endpoints for:
 - Querying audit logs with filters
 - Viewing entity history
-- Exporting logs (CSV, JSON)
+- Exporting logs (CSV, JSON, NDJSON), streamed and optionally gzipped
 - Viewing statistics
-- Managing retention policies
+- Managing retention policies and following retention progress
 
 Author: Sylvester-Francis
 """
@@ -13,15 +13,16 @@ Author: Sylvester-Francis
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import Response
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app import models
+from app.audit_retention import RetentionInProgressError, get_retention_progress
 from app.audit_service import AuditService
 from app.auth import get_current_user
 from app.database import get_db
 from app.rbac import require_role
+from app.utils.streaming import export_response
 
 router = APIRouter(prefix="/api/v1/audit", tags=["audit"])
 
@@ -56,12 +57,18 @@ class AuditLogResponse(BaseModel):
 
 
 class AuditLogListResponse(BaseModel):
-    """Paginated list of audit logs."""
+    """Paginated list of audit logs.
+
+    ``next_cursor`` continues after the last entry of the page and stays
+    fast however deep the page is; ``total`` is None when not counted.
+    """
 
     logs: list[AuditLogResponse]
-    total: int
+    total: int | None
     skip: int
     limit: int
+    next_cursor: str | None = None
+    has_more: bool = False
 
 
 class AuditStatisticsResponse(BaseModel):
@@ -88,6 +95,23 @@ class RetentionPolicyResponse(BaseModel):
     message: str
 
 
+class RetentionStatusResponse(BaseModel):
+    """Progress of the current or last retention run."""
+
+    cutoff: datetime
+    started_at: datetime
+    finished_at: datetime | None
+    running: bool
+    deleted: int
+    archived: int
+    batches: int
+    partitions_dropped: list[str]
+    archive_files: int
+    last_archive: str | None
+    interrupted: bool
+    error: str | None
+
+
 class AvailableFiltersResponse(BaseModel):
     """Available filter options."""
 
@@ -111,36 +135,49 @@ def get_audit_logs(
     end_date: datetime | None = Query(None, description="Filter until date"),
     success: bool | None = Query(None, description="Filter by success status"),
     ip_address: str | None = Query(None, description="Filter by IP address"),
-    search: str | None = Query(None, description="Search in details/entity name"),
-    skip: int = Query(0, ge=0, description="Pagination offset"),
+    search: str | None = Query(
+        None, description="Full-text search in details/entity name/username"
+    ),
+    cursor: str | None = Query(None, description="Pagination cursor"),
+    skip: int = Query(0, ge=0, description="Pagination offset (without cursor)"),
     limit: int = Query(100, ge=1, le=1000, description="Pagination limit"),
+    count: str = Query("exact", description="Total count: exact, estimate, none"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_role("admin")),
 ):
-    """Get audit logs with optional filters.
+    """Get audit logs with optional filters, newest first.
 
-    Requires admin role.
+    Requires admin role. Pass the returned ``next_cursor`` as ``cursor``
+    to page through large result sets; use ``count=estimate`` or
+    ``count=none`` to avoid counting every match.
     """
     service = AuditService(db)
-    logs, total = service.get_logs(
-        user_id=user_id,
-        action=action,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        start_date=start_date,
-        end_date=end_date,
-        success=success,
-        ip_address=ip_address,
-        search=search,
-        skip=skip,
-        limit=limit,
-    )
+    try:
+        logs, next_cursor, has_more, total = service.get_logs_page(
+            user_id=user_id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            start_date=start_date,
+            end_date=end_date,
+            success=success,
+            ip_address=ip_address,
+            search=search,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            count=count,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
     return AuditLogListResponse(
         logs=[AuditLogResponse.model_validate(log) for log in logs],
         total=total,
         skip=skip,
         limit=limit,
+        next_cursor=next_cursor,
+        has_more=has_more,
     )
 
 
@@ -246,15 +283,17 @@ def export_audit_logs_csv(
     entity_type: str | None = Query(None),
     start_date: datetime | None = Query(None),
     end_date: datetime | None = Query(None),
+    gzip: bool = Query(False, description="Gzip-compress the download"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_role("admin")),
 ):
     """Export audit logs to CSV file.
 
-    Requires admin role. Maximum 10,000 entries.
+    Requires admin role. The file is streamed while entries are read, so
+    there is no limit on the number of entries.
     """
     service = AuditService(db)
-    csv_content = service.export_to_csv(
+    chunks = service.stream_csv(
         user_id=user_id,
         action=action,
         entity_type=entity_type,
@@ -262,10 +301,12 @@ def export_audit_logs_csv(
         end_date=end_date,
     )
 
-    return Response(
-        content=csv_content,
+    return export_response(
+        chunks,
         media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=audit_logs.csv"},
+        filename="audit_logs.csv",
+        compress=gzip,
+        on_close=db.close,
     )
 
 
@@ -277,15 +318,17 @@ def export_audit_logs_json(
     entity_type: str | None = Query(None),
     start_date: datetime | None = Query(None),
     end_date: datetime | None = Query(None),
+    gzip: bool = Query(False, description="Gzip-compress the download"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(require_role("admin")),
 ):
     """Export audit logs to JSON file.
 
-    Requires admin role. Maximum 10,000 entries.
+    Requires admin role. The file is streamed while entries are read, so
+    there is no limit on the number of entries.
     """
     service = AuditService(db)
-    json_content = service.export_to_json(
+    chunks = service.stream_json(
         user_id=user_id,
         action=action,
         entity_type=entity_type,
@@ -293,10 +336,47 @@ def export_audit_logs_json(
         end_date=end_date,
     )
 
-    return Response(
-        content=json_content,
+    return export_response(
+        chunks,
         media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=audit_logs.json"},
+        filename="audit_logs.json",
+        compress=gzip,
+        on_close=db.close,
+    )
+
+
+@router.get("/export/ndjson")
+def export_audit_logs_ndjson(
+    request: Request,
+    user_id: int | None = Query(None),
+    action: str | None = Query(None),
+    entity_type: str | None = Query(None),
+    start_date: datetime | None = Query(None),
+    end_date: datetime | None = Query(None),
+    gzip: bool = Query(False, description="Gzip-compress the download"),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(require_role("admin")),
+):
+    """Export audit logs to newline-delimited JSON file.
+
+    Requires admin role. The file is streamed while entries are read, so
+    there is no limit on the number of entries.
+    """
+    service = AuditService(db)
+    chunks = service.stream_ndjson(
+        user_id=user_id,
+        action=action,
+        entity_type=entity_type,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+    return export_response(
+        chunks,
+        media_type="application/x-ndjson",
+        filename="audit_logs.ndjson",
+        compress=gzip,
+        on_close=db.close,
     )
 
 
@@ -327,14 +407,15 @@ def apply_retention_policy(
 ):
     """Apply retention policy to delete old audit logs.
 
-    Requires admin role.
+    Requires admin role. Entries are deleted in batches, and archived first
+    when an archive directory is configured.
 
     WARNING: This action is irreversible.
     """
     service = AuditService(db)
 
     # Log this action itself
-    service.log_action(
+    service.enqueue_action(
         action="apply_retention",
         entity_type="audit_log",
         user_id=current_user.id,
@@ -343,10 +424,29 @@ def apply_retention_policy(
         details=f"Applying {data.retention_days}-day retention policy",
     )
 
-    deleted_count = service.apply_retention_policy(data.retention_days)
+    try:
+        deleted_count = service.apply_retention_policy(data.retention_days)
+    except RetentionInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
 
     return RetentionPolicyResponse(
         deleted_count=deleted_count,
         retention_days=data.retention_days,
         message=f"Successfully deleted {deleted_count} audit log entries older than {data.retention_days} days",
     )
+
+
+@router.get("/retention/status", response_model=RetentionStatusResponse)
+def get_retention_status(
+    request: Request,
+    current_user: models.User = Depends(require_role("admin")),
+):
+    """Get the progress of the current or last retention run.
+
+    Requires admin role. Progress is tracked per worker process.
+    """
+    progress = get_retention_progress()
+    if progress is None:
+        raise HTTPException(status_code=404, detail="No retention run yet")
+
+    return RetentionStatusResponse(**progress.to_dict())
@@ -12,7 +12,6 @@ Author: Sylvester-Francis
 from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
-from fastapi.responses import Response
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
@@ -20,6 +19,7 @@ from app import models
 from app.auth import get_current_user
 from app.bulk_service import BulkReservationService
 from app.database import get_db
+from app.utils.streaming import export_response
 
 router = APIRouter(prefix="/api/v1/bulk", tags=["bulk"])
 
@@ -176,16 +176,18 @@ def export_reservations_csv(
         None, description="Filter by start time (until)"
     ),
     status: str | None = Query(None, description="Filter by status"),
+    gzip: bool = Query(False, description="Gzip-compress the download"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
     """Export reservations to CSV file.
 
-    Supports filtering by user, resource, date range, and status.
+    Supports filtering by user, resource, date range, and status. The file
+    is streamed while rows are read, so exports of any size are supported.
     """
     service = BulkReservationService(db)
 
-    csv_content = service.export_to_csv(
+    chunks = service.stream_csv(
         user_id=user_id,
         resource_id=resource_id,
         start_from=ensure_timezone_aware(start_from),
@@ -193,10 +195,12 @@ def export_reservations_csv(
         status=status,
     )
 
-    return Response(
-        content=csv_content,
+    return export_response(
+        chunks,
         media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=reservations_export.csv"},
+        filename="reservations_export.csv",
+        compress=gzip,
+        on_close=db.close,
     )
 
 
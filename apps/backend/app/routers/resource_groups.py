@@ -18,6 +18,12 @@ from sqlalchemy.orm import Session
 
 from app import models
 from app.auth import get_current_user
+from app.core.cache import (
+    CacheKeys,
+    CacheScopes,
+    invalidate_scopes_sync,
+    read_through_sync,
+)
 from app.database import get_db
 from app.rbac import require_role
 
@@ -150,6 +156,7 @@ def create_resource_group(
     )
     db.add(group)
     db.commit()
+    invalidate_scopes_sync(CacheScopes.GROUPS)
     db.refresh(group)
 
     return group
@@ -191,47 +198,53 @@ def get_resource_group_tree(
 
     Returns hierarchical tree with resource counts.
     """
-    # Get all groups
-    all_groups = db.query(models.ResourceGroup).all()
 
-    # Count resources per group
-    resource_counts: dict[int, int] = {}
-    resources = (
-        db.query(models.Resource.group_id)
-        .filter(models.Resource.group_id.isnot(None))
-        .all()
-    )
-    for (group_id,) in resources:
-        resource_counts[group_id] = resource_counts.get(group_id, 0) + 1
-
-    # Build tree structure
-    def build_tree(parent_id: int | None) -> list[dict[str, Any]]:
-        children = []
-        for group in all_groups:
-            if group.parent_id == parent_id:
-                group_dict = {
-                    "id": group.id,
-                    "name": group.name,
-                    "description": group.description,
-                    "parent_id": group.parent_id,
-                    "building": group.building,
-                    "floor": group.floor,
-                    "room": group.room,
-                    "created_at": group.created_at,
-                    "updated_at": group.updated_at,
-                    "children": build_tree(group.id),
-                    "resource_count": resource_counts.get(group.id, 0),
-                }
-                children.append(group_dict)
-        return children
-
-    tree = build_tree(None)
-    total_resources = db.query(models.Resource).count()
-
-    return ResourceGroupTree(
-        groups=tree,
-        total_groups=len(all_groups),
-        total_resources=total_resources,
+    def load_tree() -> dict[str, Any]:
+        # Get all groups
+        all_groups = db.query(models.ResourceGroup).all()
+
+        # Count resources per group
+        resource_counts: dict[int, int] = {}
+        resources = (
+            db.query(models.Resource.group_id)
+            .filter(models.Resource.group_id.isnot(None))
+            .all()
+        )
+        for (group_id,) in resources:
+            resource_counts[group_id] = resource_counts.get(group_id, 0) + 1
+
+        # Build tree structure
+        def build_tree(parent_id: int | None) -> list[dict[str, Any]]:
+            children = []
+            for group in all_groups:
+                if group.parent_id == parent_id:
+                    group_dict = {
+                        "id": group.id,
+                        "name": group.name,
+                        "description": group.description,
+                        "parent_id": group.parent_id,
+                        "building": group.building,
+                        "floor": group.floor,
+                        "room": group.room,
+                        "created_at": group.created_at,
+                        "updated_at": group.updated_at,
+                        "children": build_tree(group.id),
+                        "resource_count": resource_counts.get(group.id, 0),
+                    }
+                    children.append(group_dict)
+            return children
+
+        tree = build_tree(None)
+        total_resources = db.query(models.Resource).count()
+
+        return ResourceGroupTree(
+            groups=tree,
+            total_groups=len(all_groups),
+            total_resources=total_resources,
+        ).model_dump(mode="json")
+
+    return read_through_sync(
+        CacheKeys.RESOURCE_GROUP_TREE, [CacheScopes.GROUPS], load_tree
     )
 
 
@@ -390,6 +403,7 @@ def update_resource_group(
         setattr(group, field, value)
 
     db.commit()
+    invalidate_scopes_sync(CacheScopes.GROUPS)
     db.refresh(group)
 
     return group
@@ -459,6 +473,7 @@ def delete_resource_group(
 
     db.delete(group)
     db.commit()
+    invalidate_scopes_sync(CacheScopes.GROUPS)
 
 
 # ============================================================================
@@ -544,6 +559,7 @@ def assign_resource_to_group(
 
     resource.group_id = group_id
     db.commit()
+    invalidate_scopes_sync(CacheScopes.GROUPS)
 
     return {"message": f"Resource '{resource.name}' assigned to group '{group.name}'"}
 
@@ -573,6 +589,7 @@ def remove_resource_from_group(
 
     resource.group_id = None
     db.commit()
+    invalidate_scopes_sync(CacheScopes.GROUPS)
 
     return {"message": f"Resource '{resource.name}' removed from group"}
 
@@ -17,6 +17,7 @@ from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.auth import get_current_user
+from app.core.cache import CacheKeys, CacheScopes, read_through_sync
 from app.database import get_db
 from app.search_service import SavedSearchService, SearchService
 
@@ -208,7 +209,12 @@ def get_popular_tags(
 ):
     """Get the most popular tags across all resources."""
     service = SearchService(db)
-    tags = service.get_popular_tags(limit)
+    tags = read_through_sync(
+        CacheKeys.RESOURCE_TAGS,
+        [CacheScopes.TAGS],
+        lambda: service.get_popular_tags(limit),
+        popular=limit,
+    )
     return {"tags": tags}
 
 
@@ -73,6 +73,18 @@ class WebhookCreate(BaseModel):
         ..., min_length=1, description="List of event types to subscribe to"
     )
     description: str | None = Field(None, max_length=255)
+    batch_max_items: int | None = Field(
+        None,
+        ge=1,
+        le=1000,
+        description="Deliver events as signed arrays of up to this many events",
+    )
+    batch_window_ms: int | None = Field(
+        None,
+        ge=10,
+        le=60000,
+        description="Longest time an event waits for its batch to fill",
+    )
 
 
 class WebhookUpdate(BaseModel):
@@ -82,6 +94,10 @@ class WebhookUpdate(BaseModel):
     events: list[str] | None = None
     description: str | None = None
     is_active: bool | None = None
+    batch_max_items: int | None = Field(
+        None, ge=0, le=1000, description="Events per batch; 0 disables batching"
+    )
+    batch_window_ms: int | None = Field(None, ge=10, le=60000)
 
 
 class WebhookResponse(BaseModel):
@@ -92,6 +108,8 @@ class WebhookResponse(BaseModel):
     events: list[str]
     description: str | None
     is_active: bool
+    batch_max_items: int | None = None
+    batch_window_ms: int | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -280,6 +298,8 @@ def create_webhook(
         url=str(data.url),
         events=data.events,
         description=data.description,
+        batch_max_items=data.batch_max_items,
+        batch_window_ms=data.batch_window_ms,
     )
 
     return WebhookWithSecretResponse(
@@ -289,6 +309,8 @@ def create_webhook(
         events=webhook.events,
         description=webhook.description,
         is_active=webhook.is_active,
+        batch_max_items=webhook.batch_max_items,
+        batch_window_ms=webhook.batch_window_ms,
         created_at=webhook.created_at,
         updated_at=webhook.updated_at,
     )
@@ -417,6 +439,8 @@ def update_webhook(
         events=data.events,
         description=data.description,
         is_active=data.is_active,
+        batch_max_items=data.batch_max_items,
+        batch_window_ms=data.batch_window_ms,
     )
 
     return updated
@@ -517,6 +541,8 @@ def regenerate_webhook_secret(
         events=updated.events,
         description=updated.description,
         is_active=updated.is_active,
+        batch_max_items=updated.batch_max_items,
+        batch_window_ms=updated.batch_window_ms,
         created_at=updated.created_at,
         updated_at=updated.updated_at,
     )
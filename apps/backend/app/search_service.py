@@ -17,6 +17,7 @@ from sqlalchemy import or_
 from sqlalchemy.orm import Session, joinedload
 
 from app import models
+from app.conflicts import conflict_exists
 
 logger = logging.getLogger(__name__)
 
@@ -97,6 +98,15 @@ class SearchService:
                 models.Resource.requires_approval == requires_approval
             )
 
+        # Filter by time availability with a single anti-join
+        if available_from and available_until:
+            db_query = db_query.filter(
+                ~conflict_exists(
+                    ensure_timezone_aware(available_from),
+                    ensure_timezone_aware(available_until),
+                )
+            )
+
         # Get all matching resources
         all_resources = db_query.all()
 
@@ -110,28 +120,6 @@ class SearchService:
                 if tag_set.issubset({t.lower() for t in (r.tags or [])})
             ]
 
-        # Filter by time availability
-        if available_from and available_until:
-            available_from = ensure_timezone_aware(available_from)
-            available_until = ensure_timezone_aware(available_until)
-
-            filtered_resources = []
-            for resource in all_resources:
-                # Check if there are any conflicting reservations
-                conflict = (
-                    self.db.query(models.Reservation)
-                    .filter(
-                        models.Reservation.resource_id == resource.id,
-                        models.Reservation.status == "active",
-                        models.Reservation.end_time > available_from,
-                        models.Reservation.start_time < available_until,
-                    )
-                    .first()
-                )
-                if not conflict:
-                    filtered_resources.append(resource)
-            all_resources = filtered_resources
-
         total_count = len(all_resources)
 
         # Apply pagination
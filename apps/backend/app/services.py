@@ -44,38 +44,90 @@ Author:
 import base64
 import json
 import logging
+import threading
 from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import anyio
+from cachetools import TTLCache
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
 from app import models, schemas
 from app.auth import hash_password
-from app.core.cache import invalidate_resource_cache
+from app.availability_engine import AvailabilityEngine
+from app.config import get_settings
+from app.conflicts import IntervalIndex, find_conflicts, has_conflict
+from app.core.cache import CacheScopes, invalidate_scopes_sync
 from app.utils.recurrence import generate_occurrences
 from app.websocket import manager as ws_manager
 
 logger = logging.getLogger(__name__)
 
+# Optional cache for include_total counts on resource listings
+_resource_count_lock = threading.Lock()
+_resource_count_cache: TTLCache | None = (
+    TTLCache(maxsize=256, ttl=get_settings().resource_count_cache_ttl)
+    if get_settings().resource_count_cache_ttl > 0
+    else None
+)
 
-def _invalidate_cache_sync() -> None:
-    """Invalidate the resource cache from a synchronous context.
 
-    This is a wrapper function that runs the async cache invalidation
-    function from a synchronous thread context using anyio.
+def clear_resource_count_cache() -> None:
+    """Drop all cached resource listing totals."""
+    if _resource_count_cache is not None:
+        with _resource_count_lock:
+            _resource_count_cache.clear()
+
+
+def _invalidate_cache_sync(*scopes: str) -> None:
+    """Invalidate cached resource reads from a synchronous context.
+
+    Clears the in-process listing totals and bumps the given cache scopes
+    so only entries depending on them are invalidated.
+
+    Args:
+        *scopes: The CacheScopes affected by the write. Defaults to
+            ``CacheScopes.RESOURCES``.
 
     Note:
         Cache invalidation failures are logged but do not raise exceptions
         to prevent cache issues from affecting core functionality.
     """
+    clear_resource_count_cache()
+    invalidate_scopes_sync(*(scopes or (CacheScopes.RESOURCES,)))
+
+
+def _publish_availability_change(
+    resource: models.Resource, previous_status: str, reason: str
+) -> None:
+    """Push a resource's availability delta to WebSocket topic subscribers.
+
+    Args:
+        resource: The resource after the change.
+        previous_status: The resource's status before the change.
+        reason: What caused the change, e.g. "reservation_cancelled".
+
+    Note:
+        Failures are logged; a missed push never fails the write.
+    """
+    change = {
+        "resource_id": resource.id,
+        "group_id": resource.group_id,
+        "status": resource.status,
+        "previous_status": previous_status,
+        "available": resource.available,
+        "reason": reason,
+    }
     try:
-        anyio.from_thread.run(invalidate_resource_cache)
-        logger.debug("Resource cache invalidated")
-    except Exception as e:
-        logger.debug(f"Cache invalidation skipped: {e}")
+        anyio.from_thread.run(ws_manager.publish_availability, [change])
+    except Exception as exc:  # pragma: no cover - best-effort notification
+        logger.warning(
+            "Failed to publish availability change for resource %s: %s",
+            resource.id,
+            exc,
+        )
 
 
 def ensure_timezone_aware(dt: datetime | None) -> datetime | None:
@@ -317,7 +369,9 @@ class ResourceService:
                 self.db.add(resource)
                 self.db.commit()
                 self.db.refresh(resource)
-                _invalidate_cache_sync()  # Invalidate resource cache
+                _invalidate_cache_sync(
+                    CacheScopes.RESOURCES, CacheScopes.TAGS, CacheScopes.GROUPS
+                )
                 return resource
             except IntegrityError as e:
                 self.db.rollback()
@@ -356,13 +410,8 @@ class ResourceService:
         """
         resources = self.db.query(models.Resource).all()
 
-        # Add current availability as a computed field (read-only)
-        for resource in resources:
-            resource.current_availability = self._is_resource_currently_available(
-                resource.id
-            )
-
-        return resources
+        # Add current availability as a computed field in one bulk lookup
+        return AvailabilityEngine(self.db).annotate(resources)
 
     def search_resources(
         self,
@@ -400,98 +449,19 @@ class ResourceService:
             ...     available_until=end,
             ...     tags=["large", "video"]
             ... )
-        """
-        # Ensure timezone awareness for datetime parameters
-        if available_from:
-            available_from = ensure_timezone_aware(available_from)
-        if available_until:
-            available_until = ensure_timezone_aware(available_until)
-
-        # If time period specified, filter out booked resources
-        if available_from and available_until:
-            available_resources = []
-
-            # Get all resources that are not permanently disabled
-            resources = (
-                self.db.query(models.Resource)
-                .filter(models.Resource.available)  # Only include enabled resources
-                .all()
-            )
 
-            for resource in resources:
-                if status_filter != "all":
-                    if status_filter == "available" and not resource.available:
-                        continue
-                    if status_filter == "unavailable" and resource.available:
-                        continue
-                    if status_filter == "in_use" and resource.status != "in_use":
-                        continue
-
-                if tags:
-                    tag_set = {tag.lower() for tag in tags}
-                    resource_tags = {tag.lower() for tag in (resource.tags or [])}
-                    if not tag_set.issubset(resource_tags):
-                        continue
-
-                if not self._has_conflict(resource.id, available_from, available_until):
-                    # Set current availability for time-based search
-                    resource.current_availability = True
-                    available_resources.append(resource)
-
-            # Apply text search if provided
-            if query:
-                query_lower = query.lower()
-                available_resources = [
-                    r for r in available_resources if query_lower in r.name.lower()
-                ]
-
-            return available_resources
-
-        # Regular search without time filtering
-        db_query = self.db.query(models.Resource)
-
-        # Get base resources
-        resources = db_query.all()
-
-        # Filter resources without changing their status
-        filtered_resources = []
-        for resource in resources:
-            # Apply status filter (use existing status, don't update it)
-            if status_filter != "all":
-                if status_filter == "available" and not resource.available:
-                    continue
-                if status_filter == "unavailable" and resource.available:
-                    continue
-                if status_filter == "in_use" and resource.status != "in_use":
-                    continue
-
-            if tags:
-                tag_set = {tag.lower() for tag in tags}
-                resource_tags = {tag.lower() for tag in (resource.tags or [])}
-                if not tag_set.issubset(resource_tags):
-                    continue
-
-            # Apply text search filter
-            if query:
-                query_lower = query.lower()
-                if not (
-                    query_lower in resource.name.lower()
-                    or any(query_lower in tag.lower() for tag in resource.tags)
-                ):
-                    continue
-
-            # Set current availability for response (read-only check)
-            resource.current_availability = self._is_resource_currently_available(
-                resource.id
-            )
-            # Set current user name if resource is in use
-            if resource.status == "in_use":
-                resource.current_user_name = self._get_current_user_for_resource(
-                    resource.id
-                )
-            filtered_resources.append(resource)
-
-        return filtered_resources
+        Note:
+            Delegates to AvailabilityEngine, which resolves the time window
+            with a single anti-join and annotates all results in one bulk
+            lookup, so the query count does not grow with the resource count.
+        """
+        return AvailabilityEngine(self.db).find_resources(
+            query=query,
+            status_filter=status_filter,
+            available_from=available_from,
+            available_until=available_until,
+            tags=tags,
+        )
 
     def get_resources_paginated(
         self,
@@ -506,7 +476,10 @@ class ResourceService:
         """Get paginated resources with optional filtering.
 
         Combines search functionality with cursor-based pagination for
-        efficient retrieval of large resource sets.
+        efficient retrieval of large resource sets. Sorting and keyset
+        pagination run in SQL, so each page fetches ``limit + 1`` rows
+        regardless of how deep the cursor is. The total is a separate
+        count query and is only issued when requested.
 
         Args:
             pagination: Pagination parameters including limit, cursor,
@@ -534,42 +507,66 @@ class ResourceService:
             ...     params, query="room", include_total=True
             ... )
         """
-        resources = self.search_resources(
-            query=query,
-            status_filter=status_filter,
-            available_from=available_from,
-            available_until=available_until,
-            tags=tags,
-        )
-
-        total_count = len(resources) if include_total else None
         sort_by = pagination.sort_by or "name"
         sort_order = (pagination.sort_order or "asc").lower()
 
-        sort_options = {
-            "id": lambda r: r.id,
-            "name": lambda r: r.name.lower(),
-            "status": lambda r: r.status,
-            "created_at": lambda r: r.id,
-        }
-
         if sort_order not in {"asc", "desc"}:
             raise ValueError("Invalid sort_order. Must be 'asc' or 'desc'.")
-        if sort_by not in sort_options:
+        if sort_by not in AvailabilityEngine.SORT_FIELDS:
             raise ValueError(
                 "Invalid sort_by. Must be one of: id, name, status, created_at."
             )
 
-        page_items, next_cursor, has_more = _paginate_items(
-            resources,
-            sort_key=sort_options[sort_by],
+        filters = {
+            "query": query,
+            "status_filter": status_filter,
+            "available_from": ensure_timezone_aware(available_from),
+            "available_until": ensure_timezone_aware(available_until),
+            "tags": tags,
+        }
+        engine = AvailabilityEngine(self.db)
+
+        page_items, next_cursor, has_more = engine.paginate(
+            sort_by=sort_by,
             sort_order=sort_order,
             limit=pagination.limit,
             cursor=pagination.cursor,
+            **filters,
         )
 
+        total_count = self._count_resources(engine, filters) if include_total else None
+
         return page_items, next_cursor, has_more, total_count
 
+    def _count_resources(self, engine: AvailabilityEngine, filters: dict) -> int:
+        """Count resources matching search filters, optionally cached.
+
+        The count is a separate query from the page itself. When
+        ``resource_count_cache_ttl`` is positive, results are kept in an
+        in-process TTL cache that is cleared on every resource or
+        reservation write.
+
+        Args:
+            engine: The availability engine bound to this session.
+            filters: The search filters passed to the engine.
+
+        Returns:
+            The number of matching resources.
+        """
+        if _resource_count_cache is None:
+            return engine.count_resources(**filters)
+
+        key = json.dumps(filters, default=str, sort_keys=True)
+        with _resource_count_lock:
+            cached_count = _resource_count_cache.get(key)
+        if cached_count is not None:
+            return cached_count
+
+        count = engine.count_resources(**filters)
+        with _resource_count_lock:
+            _resource_count_cache[key] = count
+        return count
+
     def _is_resource_currently_available(self, resource_id: int) -> bool:
         """Check if a resource is currently available for reservation.
 
@@ -592,9 +589,9 @@ class ResourceService:
         if not resource:
             return False
 
-        # Reuse status update logic so status and availability stay in sync
-        self._update_resource_status(resource)
-        return resource.available and resource.status == "available"
+        # Computed at read time; the status reconciler persists transitions
+        AvailabilityEngine(self.db).annotate([resource])
+        return resource.current_availability
 
     def _get_current_user_for_resource(self, resource_id: int) -> str | None:
         """Get the username of who is currently using a resource.
@@ -638,7 +635,8 @@ class ResourceService:
         Note:
             This method commits changes to the database if the status changes.
             It respects manual "unavailable" status and will not change it
-            based on reservations.
+            based on reservations. Only write paths call it; reads use
+            ``AvailabilityEngine.annotate`` and never commit.
         """
         now = utcnow()
         changed = False
@@ -698,22 +696,7 @@ class ResourceService:
             True if there are any active reservations that overlap with
             the specified time period. False otherwise.
         """
-        # Ensure timezone awareness
-        start_time = ensure_timezone_aware(start_time)
-        end_time = ensure_timezone_aware(end_time)
-
-        conflict = (
-            self.db.query(models.Reservation)
-            .filter(
-                models.Reservation.resource_id == resource_id,
-                models.Reservation.status == "active",
-                models.Reservation.end_time > start_time,
-                models.Reservation.start_time < end_time,
-            )
-            .first()
-        )
-
-        return conflict is not None
+        return has_conflict(self.db, resource_id, start_time, end_time)
 
     def update_resource_availability(
         self, resource_id: int, available: bool
@@ -746,6 +729,7 @@ class ResourceService:
         if not resource:
             raise ValueError("Resource not found")
 
+        previous_status = resource.status
         resource.available = available
         self.db.commit()
         self.db.refresh(resource)
@@ -761,6 +745,11 @@ class ResourceService:
                 "auto_reset_hours": resource.auto_reset_hours,
             },
         )
+        _publish_availability_change(
+            resource,
+            previous_status,
+            "resource_enabled" if available else "resource_disabled",
+        )
         return resource
 
     def update_resource(
@@ -825,7 +814,7 @@ class ResourceService:
 
         self.db.commit()
         self.db.refresh(resource)
-        _invalidate_cache_sync()  # Invalidate resource cache
+        _invalidate_cache_sync(CacheScopes.RESOURCES, CacheScopes.TAGS)
 
         anyio.from_thread.run(
             ws_manager.broadcast_all,
@@ -871,6 +860,7 @@ class ResourceService:
         if not resource:
             raise ValueError("Resource not found")
 
+        previous_status = resource.status
         resource.set_unavailable(auto_reset_hours)
         self.db.commit()
         self.db.refresh(resource)
@@ -886,6 +876,7 @@ class ResourceService:
                 "auto_reset_hours": resource.auto_reset_hours,
             },
         )
+        _publish_availability_change(resource, previous_status, "resource_unavailable")
         return resource
 
     def reset_resource_to_available(self, resource_id: int) -> models.Resource:
@@ -916,6 +907,7 @@ class ResourceService:
         if not resource:
             raise ValueError("Resource not found")
 
+        previous_status = resource.status
         resource.set_available()
         self.db.commit()
         self.db.refresh(resource)
@@ -930,6 +922,7 @@ class ResourceService:
                 "available": resource.available,
             },
         )
+        _publish_availability_change(resource, previous_status, "resource_available")
         return resource
 
     def get_resource_status(self, resource_id: int) -> dict:
@@ -967,9 +960,8 @@ class ResourceService:
         if not resource:
             raise ValueError("Resource not found")
 
-        # Only update status when explicitly requested for status details
-        # This is appropriate since the user is asking for current status info
-        self._update_resource_status(resource)
+        # Report the live status without persisting it on this read path
+        AvailabilityEngine(self.db).annotate([resource])
 
         now = utcnow()
         current_reservation = (
@@ -1164,7 +1156,7 @@ class ResourceService:
             updated_count += 1
 
         self.db.commit()
-        _invalidate_cache_sync()
+        _invalidate_cache_sync(CacheScopes.RESOURCES, CacheScopes.TAGS)
 
         # Broadcast update
         anyio.from_thread.run(
@@ -1214,7 +1206,7 @@ class ResourceService:
             updated_count += 1
 
         self.db.commit()
-        _invalidate_cache_sync()
+        _invalidate_cache_sync(CacheScopes.RESOURCES, CacheScopes.TAGS)
 
         # Broadcast update
         anyio.from_thread.run(
@@ -1667,10 +1659,19 @@ class ReservationService:
 
         occurrences = generate_occurrences(start_time, end_time, data.recurrence)
 
-        # Check conflicts for all occurrences first
+        # Check conflicts for all occurrences first against one snapshot
+        index = (
+            IntervalIndex.load(
+                self.db,
+                [data.resource_id],
+                min(occ_start for occ_start, _ in occurrences),
+                max(occ_end for _, occ_end in occurrences),
+            )
+            if occurrences
+            else IntervalIndex()
+        )
         for occ_start, occ_end in occurrences:
-            conflicts = self._get_conflicts(data.resource_id, occ_start, occ_end)
-            if conflicts:
+            if index.overlaps(data.resource_id, occ_start, occ_end):
                 raise ValueError(
                     f"Conflicts detected for recurring reservation starting at {occ_start.isoformat()}"
                 )
@@ -1714,6 +1715,7 @@ class ReservationService:
             reservations.append(reservation)
 
         self.db.commit()
+        _invalidate_cache_sync()  # Invalidate resource cache
 
         for res in reservations:
             self.db.refresh(res)
@@ -1821,7 +1823,12 @@ class ReservationService:
 
         # Update resource status after cancellation
         if resource:
+            previous_status = resource.status
             ResourceService(self.db)._update_resource_status(resource)
+            if resource.status != previous_status:
+                _publish_availability_change(
+                    resource, previous_status, "reservation_cancelled"
+                )
 
         # Check if anyone is waiting for this slot and offer it to them
         # Import here to avoid circular imports
@@ -1973,20 +1980,7 @@ class ReservationService:
             A list of Reservation model instances that conflict with
             the specified time period.
         """
-        # Ensure timezone awareness
-        start_time = ensure_timezone_aware(start_time)
-        end_time = ensure_timezone_aware(end_time)
-
-        return (
-            self.db.query(models.Reservation)
-            .filter(
-                models.Reservation.resource_id == resource_id,
-                models.Reservation.status == "active",
-                models.Reservation.end_time > start_time,
-                models.Reservation.start_time < end_time,
-            )
-            .all()
-        )
+        return find_conflicts(self.db, resource_id, start_time, end_time)
 
     def _log_action(
         self, reservation_id: int, action: str, user_id: int, details: str
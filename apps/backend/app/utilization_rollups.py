@@ -0,0 +1,315 @@
+"""Hourly utilization rollups for analytics.
+
+Provides functionality for:
+- Splitting reservations into UTC hour buckets keyed by
+  (resource_id, day, hour)
+- Keeping ``utilization_rollups`` in step with reservation writes: an
+  ``after_flush`` listener, registered by ``app.database``, adds or
+  subtracts the buckets of every flushed reservation in the same
+  transaction, whichever code path wrote it
+- Rebuilding the rollups from raw reservations (backfill)
+- Splitting an analysis window into whole hours, served from the rollups,
+  and partial edge hours, served from raw reservations
+
+Only active and expired reservations count as booked time. Creation,
+cancellation, approval and rejection move buckets in or out of the
+rollups; expiry (active -> expired) leaves them unchanged, so set-based
+expiry updates that bypass the ORM need no rollup maintenance.
+
+Example:
+    >>> rebuild_rollups(db)  # once, after the migration
+    >>> core = whole_hours(start, end)
+    >>> if core:
+    ...     rows = db.query(models.UtilizationRollup).filter(
+    ...         bucket_filter(*core)
+    ...     )
+
+Author: Sylvester-Francis
+"""
+
+import logging
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, delete, event, insert, inspect, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+# Reservation statuses that count as booked time
+BOOKED_STATUSES = ("active", "expired")
+
+# Reservation attributes that decide its buckets
+_TRACKED_ATTRIBUTES = ("status", "resource_id", "start_time", "end_time")
+
+# Rows per INSERT when writing rollups
+_WRITE_CHUNK_SIZE = 1000
+
+_ONE_HOUR = timedelta(hours=1)
+
+# Bucket key -> [booked minutes, reservation count]
+Deltas = dict[tuple[int, object, int], list[float]]
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Return ``dt`` in UTC, treating naive datetimes as UTC."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC)
+
+
+def floor_hour(dt: datetime) -> datetime:
+    """Round a datetime down to the start of its UTC hour."""
+    return _as_utc(dt).replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(dt: datetime) -> datetime:
+    """Round a datetime up to the next UTC hour boundary."""
+    floored = floor_hour(dt)
+    return floored if floored == _as_utc(dt) else floored + _ONE_HOUR
+
+
+def hour_buckets(start: datetime, end: datetime) -> Iterator[tuple[datetime, float]]:
+    """Split [start, end) into UTC hours.
+
+    Args:
+        start: Interval start.
+        end: Interval end.
+
+    Yields:
+        tuple: (hour start, minutes of the interval inside that hour).
+    """
+    start, end = _as_utc(start), _as_utc(end)
+    bucket = floor_hour(start)
+    while bucket < end:
+        upper = bucket + _ONE_HOUR
+        minutes = (min(end, upper) - max(start, bucket)).total_seconds() / 60
+        yield bucket, minutes
+        bucket = upper
+
+
+def add_reservation(
+    deltas: Deltas,
+    resource_id: int,
+    start: datetime,
+    end: datetime,
+    sign: int = 1,
+) -> None:
+    """Add (or with ``sign=-1`` subtract) a reservation's buckets.
+
+    Args:
+        deltas: Accumulator keyed by (resource_id, day, hour).
+        resource_id: The reserved resource.
+        start: Reservation start.
+        end: Reservation end.
+        sign: 1 to add, -1 to subtract.
+    """
+    for index, (bucket, minutes) in enumerate(hour_buckets(start, end)):
+        entry = deltas.setdefault((resource_id, bucket.date(), bucket.hour), [0.0, 0])
+        entry[0] += sign * minutes
+        if index == 0:
+            entry[1] += sign
+
+
+def whole_hours(start: datetime, end: datetime) -> tuple[datetime, datetime] | None:
+    """Return the whole-hour part of [start, end), if there is one.
+
+    Args:
+        start: Window start.
+        end: Window end.
+
+    Returns:
+        (first hour, end hour) aligned to UTC hours, or None if the window
+        contains no complete hour.
+    """
+    lower, upper = ceil_hour(start), floor_hour(end)
+    return (lower, upper) if lower < upper else None
+
+
+def bucket_filter(start: datetime, end: datetime):
+    """SQL criteria selecting rollup buckets in an hour-aligned window.
+
+    Args:
+        start: First hour of the window (hour-aligned).
+        end: End of the window, exclusive (hour-aligned).
+
+    Returns:
+        A criteria expression on ``UtilizationRollup`` using the
+        (day, hour) index.
+    """
+    rollup = models.UtilizationRollup
+    start, end = _as_utc(start), _as_utc(end)
+    first_day, last_day = start.date(), end.date()
+    if first_day == last_day:
+        return and_(
+            rollup.day == first_day,
+            rollup.hour >= start.hour,
+            rollup.hour < end.hour,
+        )
+    return or_(
+        and_(rollup.day == first_day, rollup.hour >= start.hour),
+        and_(rollup.day > first_day, rollup.day < last_day),
+        and_(rollup.day == last_day, rollup.hour < end.hour),
+    )
+
+
+def apply_deltas(connection: Connection, deltas: Deltas) -> None:
+    """Add bucket deltas to the rollup table with upserts.
+
+    Args:
+        connection: Connection of the transaction to write in.
+        deltas: Changes keyed by (resource_id, day, hour).
+    """
+    rows = [
+        {
+            "resource_id": resource_id,
+            "day": day,
+            "hour": hour,
+            "booked_minutes": minutes,
+            "reservation_count": count,
+        }
+        for (resource_id, day, hour), (minutes, count) in deltas.items()
+        if minutes or count
+    ]
+    if not rows:
+        return
+
+    table = models.UtilizationRollup.__table__
+    dialect_insert = (
+        postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    )
+    for offset in range(0, len(rows), _WRITE_CHUNK_SIZE):
+        stmt = dialect_insert(table).values(rows[offset : offset + _WRITE_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.resource_id, table.c.day, table.c.hour],
+            set_={
+                "booked_minutes": table.c.booked_minutes + stmt.excluded.booked_minutes,
+                "reservation_count": table.c.reservation_count
+                + stmt.excluded.reservation_count,
+            },
+        )
+        connection.execute(stmt)
+
+
+def _previous_value(obj: models.Reservation, key: str):
+    """Return an attribute's value as of the last flush."""
+    history = inspect(obj).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, key)
+
+
+def _flush_deltas(session: Session) -> Deltas:
+    """Collect bucket changes from reservations in the current flush."""
+    deltas: Deltas = {}
+
+    for obj in session.new:
+        if isinstance(obj, models.Reservation):
+            if (obj.status or "active") in BOOKED_STATUSES:
+                add_reservation(deltas, obj.resource_id, obj.start_time, obj.end_time)
+
+    for obj in session.deleted:
+        if isinstance(obj, models.Reservation):
+            old = [_previous_value(obj, key) for key in _TRACKED_ATTRIBUTES]
+            if old[0] in BOOKED_STATUSES:
+                add_reservation(deltas, *old[1:], sign=-1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, models.Reservation):
+            continue
+        old = [_previous_value(obj, key) for key in _TRACKED_ATTRIBUTES]
+        new = [getattr(obj, key) for key in _TRACKED_ATTRIBUTES]
+        if old == new:
+            continue
+        if old[0] in BOOKED_STATUSES:
+            add_reservation(deltas, *old[1:], sign=-1)
+        if new[0] in BOOKED_STATUSES:
+            add_reservation(deltas, *new[1:])
+
+    return deltas
+
+
+def _maintain_rollups(session: Session, flush_context) -> None:
+    """Write the rollup changes of a flush in the same transaction."""
+    deltas = _flush_deltas(session)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    """Attribute listener that only exists to request ``active_history``."""
+    return value
+
+
+def register_rollup_upkeep() -> None:
+    """Keep rollups in step with every session's reservation writes.
+
+    Called once by ``app.database`` next to the session setup; calling it
+    again is a no-op.
+    """
+    if event.contains(Session, "after_flush", _maintain_rollups):
+        return
+    event.listen(Session, "after_flush", _maintain_rollups)
+    # Load the old value on assignment even if the attribute was expired, so
+    # the flush listener can subtract what a reservation used to contribute
+    for key in _TRACKED_ATTRIBUTES:
+        event.listen(
+            getattr(models.Reservation, key),
+            "set",
+            _load_previous_value,
+            retval=True,
+            active_history=True,
+        )
+
+
+def rebuild_rollups(db: Session, batch_size: int = 5000) -> int:
+    """Recompute all rollups from raw reservations (backfill).
+
+    Replaces the table contents in one transaction, streaming reservations
+    in batches.
+
+    Args:
+        db: Database session.
+        batch_size: Reservations fetched per round trip.
+
+    Returns:
+        int: Number of rollup buckets written.
+    """
+    deltas: Deltas = {}
+    rows = (
+        db.query(
+            models.Reservation.resource_id,
+            models.Reservation.start_time,
+            models.Reservation.end_time,
+        )
+        .filter(models.Reservation.status.in_(BOOKED_STATUSES))
+        .yield_per(batch_size)
+    )
+    for resource_id, start, end in rows:
+        add_reservation(deltas, resource_id, start, end)
+
+    db.execute(delete(models.UtilizationRollup))
+    values = [
+        {
+            "resource_id": resource_id,
+            "day": day,
+            "hour": hour,
+            "booked_minutes": minutes,
+            "reservation_count": count,
+        }
+        for (resource_id, day, hour), (minutes, count) in deltas.items()
+    ]
+    for offset in range(0, len(values), _WRITE_CHUNK_SIZE):
+        db.execute(
+            insert(models.UtilizationRollup),
+            values[offset : offset + _WRITE_CHUNK_SIZE],
+        )
+    db.commit()
+    logger.info(f"Rebuilt {len(values)} utilization rollup buckets")
+    return len(values)
@@ -0,0 +1,1024 @@
+"""Pooled webhook delivery engine.
+
+This module sends webhook deliveries through one long-lived ``httpx``
+client so connections to subscriber endpoints are kept alive and reused
+instead of paying a TCP/TLS handshake per delivery.
+
+Features:
+    - Shared keep-alive connection pool sized to the global concurrency cap
+    - Global and per-endpoint (scheme + host) concurrency limits
+    - Deliveries never touch the caller's database session; each job
+      carries the data it needs and outcomes are written with short-lived
+      sessions owned by the engine
+    - Outcomes are buffered and written in batches, one query and one
+      commit per batch
+    - Bounded backlog; deliveries over the limit stay "pending" in the
+      database for the retry worker
+    - Opt-in per-webhook batching: events are collected for up to N items
+      or T milliseconds and sent as one signed JSON array
+    - Durable retry worker that claims due deliveries in batches
+      (``FOR UPDATE SKIP LOCKED`` on PostgreSQL, an atomic claim UPDATE on
+      SQLite) and sleeps until the earliest ``next_retry_at``
+
+Example Usage:
+    Started and stopped from the application lifespan::
+
+        engine = get_delivery_engine()
+        engine.start()
+        get_retry_worker().start()
+        engine.submit(DeliveryJob.from_models(webhook, delivery))
+        await close_delivery_engine()
+
+    In tests, any ``httpx`` transport can be injected::
+
+        engine = WebhookDeliveryEngine(
+            session_factory=SessionLocal,
+            transport=httpx.MockTransport(handler),
+        )
+
+Author: Sylvester-Francis
+"""
+
+import asyncio
+import json
+import logging
+import secrets
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import get_settings
+from app.core.metrics import metrics
+from app.database import SessionLocal
+from app.webhook_service import MAX_RETRIES, RETRY_DELAYS, sign_payload
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "ResourceReserver-Webhook/1.0"
+
+# Deliveries queued or in flight before submit() starts refusing work
+DEFAULT_MAX_PENDING = 10_000
+
+# Upper bound on ids per UPDATE batch query
+_WRITE_CHUNK_SIZE = 500
+
+# Claims older than this are considered abandoned (e.g. a crashed worker)
+CLAIM_LEASE_SECONDS = 300
+
+# Shortest sleep of the retry worker after a pass that claimed nothing
+MIN_POLL_SECONDS = 1.0
+
+# Event type of deliveries whose payload is an array of events
+BATCH_EVENT_TYPE = "batch"
+
+# Batch window used when a webhook sets batch_max_items only
+DEFAULT_BATCH_WINDOW_MS = 1000
+
+# Statuses the retry worker picks up; "failed" rows past MAX_RETRIES are
+# excluded by the retry_count filter
+_RETRYABLE_STATUSES = ("pending", "failed")
+
+
+@dataclass(frozen=True)
+class DeliveryJob:
+    """A delivery snapshot that can be sent without a database session.
+
+    Attributes:
+        delivery_id: ID of the WebhookDelivery row.
+        url: Endpoint URL.
+        secret: HMAC secret used to sign the payload.
+        event_type: Event type sent in the X-Webhook-Event header.
+        payload: JSON-serializable body.
+    """
+
+    delivery_id: int
+    url: str
+    secret: str
+    event_type: str
+    payload: Any
+
+    @classmethod
+    def from_models(
+        cls, webhook: models.Webhook, delivery: models.WebhookDelivery
+    ) -> "DeliveryJob":
+        """Build a job from loaded webhook and delivery rows."""
+        return cls(
+            delivery_id=delivery.id,
+            url=webhook.url,
+            secret=webhook.secret,
+            event_type=delivery.event_type,
+            payload=delivery.payload,
+        )
+
+    @property
+    def endpoint(self) -> str:
+        """The scheme and host the per-endpoint cap is keyed on."""
+        parts = urlsplit(self.url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+@dataclass(frozen=True)
+class BatchTarget:
+    """A webhook that receives its events as signed arrays.
+
+    Attributes:
+        webhook_id: ID of the webhook.
+        url: Endpoint URL.
+        secret: HMAC secret used to sign the payload.
+        max_items: Events per delivery at most.
+        window_ms: Longest time an event waits for its batch to fill.
+    """
+
+    webhook_id: int
+    url: str
+    secret: str
+    max_items: int
+    window_ms: int
+
+    @classmethod
+    def from_webhook(cls, webhook: models.Webhook) -> "BatchTarget":
+        """Build a target from a webhook with batching enabled."""
+        return cls(
+            webhook_id=webhook.id,
+            url=webhook.url,
+            secret=webhook.secret,
+            max_items=webhook.batch_max_items,
+            window_ms=webhook.batch_window_ms or DEFAULT_BATCH_WINDOW_MS,
+        )
+
+
+@dataclass(frozen=True)
+class DeliveryResult:
+    """Outcome of one delivery attempt.
+
+    Attributes:
+        delivery_id: ID of the WebhookDelivery row.
+        success: True for a 2xx response.
+        status_code: HTTP status code, if a response was received.
+        response_body: Response text, if a response was received.
+        error_message: Failure reason for unsuccessful attempts.
+    """
+
+    delivery_id: int
+    success: bool
+    status_code: int | None = None
+    response_body: str | None = None
+    error_message: str | None = None
+
+
+def apply_delivery_result(
+    delivery: models.WebhookDelivery,
+    result: DeliveryResult,
+    now: datetime | None = None,
+) -> None:
+    """Record an attempt outcome on a delivery row without committing.
+
+    Failed attempts increment ``retry_count`` and schedule ``next_retry_at``
+    using RETRY_DELAYS. The delivery is marked "failed" once MAX_RETRIES is
+    reached and stays "pending" otherwise.
+
+    Args:
+        delivery: The delivery row to update.
+        result: The attempt outcome.
+        now: Timestamp to record. Defaults to the current time.
+    """
+    now = now or datetime.now(UTC)
+    delivery.claimed_at = None
+    delivery.claim_token = None
+    delivery.status_code = result.status_code
+    delivery.response_body = (
+        result.response_body[:1000] if result.response_body else None
+    )
+    delivery.error_message = result.error_message
+
+    if result.success:
+        delivery.status = "delivered"
+        delivery.delivered_at = now
+        return
+
+    delivery.retry_count = (delivery.retry_count or 0) + 1
+    next_delay = RETRY_DELAYS[min(delivery.retry_count - 1, len(RETRY_DELAYS) - 1)]
+    delivery.next_retry_at = now + timedelta(seconds=next_delay)
+    delivery.status = "failed" if delivery.retry_count >= MAX_RETRIES else "pending"
+    delivery.delivered_at = None
+
+
+@dataclass
+class _EndpointSlot:
+    """Per-endpoint semaphore and the number of jobs using it."""
+
+    semaphore: asyncio.Semaphore
+    users: int = 0
+
+
+@dataclass
+class _BatchBuffer:
+    """Events collected for one batching webhook."""
+
+    target: BatchTarget
+    events: list[dict[str, Any]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class WebhookDeliveryEngine:
+    """Long-lived, concurrency-limited webhook sender.
+
+    The engine is bound to the event loop it was started on. If it is used
+    from a different loop (e.g. a test client that runs each request in a
+    fresh loop) it transparently starts over on the new loop.
+
+    Attributes:
+        max_concurrency: Maximum deliveries in flight overall.
+        max_per_endpoint: Maximum deliveries in flight per endpoint.
+        timeout: HTTP timeout in seconds.
+        flush_interval: Seconds between batched outcome writes.
+        batch_size: Buffered outcomes that trigger an early write.
+        max_pending: Maximum deliveries queued or in flight.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_concurrency: int | None = None,
+        max_per_endpoint: int | None = None,
+        timeout: float | None = None,
+        flush_interval: float | None = None,
+        batch_size: int | None = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Initialize the engine. Unset limits come from settings.
+
+        Args:
+            session_factory: Callable returning a new database session.
+            max_concurrency: Global in-flight cap.
+            max_per_endpoint: Per-endpoint in-flight cap.
+            timeout: HTTP timeout in seconds.
+            flush_interval: Seconds between batched outcome writes.
+            batch_size: Buffered outcomes that trigger an early write.
+            max_pending: Maximum deliveries queued or in flight.
+            transport: Optional httpx transport, e.g. ``httpx.MockTransport``.
+        """
+        settings = get_settings()
+        self.max_concurrency = max_concurrency or settings.webhook_max_concurrency
+        self.max_per_endpoint = max_per_endpoint or settings.webhook_max_per_endpoint
+        self.timeout = timeout or settings.webhook_timeout_seconds
+        self.flush_interval = flush_interval or settings.webhook_status_flush_interval
+        self.batch_size = batch_size or settings.webhook_status_batch_size
+        self.max_pending = max_pending
+        self._session_factory = session_factory
+        self._transport = transport
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._endpoints: dict[str, _EndpointSlot] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._results: list[DeliveryResult] = []
+        self._batches: dict[int, _BatchBuffer] = {}
+        self._flush_wakeup: asyncio.Event | None = None
+        self._flusher: asyncio.Task | None = None
+        self.on_retry_scheduled: Callable[[], None] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the engine is started on the current event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return self._client is not None and self._loop is loop
+
+    @property
+    def pending(self) -> int:
+        """Number of deliveries queued or in flight."""
+        return len(self._tasks)
+
+    def start(self) -> None:
+        """Create the connection pool and the flush task on the running loop.
+
+        When the engine moves to a new loop, buffered outcomes are kept for
+        the next flush, buffered batch events are sent from the new loop and
+        the previous connection pool is closed.
+        """
+        if self.running:
+            return
+        old_client, old_loop = self._client, self._loop
+        pending_batches = list(self._batches.values())
+        if old_client is not None:
+            logger.debug("Webhook delivery engine moved to a new event loop")
+
+        self._loop = asyncio.get_running_loop()
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+            headers={"User-Agent": USER_AGENT},
+            transport=self._transport,
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._endpoints = {}
+        self._tasks = set()
+        self._flush_wakeup = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+        self._batches = {}
+        for buffer in pending_batches:
+            if buffer.timer is not None:
+                buffer.timer.cancel()
+            if buffer.events:
+                self._spawn(self._send_batch(buffer.target, buffer.events))
+        if old_client is not None:
+            if old_loop is not None and old_loop.is_running():
+                asyncio.run_coroutine_threadsafe(old_client.aclose(), old_loop)
+            else:
+                self._spawn(self._close_client(old_client))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Wait for in-flight deliveries, write outcomes and close the pool.
+
+        Deliveries still running after ``timeout`` are cancelled and remain
+        "pending" in the database.
+
+        Args:
+            timeout: Seconds to wait for in-flight deliveries.
+        """
+        if not self.running:
+            return
+
+        for webhook_id in list(self._batches):
+            self._flush_batch(webhook_id)
+
+        if self._tasks:
+            _, still_running = await asyncio.wait(set(self._tasks), timeout=timeout)
+            for task in still_running:
+                task.cancel()
+            if still_running:
+                logger.warning(
+                    f"Cancelled {len(still_running)} webhook deliveries on shutdown"
+                )
+
+        self._flusher.cancel()
+        try:
+            await self._flusher
+        except asyncio.CancelledError:
+            pass
+
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to write webhook delivery outcomes: {e}")
+
+        await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+    def submit(self, job: DeliveryJob) -> bool:
+        """Queue a delivery without waiting for it.
+
+        Args:
+            job: The delivery to send.
+
+        Returns:
+            bool: False if the backlog is full; the delivery then stays
+            "pending" in the database.
+        """
+        self.start()
+        if len(self._tasks) >= self.max_pending:
+            logger.warning(
+                f"Webhook delivery backlog full, leaving delivery "
+                f"{job.delivery_id} pending"
+            )
+            return False
+
+        self._spawn(self._deliver(job))
+        return True
+
+    def enqueue(self, target: BatchTarget, events: list[dict[str, Any]]) -> None:
+        """Add events to a webhook's batch.
+
+        Full batches are sent right away; a partial batch is sent when its
+        window elapses. Buffered events only exist in memory until their
+        batch is written as a delivery row.
+
+        Args:
+            target: The batching webhook.
+            events: Event envelopes to deliver.
+        """
+        self.start()
+        buffer = self._batches.get(target.webhook_id)
+        if buffer is None:
+            buffer = self._batches[target.webhook_id] = _BatchBuffer(target)
+        buffer.target = target
+        buffer.events.extend(events)
+
+        while len(buffer.events) >= target.max_items:
+            chunk = buffer.events[: target.max_items]
+            del buffer.events[: target.max_items]
+            self._spawn(self._send_batch(target, chunk))
+
+        if not buffer.events:
+            self._flush_batch(target.webhook_id)
+        elif buffer.timer is None:
+            buffer.timer = self._loop.call_later(
+                target.window_ms / 1000, self._flush_batch, target.webhook_id
+            )
+
+    def accept(
+        self,
+        jobs: list[DeliveryJob],
+        batches: list[tuple[BatchTarget, list[dict[str, Any]]]],
+    ) -> list[int]:
+        """Submit direct deliveries and enqueue batched events.
+
+        Args:
+            jobs: Deliveries already written as claimed rows.
+            batches: (target, events) pairs for batching webhooks.
+
+        Returns:
+            list[int]: IDs of jobs refused because the backlog is full.
+        """
+        refused = [job.delivery_id for job in jobs if not self.submit(job)]
+        for target, events in batches:
+            self.enqueue(target, events)
+        return refused
+
+    def accept_threadsafe(
+        self,
+        jobs: list[DeliveryJob],
+        batches: list[tuple[BatchTarget, list[dict[str, Any]]]],
+    ) -> bool:
+        """Hand work to the engine from a thread outside its event loop.
+
+        Used by synchronous code such as bulk operations running in the
+        threadpool. Claims of refused jobs are released by the engine.
+
+        Args:
+            jobs: Deliveries already written as claimed rows.
+            batches: (target, events) pairs for batching webhooks.
+
+        Returns:
+            bool: False if the engine is not running on any loop.
+        """
+        loop = self._loop
+        if self._client is None or loop is None or loop.is_closed():
+            return False
+
+        def accept() -> None:
+            refused = self.accept(jobs, batches)
+            if refused:
+                self._spawn(asyncio.to_thread(self._release_claims, refused))
+
+        loop.call_soon_threadsafe(accept)
+        return True
+
+    async def drain(self) -> None:
+        """Wait until every submitted delivery has been attempted."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def send(self, job: DeliveryJob) -> DeliveryResult:
+        """Send one delivery under the concurrency caps and return its outcome.
+
+        The outcome is not written to the database; see ``submit`` for
+        fire-and-forget delivery with batched writes.
+
+        Args:
+            job: The delivery to send.
+
+        Returns:
+            DeliveryResult: The attempt outcome.
+        """
+        self.start()
+        async with self._endpoint_slot(job.endpoint), self._semaphore:
+            return await self._post(job)
+
+    async def flush(self) -> int:
+        """Write buffered outcomes now.
+
+        Returns:
+            int: Number of outcomes written.
+        """
+        if not self._results:
+            return 0
+        batch, self._results = self._results, []
+        try:
+            await asyncio.to_thread(self._write_results, batch)
+        except BaseException:
+            # Keep the outcomes for the next flush so delivered rows are not
+            # left claimed and sent again once their lease expires
+            self._results[:0] = batch
+            raise
+        if self.on_retry_scheduled and any(not result.success for result in batch):
+            self.on_retry_scheduled()
+        return len(batch)
+
+    @staticmethod
+    async def _close_client(client: httpx.AsyncClient) -> None:
+        """Close a connection pool left behind by a previous event loop."""
+        try:
+            await client.aclose()
+        except Exception as e:  # noqa: BLE001 - its loop may be gone
+            logger.debug(f"Failed to close previous webhook client: {e}")
+
+    def _spawn(self, coro) -> None:
+        """Run a coroutine as a tracked task."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _flush_batch(self, webhook_id: int) -> None:
+        """Send whatever is buffered for a webhook (batch window elapsed)."""
+        buffer = self._batches.pop(webhook_id, None)
+        if buffer is None:
+            return
+        if buffer.timer is not None:
+            buffer.timer.cancel()
+        if buffer.events:
+            self._spawn(self._send_batch(buffer.target, buffer.events))
+
+    async def _send_batch(
+        self, target: BatchTarget, events: list[dict[str, Any]]
+    ) -> None:
+        """Write one delivery row for a batch and send it."""
+        try:
+            delivery_id = await asyncio.to_thread(
+                self._create_batch_delivery, target.webhook_id, events
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to record a batch of {len(events)} events for "
+                f"webhook {target.webhook_id}: {e}"
+            )
+            return
+        await self._deliver(
+            DeliveryJob(
+                delivery_id=delivery_id,
+                url=target.url,
+                secret=target.secret,
+                event_type=BATCH_EVENT_TYPE,
+                payload=events,
+            )
+        )
+
+    def _create_batch_delivery(
+        self, webhook_id: int, events: list[dict[str, Any]]
+    ) -> int:
+        """Insert a claimed batch delivery row and return its ID."""
+        db = self._session_factory()
+        try:
+            delivery = models.WebhookDelivery(
+                webhook_id=webhook_id,
+                event_type=BATCH_EVENT_TYPE,
+                payload=events,
+                status="pending",
+                claimed_at=datetime.now(UTC),
+            )
+            db.add(delivery)
+            db.commit()
+            return delivery.id
+        finally:
+            db.close()
+
+    def _release_claims(self, delivery_ids: list[int]) -> None:
+        """Release claims with a short-lived session."""
+        db = self._session_factory()
+        try:
+            release_claims(db, delivery_ids)
+        finally:
+            db.close()
+
+    @asynccontextmanager
+    async def _endpoint_slot(self, endpoint: str) -> AsyncIterator[None]:
+        """Hold one of the per-endpoint slots for ``endpoint``."""
+        slot = self._endpoints.get(endpoint)
+        if slot is None:
+            slot = self._endpoints[endpoint] = _EndpointSlot(
+                asyncio.Semaphore(self.max_per_endpoint)
+            )
+        slot.users += 1
+        try:
+            async with slot.semaphore:
+                yield
+        finally:
+            slot.users -= 1
+            if slot.users == 0:
+                self._endpoints.pop(endpoint, None)
+
+    async def _post(self, job: DeliveryJob) -> DeliveryResult:
+        """Sign and POST a payload through the shared client."""
+        payload_str = json.dumps(job.payload, default=str)
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Signature": sign_payload(payload_str, job.secret),
+            "X-Webhook-Event": job.event_type,
+            "X-Webhook-Delivery": str(job.delivery_id),
+        }
+        if isinstance(job.payload, list):
+            headers["X-Webhook-Batch-Size"] = str(len(job.payload))
+
+        try:
+            response = await self._client.post(
+                job.url, content=payload_str, headers=headers
+            )
+        except Exception as e:
+            logger.error(f"Webhook delivery {job.delivery_id} error: {e}")
+            return DeliveryResult(
+                job.delivery_id, success=False, error_message=str(e)[:500]
+            )
+
+        if 200 <= response.status_code < 300:
+            logger.info(
+                f"Webhook delivery {job.delivery_id} succeeded: {response.status_code}"
+            )
+            return DeliveryResult(
+                job.delivery_id,
+                success=True,
+                status_code=response.status_code,
+                response_body=response.text,
+            )
+
+        logger.warning(
+            f"Webhook delivery {job.delivery_id} failed: {response.status_code}"
+        )
+        return DeliveryResult(
+            job.delivery_id,
+            success=False,
+            status_code=response.status_code,
+            response_body=response.text,
+            error_message=f"HTTP {response.status_code}",
+        )
+
+    async def _deliver(self, job: DeliveryJob) -> None:
+        """Send a submitted job and buffer its outcome."""
+        result = await self.send(job)
+        self._results.append(result)
+        if len(self._results) >= self.batch_size:
+            self._flush_wakeup.set()
+
+    async def _flush_loop(self) -> None:
+        """Write buffered outcomes every interval or when a batch fills."""
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_wakeup.wait(), timeout=self.flush_interval
+                )
+            except TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to write webhook delivery outcomes: {e}")
+
+    def _write_results(self, batch: list[DeliveryResult]) -> None:
+        """Apply outcomes with one short-lived session, a query per chunk."""
+        db = self._session_factory()
+        try:
+            now = datetime.now(UTC)
+            for offset in range(0, len(batch), _WRITE_CHUNK_SIZE):
+                chunk = batch[offset : offset + _WRITE_CHUNK_SIZE]
+                deliveries = {
+                    delivery.id: delivery
+                    for delivery in db.query(models.WebhookDelivery).filter(
+                        models.WebhookDelivery.id.in_(
+                            [result.delivery_id for result in chunk]
+                        )
+                    )
+                }
+                for result in chunk:
+                    delivery = deliveries.get(result.delivery_id)
+                    if delivery is not None:
+                        apply_delivery_result(delivery, result, now)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+def _aware(value: datetime | None) -> datetime | None:
+    """Treat naive datetimes read back from SQLite as UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
+def _retry_criteria(now: datetime, lease_seconds: float) -> list:
+    """Criteria for unclaimed deliveries that still have retries left."""
+    Delivery = models.WebhookDelivery
+    return [
+        Delivery.status.in_(_RETRYABLE_STATUSES),
+        Delivery.retry_count < MAX_RETRIES,
+        Delivery.claimed_at.is_(None)
+        | (Delivery.claimed_at < now - timedelta(seconds=lease_seconds)),
+    ]
+
+
+def claim_due_deliveries(
+    db: Session,
+    limit: int,
+    now: datetime | None = None,
+    lease_seconds: float = CLAIM_LEASE_SECONDS,
+) -> list[DeliveryJob]:
+    """Atomically claim due deliveries of active webhooks and commit.
+
+    On PostgreSQL candidate rows are locked with ``FOR UPDATE SKIP LOCKED``
+    so concurrent workers claim disjoint batches without blocking. On other
+    databases a single ``UPDATE ... WHERE id IN (SELECT ... LIMIT n)`` sets
+    the claim, which SQLite executes atomically. Either way the claim
+    columns then keep the rows out of other workers' scans until the
+    outcome is written or the lease expires.
+
+    Args:
+        db: The database session.
+        limit: Maximum number of deliveries to claim.
+        now: Current time. Defaults to now.
+        lease_seconds: Age after which an unfinished claim can be taken over.
+
+    Returns:
+        list[DeliveryJob]: The claimed deliveries, earliest due first.
+    """
+    Delivery = models.WebhookDelivery
+    now = now or datetime.now(UTC)
+    token = secrets.token_hex(16)
+
+    candidates = (
+        select(Delivery.id)
+        .join(models.Webhook, models.Webhook.id == Delivery.webhook_id)
+        .where(
+            *_retry_criteria(now, lease_seconds),
+            Delivery.next_retry_at.is_(None) | (Delivery.next_retry_at <= now),
+            models.Webhook.is_active == True,  # noqa: E712
+        )
+        .order_by(Delivery.next_retry_at, Delivery.id)
+        .limit(limit)
+    )
+
+    if db.get_bind().dialect.name == "postgresql":
+        ids = db.execute(candidates.with_for_update(skip_locked=True)).scalars().all()
+        claim = update(Delivery).where(Delivery.id.in_(ids))
+    else:
+        ids = None
+        claim = update(Delivery).where(
+            Delivery.id.in_(candidates.scalar_subquery()),
+            *_retry_criteria(now, lease_seconds),
+        )
+
+    if ids == []:
+        db.rollback()
+        return []
+
+    db.execute(
+        claim.values(claimed_at=now, claim_token=token).execution_options(
+            synchronize_session=False
+        )
+    )
+    rows = (
+        db.query(
+            Delivery.id,
+            models.Webhook.url,
+            models.Webhook.secret,
+            Delivery.event_type,
+            Delivery.payload,
+        )
+        .join(models.Webhook, models.Webhook.id == Delivery.webhook_id)
+        .filter(Delivery.claim_token == token)
+        .order_by(Delivery.next_retry_at, Delivery.id)
+        .all()
+    )
+    db.commit()
+    return [DeliveryJob(*row) for row in rows]
+
+
+def release_claims(db: Session, delivery_ids: list[int]) -> None:
+    """Clear the claim on deliveries that were not sent, and commit.
+
+    Args:
+        db: The database session.
+        delivery_ids: Deliveries to hand back to the retry worker.
+    """
+    if not delivery_ids:
+        return
+    db.execute(
+        update(models.WebhookDelivery)
+        .where(models.WebhookDelivery.id.in_(delivery_ids))
+        .values(claimed_at=None, claim_token=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def retry_queue_state(
+    db: Session,
+    now: datetime | None = None,
+    lease_seconds: float = CLAIM_LEASE_SECONDS,
+) -> tuple[int, datetime | None]:
+    """Return the number of deliveries awaiting retry and the earliest due time.
+
+    Only deliveries of active webhooks count, matching what
+    :func:`claim_due_deliveries` can claim.
+
+    Args:
+        db: The database session.
+        now: Current time. Defaults to now.
+        lease_seconds: Claim lease used to recognize abandoned claims.
+
+    Returns:
+        tuple: (queue depth, earliest ``next_retry_at`` or None).
+    """
+    now = now or datetime.now(UTC)
+    Delivery = models.WebhookDelivery
+    depth, earliest = (
+        db.query(func.count(Delivery.id), func.min(Delivery.next_retry_at))
+        .join(models.Webhook, models.Webhook.id == Delivery.webhook_id)
+        .filter(
+            *_retry_criteria(now, lease_seconds),
+            models.Webhook.is_active == True,  # noqa: E712
+        )
+        .one()
+    )
+    return depth, _aware(earliest)
+
+
+class WebhookRetryWorker:
+    """Background task that re-sends deliveries once they are due.
+
+    Each cycle claims up to ``batch_size`` due deliveries, hands them to the
+    delivery engine and then sleeps until the earliest ``next_retry_at``
+    among the remaining ones, capped at ``max_sleep`` so deliveries
+    scheduled by other processes are noticed. Retries scheduled by this
+    process's engine wake the worker early.
+
+    Attributes:
+        engine: The delivery engine retries are submitted to.
+        batch_size: Maximum deliveries claimed per cycle.
+        max_sleep: Upper bound in seconds on the idle sleep.
+        lease_seconds: Age after which an unfinished claim is taken over.
+    """
+
+    def __init__(
+        self,
+        engine: WebhookDeliveryEngine,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int | None = None,
+        max_sleep: float | None = None,
+        lease_seconds: float = CLAIM_LEASE_SECONDS,
+    ) -> None:
+        """Initialize the worker. Unset limits come from settings.
+
+        Args:
+            engine: The delivery engine retries are submitted to.
+            session_factory: Callable returning a new database session.
+            batch_size: Maximum deliveries claimed per cycle.
+            max_sleep: Upper bound in seconds on the idle sleep.
+            lease_seconds: Age after which an unfinished claim is taken over.
+        """
+        settings = get_settings()
+        self.engine = engine
+        self.batch_size = batch_size or settings.webhook_retry_batch_size
+        self.max_sleep = max_sleep or settings.webhook_retry_max_sleep
+        self.lease_seconds = lease_seconds
+        self._session_factory = session_factory
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the worker loop on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self.engine.on_retry_scheduled = self.wake
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the worker loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self.engine.on_retry_scheduled == self.wake:
+            self.engine.on_retry_scheduled = None
+
+    def wake(self) -> None:
+        """Re-check the queue now instead of at the scheduled time."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run_once(self) -> float:
+        """Claim and submit one batch, then update the queue metrics.
+
+        Returns:
+            float: Seconds to sleep before the next cycle.
+        """
+        jobs = await asyncio.to_thread(
+            self._with_session,
+            claim_due_deliveries,
+            self.batch_size,
+            None,
+            self.lease_seconds,
+        )
+        refused = [job.delivery_id for job in jobs if not self.engine.submit(job)]
+        if refused:
+            await asyncio.to_thread(self._with_session, release_claims, refused)
+        metrics.record_webhook_retries_claimed(len(jobs) - len(refused))
+
+        now = datetime.now(UTC)
+        depth, earliest = await asyncio.to_thread(
+            self._with_session, retry_queue_state, now, self.lease_seconds
+        )
+        lag = (now - earliest).total_seconds() if earliest else 0.0
+        metrics.update_webhook_queue(depth, lag)
+
+        if refused:
+            # Engine backlog is full; give it a moment before re-claiming
+            return min(1.0, self.max_sleep)
+        if len(jobs) == self.batch_size:
+            return 0.0
+        if earliest is None:
+            return self.max_sleep
+        delay = min(max(-lag, 0.0), self.max_sleep)
+        if not jobs:
+            # Nothing claimable although something looks due; never spin
+            delay = max(delay, min(MIN_POLL_SECONDS, self.max_sleep))
+        return delay
+
+    def _with_session(self, func: Callable, *args):
+        """Run ``func(db, *args)`` in a short-lived session."""
+        db = self._session_factory()
+        try:
+            return func(db, *args)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        """Worker loop."""
+        logger.info("Starting webhook retry worker")
+        while True:
+            try:
+                delay = await self.run_once()
+            except Exception as e:
+                logger.error(f"Error in webhook retry worker: {e}")
+                delay = self.max_sleep
+
+            self._wakeup.clear()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except TimeoutError:
+                    pass
+
+
+_engine: WebhookDeliveryEngine | None = None
+_retry_worker: WebhookRetryWorker | None = None
+
+
+def get_delivery_engine() -> WebhookDeliveryEngine:
+    """Get the global delivery engine, creating it on first use.
+
+    Returns:
+        WebhookDeliveryEngine: The process-wide engine.
+    """
+    global _engine
+    if _engine is None:
+        _engine = WebhookDeliveryEngine()
+    return _engine
+
+
+def get_retry_worker() -> WebhookRetryWorker:
+    """Get the global retry worker, creating it on first use.
+
+    Returns:
+        WebhookRetryWorker: The process-wide retry worker, bound to the
+        global delivery engine.
+    """
+    global _retry_worker
+    if _retry_worker is None:
+        _retry_worker = WebhookRetryWorker(get_delivery_engine())
+    return _retry_worker
+
+
+async def close_delivery_engine() -> None:
+    """Stop the global retry worker and delivery engine if they were started."""
+    if _retry_worker is not None:
+        await _retry_worker.stop()
+    if _engine is not None:
+        await _engine.stop()
@@ -10,7 +10,8 @@ Features:
     - Secure payload signing using HMAC-SHA256
     - Automatic retry logic with exponential backoff
     - Delivery logging and history tracking
-    - Asynchronous event dispatch for non-blocking operation
+    - Asynchronous event dispatch through the pooled delivery engine
+      (see ``app.webhook_delivery``)
 
 Example Usage:
     Basic webhook registration and event dispatch::
@@ -45,17 +46,14 @@ Example Usage:
 Author: Sylvester-Francis
 """
 
-import asyncio
 import hashlib
 import hmac
-import json
 import logging
 import secrets
 from datetime import UTC, datetime, timedelta
 from enum import Enum
 from typing import Any
 
-import httpx
 from sqlalchemy.orm import Session
 
 from app import models
@@ -209,6 +207,8 @@ class WebhookService:
         url: str,
         events: list[str],
         description: str | None = None,
+        batch_max_items: int | None = None,
+        batch_window_ms: int | None = None,
     ) -> models.Webhook:
         """Register a new webhook subscription.
 
@@ -223,6 +223,10 @@ class WebhookService:
                 (e.g., ["reservation.created", "resource.updated"]).
             description: Optional human-readable description of the webhook's
                 purpose.
+            batch_max_items: Opt into batched delivery of up to this many
+                events per request. None or 0 delivers each event separately.
+            batch_window_ms: Longest time an event waits for its batch to
+                fill, in milliseconds.
 
         Returns:
             The newly created Webhook model instance with its generated secret.
@@ -245,6 +249,8 @@ class WebhookService:
             events=events,
             description=description,
             is_active=True,
+            batch_max_items=batch_max_items or None,
+            batch_window_ms=batch_window_ms,
         )
 
         self.db.add(webhook)
@@ -292,6 +298,8 @@ class WebhookService:
         events: list[str] | None = None,
         description: str | None = None,
         is_active: bool | None = None,
+        batch_max_items: int | None = None,
+        batch_window_ms: int | None = None,
     ) -> models.Webhook | None:
         """Update an existing webhook's configuration.
 
@@ -304,6 +312,10 @@ class WebhookService:
             events: New list of event types to subscribe to.
             description: New description for the webhook.
             is_active: Whether the webhook should receive events.
+            batch_max_items: Events per batched delivery; 0 turns batching
+                off.
+            batch_window_ms: Longest time an event waits for its batch to
+                fill, in milliseconds.
 
         Returns:
             The updated Webhook model instance, or None if the webhook
@@ -321,6 +333,10 @@ class WebhookService:
             webhook.description = description
         if is_active is not None:
             webhook.is_active = is_active
+        if batch_max_items is not None:
+            webhook.batch_max_items = batch_max_items or None
+        if batch_window_ms is not None:
+            webhook.batch_window_ms = batch_window_ms
 
         self.db.commit()
         self.db.refresh(webhook)
@@ -377,8 +393,9 @@ class WebhookService:
     def get_webhooks_for_event(self, event_type: str) -> list[models.Webhook]:
         """Retrieve all active webhooks subscribed to a specific event type.
 
-        Filters webhooks to return only those that are active and have
-        the specified event type in their subscription list.
+        Uses the normalized ``webhook_event_subscriptions`` table, so the
+        lookup is a single query served by the event type index and only
+        subscribed webhooks are loaded.
 
         Args:
             event_type: The event type to filter by
@@ -387,13 +404,15 @@ class WebhookService:
         Returns:
             List of active Webhook model instances subscribed to the event.
         """
-        webhooks = (
+        return (
             self.db.query(models.Webhook)
-            .filter(models.Webhook.is_active == True)  # noqa: E712
+            .join(models.WebhookSubscription)
+            .filter(
+                models.WebhookSubscription.event_type == event_type,
+                models.Webhook.is_active == True,  # noqa: E712
+            )
             .all()
         )
-        # Filter by event type (events is a JSON array)
-        return [w for w in webhooks if event_type in (w.events or [])]
 
     def create_delivery(
         self,
@@ -541,10 +560,12 @@ async def deliver_webhook(
     delivery: models.WebhookDelivery,
     db: Session,
 ) -> bool:
-    """Deliver a webhook payload to the configured endpoint.
+    """Deliver a webhook payload now and record the outcome.
 
-    Performs an HTTP POST request to the webhook URL with the signed payload.
-    Updates the delivery record with the result of the attempt.
+    Sends through the shared delivery engine (pooled connections,
+    concurrency caps) and waits for the result. Used where the caller needs
+    the outcome, such as test and manual retry endpoints; event dispatch
+    uses ``dispatch_event`` instead.
 
     The request includes the following headers:
         - Content-Type: application/json
@@ -556,7 +577,7 @@ async def deliver_webhook(
     Args:
         webhook: The Webhook model instance with URL and secret.
         delivery: The WebhookDelivery record containing the payload.
-        db: Database session for updating delivery status.
+        db: Database session the delivery record belongs to.
 
     Returns:
         True if the delivery succeeded (2xx response), False otherwise.
@@ -565,60 +586,88 @@ async def deliver_webhook(
         Failed deliveries are automatically scheduled for retry up to
         MAX_RETRIES times with exponential backoff.
     """
-    service = WebhookService(db)
-    payload_str = json.dumps(delivery.payload, default=str)
-    signature = sign_payload(payload_str, webhook.secret)
-
-    headers = {
-        "Content-Type": "application/json",
-        "X-Webhook-Signature": signature,
-        "X-Webhook-Event": delivery.event_type,
-        "X-Webhook-Delivery": str(delivery.id),
-        "User-Agent": "ResourceReserver-Webhook/1.0",
-    }
-
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                webhook.url,
-                content=payload_str,
-                headers=headers,
-            )
+    from app.webhook_delivery import (
+        DeliveryJob,
+        apply_delivery_result,
+        get_delivery_engine,
+    )
+
+    # Claim the row so the retry worker does not send it concurrently
+    delivery.claimed_at = datetime.now(UTC)
+    db.commit()
+
+    result = await get_delivery_engine().send(
+        DeliveryJob.from_models(webhook, delivery)
+    )
+    apply_delivery_result(delivery, result)
+    db.commit()
+    return result.success
+
+
+def _prepare_dispatch(
+    db: Session,
+    event_type: str,
+    payloads: list[dict[str, Any]],
+) -> tuple[list, list]:
+    """Write deliveries for non-batching subscribers and collect batched events.
+
+    Subscribers are looked up once. Webhooks without batching get one
+    claimed delivery row per event, all written in a single commit; webhooks
+    with batching get their event envelopes handed back for the engine to
+    group.
+
+    Args:
+        db: Database session for webhook and delivery operations.
+        event_type: The type of event being dispatched.
+        payloads: The event-specific data, one entry per event.
+
+    Returns:
+        tuple: (DeliveryJob list, list of (BatchTarget, envelopes) pairs).
+    """
+    from app.webhook_delivery import BatchTarget, DeliveryJob
+
+    webhooks = WebhookService(db).get_webhooks_for_event(event_type)
+    if not webhooks or not payloads:
+        return [], []
+
+    now = datetime.now(UTC)
+    envelopes = [
+        {"event": event_type, "timestamp": now.isoformat(), "data": payload}
+        for payload in payloads
+    ]
+    batches = [
+        (BatchTarget.from_webhook(webhook), envelopes)
+        for webhook in webhooks
+        if webhook.batch_max_items
+    ]
 
-            if response.status_code >= 200 and response.status_code < 300:
-                service.update_delivery_status(
-                    delivery.id,
-                    status="delivered",
-                    status_code=response.status_code,
-                    response_body=response.text,
-                )
-                logger.info(
-                    f"Webhook delivery {delivery.id} succeeded: {response.status_code}"
-                )
-                return True
-            else:
-                retry_count = service.increment_retry(delivery.id)
-                service.update_delivery_status(
-                    delivery.id,
-                    status="failed" if retry_count >= MAX_RETRIES else "pending",
-                    status_code=response.status_code,
-                    response_body=response.text,
-                    error_message=f"HTTP {response.status_code}",
-                )
-                logger.warning(
-                    f"Webhook delivery {delivery.id} failed: {response.status_code}"
-                )
-                return False
-
-    except Exception as e:
-        retry_count = service.increment_retry(delivery.id)
-        service.update_delivery_status(
-            delivery.id,
-            status="failed" if retry_count >= MAX_RETRIES else "pending",
-            error_message=str(e)[:500],
+    # Created claimed: the engine sends them now, the retry worker only
+    # picks up the ones it refuses or fails
+    pairs = [
+        (
+            webhook,
+            models.WebhookDelivery(
+                webhook_id=webhook.id,
+                event_type=event_type,
+                payload=envelope,
+                status="pending",
+                claimed_at=now,
+            ),
         )
-        logger.error(f"Webhook delivery {delivery.id} error: {e}")
-        return False
+        for webhook in webhooks
+        if not webhook.batch_max_items
+        for envelope in envelopes
+    ]
+    if not pairs:
+        return [], batches
+
+    db.add_all(delivery for _, delivery in pairs)
+    db.flush()
+
+    # Snapshot before commit expires the rows; delivery never reads ``db``
+    jobs = [DeliveryJob.from_models(webhook, delivery) for webhook, delivery in pairs]
+    db.commit()
+    return jobs, batches
 
 
 async def dispatch_event(
@@ -628,8 +677,11 @@ async def dispatch_event(
 ) -> int:
     """Dispatch an event to all webhooks subscribed to the event type.
 
-    Creates delivery records for each subscribed webhook and initiates
-    asynchronous delivery. The event payload is wrapped with metadata
+    Creates delivery records for each subscribed webhook in a single commit
+    and hands them to the delivery engine. Webhooks with batching enabled
+    receive the event as part of a signed array instead. Delivery runs in
+    the background with the engine's own sessions, so ``db`` can be closed
+    as soon as this returns. The event payload is wrapped with metadata
     including the event type and timestamp.
 
     Args:
@@ -639,7 +691,7 @@ async def dispatch_event(
         payload: The event-specific data to include in the delivery.
 
     Returns:
-        The number of webhook deliveries that were created and dispatched.
+        The number of subscribed webhooks the event was dispatched to.
 
     Example:
         >>> count = await dispatch_event(
@@ -653,31 +705,68 @@ async def dispatch_event(
         ... )
         >>> print(f"Dispatched to {count} webhooks")
     """
-    service = WebhookService(db)
-    webhooks = service.get_webhooks_for_event(event_type)
+    from app.webhook_delivery import get_delivery_engine, release_claims
 
-    if not webhooks:
+    jobs, batches = _prepare_dispatch(db, event_type, [payload])
+    if not jobs and not batches:
         return 0
 
-    deliveries_created = 0
-    for webhook in webhooks:
-        # Create delivery record with wrapped payload
-        delivery = service.create_delivery(
-            webhook_id=webhook.id,
-            event_type=event_type,
-            payload={
-                "event": event_type,
-                "timestamp": datetime.now(UTC).isoformat(),
-                "data": payload,
-            },
-        )
-        deliveries_created += 1
+    refused = get_delivery_engine().accept(jobs, batches)
+    release_claims(db, refused)
+
+    count = len(jobs) + len(batches)
+    logger.info(f"Dispatched {event_type} to {count} webhooks")
+    return count
+
+
+def dispatch_events_sync(
+    db: Session,
+    event_type: str,
+    payloads: list[dict[str, Any]],
+) -> int:
+    """Dispatch many events of one type from synchronous code.
 
-        # Try to deliver immediately (async, non-blocking)
-        asyncio.create_task(deliver_webhook(webhook, delivery, db))
+    Intended for bulk operations that run in the threadpool. Subscribers
+    are looked up once for the whole set, and batching webhooks receive the
+    events as signed arrays of up to ``batch_max_items`` events. When the
+    delivery engine is not running in this process, the deliveries are left
+    for the retry worker.
+
+    Args:
+        db: Database session for webhook and delivery operations.
+        event_type: The type of the events.
+        payloads: The event-specific data, one entry per event.
+
+    Returns:
+        The number of (webhook, event) pairs dispatched.
+    """
+    from app.webhook_delivery import (
+        BATCH_EVENT_TYPE,
+        get_delivery_engine,
+        release_claims,
+    )
+
+    jobs, batches = _prepare_dispatch(db, event_type, payloads)
+    if not jobs and not batches:
+        return 0
+
+    if not get_delivery_engine().accept_threadsafe(jobs, batches):
+        release_claims(db, [job.delivery_id for job in jobs])
+        db.add_all(
+            models.WebhookDelivery(
+                webhook_id=target.webhook_id,
+                event_type=BATCH_EVENT_TYPE,
+                payload=events[offset : offset + target.max_items],
+                status="pending",
+            )
+            for target, events in batches
+            for offset in range(0, len(events), target.max_items)
+        )
+        db.commit()
 
-    logger.info(f"Dispatched {event_type} to {deliveries_created} webhooks")
-    return deliveries_created
+    count = len(jobs) + sum(len(events) for _, events in batches)
+    logger.info(f"Dispatched {len(payloads)} {event_type} events to {count} recipients")
+    return count
 
 
 def get_event_types() -> list[dict[str, str]]:
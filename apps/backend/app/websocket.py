@@ -1,18 +1,327 @@
-"""WebSocket connection manager for real-time updates."""
+"""WebSocket connection manager for real-time updates.
 
-from fastapi import WebSocket
+Each connection gets a bounded outbound queue drained by its own writer
+task, so a broadcast only serializes the message once and enqueues it for
+every recipient. A slow client can no longer stall the others: when its
+queue stays over the limit for the send timeout (or reaches the hard cap
+during a burst) it is disconnected and expected to reconnect and resync.
+Sockets that fail to send are pruned automatically.
+
+Broadcasts go through a ``BroadcastBus`` so they reach sockets held by
+other worker processes. With the Redis bus every worker subscribes once
+and routes each message to its own sockets; the in-memory bus keeps
+everything in one process (the default, also used by tests).
+
+Clients can subscribe to topics by sending JSON over the socket::
+
+    {"action": "subscribe", "topics": ["resource:12", "availability:summary"]}
+
+Supported topics are ``resource:{id}``, ``group:{id}`` and
+``availability:summary``. Subscribers receive compact
+``availability_changed`` deltas instead of polling the REST endpoints: one
+message per batch of changes, listing the changes matching any of the
+connection's topics::
+
+    {"type": "availability_changed", "changes": [{"resource_id": 12, ...}]}
+"""
+
+import asyncio
+import json
+import logging
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import redis.asyncio as redis
+from fastapi import WebSocket, status
+from redis.exceptions import RedisError
+
+from app.config import get_settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Redis channel shared by all workers
+BROADCAST_CHANNEL = "ws:broadcast"
+
+# Envelope handler registered by a ConnectionManager
+EnvelopeHandler = Callable[[dict[str, Any]], None]
+
+# Topic carrying every availability change, for dashboard summaries
+SUMMARY_TOPIC = "availability:summary"
+
+_TOPIC_PATTERN = re.compile(r"^(?:resource|group):\d+$|^availability:summary$")
+
+# Upper bound on topics a single connection may subscribe to
+MAX_TOPICS_PER_CONNECTION = 100
+
+# Hard cap on a connection's queue, as a multiple of the queue size; a
+# burst may overflow the queue size for up to the send timeout, never this
+OVERFLOW_FACTOR = 4
+
+
+def availability_topics(resource_id: int, group_id: int | None) -> list[str]:
+    """Return the topics an availability change of a resource is sent to.
+
+    Args:
+        resource_id: The resource whose status changed.
+        group_id: The resource's group, if any.
+
+    Returns:
+        list[str]: The resource topic, the group topic (when grouped) and
+            the summary topic.
+    """
+    topics = [f"resource:{resource_id}"]
+    if group_id is not None:
+        topics.append(f"group:{group_id}")
+    topics.append(SUMMARY_TOPIC)
+    return topics
+
+
+def _serialize(message: dict) -> str:
+    """Encode a message the same way ``WebSocket.send_json`` does."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class BroadcastBus(ABC):
+    """Transport that carries broadcast envelopes to every worker.
+
+    An envelope is a dict with the encoded message under ``"text"`` and the
+    recipients under ``"topics"`` (a list of topic names) or ``"user_id"``
+    (None for everyone), or a batch of availability changes under
+    ``"changes"``. Subscribed handlers are called once per envelope in
+    every process.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: list[EnvelopeHandler] = []
+
+    def subscribe(self, handler: EnvelopeHandler) -> None:
+        """Register a handler for envelopes published by any worker."""
+        self._handlers.append(handler)
+
+    @abstractmethod
+    async def start(self) -> None:
+        """Begin receiving envelopes published by other workers."""
+
+    @abstractmethod
+    async def publish(self, envelope: dict[str, Any]) -> None:
+        """Send an envelope to every worker, this one included."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Stop receiving and release any connections held by the bus."""
+
+    def _dispatch(self, envelope: dict[str, Any]) -> None:
+        """Hand an envelope to the local handlers."""
+        for handler in self._handlers:
+            handler(envelope)
+
+
+class InMemoryBroadcastBus(BroadcastBus):
+    """Process-local bus: publishing calls the handlers directly."""
+
+    async def start(self) -> None:
+        """Nothing to receive from: every publisher is in this process."""
+
+    async def publish(self, envelope: dict[str, Any]) -> None:
+        """Deliver an envelope to this process's handlers."""
+        self._dispatch(envelope)
+
+    async def close(self) -> None:
+        """Nothing to release."""
+
+
+class RedisBroadcastBus(BroadcastBus):
+    """Bus backed by Redis pub/sub, shared by all workers.
+
+    Each worker holds one subscription. Until it is started, or while
+    Redis errors, envelopes are delivered to local sockets only rather
+    than dropped.
+
+    Example:
+        >>> bus = RedisBroadcastBus(redis_url="redis://localhost:6379/0")
+        >>> manager = ConnectionManager(bus=bus)
+        >>> await manager.start()
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        client: redis.Redis | None = None,
+        channel: str = BROADCAST_CHANNEL,
+    ) -> None:
+        """Initialize the bus.
+
+        Args:
+            redis_url: Redis connection URL. Connections are opened lazily.
+            client: An existing async client to use instead of ``redis_url``.
+            channel: Pub/sub channel shared by the workers.
+        """
+        super().__init__()
+        if client is None:
+            client = redis.Redis.from_url(redis_url, decode_responses=True)
+        self._client = client
+        self._channel = channel
+        self._listener: asyncio.Task | None = None
+        self._subscribed = asyncio.Event()
+
+    async def start(self) -> None:
+        """Subscribe to the channel and wait until the subscription is live."""
+        if self._listener is None:
+            self._subscribed = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), timeout=5)
+        except TimeoutError:
+            logger.warning("WebSocket broadcast bus is not subscribed yet")
+
+    async def publish(self, envelope: dict[str, Any]) -> None:
+        """Publish an envelope; this worker receives it through its listener."""
+        if self._listener is None:
+            self._dispatch(envelope)
+            return
+        try:
+            await self._client.publish(self._channel, json.dumps(envelope))
+        except RedisError as e:
+            logger.warning(f"WebSocket broadcast bus unavailable, local only: {e}")
+            self._dispatch(envelope)
+
+    async def close(self) -> None:
+        """Cancel the listener and close the Redis client."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._client.aclose()
+
+    async def _listen(self) -> None:
+        """Route published envelopes to local handlers until cancelled."""
+        while True:
+            try:
+                pubsub = self._client.pubsub()
+                await pubsub.subscribe(self._channel)
+                self._subscribed.set()
+                try:
+                    async for message in pubsub.listen():
+                        self.handle_message(message)
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket broadcast listener error: {e}")
+                await asyncio.sleep(1)
+
+    def handle_message(self, message: dict[str, Any]) -> None:
+        """Dispatch one pub/sub message.
+
+        Args:
+            message: A message as yielded by ``PubSub.listen``. Subscription
+                confirmations and malformed payloads are ignored.
+        """
+        if message.get("type") != "message":
+            return
+        try:
+            envelope = json.loads(message["data"])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Ignoring malformed broadcast message: {e}")
+            return
+        self._dispatch(envelope)
+
+
+def create_broadcast_bus() -> BroadcastBus:
+    """Return the bus selected by ``ws_broadcast_backend`` in settings.
+
+    Returns:
+        A RedisBroadcastBus when the backend is "redis", otherwise an
+        InMemoryBroadcastBus.
+    """
+    settings = get_settings()
+    if settings.ws_broadcast_backend == "redis":
+        return RedisBroadcastBus(settings.ws_broadcast_redis_url)
+    return InMemoryBroadcastBus()
+
+
+class _Connection:
+    """One accepted socket with its outbound queue and writer task."""
+
+    def __init__(self, websocket: WebSocket, user_id: int, queue_size: int):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue: asyncio.Queue[str] = asyncio.Queue(
+            maxsize=queue_size * OVERFLOW_FACTOR
+        )
+        self.loop = asyncio.get_running_loop()
+        # Loop time at which the queue went over the queue size, if it is
+        self.full_since: float | None = None
+        self.writer: asyncio.Task | None = None
+        self.topics: set[str] = set()
+        self.closed = False
 
 
 class ConnectionManager:
     """Track and manage active WebSocket connections by user ID.
 
+    Broadcasts are published on the bus and routed to local sockets when
+    the bus delivers them, so they reach users connected to any worker.
+    They are safe to call from any event loop; messages for a connection
+    are always enqueued on the loop that owns it.
+
     Attributes:
-        active_connections: Mapping of user IDs to active WebSocket sets.
+        bus: Transport that carries broadcasts between workers.
+        active_connections: Mapping of user IDs to their connections, keyed
+            by WebSocket.
+        topic_subscribers: Mapping of topics to the local connections
+            subscribed to them.
+        queue_size: Messages buffered per connection before the client
+            counts as lagging; a client lagging for longer than
+            ``send_timeout`` is treated as a slow consumer and disconnected.
+        send_timeout: Seconds a single send may take before the socket is
+            considered dead.
     """
 
-    def __init__(self):
-        """Initialize the connection manager with no active connections."""
-        self.active_connections: dict[int, set[WebSocket]] = {}
+    def __init__(
+        self,
+        queue_size: int | None = None,
+        send_timeout: float | None = None,
+        bus: BroadcastBus | None = None,
+    ):
+        """Initialize the connection manager with no active connections.
+
+        Args:
+            queue_size: Per-connection queue bound. Defaults to settings.
+            send_timeout: Per-send timeout in seconds. Defaults to settings.
+            bus: Broadcast transport. Defaults to the one selected in
+                settings.
+        """
+        settings = get_settings()
+        self.bus = bus or create_broadcast_bus()
+        self.bus.subscribe(self.route)
+        self.queue_size = queue_size or settings.ws_send_queue_size
+        self.send_timeout = send_timeout or settings.ws_send_timeout_seconds
+        self.active_connections: dict[int, dict[WebSocket, _Connection]] = {}
+        self.topic_subscribers: dict[str, set[_Connection]] = {}
+        self._queued = 0
+        # Pending closes of dropped clients, referenced until they finish
+        self._close_tasks: set[asyncio.Task] = set()
+
+    @property
+    def connection_count(self) -> int:
+        """Number of open connections across all users."""
+        return sum(len(conns) for conns in self.active_connections.values())
+
+    async def start(self) -> None:
+        """Start receiving broadcasts from other workers."""
+        await self.bus.start()
+
+    async def close(self) -> None:
+        """Stop receiving broadcasts from other workers."""
+        await self.bus.close()
 
     async def connect(self, websocket: WebSocket, user_id: int):
         """Accept a connection and associate it with a user.
@@ -22,9 +331,10 @@ class ConnectionManager:
             user_id: The authenticated user ID for the connection.
         """
         await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = set()
-        self.active_connections[user_id].add(websocket)
+        conn = _Connection(websocket, user_id, self.queue_size)
+        conn.writer = asyncio.create_task(self._write(conn))
+        self.active_connections.setdefault(user_id, {})[websocket] = conn
+        metrics.record_ws_connect()
 
     def disconnect(self, websocket: WebSocket, user_id: int):
         """Remove a connection for a given user.
@@ -33,8 +343,9 @@ class ConnectionManager:
             websocket: The WebSocket instance to remove.
             user_id: The authenticated user ID for the connection.
         """
-        if user_id in self.active_connections:
-            self.active_connections[user_id].discard(websocket)
+        conn = self.active_connections.get(user_id, {}).get(websocket)
+        if conn is not None:
+            self._remove(conn)
 
     async def broadcast_to_user(self, user_id: int, message: dict):
         """Send a JSON message to all connections for one user.
@@ -43,9 +354,7 @@ class ConnectionManager:
             user_id: The user ID to target.
             message: The JSON-serializable payload to send.
         """
-        if user_id in self.active_connections:
-            for connection in list(self.active_connections[user_id]):
-                await connection.send_json(message)
+        await self.bus.publish({"user_id": user_id, "text": _serialize(message)})
 
     async def broadcast_all(self, message: dict):
         """Send a JSON message to every active connection.
@@ -53,9 +362,292 @@ class ConnectionManager:
         Args:
             message: The JSON-serializable payload to send.
         """
-        for connections in self.active_connections.values():
-            for connection in list(connections):
-                await connection.send_json(message)
+        await self.bus.publish({"user_id": None, "text": _serialize(message)})
+
+    async def publish(self, topics: list[str], message: dict):
+        """Send a JSON message to every connection subscribed to any topic.
+
+        A connection subscribed to several of the topics receives the
+        message once.
+
+        Args:
+            topics: Topic names, e.g. ``["resource:3", "group:1"]``.
+            message: The JSON-serializable payload to send.
+        """
+        await self.bus.publish({"topics": topics, "text": _serialize(message)})
+
+    async def publish_availability(self, changes: list[dict]):
+        """Push availability deltas to resource, group and summary topics.
+
+        The batch travels as a single envelope and every subscriber gets one
+        ``availability_changed`` message with the changes matching its
+        topics, so a large reconcile tick does not flood the summary
+        subscribers' queues with one message per resource.
+
+        Args:
+            changes: One dict per resource with ``resource_id``,
+                ``group_id``, ``status``, ``previous_status``, ``available``
+                and ``reason``.
+        """
+        if changes:
+            await self.bus.publish({"changes": changes})
+
+    def subscribe(
+        self, websocket: WebSocket, user_id: int, topics: Iterable[str]
+    ) -> list[str]:
+        """Subscribe a connection to topics.
+
+        Args:
+            websocket: The subscribing WebSocket.
+            user_id: The authenticated user ID for the connection.
+            topics: Topic names to add.
+
+        Returns:
+            list[str]: The connection's topics after subscribing.
+
+        Raises:
+            ValueError: If a topic is not supported or the connection would
+                exceed MAX_TOPICS_PER_CONNECTION.
+        """
+        conn = self.active_connections.get(user_id, {}).get(websocket)
+        if conn is None:
+            return []
+        topics = list(topics)
+        if not all(isinstance(topic, str) for topic in topics):
+            raise ValueError("Topics must be strings")
+        topics = set(topics)
+        invalid = sorted(t for t in topics if not _TOPIC_PATTERN.match(t))
+        if invalid:
+            raise ValueError(f"Unsupported topics: {', '.join(invalid)}")
+        if len(conn.topics | topics) > MAX_TOPICS_PER_CONNECTION:
+            raise ValueError(
+                f"At most {MAX_TOPICS_PER_CONNECTION} topics per connection"
+            )
+        for topic in topics:
+            conn.topics.add(topic)
+            self.topic_subscribers.setdefault(topic, set()).add(conn)
+        return sorted(conn.topics)
+
+    def unsubscribe(
+        self, websocket: WebSocket, user_id: int, topics: Iterable[str]
+    ) -> list[str]:
+        """Unsubscribe a connection from topics.
+
+        Args:
+            websocket: The WebSocket to unsubscribe.
+            user_id: The authenticated user ID for the connection.
+            topics: Topic names to drop; unknown names are ignored.
+
+        Returns:
+            list[str]: The connection's remaining topics.
+        """
+        conn = self.active_connections.get(user_id, {}).get(websocket)
+        if conn is None:
+            return []
+        self._drop_topics(conn, {t for t in topics if isinstance(t, str)})
+        return sorted(conn.topics)
+
+    def handle_client_message(self, websocket: WebSocket, user_id: int, text: str):
+        """Apply a subscribe/unsubscribe request sent by a client.
+
+        The reply (``subscribed`` or ``error``) is queued on the connection
+        behind any pending messages. Text that is not a JSON object, such as
+        keep-alive pings, is ignored.
+
+        Args:
+            websocket: The WebSocket that sent the message.
+            user_id: The authenticated user ID for the connection.
+            text: The raw frame received from the client.
+        """
+        conn = self.active_connections.get(user_id, {}).get(websocket)
+        try:
+            request = json.loads(text)
+        except ValueError:
+            return
+        if conn is None or not isinstance(request, dict):
+            return
+
+        action = request.get("action")
+        topics = request.get("topics")
+        if action not in ("subscribe", "unsubscribe"):
+            return
+        if not isinstance(topics, list):
+            reply = {"type": "error", "detail": "topics must be a list"}
+        else:
+            try:
+                if action == "subscribe":
+                    current = self.subscribe(websocket, user_id, topics)
+                else:
+                    current = self.unsubscribe(websocket, user_id, topics)
+                reply = {"type": "subscribed", "topics": current}
+            except ValueError as e:
+                reply = {"type": "error", "detail": str(e)}
+        self._offer(conn, _serialize(reply))
+
+    def route(self, envelope: dict[str, Any]) -> None:
+        """Enqueue a bus envelope for the matching local connections.
+
+        Args:
+            envelope: ``{"topics": [...], "text": str}``,
+                ``{"user_id": int | None, "text": str}`` (a None user ID
+                addresses every connection) or ``{"changes": [...]}`` for
+                a batch of availability changes.
+        """
+        if "changes" in envelope:
+            self._route_changes(envelope["changes"])
+            return
+        user_id = envelope.get("user_id")
+        if "topics" in envelope:
+            conns = list(
+                {
+                    conn
+                    for topic in envelope["topics"]
+                    for conn in list(self.topic_subscribers.get(topic, ()))
+                }
+            )
+        elif user_id is None:
+            conns = [
+                conn
+                for user_conns in list(self.active_connections.values())
+                for conn in list(user_conns.values())
+            ]
+        else:
+            conns = list(self.active_connections.get(user_id, {}).values())
+        if conns:
+            self._fan_out(conns, envelope["text"])
+
+    def _route_changes(self, changes: list[dict]) -> None:
+        """Send each subscriber one message with its matching changes."""
+        matched: dict[_Connection, list[int]] = {}
+        for index, change in enumerate(changes):
+            topics = availability_topics(change["resource_id"], change.get("group_id"))
+            conns = {
+                conn
+                for topic in topics
+                for conn in list(self.topic_subscribers.get(topic, ()))
+            }
+            for conn in conns:
+                matched.setdefault(conn, []).append(index)
+
+        # Connections with the same matches share one serialized message
+        by_matches: dict[tuple[int, ...], list[_Connection]] = {}
+        for conn, indexes in matched.items():
+            by_matches.setdefault(tuple(indexes), []).append(conn)
+        for indexes, conns in by_matches.items():
+            message = {
+                "type": "availability_changed",
+                "changes": [changes[index] for index in indexes],
+            }
+            self._fan_out(conns, _serialize(message))
+
+    def _fan_out(self, conns: list[_Connection], text: str) -> None:
+        """Enqueue an encoded message on each connection's own loop."""
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for conn in conns:
+            if conn.loop is current:
+                self._offer(conn, text)
+            elif not conn.loop.is_closed():
+                conn.loop.call_soon_threadsafe(self._offer, conn, text)
+
+    def _offer(self, conn: _Connection, text: str) -> None:
+        """Queue a message, dropping the connection if it cannot keep up.
+
+        A queue over ``queue_size`` is tolerated for ``send_timeout`` so
+        healthy clients ride out bursts published faster than their writer
+        runs; a client still over the limit after that, or at the hard cap,
+        is dropped.
+        """
+        if conn.closed:
+            return
+        try:
+            if conn.queue.qsize() >= self.queue_size:
+                now = conn.loop.time()
+                if conn.full_since is None:
+                    conn.full_since = now
+                elif now - conn.full_since >= self.send_timeout:
+                    raise asyncio.QueueFull
+            conn.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            logger.warning(
+                "Dropping slow WebSocket client for user %s (%d messages queued)",
+                conn.user_id,
+                conn.queue.qsize(),
+            )
+            metrics.record_ws_slow_consumer()
+            self._remove(conn)
+            task = asyncio.create_task(self._close(conn))
+            self._close_tasks.add(task)
+            task.add_done_callback(self._close_tasks.discard)
+            return
+        self._track_queued(1)
+
+    async def _write(self, conn: _Connection) -> None:
+        """Drain a connection's queue until it is closed or a send fails."""
+        try:
+            while True:
+                text = await conn.queue.get()
+                self._track_queued(-1)
+                if conn.queue.qsize() < self.queue_size:
+                    conn.full_since = None
+                async with asyncio.timeout(self.send_timeout):
+                    await conn.websocket.send_text(text)
+                metrics.record_ws_message_sent()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001 - any send failure means a dead socket
+            logger.info("Pruning WebSocket for user %s: %r", conn.user_id, exc)
+            self._remove(conn, from_writer=True)
+
+    async def _close(self, conn: _Connection) -> None:
+        """Close a dropped client's socket, ignoring errors."""
+        try:
+            await conn.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        except Exception:  # noqa: BLE001 - the socket may already be gone
+            pass
+
+    def _remove(self, conn: _Connection, from_writer: bool = False) -> None:
+        """Forget a connection and stop its writer. Idempotent.
+
+        Args:
+            conn: The connection to forget.
+            from_writer: True when called by the connection's own writer,
+                which must not cancel itself.
+        """
+        if conn.closed:
+            return
+        conn.closed = True
+
+        user_conns = self.active_connections.get(conn.user_id)
+        if user_conns is not None:
+            user_conns.pop(conn.websocket, None)
+            if not user_conns:
+                del self.active_connections[conn.user_id]
+
+        self._drop_topics(conn, set(conn.topics))
+
+        if conn.writer is not None and not from_writer:
+            conn.writer.cancel()
+        self._track_queued(-conn.queue.qsize())
+        metrics.record_ws_disconnect()
+
+    def _drop_topics(self, conn: _Connection, topics: set[str]) -> None:
+        """Remove a connection from the subscriber sets of ``topics``."""
+        for topic in topics & conn.topics:
+            conn.topics.discard(topic)
+            subscribers = self.topic_subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(conn)
+                if not subscribers:
+                    del self.topic_subscribers[topic]
+
+    def _track_queued(self, delta: int) -> None:
+        """Keep the queued-messages gauge in step with the queues."""
+        if delta:
+            self._queued = max(0, self._queued + delta)
+            metrics.update_ws_queue_depth(self._queued)
 
 
 manager = ConnectionManager()
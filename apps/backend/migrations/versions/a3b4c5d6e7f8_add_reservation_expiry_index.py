@@ -0,0 +1,30 @@
+"""Add an index for the reservation expiry sweeper.
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-16 21:00:00.000000
+
+The sweeper selects active reservations by end time in bounded batches;
+(status, end_time) serves that query without scanning every reservation.
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3b4c5d6e7f8"
+down_revision: str | Sequence[str] | None = "f2a3b4c5d6e7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create the expiry index."""
+    op.create_index("ix_reservations_expiry", "reservations", ["status", "end_time"])
+
+
+def downgrade() -> None:
+    """Drop the expiry index."""
+    op.drop_index("ix_reservations_expiry", table_name="reservations")
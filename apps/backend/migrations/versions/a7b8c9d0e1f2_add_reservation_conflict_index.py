@@ -0,0 +1,31 @@
+"""Add composite index for reservation conflict detection.
+
+Revision ID: a7b8c9d0e1f2
+Revises: 4e70906a9aa7
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7b8c9d0e1f2"
+down_revision: str | Sequence[str] | None = "4e70906a9aa7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create the (resource_id, status, start_time, end_time) index."""
+    op.create_index(
+        "ix_reservations_conflict",
+        "reservations",
+        ["resource_id", "status", "start_time", "end_time"],
+    )
+
+
+def downgrade() -> None:
+    """Drop the reservation conflict index."""
+    op.drop_index("ix_reservations_conflict", table_name="reservations")
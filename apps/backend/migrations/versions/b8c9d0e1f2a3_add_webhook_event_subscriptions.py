@@ -0,0 +1,68 @@
+"""Add normalized webhook event subscriptions.
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c9d0e1f2a3"
+down_revision: str | Sequence[str] | None = "a7b8c9d0e1f2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create webhook_event_subscriptions and backfill it from webhooks.events."""
+    subscriptions = op.create_table(
+        "webhook_event_subscriptions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("webhook_id", sa.Integer(), nullable=False),
+        sa.Column("event_type", sa.String(length=50), nullable=False),
+        sa.ForeignKeyConstraint(["webhook_id"], ["webhooks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("webhook_id", "event_type", name="uq_webhook_event"),
+    )
+    op.create_index(
+        op.f("ix_webhook_event_subscriptions_id"),
+        "webhook_event_subscriptions",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_webhook_subscriptions_event",
+        "webhook_event_subscriptions",
+        ["event_type", "webhook_id"],
+    )
+
+    webhooks = sa.table(
+        "webhooks",
+        sa.column("id", sa.Integer()),
+        sa.column("events", sa.JSON()),
+    )
+    rows = op.get_bind().execute(sa.select(webhooks.c.id, webhooks.c.events))
+    backfill = [
+        {"webhook_id": webhook_id, "event_type": event_type}
+        for webhook_id, events in rows
+        for event_type in sorted(set(events or []))
+    ]
+    if backfill:
+        op.bulk_insert(subscriptions, backfill)
+
+
+def downgrade() -> None:
+    """Drop webhook_event_subscriptions."""
+    op.drop_index(
+        "ix_webhook_subscriptions_event", table_name="webhook_event_subscriptions"
+    )
+    op.drop_index(
+        op.f("ix_webhook_event_subscriptions_id"),
+        table_name="webhook_event_subscriptions",
+    )
+    op.drop_table("webhook_event_subscriptions")
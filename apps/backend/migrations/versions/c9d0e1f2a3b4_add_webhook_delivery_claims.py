@@ -0,0 +1,51 @@
+"""Add claim columns and a due index to webhook deliveries.
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c9d0e1f2a3b4"
+down_revision: str | Sequence[str] | None = "b8c9d0e1f2a3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add claimed_at/claim_token and the (status, next_retry_at) index."""
+    op.add_column(
+        "webhook_deliveries",
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "webhook_deliveries",
+        sa.Column("claim_token", sa.String(length=32), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_webhook_deliveries_claim_token"),
+        "webhook_deliveries",
+        ["claim_token"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_webhook_deliveries_due",
+        "webhook_deliveries",
+        ["status", "next_retry_at"],
+    )
+
+
+def downgrade() -> None:
+    """Drop the claim columns and the due index."""
+    op.drop_index("ix_webhook_deliveries_due", table_name="webhook_deliveries")
+    op.drop_index(
+        op.f("ix_webhook_deliveries_claim_token"), table_name="webhook_deliveries"
+    )
+    op.drop_column("webhook_deliveries", "claim_token")
+    op.drop_column("webhook_deliveries", "claimed_at")
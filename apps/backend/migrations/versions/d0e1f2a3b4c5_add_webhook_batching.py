@@ -0,0 +1,30 @@
+"""Add opt-in batched delivery settings to webhooks.
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d0e1f2a3b4c5"
+down_revision: str | Sequence[str] | None = "c9d0e1f2a3b4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add batch_max_items and batch_window_ms to webhooks."""
+    op.add_column("webhooks", sa.Column("batch_max_items", sa.Integer(), nullable=True))
+    op.add_column("webhooks", sa.Column("batch_window_ms", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the webhook batching columns."""
+    op.drop_column("webhooks", "batch_window_ms")
+    op.drop_column("webhooks", "batch_max_items")
@@ -0,0 +1,44 @@
+"""Add hourly utilization rollups for analytics.
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-16 17:00:00.000000
+
+Existing reservations are not rolled up by this migration; run
+``python scripts/backfill_rollups.py`` once after upgrading.
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f2a3b4c5d6"
+down_revision: str | Sequence[str] | None = "d0e1f2a3b4c5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create the utilization_rollups table."""
+    op.create_table(
+        "utilization_rollups",
+        sa.Column("resource_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("hour", sa.Integer(), nullable=False),
+        sa.Column("booked_minutes", sa.Float(), nullable=False),
+        sa.Column("reservation_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["resource_id"], ["resources.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("resource_id", "day", "hour"),
+    )
+    op.create_index(
+        "ix_utilization_rollups_day_hour", "utilization_rollups", ["day", "hour"]
+    )
+
+
+def downgrade() -> None:
+    """Drop the utilization_rollups table."""
+    op.drop_index("ix_utilization_rollups_day_hour", table_name="utilization_rollups")
+    op.drop_table("utilization_rollups")
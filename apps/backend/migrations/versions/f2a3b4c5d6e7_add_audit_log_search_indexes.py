@@ -0,0 +1,100 @@
+"""Add keyset and full-text search indexes to audit_logs.
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-16 19:00:00.000000
+
+The single-column timestamp, action and entity_type indexes are replaced
+by composite indexes ending in (timestamp, id), the audit log page order.
+Free-text search gets a GIN index over a tsvector on PostgreSQL and an
+external-content FTS5 table, filled here and kept in sync by triggers, on
+SQLite.
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a3b4c5d6e7"
+down_revision: str | Sequence[str] | None = "e1f2a3b4c5d6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COMPOSITE_INDEXES = {
+    "ix_audit_logs_timestamp_id": ["timestamp", "id"],
+    "ix_audit_logs_user_timestamp": ["user_id", "timestamp", "id"],
+    "ix_audit_logs_action_timestamp": ["action", "timestamp", "id"],
+    "ix_audit_logs_entity": ["entity_type", "entity_id", "timestamp", "id"],
+}
+
+REPLACED_INDEXES = {
+    "ix_audit_logs_timestamp": ["timestamp"],
+    "ix_audit_logs_action": ["action"],
+    "ix_audit_logs_entity_type": ["entity_type"],
+}
+
+SQLITE_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS audit_logs_fts USING fts5("
+    "details, entity_name, username, content='audit_logs', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS audit_logs_fts_insert AFTER INSERT ON audit_logs "
+    "BEGIN "
+    "INSERT INTO audit_logs_fts (rowid, details, entity_name, username) "
+    "VALUES (new.id, new.details, new.entity_name, new.username); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS audit_logs_fts_delete AFTER DELETE ON audit_logs "
+    "BEGIN "
+    "INSERT INTO audit_logs_fts "
+    "(audit_logs_fts, rowid, details, entity_name, username) "
+    "VALUES ('delete', old.id, old.details, old.entity_name, old.username); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS audit_logs_fts_update "
+    "AFTER UPDATE OF details, entity_name, username ON audit_logs "
+    "BEGIN "
+    "INSERT INTO audit_logs_fts "
+    "(audit_logs_fts, rowid, details, entity_name, username) "
+    "VALUES ('delete', old.id, old.details, old.entity_name, old.username); "
+    "INSERT INTO audit_logs_fts (rowid, details, entity_name, username) "
+    "VALUES (new.id, new.details, new.entity_name, new.username); "
+    "END",
+    "INSERT INTO audit_logs_fts (audit_logs_fts) VALUES ('rebuild')",
+)
+
+POSTGRESQL_SEARCH_INDEX = (
+    "CREATE INDEX ix_audit_logs_search ON audit_logs USING gin ("
+    "to_tsvector('simple'::regconfig, "
+    "coalesce(details, '') || ' ' || coalesce(entity_name, '') || ' ' "
+    "|| coalesce(username, '')))"
+)
+
+
+def upgrade() -> None:
+    """Create the composite and full-text search indexes."""
+    for name, columns in COMPOSITE_INDEXES.items():
+        op.create_index(name, "audit_logs", columns)
+    for name in REPLACED_INDEXES:
+        op.drop_index(name, table_name="audit_logs")
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(POSTGRESQL_SEARCH_INDEX)
+    elif dialect == "sqlite":
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Restore the single-column indexes and drop the search indexes."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_audit_logs_search")
+    elif dialect == "sqlite":
+        for trigger in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER IF EXISTS audit_logs_fts_{trigger}")
+        op.execute("DROP TABLE IF EXISTS audit_logs_fts")
+
+    for name, columns in REPLACED_INDEXES.items():
+        op.create_index(name, "audit_logs", columns)
+    for name in COMPOSITE_INDEXES:
+        op.drop_index(name, table_name="audit_logs")
@@ -0,0 +1,31 @@
+"""Backfill the hourly utilization rollups from existing reservations."""
+
+import os
+import sys
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from app.database import SessionLocal
+from app.utilization_rollups import rebuild_rollups
+
+
+def backfill():
+    """Rebuild utilization_rollups from the reservations table."""
+    print("Rebuilding utilization rollups...")
+
+    db = SessionLocal()
+    try:
+        buckets = rebuild_rollups(db)
+        print(f"✓ Wrote {buckets} hourly buckets")
+    except Exception as e:
+        print(f"\n❌ Backfill failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill()
@@ -0,0 +1,115 @@
+"""Convert audit_logs into a table partitioned by month (PostgreSQL only).
+
+Once partitioned, audit retention drops whole expired months with
+``DROP TABLE`` on the partition instead of deleting their rows, and keeps
+``AUDIT_PARTITION_MONTHS_AHEAD`` future partitions created.
+
+The conversion runs in one transaction: the existing table is renamed,
+a partitioned table with the same columns and indexes takes its place,
+monthly partitions covering the existing entries are created and the
+entries are copied over. The primary key becomes (id, timestamp), as
+PostgreSQL requires the partition key in every unique constraint. Plan a
+maintenance window on large tables; the copy holds an exclusive lock.
+"""
+
+import os
+import sys
+from datetime import UTC, datetime
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from sqlalchemy import text
+
+from app import models
+from app.audit_retention import (
+    create_partition_sql,
+    is_partitioned,
+    month_start,
+    next_month,
+)
+from app.config import get_settings
+from app.database import SessionLocal
+
+
+def partition():
+    """Rebuild audit_logs as a monthly range-partitioned table."""
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            print("❌ Partitioning requires PostgreSQL")
+            return
+        if is_partitioned(db):
+            print("✓ audit_logs is already partitioned")
+            return
+
+        print("Partitioning audit_logs by month...")
+        db.execute(text("LOCK TABLE audit_logs IN ACCESS EXCLUSIVE MODE"))
+        db.execute(
+            text("UPDATE audit_logs SET timestamp = now() WHERE timestamp IS NULL")
+        )
+        oldest, newest = db.execute(
+            text("SELECT min(timestamp), max(timestamp) FROM audit_logs")
+        ).one()
+
+        db.execute(text("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned"))
+        db.execute(
+            text(
+                "ALTER TABLE audit_logs_unpartitioned "
+                "RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey"
+            )
+        )
+        db.execute(text("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE"))
+        db.execute(
+            text(
+                "CREATE TABLE audit_logs "
+                "(LIKE audit_logs_unpartitioned INCLUDING DEFAULTS) "
+                "PARTITION BY RANGE (timestamp)"
+            )
+        )
+        db.execute(text("ALTER TABLE audit_logs ALTER COLUMN timestamp SET NOT NULL"))
+        db.execute(text("ALTER TABLE audit_logs ADD PRIMARY KEY (id, timestamp)"))
+        db.execute(
+            text(
+                "ALTER TABLE audit_logs ADD FOREIGN KEY (user_id) REFERENCES users (id)"
+            )
+        )
+
+        # Months of the existing entries through the months kept ahead
+        now = datetime.now(UTC)
+        month = month_start(oldest or now)
+        end = month_start(max(newest or now, now))
+        for _ in range(get_settings().audit_partition_months_ahead + 1):
+            end = next_month(end)
+        created = 0
+        while month < end:
+            db.execute(text(create_partition_sql(month)))
+            month = next_month(month)
+            created += 1
+        db.execute(
+            text("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+        )
+
+        db.execute(
+            text("INSERT INTO audit_logs SELECT * FROM audit_logs_unpartitioned")
+        )
+        db.execute(text("DROP TABLE audit_logs_unpartitioned"))
+        db.execute(text("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id"))
+
+        connection = db.connection()
+        for index in models.AuditLog.__table__.indexes:
+            index.create(bind=connection)
+
+        db.commit()
+        print(f"✓ Created {created} monthly partitions")
+    except Exception as e:
+        print(f"\n❌ Partitioning failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    partition()
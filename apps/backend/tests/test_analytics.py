@@ -3,7 +3,20 @@
 Author: Sylvester-Francis
 """
 
+from datetime import UTC, datetime, timedelta
+
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import models
+from app.analytics_service import AnalyticsService
+from app.utilization_rollups import (
+    _maintain_rollups,
+    hour_buckets,
+    rebuild_rollups,
+    register_rollup_upkeep,
+)
 
 
 class TestAnalyticsEndpoints:
@@ -92,6 +105,16 @@ class TestAnalyticsEndpoints:
         )
         assert response.status_code == 200
 
+    def test_heatmap_endpoint(self, client: TestClient, auth_headers: dict):
+        """Test weekday-by-hour heatmap endpoint."""
+        response = client.get("/api/v1/analytics/heatmap?days=14", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["occupied_hours"]) == 7
+        assert all(len(row) == 24 for row in data["occupied_hours"])
+        assert len(data["reservation_starts"]) == 7
+        assert data["days"][0] == "Monday"
+
     def test_user_patterns_endpoint(self, client: TestClient, auth_headers: dict):
         """Test user patterns endpoint."""
         response = client.get("/api/v1/analytics/user-patterns", headers=auth_headers)
@@ -142,3 +165,349 @@ class TestAnalyticsEndpoints:
         """Test that reservations export requires authentication."""
         response = client.get("/api/v1/analytics/export/reservations.csv")
         assert response.status_code == 401
+
+
+class TestAnalyticsService:
+    """Tests for AnalyticsService aggregates."""
+
+    @staticmethod
+    def _seed(db, user):
+        """Two resources with reservations straddling a 10-day window."""
+        start = datetime(2024, 1, 1, tzinfo=UTC)
+        busy = models.Resource(name="Busy Room")
+        idle = models.Resource(name="Idle Room")
+        db.add_all([busy, idle])
+        db.flush()
+        db.add_all(
+            [
+                # 2h before the window + 2h inside: only 2h count
+                models.Reservation(
+                    resource_id=busy.id,
+                    user_id=user.id,
+                    start_time=start - timedelta(hours=2),
+                    end_time=start + timedelta(hours=2),
+                    status="expired",
+                ),
+                models.Reservation(
+                    resource_id=busy.id,
+                    user_id=user.id,
+                    start_time=start + timedelta(days=1),
+                    end_time=start + timedelta(days=1, hours=6),
+                    status="active",
+                ),
+                # Cancelled time is not booked time
+                models.Reservation(
+                    resource_id=idle.id,
+                    user_id=user.id,
+                    start_time=start + timedelta(days=2),
+                    end_time=start + timedelta(days=2, hours=4),
+                    status="cancelled",
+                ),
+            ]
+        )
+        db.commit()
+        return start, busy, idle
+
+    def test_utilization_clips_to_period(self, test_db, test_user):
+        db = test_db()
+        try:
+            start, busy, idle = self._seed(db, test_user)
+            resource_ids = [busy.id, idle.id]
+            result = AnalyticsService(db).get_resource_utilization(
+                start_date=start, end_date=start + timedelta(days=10)
+            )
+        finally:
+            db.close()
+
+        assert [r["resource_id"] for r in result] == resource_ids
+        assert result[0]["total_hours_available"] == 240.0
+        assert result[0]["booked_hours"] == 8.0
+        assert result[0]["utilization_percent"] == round(8 / 240 * 100, 2)
+        assert result[1]["booked_hours"] == 0.0
+
+    def test_utilization_query_count_is_constant(self, test_db, test_user):
+        db = test_db()
+        try:
+            start, _, _ = self._seed(db, test_user)
+            db.add_all(models.Resource(name=f"Extra {i}") for i in range(20))
+            db.commit()
+
+            statements = []
+
+            def _record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            bind = db.get_bind()
+            event.listen(bind, "before_cursor_execute", _record)
+            try:
+                result = AnalyticsService(db).get_resource_utilization(
+                    start_date=start, end_date=start + timedelta(days=10)
+                )
+            finally:
+                event.remove(bind, "before_cursor_execute", _record)
+        finally:
+            db.close()
+
+        assert len(result) == 22
+        assert len(statements) == 1
+
+    def test_popular_resources_and_patterns_rank_by_count(self, test_db, test_user):
+        db = test_db()
+        try:
+            start, busy, _ = self._seed(db, test_user)
+            busy_id = busy.id
+            service = AnalyticsService(db)
+            popular = service.get_popular_resources(
+                start_date=start - timedelta(days=1),
+                end_date=start + timedelta(days=10),
+            )
+            patterns = service.get_user_booking_patterns(
+                start_date=datetime.now(UTC) - timedelta(days=1),
+                end_date=datetime.now(UTC) + timedelta(days=1),
+            )
+        finally:
+            db.close()
+
+        assert popular == [
+            {
+                "resource_id": busy_id,
+                "resource_name": "Busy Room",
+                "reservation_count": 2,
+                "rank": 1,
+            }
+        ]
+        assert patterns[0]["username"] == "testuser"
+        assert patterns[0]["total_reservations"] == 3
+        assert patterns[0]["cancelled_count"] == 1
+        assert patterns[0]["cancellation_rate"] == 33.33
+
+    def test_peak_times_weight_occupancy(self, test_db, test_user):
+        db = test_db()
+        try:
+            resource = models.Resource(name="Lab")
+            db.add(resource)
+            db.flush()
+            monday = datetime(2024, 1, 1, tzinfo=UTC)
+            db.add_all(
+                [
+                    # One long Monday booking from 09:30 to 15:00
+                    models.Reservation(
+                        resource_id=resource.id,
+                        user_id=test_user.id,
+                        start_time=monday + timedelta(hours=9, minutes=30),
+                        end_time=monday + timedelta(hours=15),
+                        status="active",
+                    ),
+                ]
+                + [
+                    # Three short Tuesday bookings starting at 08:00
+                    models.Reservation(
+                        resource_id=resource.id,
+                        user_id=test_user.id,
+                        start_time=monday + timedelta(days=1, hours=8),
+                        end_time=monday + timedelta(days=1, hours=8, minutes=10),
+                        status="expired",
+                    )
+                    for _ in range(3)
+                ]
+            )
+            db.commit()
+            peak = AnalyticsService(db, use_rollups=False).get_peak_usage_times(
+                start_date=monday, end_date=monday + timedelta(days=7)
+            )
+        finally:
+            db.close()
+
+        hourly = peak["hourly_distribution"]
+        assert peak["total_reservations"] == 4
+        assert hourly[8]["count"] == 3
+        assert hourly[8]["occupied_hours"] == 0.5
+        assert hourly[9]["occupied_hours"] == 0.5
+        assert hourly[12]["occupied_hours"] == 1.0
+        assert hourly[15]["occupied_hours"] == 0.0
+        # Ranked by booked time, not by start events
+        assert peak["peak_hour"] == 10
+        assert peak["peak_day"] == "Monday"
+        assert peak["daily_distribution"][0]["occupied_hours"] == 5.5
+        assert peak["daily_distribution"][1]["count"] == 3
+
+    def test_heatmap_matches_hour_by_hour_split(self, test_db, test_user):
+        db = test_db()
+        try:
+            resource = models.Resource(name="Studio")
+            db.add(resource)
+            db.flush()
+            origin = datetime(2024, 2, 5, tzinfo=UTC)
+            spans = [
+                (origin + timedelta(minutes=97 * i), timedelta(minutes=45 + 211 * i))
+                for i in range(40)
+            ]
+            db.add_all(
+                models.Reservation(
+                    resource_id=resource.id,
+                    user_id=test_user.id,
+                    start_time=start,
+                    end_time=start + length,
+                    status="active",
+                )
+                for start, length in spans
+            )
+            db.commit()
+
+            window = (origin + timedelta(minutes=50), origin + timedelta(days=9))
+            expected = [[0.0] * 24 for _ in range(7)]
+            for start, length in spans:
+                lower = max(start, window[0])
+                upper = min(start + length, window[1])
+                if lower >= upper:
+                    continue
+                for bucket, minutes in hour_buckets(lower, upper):
+                    expected[bucket.weekday()][bucket.hour] += minutes / 60
+
+            maps = [
+                AnalyticsService(db, use_rollups=use_rollups).get_usage_heatmap(
+                    resource_id=resource.id, start_date=window[0], end_date=window[1]
+                )
+                for use_rollups in (False, True)
+            ]
+        finally:
+            db.close()
+
+        expected = [[round(cell, 2) for cell in row] for row in expected]
+        for heatmap in maps:
+            assert heatmap["occupied_hours"] == expected
+            assert heatmap["max_occupied_hours"] == max(max(row) for row in expected)
+            assert sum(map(sum, heatmap["reservation_starts"])) == sum(
+                1 for start, _ in spans if window[0] <= start < window[1]
+            )
+
+
+class TestUtilizationRollups:
+    """Tests for the hourly utilization rollups behind AnalyticsService."""
+
+    @staticmethod
+    def _buckets(db):
+        rollup = models.UtilizationRollup
+        rows = db.query(rollup).order_by(rollup.day, rollup.hour, rollup.resource_id)
+        return [
+            (r.resource_id, r.day, r.hour, r.booked_minutes, r.reservation_count)
+            for r in rows
+        ]
+
+    def test_rollups_follow_reservation_lifecycle(self, test_db, test_user):
+        db = test_db()
+        try:
+            resource = models.Resource(name="Rolled Room")
+            db.add(resource)
+            db.commit()
+            resource_id = resource.id
+            start = datetime(2024, 3, 4, 10, 30, tzinfo=UTC)
+            reservation = models.Reservation(
+                resource_id=resource_id,
+                user_id=test_user.id,
+                start_time=start,
+                end_time=start + timedelta(minutes=90),
+                status="active",
+            )
+            db.add(reservation)
+            db.commit()
+            created = self._buckets(db)
+
+            reservation.status = "expired"
+            db.commit()
+            expired = self._buckets(db)
+
+            reservation.status = "cancelled"
+            db.commit()
+            cancelled = self._buckets(db)
+        finally:
+            db.close()
+
+        day = start.date()
+        assert created == [
+            (resource_id, day, 10, 30.0, 1),
+            (resource_id, day, 11, 60.0, 0),
+        ]
+        assert expired == created
+        assert cancelled == [
+            (resource_id, day, 10, 0.0, 0),
+            (resource_id, day, 11, 0.0, 0),
+        ]
+
+    def test_session_setup_registers_upkeep_once(self, test_db, test_user):
+        import app.database  # noqa: F401 - registers the listener
+
+        assert event.contains(Session, "after_flush", _maintain_rollups)
+
+        # A second call must not double every later rollup write
+        register_rollup_upkeep()
+        self.test_rollups_follow_reservation_lifecycle(test_db, test_user)
+
+    def test_rollup_reads_match_raw_reads(self, test_db, test_user):
+        db = test_db()
+        try:
+            start, _, _ = TestAnalyticsService._seed(db, test_user)
+            rolled = AnalyticsService(db, use_rollups=True)
+            raw = AnalyticsService(db, use_rollups=False)
+            windows = [
+                (start, start + timedelta(days=10)),
+                (start + timedelta(minutes=45), start + timedelta(days=1, hours=3)),
+                (start - timedelta(hours=1, minutes=20), start + timedelta(hours=1)),
+            ]
+            for lower, upper in windows:
+                kwargs = {"start_date": lower, "end_date": upper}
+                assert rolled.get_resource_utilization(
+                    **kwargs
+                ) == raw.get_resource_utilization(**kwargs)
+                assert rolled.get_popular_resources(
+                    **kwargs
+                ) == raw.get_popular_resources(**kwargs)
+                assert rolled.get_peak_usage_times(
+                    **kwargs
+                ) == raw.get_peak_usage_times(**kwargs)
+        finally:
+            db.close()
+
+    def test_aligned_window_skips_reservations_table(self, test_db, test_user):
+        db = test_db()
+        try:
+            start, busy, _ = TestAnalyticsService._seed(db, test_user)
+            busy_id = busy.id
+            statements = []
+
+            def _record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            bind = db.get_bind()
+            event.listen(bind, "before_cursor_execute", _record)
+            try:
+                service = AnalyticsService(db, use_rollups=True)
+                result = service.get_resource_utilization(
+                    resource_id=busy_id,
+                    start_date=start,
+                    end_date=start + timedelta(days=10),
+                )
+            finally:
+                event.remove(bind, "before_cursor_execute", _record)
+        finally:
+            db.close()
+
+        assert result[0]["booked_hours"] == 8.0
+        assert len(statements) == 1
+        assert "FROM reservations" not in statements[0]
+
+    def test_rebuild_matches_incremental_rollups(self, test_db, test_user):
+        db = test_db()
+        try:
+            TestAnalyticsService._seed(db, test_user)
+            incremental = [b for b in self._buckets(db) if b[3] or b[4]]
+
+            db.query(models.UtilizationRollup).delete()
+            db.commit()
+            written = rebuild_rollups(db)
+            rebuilt = self._buckets(db)
+        finally:
+            db.close()
+
+        assert written == len(rebuilt)
+        assert rebuilt == incremental
@@ -260,6 +260,38 @@ class TestAuditService:
 
         db.close()
 
+    def test_stream_exports_span_chunks(self, test_db, monkeypatch):
+        """Test that streamed exports stay valid across chunk boundaries."""
+        import json
+
+        from app import audit_service, models
+        from app.audit_service import AuditService
+        from app.utils import streaming
+
+        monkeypatch.setattr(audit_service, "CHUNK_SIZE", 1)
+        monkeypatch.setattr(streaming, "CHUNK_SIZE", 1)
+
+        db = test_db()
+        service = AuditService(db)
+        for i in range(5):
+            service.log_action(action="create", entity_type="resource", entity_id=i)
+
+        json_chunks = list(service.stream_json(entity_type="resource"))
+        data = json.loads("".join(json_chunks))
+        assert len(json_chunks) > 2
+        assert data["total"] == 5
+        assert [log["entity_id"] for log in data["logs"]] == [4, 3, 2, 1, 0]
+
+        lines = "".join(service.stream_ndjson(limit=3)).splitlines()
+        assert [json.loads(line)["entity_id"] for line in lines] == [4, 3, 2]
+
+        rows = "".join(service.stream_csv(entity_type="resource")).splitlines()
+        assert rows[0].startswith("id,timestamp,user_id")
+        assert len(rows) == 6
+        assert db.query(models.AuditLog).count() == 5
+
+        db.close()
+
     def test_apply_retention_policy(self, test_db):
         """Test retention policy application."""
         from app import models
@@ -358,3 +390,256 @@ class TestAuditService:
         assert total == 2
 
         db.close()
+
+    def test_search_matches_word_prefixes(self, test_db):
+        """Test that full-text search matches all words as prefixes."""
+        from app.audit_service import AuditService
+
+        db = test_db()
+        service = AuditService(db)
+
+        log = service.log_action(
+            action="update",
+            entity_type="resource",
+            entity_name="Meeting Room B",
+            username="alice",
+            details="Updated meeting room capacity",
+        )
+        service.log_action(action="create", entity_type="resource", details="Other")
+
+        assert service.get_logs(search="meet capac")[1] == 1
+        assert service.get_logs(search="ALICE")[1] == 1
+        assert service.get_logs(search="room other")[1] == 0
+
+        # The search index follows updates
+        log.details = "Renamed"
+        db.commit()
+        assert service.get_logs(search="capacity")[1] == 0
+        assert service.get_logs(search="renamed")[1] == 1
+
+        db.close()
+
+    def test_keyset_pages_cover_all_logs(self, test_db):
+        """Test that following next_cursor visits every log once, newest first."""
+        from app.audit_service import AuditService
+
+        db = test_db()
+        service = AuditService(db)
+        created = [
+            service.log_action(action="page", entity_type="test").id for _ in range(5)
+        ]
+
+        seen, cursor = [], None
+        while True:
+            logs, cursor, has_more, total = service.get_logs_page(
+                action="page", cursor=cursor, limit=2, count="none"
+            )
+            seen.extend(log.id for log in logs)
+            assert total is None
+            if not has_more:
+                break
+
+        assert seen == sorted(created, reverse=True)
+        assert cursor is None
+
+        _, _, _, estimate = service.get_logs_page(action="page", count="estimate")
+        assert estimate == 5
+
+        db.close()
+
+    def test_invalid_cursor_is_rejected(self, client: TestClient, admin_headers: dict):
+        """Test that a malformed cursor is a bad request."""
+        response = client.get(
+            "/api/v1/audit/logs?cursor=not-a-cursor", headers=admin_headers
+        )
+        assert response.status_code == 400
+
+
+class TestAuditLogWriter:
+    """Tests for the batched background audit writer."""
+
+    def test_writer_flushes_queued_entries_on_stop(self, test_db):
+        """Queued entries are bulk inserted and all written on stop."""
+        from app import models
+        from app.audit_service import AuditService
+        from app.audit_writer import AuditLogWriter
+
+        writer = AuditLogWriter(
+            session_factory=test_db, batch_size=2, flush_interval=5.0
+        )
+        writer.start()
+        for i in range(5):
+            entry = AuditService.build_entry("create", "resource", entity_id=i)
+            assert writer.submit(entry) is True
+        writer.stop()
+
+        db = test_db()
+        try:
+            ids = [
+                entity_id
+                for (entity_id,) in db.query(models.AuditLog.entity_id).order_by(
+                    models.AuditLog.entity_id
+                )
+            ]
+        finally:
+            db.close()
+
+        assert ids == [0, 1, 2, 3, 4]
+        assert writer.running is False
+        assert writer.pending == 0
+
+    def test_full_queue_falls_back_to_caller(self, test_db):
+        """A full queue refuses entries so the caller writes them itself."""
+        import threading
+
+        from app.audit_service import AuditService
+        from app.audit_writer import AuditLogWriter
+
+        writing = threading.Event()
+        release = threading.Event()
+
+        def blocking_session():
+            writing.set()
+            release.wait(5)
+            return test_db()
+
+        writer = AuditLogWriter(
+            session_factory=blocking_session,
+            queue_size=1,
+            batch_size=1,
+            flush_interval=5.0,
+        )
+        writer.start()
+        try:
+            assert writer.submit(AuditService.build_entry("a", "test")) is True
+            assert writing.wait(5)
+            assert writer.submit(AuditService.build_entry("b", "test")) is True
+            assert writer.submit(AuditService.build_entry("c", "test")) is False
+            assert writer.sync_fallbacks == 1
+        finally:
+            release.set()
+            writer.stop()
+
+        db = test_db()
+        try:
+            logs, total = AuditService(db).get_logs(entity_type="test")
+        finally:
+            db.close()
+        assert total == 2
+
+    def test_enqueue_action_writes_directly_without_writer(self, test_db):
+        """Without a running writer, enqueue_action writes synchronously."""
+        from app.audit_service import AuditService
+
+        db = test_db()
+        try:
+            service = AuditService(db)
+            queued = service.enqueue_action(
+                "apply_retention", "audit_log", user_id=1, details="sync"
+            )
+            logs, total = service.get_logs(action="apply_retention")
+        finally:
+            db.close()
+
+        assert queued is False
+        assert total == 1
+        assert logs[0].details == "sync"
+        assert logs[0].timestamp is not None
+
+
+class TestAuditRetention:
+    """Tests for batched audit log retention and archival."""
+
+    def _add_logs(self, db, days_ago: int, count: int):
+        from app import models
+
+        for i in range(count):
+            db.add(
+                models.AuditLog(
+                    action="old_action",
+                    entity_type="old_type",
+                    entity_id=i,
+                    timestamp=datetime.now(UTC) - timedelta(days=days_ago, minutes=i),
+                )
+            )
+        db.commit()
+
+    def test_purge_deletes_in_batches(self, test_db):
+        """Test that expired entries are removed in bounded batches."""
+        from app import models
+        from app.audit_retention import purge_expired
+
+        db = test_db()
+        self._add_logs(db, days_ago=100, count=5)
+        self._add_logs(db, days_ago=1, count=1)
+
+        cutoff = datetime.now(UTC) - timedelta(days=90)
+        progress = purge_expired(db, cutoff, batch_size=2)
+
+        assert progress.deleted == 5
+        assert progress.batches == 3
+        assert not progress.running
+        assert not progress.interrupted
+        assert db.query(models.AuditLog).count() == 1
+
+        db.close()
+
+    def test_purge_archives_before_deleting(self, test_db, tmp_path):
+        """Test that archived entries can be read back from NDJSON files."""
+        import gzip
+        import json
+
+        from app.audit_retention import purge_expired
+
+        db = test_db()
+        self._add_logs(db, days_ago=100, count=3)
+
+        cutoff = datetime.now(UTC) - timedelta(days=90)
+        progress = purge_expired(db, cutoff, batch_size=2, archive_dir=str(tmp_path))
+
+        entries = []
+        for path in sorted(tmp_path.glob("*.ndjson.gz")):
+            with gzip.open(path, "rt") as f:
+                entries.extend(json.loads(line) for line in f)
+
+        assert progress.archived == 3
+        assert progress.archive_files == 2
+        assert sorted(entry["entity_id"] for entry in entries) == [0, 1, 2]
+        assert all(entry["action"] == "old_action" for entry in entries)
+
+        db.close()
+
+    def test_stopped_run_resumes(self, test_db):
+        """Test that a stopped run leaves the rest for the next run."""
+        import threading
+
+        from app.audit_retention import purge_expired
+
+        db = test_db()
+        self._add_logs(db, days_ago=100, count=3)
+        cutoff = datetime.now(UTC) - timedelta(days=90)
+
+        stop = threading.Event()
+        stop.set()
+        progress = purge_expired(db, cutoff, batch_size=1, stop=stop)
+        assert progress.interrupted
+        assert progress.deleted == 0
+
+        progress = purge_expired(db, cutoff, batch_size=1)
+        assert progress.deleted == 3
+
+        db.close()
+
+    def test_concurrent_run_is_refused(self, test_db):
+        """Test that a second retention run fails while one is in progress."""
+        import pytest
+
+        from app import audit_retention
+        from app.audit_service import AuditService
+
+        db = test_db()
+        with audit_retention._run_lock:
+            with pytest.raises(audit_retention.RetentionInProgressError):
+                AuditService(db).apply_retention_policy(retention_days=90)
+
+        db.close()
@@ -229,6 +229,21 @@ class TestCSVExport:
         )
         assert response.status_code == 200
 
+    def test_export_gzip(self, client: TestClient, auth_headers: dict):
+        """Test that a gzip export decodes to the same CSV."""
+        plain = client.get(
+            "/api/v1/bulk/reservations/export",
+            headers=auth_headers,
+        )
+        compressed = client.get(
+            "/api/v1/bulk/reservations/export?gzip=true",
+            headers=auth_headers,
+        )
+        assert compressed.status_code == 200
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.text == plain.text
+        assert compressed.text.startswith("reservation_id,resource_id")
+
 
 class TestBulkValidate:
     """Tests for bulk validate endpoint."""
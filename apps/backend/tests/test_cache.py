@@ -3,16 +3,123 @@
 Author: Sylvester-Francis
 """
 
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from app.core.cache import (
+    INVALIDATION_CHANNEL,
     CacheKeys,
     CacheManager,
+    CacheScopes,
     _make_cache_key,
+    build_versioned_key,
     cache_manager,
+    cache_stats,
+    cached,
+    get_cached_stats,
+    invalidate_cache,
+    invalidate_resource_cache,
+    invalidate_scopes,
+    invalidate_scopes_sync,
+    namespaced_key,
+    read_through_sync,
 )
+from app.core.local_cache import LocalCache
+from app.core.metrics import metrics
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the async Redis client."""
+
+    def __init__(self):
+        self.store: dict[str, str] = {}
+        self.published: list[tuple[str, str]] = []
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    async def eval(self, script, numkeys, key, token):
+        # Only the compare-and-delete lock release script is used
+        if self.store.get(key) == token:
+            return await self.delete(key)
+        return 0
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+        return int(self.store[key])
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Buffered pipeline for FakeRedis."""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incr(self, key):
+        self.calls.append(key)
+
+    async def execute(self):
+        return [await self.client.incr(key) for key in self.calls]
+
+
+@pytest.fixture
+def fake_redis():
+    """Connect the global cache manager to an in-memory fake."""
+    client = FakeRedis()
+    cache_manager._client = client
+    cache_manager._connected = True
+    try:
+        yield client
+    finally:
+        cache_manager._client = None
+        cache_manager._connected = False
+
+
+@pytest.fixture
+def local_tier():
+    """Give the global cache manager an L1 tier for the test."""
+    tier = LocalCache(max_bytes=1024 * 1024, ttl=60)
+    cache_manager._local = tier
+    metrics.reset()
+    try:
+        yield tier
+    finally:
+        cache_manager._local = None
 
 
 class TestMakeCacheKey:
@@ -214,3 +321,339 @@ class TestGlobalCacheManager:
         """Test global cache_manager properties."""
         # enabled property should return a boolean based on settings
         assert isinstance(cache_manager.enabled, bool)
+
+
+class TestVersionedKeys:
+    """Tests for scope-versioned read-through keys."""
+
+    @pytest.mark.asyncio
+    async def test_invalidation_only_changes_affected_scope(self, fake_redis):
+        """Bumping one scope leaves keys of other scopes untouched."""
+        params = {"limit": 20}
+        resources_key = await build_versioned_key(
+            CacheKeys.RESOURCES_LIST, [CacheScopes.RESOURCES], params
+        )
+        tags_key = await build_versioned_key(
+            CacheKeys.RESOURCE_TAGS, [CacheScopes.TAGS], params
+        )
+
+        assert await invalidate_scopes(CacheScopes.RESOURCES)
+
+        assert (
+            await build_versioned_key(
+                CacheKeys.RESOURCES_LIST, [CacheScopes.RESOURCES], params
+            )
+            != resources_key
+        )
+        assert (
+            await build_versioned_key(
+                CacheKeys.RESOURCE_TAGS, [CacheScopes.TAGS], params
+            )
+            == tags_key
+        )
+
+    @pytest.mark.asyncio
+    async def test_params_are_hashed(self, fake_redis):
+        """Different parameters never share a key."""
+        first = await build_versioned_key("p", [CacheScopes.RESOURCES], {"q": "a:b"})
+        second = await build_versioned_key(
+            "p", [CacheScopes.RESOURCES], {"q": "a", "b": None}
+        )
+        assert first != second
+        assert first.startswith("p:v1:resources=0:")
+
+    @pytest.mark.asyncio
+    async def test_not_connected(self):
+        """Without Redis no key is built and invalidation is a no-op."""
+        assert await build_versioned_key("p", [CacheScopes.TAGS], {}) is None
+        assert await invalidate_scopes(CacheScopes.TAGS) is False
+
+
+class TestReadThroughEndpoints:
+    """Tests for cached resource endpoints."""
+
+    def test_resource_list_hits_cache_until_write(
+        self, client, fake_redis, admin_headers, test_resource
+    ):
+        """Listing is served from cache and refreshed after a resource write."""
+        hits, misses = metrics.cache.hits, metrics.cache.misses
+
+        first = client.get("/api/v1/resources")
+        second = client.get("/api/v1/resources")
+        assert first.json() == second.json()
+        assert metrics.cache.misses == misses + 1
+        assert metrics.cache.hits == hits + 1
+
+        created = client.post(
+            "/api/v1/resources/",
+            json={"name": "Cached Room", "tags": ["fresh"]},
+            headers=admin_headers,
+        )
+        assert created.status_code == 201
+
+        names = [r["name"] for r in client.get("/api/v1/resources").json()["data"]]
+        assert "Cached Room" in names
+        assert "fresh" in client.get("/api/v1/resources/tags").json()
+
+    def test_recurring_booking_invalidates_resource_entries(
+        self, client, fake_redis, auth_headers, test_resource, future_datetime
+    ):
+        """A recurring booking refreshes cached resource reads."""
+        client.get("/api/v1/resources")
+
+        created = client.post(
+            "/api/v1/reservations/recurring",
+            json={
+                "resource_id": test_resource.id,
+                "start_time": future_datetime.isoformat(),
+                "end_time": (future_datetime + timedelta(hours=1)).isoformat(),
+                "recurrence": {
+                    "frequency": "daily",
+                    "interval": 1,
+                    "end_type": "after_count",
+                    "occurrence_count": 2,
+                },
+            },
+            headers=auth_headers,
+        )
+        assert created.status_code == 201
+
+        misses = metrics.cache.misses
+        client.get("/api/v1/resources")
+        assert metrics.cache.misses == misses + 1
+
+    def test_group_write_keeps_resource_entries(
+        self, client, fake_redis, admin_headers, auth_headers
+    ):
+        """Group writes invalidate the tree but not resource listings."""
+        client.get("/api/v1/resources")
+        tree = client.get("/api/v1/resource-groups/tree", headers=auth_headers)
+        assert tree.json()["total_groups"] == 0
+
+        created = client.post(
+            "/api/v1/resource-groups/",
+            json={"name": "Building A"},
+            headers=admin_headers,
+        )
+        assert created.status_code == 201
+
+        hits = metrics.cache.hits
+        client.get("/api/v1/resources")
+        assert metrics.cache.hits == hits + 1
+
+        tree = client.get("/api/v1/resource-groups/tree", headers=auth_headers)
+        assert tree.json()["total_groups"] == 1
+
+
+class TestLocalCacheTier:
+    """Tests for the in-process L1 tier."""
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        """Entries are evicted LRU once the byte budget is exceeded."""
+        tier = LocalCache(max_bytes=100, ttl=60)
+        tier.set("a", 1, size=40)
+        tier.set("b", 2, size=40)
+        assert tier.get("a") == 1
+        tier.set("c", 3, size=40)
+
+        assert tier.get("b") is None
+        assert tier.get("a") == 1
+        assert tier.current_bytes == 80
+        assert tier.set("huge", 4, size=101) is False
+
+    def test_standalone_without_redis(self, local_tier):
+        """Without Redis the L1 tier caches and invalidates on its own."""
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return {"count": len(calls)}
+
+        assert cache_manager.is_connected() is False
+        first = read_through_sync("p", [CacheScopes.RESOURCES], loader, q="x")
+        second = read_through_sync("p", [CacheScopes.RESOURCES], loader, q="x")
+        assert first == second == {"count": 1}
+
+        invalidate_scopes_sync(CacheScopes.TAGS)
+        read_through_sync("p", [CacheScopes.RESOURCES], loader, q="x")
+        assert len(calls) == 1
+
+        invalidate_scopes_sync(CacheScopes.RESOURCES)
+        third = read_through_sync("p", [CacheScopes.RESOURCES], loader, q="x")
+        assert third == {"count": 2}
+        assert metrics.cache.tier_hits["l1"] == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_hits_fill_l1(self, fake_redis, local_tier):
+        """A Redis hit is copied into L1 and served locally afterwards."""
+        other_worker = LocalCache(max_bytes=1024, ttl=60)
+        cache_manager._local = other_worker
+        await cache_manager.set("k", {"when": "now"}, ttl=30)
+        cache_manager._local = local_tier
+
+        assert await cache_manager.get("k") == {"when": "now"}
+        fake_redis.store.clear()
+        assert await cache_manager.get("k") == {"when": "now"}
+
+        assert metrics.cache.tier_misses["l1"] == 1
+        assert metrics.cache.tier_hits["l2"] == 1
+        assert metrics.cache.tier_hits["l1"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_is_published_to_other_workers(
+        self, fake_redis, local_tier
+    ):
+        """Scope bumps reach another worker's L1 through pub/sub."""
+        params = {"limit": 20}
+        before = await build_versioned_key("p", [CacheScopes.RESOURCES], params)
+
+        # A second worker bumps the scope and publishes the new version
+        fake_redis.store["cache:scope:resources"] = "6"
+        cache_manager.handle_invalidation_message({"type": "subscribe", "data": 1})
+        assert await build_versioned_key("p", [CacheScopes.RESOURCES], params) == (
+            before
+        )
+        cache_manager.handle_invalidation_message(
+            {"type": "message", "data": '{"scope": "resources", "version": 6}'}
+        )
+        after = await build_versioned_key("p", [CacheScopes.RESOURCES], params)
+        assert after != before
+        assert "resources=6" in after
+
+        assert await invalidate_scopes(CacheScopes.RESOURCES)
+        channel, message = fake_redis.published[-1]
+        assert channel == INVALIDATION_CHANNEL
+        assert message == '{"scope": "resources", "version": 7}'
+
+
+class TestNamespaceGenerations:
+    """Tests for generation-counter namespace invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_invalidation_is_a_single_incr(self, fake_redis):
+        """Invalidating a namespace bumps one counter instead of scanning."""
+        calls = []
+
+        @cached(CacheKeys.RESOURCES_LIST, ttl=30)
+        async def list_resources(status: str):
+            calls.append(status)
+            return [status, len(calls)]
+
+        assert await list_resources("active") == ["active", 1]
+        assert await list_resources("active") == ["active", 1]
+        assert await cache_stats("daily", {"total": 3})
+
+        # FakeRedis has no scan_iter, so any keyspace walk would fail here
+        assert await invalidate_resource_cache() == 2
+        assert "resources:g0:list:active" in fake_redis.store
+        assert fake_redis.store["cache:scope:resources"] == "1"
+
+        assert await list_resources("active") == ["active", 2]
+        assert await get_cached_stats("daily") == {"total": 3}
+
+    @pytest.mark.asyncio
+    async def test_legacy_patterns_map_to_namespace(self, fake_redis):
+        """Glob patterns passed to invalidate_cache bump their namespace."""
+        before = await namespaced_key("stats:daily")
+        assert before == "stats:g0:daily"
+
+        assert await invalidate_cache("stats:*") == 1
+        assert await namespaced_key("stats:daily") == "stats:g1:daily"
+        assert await namespaced_key("user") == "user:g0"
+
+    @pytest.mark.asyncio
+    async def test_in_memory_generations_without_redis(self, local_tier):
+        """Without Redis generations live in process memory."""
+        assert await namespaced_key("resources:list") == "resources:g0:list"
+        assert await invalidate_cache("resources") == 1
+        assert await namespaced_key("resources:list") == "resources:g1:list"
+
+    @pytest.mark.asyncio
+    async def test_unavailable_cache_is_a_noop(self):
+        """Without any cache tier nothing is invalidated."""
+        assert await namespaced_key("resources:list") is None
+        assert await invalidate_cache("resources") == 0
+
+
+class TestSingleFlight:
+    """Tests for request coalescing and stale-while-revalidate."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self, fake_redis):
+        """Concurrent callers of one key share a single computation."""
+        calls = []
+
+        @cached(CacheKeys.STATS, ttl=30)
+        async def summary(day: str):
+            calls.append(day)
+            await asyncio.sleep(0.05)
+            return {"day": day}
+
+        results = await asyncio.gather(*(summary("mon") for _ in range(20)))
+        assert results == [{"day": "mon"}] * 20
+        assert calls == ["mon"]
+        assert not any(key.startswith("lock:") for key in fake_redis.store)
+
+    @pytest.mark.asyncio
+    async def test_waits_for_lock_held_by_other_worker(self, fake_redis):
+        """A worker that loses the lock waits for the holder's result."""
+        calls = []
+
+        @cached(CacheKeys.STATS, ttl=30, lock_timeout=2)
+        async def summary():
+            calls.append(1)
+            return {"from": "self"}
+
+        key = await namespaced_key(CacheKeys.STATS)
+        fake_redis.store[f"lock:{key}"] = "other-worker"
+
+        async def other_worker_finishes():
+            await asyncio.sleep(0.1)
+            fake_redis.store[key] = '{"from": "peer"}'
+
+        peer = asyncio.create_task(other_worker_finishes())
+        assert await summary() == {"from": "peer"}
+        await peer
+        assert calls == []
+        assert fake_redis.store[f"lock:{key}"] == "other-worker"
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self, fake_redis):
+        """Expired values are returned at once and refreshed in the background."""
+        version = {"n": 0}
+
+        @cached(CacheKeys.DASHBOARD, ttl=10, stale_ttl=60)
+        async def dashboard():
+            version["n"] += 1
+            return {"n": version["n"]}
+
+        assert await dashboard() == {"n": 1}
+
+        with patch("app.core.cache.time.time", return_value=time.time() + 11):
+            stale = await asyncio.gather(*(dashboard() for _ in range(5)))
+            assert stale == [{"n": 1}] * 5
+            for _ in range(10):
+                await asyncio.sleep(0)
+            assert version["n"] == 2
+
+        assert await dashboard() == {"n": 2}
+
+    def test_read_through_threads_share_loader(self, local_tier):
+        """Worker threads missing the same key call the loader once."""
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"rows": 3}
+
+        def request():
+            barrier.wait()
+            return read_through_sync("p", [CacheScopes.RESOURCES], loader, q=1)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: request(), range(8)))
+
+        assert results == [{"rows": 3}] * 8
+        assert len(calls) == 1
@@ -129,6 +129,24 @@ class TestMetricsCollector:
 
         assert collector.cache.deletes == 1
 
+    def test_record_cache_tier(self, collector):
+        """Test recording per-tier cache lookups."""
+        collector.record_cache_tier("l1", hit=True)
+        collector.record_cache_tier("l1", hit=True)
+        collector.record_cache_tier("l1", hit=False)
+        collector.record_cache_tier("l2", hit=False)
+
+        assert collector.cache.tier_hits["l1"] == 2
+        assert collector.cache.tier_misses["l2"] == 1
+        tiers = collector.get_summary()["cache"]["tiers"]
+        assert tiers["l1"]["hit_rate"] == 66.67
+        assert tiers["l2"]["hit_rate"] == 0
+
+        prometheus_output = collector.export_prometheus()
+        assert 'cache_tier_hits_total{tier="l1"} 2' in prometheus_output
+        assert 'cache_tier_misses_total{tier="l2"} 1' in prometheus_output
+        assert 'cache_tier_hit_ratio{tier="l1"} 0.6667' in prometheus_output
+
     def test_record_cache_error(self, collector):
         """Test recording cache errors."""
         collector.record_cache_error()
@@ -190,6 +208,31 @@ class TestMetricsCollector:
 
         assert collector.websocket.messages_received == 1
 
+    def test_update_ws_queue_depth(self, collector):
+        """Test updating the WebSocket send queue gauge."""
+        collector.update_ws_queue_depth(7)
+
+        assert collector.websocket.queued_messages == 7
+
+    def test_record_ws_slow_consumer(self, collector):
+        """Test recording dropped slow WebSocket clients."""
+        collector.record_ws_slow_consumer()
+
+        assert collector.websocket.slow_consumers_dropped == 1
+
+    def test_record_expiry_run(self, collector):
+        """Test recording reservation expiry sweeper runs."""
+        collector.record_expiry_run(expired=5, batches=2, duration=0.25)
+        collector.record_expiry_run(expired=0, batches=1, duration=0.01)
+
+        assert collector.expiry.runs == 2
+        assert collector.expiry.expired == 5
+        assert collector.expiry.last_run_expired == 0
+        summary = collector.get_summary()
+        assert summary["expiry"]["expired"] == 5
+        assert summary["expiry"]["last_run_duration_ms"] == 10.0
+        assert "reservations_expired_total 5" in collector.export_prometheus()
+
     def test_get_uptime_seconds(self, collector):
         """Test getting uptime in seconds."""
         uptime = collector.get_uptime_seconds()
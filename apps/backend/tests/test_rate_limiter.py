@@ -3,6 +3,8 @@
 Author: Sylvester-Francis
 """
 
+import time
+import tracemalloc
 from datetime import UTC, datetime
 
 import pytest
@@ -48,6 +50,25 @@ class TestRateLimiterModule:
         assert "/api/v1/register" in ENDPOINT_LIMITS
         assert ENDPOINT_LIMITS["/api/v1/token"] > 0  # Default is 30
 
+    def test_rate_limit_key_is_stable_digest(self):
+        """Test that token keys do not depend on the process hash seed."""
+        import hashlib
+
+        from starlette.requests import Request
+
+        from app.core.rate_limiter import get_rate_limit_key
+
+        request = Request(
+            {
+                "type": "http",
+                "headers": [(b"authorization", b"Bearer abc.def")],
+                "client": ("10.0.0.1", 1234),
+            }
+        )
+
+        digest = hashlib.sha256(b"abc.def").hexdigest()[:32]
+        assert get_rate_limit_key(request) == f"user:{digest}"
+
     def test_rate_limit_info_to_headers(self):
         """Test RateLimitInfo header generation."""
         from app.core.rate_limiter import RateLimitInfo
@@ -148,6 +169,248 @@ class TestInMemoryRateLimiter:
         assert stats["date"] == today
 
 
+class TestInMemoryRateLimiterScaling:
+    """Benchmarks for the constant-size in-memory limiter."""
+
+    def test_sliding_window_weights_previous_window(self):
+        """Requests from the previous window count in proportion to overlap."""
+        from app.core.rate_limiter import InMemoryRateLimiter
+
+        now = [600.0]
+        limiter = InMemoryRateLimiter(clock=lambda: now[0])
+        for _ in range(10):
+            limiter.record_request("k")
+
+        now[0] = 660.0 + 15  # a quarter into the next window
+        assert limiter.check_rate_limit("k", limit=10).remaining == 2
+
+        now[0] = 660.0 + 59
+        assert limiter.check_rate_limit("k", limit=10).remaining == 9
+
+    def test_per_check_cost_is_flat(self):
+        """Checks cost the same with 100 or 10k requests in the window."""
+        from app.core.rate_limiter import InMemoryRateLimiter
+
+        def per_check_seconds(requests_in_window):
+            limiter = InMemoryRateLimiter(clock=lambda: 1_000_000.0)
+            for _ in range(requests_in_window):
+                limiter.record_request("busy")
+            rounds = 2000
+            start = time.perf_counter()
+            for _ in range(rounds):
+                limiter.check_rate_limit("busy", limit=20000)
+            return (time.perf_counter() - start) / rounds
+
+        small = min(per_check_seconds(100) for _ in range(3))
+        large = min(per_check_seconds(10_000) for _ in range(3))
+        assert large < small * 3
+
+    def test_memory_bounded_and_idle_keys_evicted(self):
+        """100k keys stay small and are evicted once idle."""
+        from app.core.rate_limiter import InMemoryRateLimiter
+
+        now = [1_000_000.0]
+        limiter = InMemoryRateLimiter(clock=lambda: now[0])
+
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            for i in range(100_000):
+                limiter.record_request(f"ip:{i}")
+            used = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+
+        assert len(limiter) == 100_000
+        assert used / 100_000 < 400  # bytes per key, including the key string
+
+        now[0] += 120
+        limiter.record_request("ip:fresh")
+        assert len(limiter) == 1
+
+    def test_stale_daily_counts_evicted(self):
+        """Daily counts from previous days are dropped."""
+        from app.core.rate_limiter import InMemoryRateLimiter
+
+        now = [datetime(2030, 1, 1, 23, 59, tzinfo=UTC).timestamp()]
+        limiter = InMemoryRateLimiter(clock=lambda: now[0])
+        limiter.increment_daily_count("user_1", "2030-01-01")
+
+        now[0] += 120
+        limiter.check_rate_limit("any", limit=1)
+        assert limiter.get_daily_count("user_1", "2030-01-01") == 0
+        assert limiter.get_usage_stats("user_1")["date"] == "2030-01-02"
+
+
+@pytest.fixture(params=["memory", "redis"])
+def limiter_backend(request):
+    """Yield each rate limiter backend; Redis runs against fakeredis."""
+    from app.core.rate_limiter import InMemoryRateLimiter, RedisRateLimiter
+
+    if request.param == "memory":
+        return InMemoryRateLimiter()
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisRateLimiter(client=fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
+class TestRateLimiterBackends:
+    """The in-memory and Redis backends behave the same."""
+
+    @pytest.mark.asyncio
+    async def test_check_rate_limit_initial(self, limiter_backend):
+        """Test initial rate limit check."""
+        info = await limiter_backend.peek("test_key", limit=10)
+
+        assert info.limit == 10
+        assert info.remaining == 10
+        assert info.retry_after is None
+
+    @pytest.mark.asyncio
+    async def test_hit_decrements_remaining(self, limiter_backend):
+        """Test that recorded requests decrement remaining."""
+        for expected in (9, 8, 7):
+            allowed, info = await limiter_backend.hit("test_key_2", limit=10)
+            assert allowed
+            assert info.remaining == expected
+
+        info = await limiter_backend.peek("test_key_2", limit=10)
+        assert info.remaining == 7
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_exceeded(self, limiter_backend):
+        """Test that requests beyond the limit are rejected, not recorded."""
+        for _ in range(5):
+            allowed, _ = await limiter_backend.hit("test_key_3", limit=5)
+            assert allowed
+
+        allowed, info = await limiter_backend.hit("test_key_3", limit=5)
+        assert not allowed
+        assert info.remaining == 0
+        assert info.retry_after is not None
+        assert info.retry_after > 0
+
+        # Other keys are unaffected
+        allowed, _ = await limiter_backend.hit("other_key", limit=5)
+        assert allowed
+
+    @pytest.mark.asyncio
+    async def test_daily_quota(self, limiter_backend):
+        """Test daily quota counting and enforcement."""
+        today = datetime.now(UTC).strftime("%Y-%m-%d")
+        assert await limiter_backend.daily_count("user_123", today) == 0
+
+        assert await limiter_backend.consume_daily_quota("user_123", today, 2) == (
+            True,
+            1,
+        )
+        assert await limiter_backend.consume_daily_quota("user_123", today, 2) == (
+            True,
+            2,
+        )
+        assert await limiter_backend.consume_daily_quota("user_123", today, 2) == (
+            False,
+            2,
+        )
+        assert await limiter_backend.consume_daily_quota("user_123", today, None) == (
+            True,
+            3,
+        )
+        assert await limiter_backend.daily_count("user_123", today) == 3
+
+    @pytest.mark.asyncio
+    async def test_redis_limit_is_shared_across_workers(self):
+        """Two workers sharing Redis enforce one combined limit."""
+        fakeredis = pytest.importorskip("fakeredis")
+        from app.core.rate_limiter import RedisRateLimiter
+
+        server = fakeredis.FakeServer()
+        workers = [
+            RedisRateLimiter(
+                client=fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+            )
+            for _ in range(2)
+        ]
+        results = [
+            (await workers[i % 2].hit("user:shared", limit=4))[0] for i in range(8)
+        ]
+        assert results == [True] * 4 + [False] * 4
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_memory(self):
+        """A Redis outage degrades to per-process limiting."""
+        from unittest.mock import AsyncMock
+
+        from redis.exceptions import ConnectionError
+
+        from app.core.rate_limiter import RedisRateLimiter
+
+        client = AsyncMock()
+        client.register_script = lambda script: AsyncMock(
+            side_effect=ConnectionError("down")
+        )
+        limiter = RedisRateLimiter(client=client)
+
+        assert (await limiter.hit("user:1", limit=1))[0] is True
+        assert (await limiter.hit("user:1", limit=1))[0] is False
+
+    def test_incomplete_backend_cannot_be_instantiated(self):
+        """Test that a backend missing methods fails at construction."""
+        from app.core.rate_limiter import RateLimiterBackend
+
+        class HitOnly(RateLimiterBackend):
+            async def hit(self, key, limit, window_seconds=60):
+                raise AssertionError("not called")
+
+        with pytest.raises(TypeError):
+            HitOnly()
+
+
+class TestRateLimitMiddlewareBackend:
+    """Tests for backend selection in RateLimitMiddleware."""
+
+    def test_backend_selected_from_settings(self, monkeypatch):
+        """The Redis backend is only used when configured."""
+        from app.core import rate_limiter as module
+
+        settings = module.get_settings()
+        monkeypatch.setattr(settings, "rate_limit_backend", "memory")
+        assert module.get_rate_limiter() is module.rate_limiter
+
+        monkeypatch.setattr(settings, "rate_limit_backend", "redis")
+        monkeypatch.setattr(module, "_redis_rate_limiter", None)
+        backend = module.get_rate_limiter()
+        assert isinstance(backend, module.RedisRateLimiter)
+        assert module.get_rate_limiter() is backend
+
+    def test_middleware_enforces_limit(self, monkeypatch, limiter_backend):
+        """Requests past the limit get 429 with rate limit headers."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from app.core import rate_limiter as module
+
+        settings = module.get_settings()
+        monkeypatch.setattr(settings, "rate_limit_enabled", True)
+        monkeypatch.setattr(settings, "rate_limit_testing_mode", False)
+        monkeypatch.setitem(module.TIER_LIMITS, module.UserTier.ANONYMOUS, 2)
+        monkeypatch.setattr(module, "get_rate_limiter", lambda: limiter_backend)
+
+        app = FastAPI()
+        app.add_middleware(module.RateLimitMiddleware)
+
+        @app.get("/ping")
+        def ping():
+            return {"ok": True}
+
+        with TestClient(app) as client:
+            statuses = [client.get("/ping").status_code for _ in range(3)]
+            limited = client.get("/ping")
+
+        assert statuses == [200, 200, 429]
+        assert limited.headers["X-RateLimit-Remaining"] == "0"
+        assert int(limited.headers["Retry-After"]) > 0
+
+
 class TestGetEndpointLimit:
     """Tests for endpoint-specific rate limits."""
 
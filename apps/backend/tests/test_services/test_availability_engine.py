@@ -0,0 +1,480 @@
+"""Unit tests for the set-based availability engine."""
+
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import models, schemas
+from app.availability_engine import AvailabilityEngine, run_reconcile
+from app.services import ResourceService, _encode_cursor
+
+
+@contextmanager
+def count_queries(db):
+    """Count SQL statements executed on the session's engine."""
+    counter = {"count": 0}
+
+    def _before_cursor_execute(*args, **kwargs):
+        counter["count"] += 1
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", _before_cursor_execute)
+
+
+def _seed(db, resource_count, user):
+    """Create resources with a mix of tags and reservations."""
+    now = datetime.now(UTC)
+    for i in range(resource_count):
+        resource = models.Resource(
+            name=f"Room {i:04d}",
+            tags=["Projector", "large"] if i % 2 == 0 else ["small"],
+            available=i % 5 != 0,
+        )
+        db.add(resource)
+        db.flush()
+        if i % 3 == 0:
+            # Booked for two hours starting this time tomorrow
+            start = now + timedelta(days=1)
+            db.add(
+                models.Reservation(
+                    user_id=user.id,
+                    resource_id=resource.id,
+                    start_time=start,
+                    end_time=start + timedelta(hours=2),
+                    status="active",
+                )
+            )
+        if i % 4 == 0:
+            # Running right now
+            db.add(
+                models.Reservation(
+                    user_id=user.id,
+                    resource_id=resource.id,
+                    start_time=now - timedelta(minutes=30),
+                    end_time=now + timedelta(minutes=30),
+                    status="active",
+                )
+            )
+    db.commit()
+
+
+class TestAvailabilityEngine:
+    """Test AvailabilityEngine search and annotation"""
+
+    def test_time_window_excludes_conflicts(self, test_db, test_user):
+        """Resources booked in the window are excluded by the anti-join"""
+        db = test_db()
+        try:
+            _seed(db, 12, test_user)
+            start = datetime.now(UTC) + timedelta(days=1, minutes=30)
+            end = start + timedelta(hours=1)
+
+            results = AvailabilityEngine(db).find_resources(
+                status_filter="available", available_from=start, available_until=end
+            )
+            names = {r.name for r in results}
+
+            assert all(r.current_availability is True for r in results)
+            for i in range(12):
+                expected = i % 5 != 0 and i % 3 != 0
+                assert (f"Room {i:04d}" in names) is expected
+        finally:
+            db.close()
+
+    def test_cancelled_reservations_do_not_conflict(
+        self, test_db, test_user, test_resource
+    ):
+        """Only active reservations block the window"""
+        db = test_db()
+        try:
+            start = datetime.now(UTC) + timedelta(days=2)
+            db.add(
+                models.Reservation(
+                    user_id=test_user.id,
+                    resource_id=test_resource.id,
+                    start_time=start,
+                    end_time=start + timedelta(hours=1),
+                    status="cancelled",
+                )
+            )
+            db.commit()
+
+            results = AvailabilityEngine(db).find_resources(
+                available_from=start, available_until=start + timedelta(hours=1)
+            )
+            assert [r.id for r in results] == [test_resource.id]
+        finally:
+            db.close()
+
+    def test_tags_and_query_filters(self, test_db, test_user):
+        """Tag subset and text filters match case-insensitively"""
+        db = test_db()
+        try:
+            _seed(db, 6, test_user)
+            engine = AvailabilityEngine(db)
+
+            tagged = engine.find_resources(status_filter="all", tags=["projector"])
+            assert {r.name for r in tagged} == {"Room 0000", "Room 0002", "Room 0004"}
+
+            by_tag_text = engine.find_resources(status_filter="all", query="SMALL")
+            assert {r.name for r in by_tag_text} == {
+                "Room 0001",
+                "Room 0003",
+                "Room 0005",
+            }
+
+            literal = engine.find_resources(status_filter="all", query="%")
+            assert literal == []
+        finally:
+            db.close()
+
+    def test_annotate_sets_current_user(self, test_db, test_user):
+        """Resources in use report the current user's name"""
+        db = test_db()
+        try:
+            _seed(db, 5, test_user)
+            results = AvailabilityEngine(db).find_resources(status_filter="all")
+            by_name = {r.name: r for r in results}
+
+            in_use = by_name["Room 0004"]
+            assert in_use.status == "in_use"
+            assert in_use.current_availability is False
+            assert in_use.current_user_name == test_user.username
+
+            free = by_name["Room 0001"]
+            assert free.current_availability is True
+            assert free.current_user_name is None
+        finally:
+            db.close()
+
+    def test_matches_per_resource_reference(self, test_db, test_user):
+        """Results equal the per-resource conflict loop they replace"""
+        db = test_db()
+        try:
+            _seed(db, 10, test_user)
+            service = ResourceService(db)
+            start = datetime.now(UTC) + timedelta(days=1)
+            end = start + timedelta(hours=3)
+
+            def reference(query=None, tags=None):
+                tag_set = {t.lower() for t in tags or []}
+                return [
+                    r.id
+                    for r in db.query(models.Resource).order_by(models.Resource.id)
+                    if r.available
+                    and tag_set.issubset({t.lower() for t in r.tags})
+                    and (not query or query.lower() in r.name.lower())
+                    and not service._has_conflict(r.id, start, end)
+                ]
+
+            for kwargs in ({}, {"tags": ["LARGE"]}, {"query": "room 000"}):
+                results = service.search_resources(
+                    available_from=start, available_until=end, **kwargs
+                )
+                assert [r.id for r in results] == reference(**kwargs)
+        finally:
+            db.close()
+
+    def test_query_count_is_flat(self, test_db, test_user):
+        """Benchmark: search issues the same number of queries at any scale"""
+        counts = {}
+        for resource_count in (10, 200):
+            db = test_db()
+            try:
+                db.query(models.Reservation).delete()
+                db.query(models.Resource).delete()
+                db.commit()
+                _seed(db, resource_count, test_user)
+
+                start = datetime.now(UTC) + timedelta(days=1)
+                with count_queries(db) as counter:
+                    ResourceService(db).search_resources(status_filter="all")
+                    ResourceService(db).search_resources(
+                        available_from=start,
+                        available_until=start + timedelta(hours=1),
+                        tags=["large"],
+                    )
+                counts[resource_count] = counter["count"]
+            finally:
+                db.close()
+
+        assert counts[10] == counts[200]
+        assert counts[200] <= 4
+
+
+class TestAvailabilityEnginePagination:
+    """Test keyset pagination and counting"""
+
+    def _walk(self, service, sort_by, sort_order, **filters):
+        """Collect every page for the given sort."""
+        names, cursor = [], None
+        while True:
+            params = schemas.PaginationParams(
+                limit=3, cursor=cursor, sort_by=sort_by, sort_order=sort_order
+            )
+            page, cursor, has_more, _ = service.get_resources_paginated(
+                params, status_filter="all", **filters
+            )
+            names.extend(r.name for r in page)
+            if not has_more:
+                assert cursor is None
+                return names
+
+    def test_pages_concatenate_to_sorted_list(self, test_db, test_user):
+        """Walking all pages yields the fully sorted result set"""
+        db = test_db()
+        try:
+            _seed(db, 11, test_user)
+            service = ResourceService(db)
+            all_names = [f"Room {i:04d}" for i in range(11)]
+
+            assert self._walk(service, "name", "asc") == all_names
+            assert self._walk(service, "name", "desc") == all_names[::-1]
+            assert self._walk(service, "id", "desc") == all_names[::-1]
+
+            by_status = self._walk(service, "status", "asc")
+            assert sorted(by_status) == all_names
+            assert len(set(by_status)) == 11
+
+            large = self._walk(service, "name", "asc", tags=["large"])
+            assert large == all_names[::2]
+        finally:
+            db.close()
+
+    def test_invalid_cursor_rejected(self, test_db):
+        """Malformed or mismatched cursors raise ValueError"""
+        db = test_db()
+        try:
+            service = ResourceService(db)
+            for cursor in ("not-a-cursor", _encode_cursor("abc", 1)):
+                params = schemas.PaginationParams(cursor=cursor, sort_by="id")
+                with pytest.raises(ValueError):
+                    service.get_resources_paginated(params)
+        finally:
+            db.close()
+
+    def test_include_total_counts_filters(self, test_db, test_user):
+        """Totals honour tag and text filters"""
+        db = test_db()
+        try:
+            _seed(db, 9, test_user)
+            service = ResourceService(db)
+            params = schemas.PaginationParams(limit=2, sort_by="name")
+
+            _, _, _, total = service.get_resources_paginated(
+                params, status_filter="all", include_total=True
+            )
+            assert total == 9
+
+            _, _, _, total = service.get_resources_paginated(
+                params, status_filter="all", tags=["large"], include_total=True
+            )
+            assert total == 5
+
+            _, _, _, total = service.get_resources_paginated(
+                params, status_filter="all", query="0003", include_total=True
+            )
+            assert total == 1
+        finally:
+            db.close()
+
+    def test_deep_page_costs_same_as_first(self, test_db, test_user):
+        """Benchmark: a deep page issues no more queries than the first"""
+        db = test_db()
+        try:
+            _seed(db, 60, test_user)
+            service = ResourceService(db)
+
+            first = schemas.PaginationParams(limit=5, sort_by="name", sort_order="asc")
+            with count_queries(db) as first_counter:
+                service.get_resources_paginated(first, status_filter="all")
+
+            anchor = db.query(models.Resource).filter_by(name="Room 0050").one()
+            deep = schemas.PaginationParams(
+                limit=5,
+                sort_by="name",
+                sort_order="asc",
+                cursor=_encode_cursor(anchor.name.lower(), anchor.id),
+            )
+            with count_queries(db) as deep_counter:
+                page, _, _, _ = service.get_resources_paginated(
+                    deep, status_filter="all"
+                )
+
+            assert [r.name for r in page][0] == "Room 0051"
+            assert deep_counter["count"] == first_counter["count"]
+        finally:
+            db.close()
+
+
+class TestStatusReconciliation:
+    """Test read-time status and the batched reconciler"""
+
+    def test_reads_do_not_write(self, test_db, test_user):
+        """Listing, search and status lookups issue no INSERT/UPDATE/COMMIT"""
+        db = test_db()
+        try:
+            _seed(db, 8, test_user)
+            resource = db.query(models.Resource).filter_by(name="Room 0001").one()
+            resource.set_unavailable(auto_reset_hours=1)
+            resource.unavailable_since = datetime.now(UTC) - timedelta(hours=2)
+            db.commit()
+
+            statements = []
+
+            def _record(conn, cursor, statement, *args):
+                statements.append(statement.split()[0].upper())
+
+            bind = db.get_bind()
+            event.listen(bind, "before_cursor_execute", _record)
+            try:
+                service = ResourceService(db)
+                statuses = {r.name: r.status for r in service.get_all_resources()}
+                service.search_resources(status_filter="in_use")
+                status = service.get_resource_status(resource.id)
+                assert not db.dirty
+                db.commit()
+            finally:
+                event.remove(bind, "before_cursor_execute", _record)
+
+            assert set(statements) == {"SELECT"}
+            assert statuses["Room 0004"] == "in_use"
+            assert statuses["Room 0001"] == "available"
+            assert status["status"] == "available"
+
+            db.expire_all()
+            stored = db.query(models.Resource).filter_by(name="Room 0004").one()
+            assert stored.status == "available"
+        finally:
+            db.close()
+
+    def test_in_use_filter_uses_live_status(self, test_db, test_user):
+        """The in_use filter agrees with the annotated status"""
+        db = test_db()
+        try:
+            _seed(db, 9, test_user)
+            results = ResourceService(db).search_resources(status_filter="in_use")
+            assert {r.name for r in results} == {"Room 0004", "Room 0008"}
+            assert all(r.status == "in_use" for r in results)
+        finally:
+            db.close()
+
+    def test_reconcile_batches_transitions(self, test_db, test_user):
+        """All pending transitions are persisted with a single UPDATE"""
+        db = test_db()
+        try:
+            _seed(db, 9, test_user)
+            now = datetime.now(UTC)
+            resources = {r.name: r for r in db.query(models.Resource)}
+            resources["Room 0001"].set_unavailable(auto_reset_hours=1)
+            resources["Room 0001"].unavailable_since = now - timedelta(hours=2)
+            resources["Room 0003"].set_unavailable(auto_reset_hours=8)
+            resources["Room 0002"].set_in_use()
+            db.commit()
+
+            statements = []
+
+            def _record(conn, cursor, statement, *args):
+                statements.append(statement.split()[0].upper())
+
+            bind = db.get_bind()
+            event.listen(bind, "before_cursor_execute", _record)
+            try:
+                changed = AvailabilityEngine(db).reconcile()
+            finally:
+                event.remove(bind, "before_cursor_execute", _record)
+
+            # 0004 and 0008 start running, 0002 is released, 0001 auto-resets
+            assert changed == 4
+            assert statements.count("UPDATE") == 1
+
+            db.expire_all()
+            stored = {r.name: r for r in db.query(models.Resource)}
+            assert stored["Room 0004"].status == "in_use"
+            assert stored["Room 0008"].status == "in_use"
+            assert stored["Room 0002"].status == "available"
+            assert stored["Room 0001"].status == "available"
+            assert stored["Room 0001"].unavailable_since is None
+            assert stored["Room 0003"].status == "unavailable"
+
+            assert AvailabilityEngine(db).reconcile() == 0
+        finally:
+            db.close()
+
+    def test_reconcile_transitions_describe_changes(self, test_db, test_user):
+        """Transitions carry the old and new status and the reason"""
+        db = test_db()
+        try:
+            _seed(db, 9, test_user)
+            resources = {r.name: r for r in db.query(models.Resource)}
+            resources["Room 0002"].set_in_use()
+            db.commit()
+            ids = {r.id: name for name, r in resources.items()}
+
+            transitions = AvailabilityEngine(db).reconcile_transitions()
+
+            by_name = {ids[t["resource_id"]]: t for t in transitions}
+            assert by_name["Room 0004"]["status"] == "in_use"
+            assert by_name["Room 0004"]["previous_status"] == "available"
+            assert by_name["Room 0004"]["reason"] == "reservation_started"
+            assert by_name["Room 0002"]["status"] == "available"
+            assert by_name["Room 0002"]["reason"] == "reservation_ended"
+            assert AvailabilityEngine(db).reconcile_transitions() == []
+        finally:
+            db.close()
+
+    @pytest.mark.parametrize("returning", [True, False])
+    def test_reconcile_skips_rows_changed_concurrently(
+        self, test_db, test_user, monkeypatch, returning
+    ):
+        """A transition that loses to a concurrent status change is not reported"""
+        db = test_db()
+        try:
+            monkeypatch.setattr(db.get_bind().dialect, "update_returning", returning)
+            _seed(db, 9, test_user)
+            raced = db.query(models.Resource).filter_by(name="Room 0004").one().id
+            db.commit()
+
+            raced_once = []
+
+            def _race(conn, cursor, statement, *args):
+                # A manual change lands just before the reconcile UPDATE
+                if statement.startswith("UPDATE resources") and not raced_once:
+                    raced_once.append(True)
+                    cursor.execute(
+                        "UPDATE resources SET status = 'unavailable' WHERE id = ?",
+                        (raced,),
+                    )
+
+            bind = db.get_bind()
+            event.listen(bind, "before_cursor_execute", _race)
+            try:
+                transitions = AvailabilityEngine(db).reconcile_transitions()
+            finally:
+                event.remove(bind, "before_cursor_execute", _race)
+
+            assert transitions
+            assert raced not in {t["resource_id"] for t in transitions}
+            db.expire_all()
+            assert db.get(models.Resource, raced).status == "unavailable"
+        finally:
+            db.close()
+
+    def test_run_reconcile_uses_own_session(self, test_db, test_user):
+        """A scheduled tick opens, commits and closes its own session"""
+        db = test_db()
+        try:
+            _seed(db, 9, test_user)
+        finally:
+            db.close()
+
+        transitions = run_reconcile(test_db)
+
+        assert transitions
+        assert run_reconcile(test_db) == []
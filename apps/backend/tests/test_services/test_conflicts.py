@@ -0,0 +1,199 @@
+"""Unit tests for shared conflict detection and the interval index."""
+
+import random
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import event, inspect
+
+from app import models
+from app.bulk_service import BulkReservationService
+from app.conflicts import IntervalIndex, find_conflicts, has_conflict
+from tests.test_services.test_availability_engine import count_queries
+
+
+def _book(db, user, resource, start, hours=1, status="active"):
+    """Add a reservation and return it."""
+    reservation = models.Reservation(
+        user_id=user.id,
+        resource_id=resource.id,
+        start_time=start,
+        end_time=start + timedelta(hours=hours),
+        status=status,
+    )
+    db.add(reservation)
+    db.commit()
+    return reservation
+
+
+class TestConflictQueries:
+    """Test the SQL conflict checks"""
+
+    def test_overlap_boundaries(self, test_db, test_user, test_resource):
+        """Touching intervals do not conflict, overlapping ones do"""
+        db = test_db()
+        try:
+            start = datetime.now(UTC).replace(microsecond=0) + timedelta(days=1)
+            booked = _book(db, test_user, test_resource, start, hours=2)
+            _book(db, test_user, test_resource, start, status="cancelled")
+
+            end = start + timedelta(hours=2)
+            assert has_conflict(db, test_resource.id, start, end)
+            assert has_conflict(
+                db, test_resource.id, end - timedelta(minutes=1), end + timedelta(1)
+            )
+            assert not has_conflict(db, test_resource.id, end, end + timedelta(1))
+            assert not has_conflict(
+                db, test_resource.id, start - timedelta(hours=1), start
+            )
+
+            conflicts = find_conflicts(db, test_resource.id, start, end)
+            assert [c.id for c in conflicts] == [booked.id]
+        finally:
+            db.close()
+
+    def test_composite_index_exists(self, test_db):
+        """The conflict index covers resource, status and both bounds"""
+        db = test_db()
+        try:
+            indexes = {
+                index["name"]: index["column_names"]
+                for index in inspect(db.get_bind()).get_indexes("reservations")
+            }
+            assert indexes["ix_reservations_conflict"] == [
+                "resource_id",
+                "status",
+                "start_time",
+                "end_time",
+            ]
+        finally:
+            db.close()
+
+
+class TestIntervalIndex:
+    """Test the in-process interval index"""
+
+    def test_matches_brute_force(self):
+        """Random queries agree with a linear overlap scan"""
+        rng = random.Random(7)
+        base = datetime(2030, 1, 1, tzinfo=UTC)
+        index = IntervalIndex()
+        stored = []
+        for ref in range(300):
+            start = base + timedelta(minutes=rng.randrange(0, 60 * 24 * 30))
+            end = start + timedelta(minutes=rng.randrange(15, 60 * 12))
+            index.add(1, start, end, ref)
+            stored.append((start, end, ref))
+
+        for _ in range(500):
+            start = base + timedelta(minutes=rng.randrange(0, 60 * 24 * 30))
+            end = start + timedelta(minutes=rng.randrange(1, 60 * 6))
+            expected = sorted((s, e, r) for s, e, r in stored if s < end and e > start)
+            assert sorted(index.conflicts(1, start, end)) == expected
+            assert index.overlaps(1, start, end) is bool(expected)
+
+        assert not index.overlaps(2, base, base + timedelta(days=365))
+
+    def test_load_uses_one_query(self, test_db, test_user, test_resource):
+        """Loading many resources costs a single query"""
+        db = test_db()
+        try:
+            start = datetime.now(UTC) + timedelta(days=1)
+            for day in range(5):
+                _book(db, test_user, test_resource, start + timedelta(days=day))
+
+            with count_queries(db) as counter:
+                index = IntervalIndex.load(
+                    db, [test_resource.id, 999], start, start + timedelta(days=10)
+                )
+            assert counter["count"] == 1
+            assert index.overlaps(
+                test_resource.id,
+                start + timedelta(days=2, minutes=30),
+                start + timedelta(days=2, hours=2),
+            )
+            assert not index.overlaps(
+                test_resource.id,
+                start + timedelta(days=2, hours=1),
+                start + timedelta(days=2, hours=3),
+            )
+        finally:
+            db.close()
+
+
+class TestBulkCreateConflicts:
+    """Test bulk creation against the interval index"""
+
+    def test_batch_rows_conflict_with_each_other(
+        self, test_db, test_user, test_resource
+    ):
+        """A later row clashing with an earlier row of the batch fails"""
+        db = test_db()
+        try:
+            start = datetime.now(UTC) + timedelta(days=1)
+            rows = [
+                {
+                    "resource_id": test_resource.id,
+                    "start_time": start.isoformat(),
+                    "end_time": (start + timedelta(hours=1)).isoformat(),
+                },
+                {
+                    "resource_id": test_resource.id,
+                    "start_time": (start + timedelta(minutes=30)).isoformat(),
+                    "end_time": (start + timedelta(hours=2)).isoformat(),
+                },
+            ]
+            results = BulkReservationService(db).bulk_create_reservations(
+                rows, test_user.id
+            )
+            assert results["failed"] == 1
+            assert results["errors"][0]["index"] == 1
+            assert "conflicts" in results["errors"][0]["error"]
+        finally:
+            db.close()
+
+    def test_conflict_queries_do_not_scale_with_rows(
+        self, test_db, test_user, test_resource
+    ):
+        """Benchmark: one conflict load per batch instead of one per row"""
+        counts = {}
+        for size in (5, 40):
+            db = test_db()
+            try:
+                db.query(models.Reservation).delete()
+                db.commit()
+                start = datetime.now(UTC) + timedelta(days=1)
+                rows = [
+                    {
+                        "resource_id": test_resource.id,
+                        "start_time": (start + timedelta(hours=i)).isoformat(),
+                        "end_time": (
+                            start + timedelta(hours=i, minutes=30)
+                        ).isoformat(),
+                    }
+                    for i in range(size)
+                ]
+                statements = []
+
+                def _record(conn, cursor, statement, *args, _out=statements):
+                    _out.append(statement)
+
+                bind = db.get_bind()
+                event.listen(bind, "before_cursor_execute", _record)
+                try:
+                    results = BulkReservationService(db).bulk_create_reservations(
+                        rows, test_user.id, dry_run=True
+                    )
+                finally:
+                    event.remove(bind, "before_cursor_execute", _record)
+
+                assert results["success"] == size
+                counts[size] = sum(
+                    1
+                    for statement in statements
+                    if statement.lstrip().upper().startswith("SELECT")
+                    and "FROM reservations" in statement
+                )
+            finally:
+                db.close()
+
+        assert counts[5] == counts[40] == 1
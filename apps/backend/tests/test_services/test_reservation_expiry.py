@@ -0,0 +1,109 @@
+"""Unit tests for the set-based reservation expiry sweeper."""
+
+from datetime import UTC, datetime, timedelta
+
+from app import models
+from app.core.metrics import metrics
+from app.reservation_expiry import expire_reservations, run_expiry
+
+
+def _book(db, user, resource, end, status="active"):
+    """Add a one-hour reservation ending at ``end`` and return its id."""
+    reservation = models.Reservation(
+        user_id=user.id,
+        resource_id=resource.id,
+        start_time=end - timedelta(hours=1),
+        end_time=end,
+        status=status,
+    )
+    db.add(reservation)
+    db.commit()
+    return reservation.id
+
+
+class TestExpireReservations:
+    """Test expiring finished reservations in batches"""
+
+    def test_expires_finished_active_reservations(
+        self, test_db, test_user, test_resource
+    ):
+        """Only active reservations that already ended are expired"""
+        db = test_db()
+        try:
+            now = datetime.now(UTC).replace(microsecond=0)
+            past = [
+                _book(db, test_user, test_resource, now - timedelta(hours=h))
+                for h in range(1, 6)
+            ]
+            future = _book(db, test_user, test_resource, now + timedelta(hours=2))
+            cancelled = _book(
+                db, test_user, test_resource, now - timedelta(hours=8), "cancelled"
+            )
+
+            run = expire_reservations(db, now, batch_size=2)
+
+            assert run.expired == 5
+            assert run.batches == 3
+            db.expire_all()
+            statuses = {r.id: r.status for r in db.query(models.Reservation).all()}
+            assert all(statuses[rid] == "expired" for rid in past)
+            assert statuses[future] == "active"
+            assert statuses[cancelled] == "cancelled"
+
+            history = db.query(models.ReservationHistory).all()
+            assert sorted(h.reservation_id for h in history) == sorted(past)
+            assert {h.action for h in history} == {"expired"}
+            assert {h.user_id for h in history} == {test_user.id}
+        finally:
+            db.close()
+
+    def test_exact_batch_multiple_ends_with_empty_batch(
+        self, test_db, test_user, test_resource
+    ):
+        """A full last batch is followed by one that finds nothing"""
+        db = test_db()
+        try:
+            now = datetime.now(UTC).replace(microsecond=0)
+            for h in range(1, 5):
+                _book(db, test_user, test_resource, now - timedelta(hours=h))
+
+            run = expire_reservations(db, now, batch_size=2)
+
+            assert (run.expired, run.batches) == (4, 3)
+            assert expire_reservations(db, now, batch_size=2).expired == 0
+        finally:
+            db.close()
+
+    def test_custom_details(self, test_db, test_user, test_resource):
+        """History entries carry the given details"""
+        db = test_db()
+        try:
+            now = datetime.now(UTC).replace(microsecond=0)
+            _book(db, test_user, test_resource, now - timedelta(hours=1))
+
+            expire_reservations(db, now, details="Manually expired")
+
+            history = db.query(models.ReservationHistory).one()
+            assert history.details == "Manually expired"
+        finally:
+            db.close()
+
+    def test_run_expiry_records_metrics(self, test_db, test_user, test_resource):
+        """A scheduled run uses its own session and updates the metrics"""
+        db = test_db()
+        try:
+            _book(
+                db,
+                test_user,
+                test_resource,
+                datetime.now(UTC).replace(microsecond=0) - timedelta(hours=1),
+            )
+        finally:
+            db.close()
+        runs = metrics.expiry.runs
+
+        run = run_expiry(test_db)
+
+        assert run.expired == 1
+        assert metrics.expiry.runs == runs + 1
+        assert metrics.expiry.last_run_expired == 1
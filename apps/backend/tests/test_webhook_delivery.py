@@ -0,0 +1,675 @@
+"""Tests for the pooled webhook delivery engine.
+
+Author: Sylvester-Francis
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app import models
+from app.webhook_delivery import DeliveryJob, WebhookDeliveryEngine
+from app.webhook_service import MAX_RETRIES, verify_signature
+
+
+def _create_deliveries(db, urls, event_type="reservation.created"):
+    """Create a webhook and a pending delivery per URL, returning jobs."""
+    user = models.User(username=f"engine_user_{len(urls)}", hashed_password="test")
+    db.add(user)
+    db.commit()
+
+    jobs = []
+    for index, url in enumerate(urls):
+        webhook = models.Webhook(
+            user_id=user.id,
+            url=url,
+            secret="engine_secret_12345678901234567890",
+            events=[event_type],
+        )
+        delivery = models.WebhookDelivery(
+            webhook=webhook,
+            event_type=event_type,
+            payload={"event": event_type, "data": {"n": index}},
+            status="pending",
+        )
+        db.add_all([webhook, delivery])
+        db.flush()
+        jobs.append(DeliveryJob.from_models(webhook, delivery))
+    db.commit()
+    return jobs
+
+
+class TestWebhookDeliveryEngine:
+    """Tests for WebhookDeliveryEngine."""
+
+    @pytest.mark.asyncio
+    async def test_signed_delivery_with_batched_status_writes(self, test_db):
+        """Test that deliveries are signed and outcomes are written in one batch."""
+        received = []
+
+        def handler(request):
+            received.append(request)
+            return httpx.Response(200, text="ok")
+
+        db = test_db()
+        try:
+            jobs = _create_deliveries(
+                db, [f"https://hooks.example.com/{n}" for n in range(5)]
+            )
+            engine = WebhookDeliveryEngine(
+                session_factory=test_db,
+                flush_interval=60,
+                transport=httpx.MockTransport(handler),
+            )
+            engine.start()
+            assert all(engine.submit(job) for job in jobs)
+            await engine.drain()
+
+            assert await engine.flush() == 5
+            await engine.stop()
+
+            request = received[0]
+            body = request.content.decode()
+            assert verify_signature(
+                body, jobs[0].secret, request.headers["X-Webhook-Signature"]
+            )
+            assert request.headers["User-Agent"] == "ResourceReserver-Webhook/1.0"
+            assert json.loads(body)["event"] == "reservation.created"
+
+            db.expire_all()
+            deliveries = db.query(models.WebhookDelivery).all()
+            assert {d.status for d in deliveries} == {"delivered"}
+            assert all(d.status_code == 200 and d.delivered_at for d in deliveries)
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_delivery_schedules_retry(self, test_db):
+        """Test that a non-2xx response records the failure and a retry time."""
+        db = test_db()
+        try:
+            (job,) = _create_deliveries(db, ["https://down.example.com/hook"])
+            engine = WebhookDeliveryEngine(
+                session_factory=test_db,
+                transport=httpx.MockTransport(lambda request: httpx.Response(503)),
+            )
+            engine.submit(job)
+            await engine.stop()
+
+            db.expire_all()
+            delivery = db.get(models.WebhookDelivery, job.delivery_id)
+            assert delivery.status == "pending"
+            assert delivery.retry_count == 1
+            assert delivery.next_retry_at is not None
+            assert delivery.error_message == "HTTP 503"
+            assert delivery.retry_count < MAX_RETRIES
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    async def test_transport_error_is_recorded(self, test_db):
+        """Test that connection errors are recorded on the delivery."""
+
+        def handler(request):
+            raise httpx.ConnectError("connection refused")
+
+        db = test_db()
+        try:
+            (job,) = _create_deliveries(db, ["https://unreachable.example.com/"])
+            engine = WebhookDeliveryEngine(
+                session_factory=test_db, transport=httpx.MockTransport(handler)
+            )
+            result = await engine.send(job)
+            await engine.stop()
+
+            assert result.success is False
+            assert "connection refused" in result.error_message
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    async def test_global_and_per_endpoint_caps(self, test_db):
+        """Test that concurrency never exceeds the global or per-endpoint cap."""
+        in_flight = {"total": 0, "peak": 0}
+        per_host: dict[str, int] = {}
+        per_host_peak: dict[str, int] = {}
+
+        async def handler(request):
+            host = request.url.host
+            in_flight["total"] += 1
+            per_host[host] = per_host.get(host, 0) + 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["total"])
+            per_host_peak[host] = max(per_host_peak.get(host, 0), per_host[host])
+            await asyncio.sleep(0.01)
+            in_flight["total"] -= 1
+            per_host[host] -= 1
+            return httpx.Response(204)
+
+        db = test_db()
+        try:
+            urls = [
+                f"https://{host}.example.com/{n}" for host in "ab" for n in range(10)
+            ]
+            urls += [f"https://c.example.com/{n}" for n in range(2)]
+            jobs = _create_deliveries(db, urls)
+            engine = WebhookDeliveryEngine(
+                session_factory=test_db,
+                max_concurrency=3,
+                max_per_endpoint=2,
+                transport=httpx.MockTransport(handler),
+            )
+            for job in jobs:
+                engine.submit(job)
+            await engine.stop()
+
+            assert in_flight["peak"] == 3
+            assert max(per_host_peak.values()) == 2
+            assert engine._endpoints == {}
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    async def test_backlog_limit_leaves_delivery_pending(self, test_db):
+        """Test that submit refuses work beyond max_pending."""
+        release = asyncio.Event()
+
+        async def handler(request):
+            await release.wait()
+            return httpx.Response(200)
+
+        db = test_db()
+        try:
+            jobs = _create_deliveries(
+                db, ["https://slow.example.com/1", "https://slow.example.com/2"]
+            )
+            engine = WebhookDeliveryEngine(
+                session_factory=test_db,
+                max_pending=1,
+                transport=httpx.MockTransport(handler),
+            )
+            assert engine.submit(jobs[0]) is True
+            assert engine.submit(jobs[1]) is False
+            release.set()
+            await engine.stop()
+
+            db.expire_all()
+            assert db.get(models.WebhookDelivery, jobs[1].delivery_id).status == (
+                "pending"
+            )
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_outcome_write_is_retried(self, test_db, monkeypatch):
+        """Test that outcomes survive a failed write and go out on the next."""
+        db = test_db()
+        try:
+            (job,) = _create_deliveries(db, ["https://flaky-db.example.com/hook"])
+            engine = WebhookDeliveryEngine(
+                session_factory=test_db,
+                flush_interval=60,
+                transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+            )
+            engine.start()
+            engine.submit(job)
+            await engine.drain()
+
+            write_results = engine._write_results
+
+            def fail(batch):
+                raise RuntimeError("database unavailable")
+
+            monkeypatch.setattr(engine, "_write_results", fail)
+            with pytest.raises(RuntimeError):
+                await engine.flush()
+            monkeypatch.setattr(engine, "_write_results", write_results)
+
+            assert await engine.flush() == 1
+            await engine.stop()
+
+            db.expire_all()
+            assert db.get(models.WebhookDelivery, job.delivery_id).status == (
+                "delivered"
+            )
+        finally:
+            db.close()
+
+    def test_new_loop_keeps_batched_events_and_closes_old_client(self, test_db):
+        """Test that moving to a new loop sends buffered batches."""
+        from app.webhook_delivery import BatchTarget
+
+        received = []
+
+        def handler(request):
+            received.append(request)
+            return httpx.Response(200)
+
+        db = test_db()
+        try:
+            (job,) = _create_deliveries(db, ["https://moved.example.com/hook"])
+            webhook_id = db.get(models.WebhookDelivery, job.delivery_id).webhook_id
+        finally:
+            db.close()
+        engine = WebhookDeliveryEngine(
+            session_factory=test_db, transport=httpx.MockTransport(handler)
+        )
+        target = BatchTarget(webhook_id, job.url, job.secret, 100, window_ms=60000)
+
+        async def buffer_events():
+            engine.enqueue(target, [{"event": "reservation.created"}])
+            return engine._client
+
+        async def restart():
+            engine.start()
+            await engine.drain()
+            await engine.stop()
+
+        first_loop = asyncio.new_event_loop()
+        try:
+            old_client = first_loop.run_until_complete(buffer_events())
+            # Leave the first loop as a finished request would
+            engine._flusher.cancel()
+            first_loop.run_until_complete(asyncio.sleep(0))
+        finally:
+            first_loop.close()
+        second_loop = asyncio.new_event_loop()
+        try:
+            second_loop.run_until_complete(restart())
+        finally:
+            second_loop.close()
+
+        assert len(received) == 1
+        assert received[0].headers["X-Webhook-Batch-Size"] == "1"
+        assert old_client.is_closed
+
+
+class TestWebhookRetryWorker:
+    """Tests for claiming and re-sending due deliveries."""
+
+    def test_claim_is_exclusive_and_skips_future_retries(self, test_db):
+        """Test that claimed, future and inactive deliveries are not claimed."""
+        from datetime import UTC, datetime, timedelta
+
+        from app.webhook_delivery import claim_due_deliveries
+
+        db = test_db()
+        try:
+            jobs = _create_deliveries(
+                db, [f"https://retry.example.com/{n}" for n in range(4)]
+            )
+            now = datetime.now(UTC)
+            future = db.get(models.WebhookDelivery, jobs[1].delivery_id)
+            future.next_retry_at = now + timedelta(minutes=5)
+            inactive = db.get(models.WebhookDelivery, jobs[2].delivery_id)
+            inactive.webhook.is_active = False
+            db.commit()
+
+            claimed = claim_due_deliveries(db, limit=10, now=now)
+            assert {job.delivery_id for job in claimed} == {
+                jobs[0].delivery_id,
+                jobs[3].delivery_id,
+            }
+            assert claimed[0].url == jobs[0].url
+            assert claim_due_deliveries(db, limit=10, now=now) == []
+
+            # An abandoned claim is taken over once the lease expires
+            later = now + timedelta(seconds=301)
+            reclaimed = claim_due_deliveries(db, limit=10, now=later)
+            assert {job.delivery_id for job in reclaimed} == {
+                jobs[0].delivery_id,
+                jobs[1].delivery_id,
+                jobs[3].delivery_id,
+            }
+        finally:
+            db.close()
+
+    def test_concurrent_claims_never_overlap(self, test_db):
+        """Test that workers claiming in parallel get disjoint batches."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from app.webhook_delivery import claim_due_deliveries
+
+        db = test_db()
+        try:
+            jobs = _create_deliveries(
+                db, [f"https://parallel.example.com/{n}" for n in range(40)]
+            )
+        finally:
+            db.close()
+
+        def claim(_):
+            session = test_db()
+            try:
+                claimed = []
+                while batch := claim_due_deliveries(session, limit=3):
+                    claimed.extend(job.delivery_id for job in batch)
+                return claimed
+            finally:
+                session.close()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(claim, range(4)))
+
+        claimed = [delivery_id for batch in results for delivery_id in batch]
+        assert len(claimed) == len(set(claimed))
+        assert set(claimed) == {job.delivery_id for job in jobs}
+
+    @pytest.mark.asyncio
+    async def test_run_once_resends_and_reports_queue(self, test_db):
+        """Test that the worker re-sends due retries and sleeps until the next."""
+        from datetime import UTC, datetime, timedelta
+
+        from app.core.metrics import metrics
+        from app.webhook_delivery import WebhookRetryWorker
+
+        metrics.reset()
+        db = test_db()
+        try:
+            due, later = _create_deliveries(
+                db, ["https://retry.example.com/due", "https://retry.example.com/later"]
+            )
+            row = db.get(models.WebhookDelivery, due.delivery_id)
+            row.retry_count = 1
+            row.next_retry_at = datetime.now(UTC) - timedelta(seconds=20)
+            db.get(models.WebhookDelivery, later.delivery_id).next_retry_at = (
+                datetime.now(UTC) + timedelta(seconds=10)
+            )
+            db.commit()
+
+            engine = WebhookDeliveryEngine(
+                session_factory=test_db,
+                transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+            )
+            worker = WebhookRetryWorker(
+                engine, session_factory=test_db, batch_size=10, max_sleep=30
+            )
+            delay = await worker.run_once()
+            await engine.stop()
+
+            assert 0 < delay <= 10
+            assert metrics.webhooks.retries_claimed == 1
+            assert metrics.webhooks.retry_queue_depth == 1
+            assert metrics.webhooks.retry_lag_seconds == 0
+
+            db.expire_all()
+            assert db.get(models.WebhookDelivery, due.delivery_id).status == (
+                "delivered"
+            )
+            assert db.get(models.WebhookDelivery, later.delivery_id).status == (
+                "pending"
+            )
+        finally:
+            db.close()
+            metrics.reset()
+
+    @pytest.mark.asyncio
+    async def test_inactive_webhook_does_not_keep_worker_busy(self, test_db):
+        """Test that an overdue delivery of a disabled webhook is ignored."""
+        from datetime import UTC, datetime, timedelta
+
+        from app.core.metrics import metrics
+        from app.webhook_delivery import MIN_POLL_SECONDS, WebhookRetryWorker
+
+        metrics.reset()
+        db = test_db()
+        try:
+            (job,) = _create_deliveries(db, ["https://disabled.example.com/hook"])
+            row = db.get(models.WebhookDelivery, job.delivery_id)
+            row.next_retry_at = datetime.now(UTC) - timedelta(minutes=5)
+            row.webhook.is_active = False
+            db.commit()
+
+            engine = WebhookDeliveryEngine(session_factory=test_db)
+            worker = WebhookRetryWorker(
+                engine, session_factory=test_db, batch_size=10, max_sleep=30
+            )
+            delay = await worker.run_once()
+
+            assert delay >= MIN_POLL_SECONDS
+            assert metrics.webhooks.retry_queue_depth == 0
+            assert metrics.webhooks.retry_lag_seconds == 0
+        finally:
+            db.close()
+            metrics.reset()
+
+    @pytest.mark.asyncio
+    async def test_failed_send_wakes_worker(self, test_db):
+        """Test that a retry scheduled by the engine wakes the worker early."""
+        from app.webhook_delivery import WebhookRetryWorker
+
+        db = test_db()
+        try:
+            (job,) = _create_deliveries(db, ["https://flaky.example.com/"])
+            engine = WebhookDeliveryEngine(
+                session_factory=test_db,
+                flush_interval=60,
+                transport=httpx.MockTransport(lambda request: httpx.Response(500)),
+            )
+            worker = WebhookRetryWorker(engine, session_factory=test_db)
+            worker.start()
+            assert engine.on_retry_scheduled == worker.wake
+            await worker.stop()
+            assert engine.on_retry_scheduled is None
+
+            woken = []
+            engine.on_retry_scheduled = lambda: woken.append(True)
+            engine.submit(job)
+            await engine.drain()
+            await engine.flush()
+            await engine.stop()
+
+            assert woken == [True]
+        finally:
+            db.close()
+
+
+class TestWebhookBatching:
+    """Tests for opt-in batched webhook delivery."""
+
+    @staticmethod
+    def _create_batching_setup(db, batch_max_items):
+        """Create a resource, a batching and a per-event webhook."""
+        from app.webhook_service import WebhookService
+
+        user = models.User(username="batch_user", hashed_password="test")
+        resource = models.Resource(name="Batch Room", available=True)
+        db.add_all([user, resource])
+        db.commit()
+
+        service = WebhookService(db)
+        batching = service.create_webhook(
+            user_id=user.id,
+            url="https://bulk.example.com/hook",
+            events=["reservation.created"],
+            batch_max_items=batch_max_items,
+            batch_window_ms=50,
+        )
+        single = service.create_webhook(
+            user_id=user.id,
+            url="https://single.example.com/hook",
+            events=["reservation.created"],
+        )
+        return user, resource, batching, single
+
+    @staticmethod
+    def _reservation_rows(resource, count):
+        from datetime import UTC, datetime, timedelta
+
+        base = datetime.now(UTC) + timedelta(days=1)
+        return [
+            {
+                "resource_id": resource.id,
+                "start_time": base + timedelta(hours=n),
+                "end_time": base + timedelta(hours=n, minutes=30),
+            }
+            for n in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_events_are_grouped_into_signed_arrays(self, test_db):
+        """Test that full batches go out at once and the rest after the window."""
+        from app.webhook_delivery import BATCH_EVENT_TYPE, BatchTarget
+
+        received = []
+
+        def handler(request):
+            received.append(request)
+            return httpx.Response(200)
+
+        db = test_db()
+        try:
+            user = models.User(username="batch_engine_user", hashed_password="test")
+            db.add(user)
+            db.commit()
+            webhook = models.Webhook(
+                user_id=user.id,
+                url="https://bulk.example.com/hook",
+                secret="batch_secret_12345678901234567890",
+                events=["reservation.created"],
+                batch_max_items=3,
+                batch_window_ms=60000,
+            )
+            db.add(webhook)
+            db.commit()
+
+            engine = WebhookDeliveryEngine(
+                session_factory=test_db, transport=httpx.MockTransport(handler)
+            )
+            target = BatchTarget.from_webhook(webhook)
+            engine.enqueue(
+                target, [{"event": "reservation.created", "n": n} for n in range(7)]
+            )
+            await engine.drain()
+            assert [r.headers["X-Webhook-Batch-Size"] for r in received] == ["3", "3"]
+
+            # The partial batch waits for its window; shutdown sends it
+            await engine.stop()
+
+            assert len(received) == 3
+            assert received[2].headers["X-Webhook-Batch-Size"] == "1"
+            for request in received:
+                body = request.content.decode()
+                assert request.headers["X-Webhook-Event"] == BATCH_EVENT_TYPE
+                assert verify_signature(
+                    body, webhook.secret, request.headers["X-Webhook-Signature"]
+                )
+            # Batches are sent concurrently, so they may arrive in any order
+            sent = [item["n"] for r in received for item in json.loads(r.content)]
+            assert sorted(sent) == list(range(7))
+
+            deliveries = db.query(models.WebhookDelivery).all()
+            assert len(deliveries) == 3
+            assert {d.status for d in deliveries} == {"delivered"}
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_is_sent_when_window_elapses(self, test_db):
+        """Test that a partial batch does not wait for more events forever."""
+        from app.webhook_delivery import BatchTarget
+
+        received = []
+
+        def handler(request):
+            received.append(request)
+            return httpx.Response(200)
+
+        db = test_db()
+        try:
+            (job,) = _create_deliveries(db, ["https://window.example.com/hook"])
+            webhook_id = db.get(models.WebhookDelivery, job.delivery_id).webhook_id
+            engine = WebhookDeliveryEngine(
+                session_factory=test_db, transport=httpx.MockTransport(handler)
+            )
+            target = BatchTarget(webhook_id, job.url, job.secret, 100, window_ms=20)
+            engine.enqueue(target, [{"event": "reservation.created"}])
+            assert received == []
+
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                if received:
+                    break
+            await engine.drain()
+            assert len(received) == 1
+            await engine.stop()
+        finally:
+            db.close()
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_dispatches_through_running_engine(
+        self, test_db, monkeypatch
+    ):
+        """Test that bulk creation sends batched arrays via the engine."""
+        from app import webhook_delivery
+        from app.bulk_service import BulkReservationService
+
+        received = []
+
+        def handler(request):
+            received.append(request)
+            return httpx.Response(200)
+
+        engine = WebhookDeliveryEngine(
+            session_factory=test_db, transport=httpx.MockTransport(handler)
+        )
+        monkeypatch.setattr(webhook_delivery, "_engine", engine)
+
+        db = test_db()
+        try:
+            user, resource, batching, single = self._create_batching_setup(db, 10)
+            engine.start()
+
+            results = await asyncio.to_thread(
+                BulkReservationService(db).bulk_create_reservations,
+                self._reservation_rows(resource, 25),
+                user.id,
+            )
+            assert results["success"] == 25
+
+            await asyncio.sleep(0.05)
+            await engine.stop()
+
+            hosts = [request.url.host for request in received]
+            assert hosts.count("single.example.com") == 25
+            assert hosts.count("bulk.example.com") == 3
+            sizes = sorted(
+                int(r.headers["X-Webhook-Batch-Size"])
+                for r in received
+                if r.url.host == "bulk.example.com"
+            )
+            assert sizes == [5, 10, 10]
+        finally:
+            db.close()
+
+    def test_bulk_cancel_without_engine_leaves_deliveries_for_retry(self, test_db):
+        """Test that events are persisted for the retry worker without an engine."""
+        from app.bulk_service import BulkReservationService
+        from app.webhook_delivery import BATCH_EVENT_TYPE
+
+        db = test_db()
+        try:
+            user, resource, batching, single = self._create_batching_setup(db, 4)
+            service = BulkReservationService(db)
+            # Created events go nowhere: subscribe both webhooks to cancellations
+            for webhook in (batching, single):
+                webhook.events = ["reservation.cancelled"]
+            db.commit()
+
+            created = service.bulk_create_reservations(
+                self._reservation_rows(resource, 6), user.id
+            )
+            ids = [row["reservation_id"] for row in created["created"]]
+            results = service.bulk_cancel_reservations(ids, user.id, reason="import")
+            assert results["success"] == 6
+
+            deliveries = db.query(models.WebhookDelivery).all()
+            batched = [d for d in deliveries if d.webhook_id == batching.id]
+            assert sorted(len(d.payload) for d in batched) == [2, 4]
+            assert {d.event_type for d in batched} == {BATCH_EVENT_TYPE}
+            assert len([d for d in deliveries if d.webhook_id == single.id]) == 6
+            assert all(d.claimed_at is None for d in deliveries)
+            assert batched[0].payload[0]["data"]["reason"] == "import"
+        finally:
+            db.close()
@@ -304,6 +304,158 @@ class TestWebhookServiceDB:
         db.close()
 
 
+class TestWebhookSubscriptionIndex:
+    """Tests for the normalized webhook event subscription lookup."""
+
+    @staticmethod
+    def _count_statements(db):
+        from sqlalchemy import event
+
+        statements = []
+
+        def before_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", before_execute)
+        return statements, lambda: event.remove(
+            db.get_bind(), "before_cursor_execute", before_execute
+        )
+
+    def test_subscriptions_follow_events(self, test_db):
+        """Test that create, update and delete keep subscriptions in sync."""
+        from app import models
+        from app.webhook_service import WebhookService
+
+        db = test_db()
+        try:
+            user = models.User(username="subscription_user", hashed_password="test")
+            db.add(user)
+            db.commit()
+
+            service = WebhookService(db)
+            webhook = service.create_webhook(
+                user_id=user.id,
+                url="https://example.com/hook",
+                events=["reservation.created", "resource.updated"],
+            )
+            assert sorted(s.event_type for s in webhook.subscriptions) == [
+                "reservation.created",
+                "resource.updated",
+            ]
+
+            service.update_webhook(
+                webhook.id, events=["resource.updated", "resource.deleted"]
+            )
+            assert service.get_webhooks_for_event("reservation.created") == []
+            assert [
+                w.id for w in service.get_webhooks_for_event("resource.deleted")
+            ] == [webhook.id]
+            assert db.query(models.WebhookSubscription).count() == 2
+
+            service.update_webhook(webhook.id, is_active=False)
+            assert service.get_webhooks_for_event("resource.updated") == []
+
+            service.delete_webhook(webhook.id)
+            assert db.query(models.WebhookSubscription).count() == 0
+        finally:
+            db.close()
+
+    def test_dispatch_event_only_targets_subscribers(self, test_db, monkeypatch):
+        """Test that dispatch_event creates deliveries for subscribers only."""
+        import asyncio
+
+        import httpx
+
+        from app import models, webhook_delivery, webhook_service
+
+        engine = webhook_delivery.WebhookDeliveryEngine(
+            session_factory=test_db,
+            transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+        )
+        monkeypatch.setattr(webhook_delivery, "_engine", engine)
+
+        db = test_db()
+        try:
+            user = models.User(username="dispatch_sub_user", hashed_password="test")
+            db.add(user)
+            db.commit()
+
+            service = webhook_service.WebhookService(db)
+            subscribed = service.create_webhook(
+                user_id=user.id,
+                url="https://example.com/a",
+                events=["reservation.created"],
+            )
+            service.create_webhook(
+                user_id=user.id,
+                url="https://example.com/b",
+                events=["resource.updated"],
+            )
+
+            async def run():
+                count = await webhook_service.dispatch_event(
+                    db, "reservation.created", {"reservation_id": 1}
+                )
+                await engine.stop()
+                return count
+
+            assert asyncio.run(run()) == 1
+            deliveries = db.query(models.WebhookDelivery).all()
+            assert [d.webhook_id for d in deliveries] == [subscribed.id]
+            assert deliveries[0].status == "delivered"
+        finally:
+            db.close()
+
+    def test_lookup_benchmark_10k_webhooks(self, test_db):
+        """Benchmark subscriber lookup across 10k webhooks and 20 event types."""
+        import time
+
+        from app import models
+        from app.webhook_service import WebhookService
+
+        event_types = [f"bench.event_{n}" for n in range(20)]
+        db = test_db()
+        try:
+            user = models.User(username="webhook_bench_user", hashed_password="test")
+            db.add(user)
+            db.commit()
+
+            db.add_all(
+                models.Webhook(
+                    user_id=user.id,
+                    url=f"https://example.com/hook/{i}",
+                    secret="bench_secret_12345678901234567890",
+                    events=[event_types[i % 20], event_types[(i + 7) % 20]],
+                    is_active=i % 10 != 0,
+                )
+                for i in range(10_000)
+            )
+            db.commit()
+            db.expunge_all()
+
+            service = WebhookService(db)
+            statements, stop = self._count_statements(db)
+            try:
+                started = time.perf_counter()
+                matches = [service.get_webhooks_for_event(e) for e in event_types]
+                elapsed = time.perf_counter() - started
+            finally:
+                stop()
+
+            # One indexed query per event type, returning only active subscribers
+            assert len(statements) == len(event_types)
+            for n, webhooks in enumerate(matches):
+                expected = {
+                    i
+                    for i in range(10_000)
+                    if i % 10 != 0 and n in (i % 20, (i + 7) % 20)
+                }
+                assert {int(w.url.rsplit("/", 1)[1]) for w in webhooks} == expected
+            print(f"20 subscriber lookups over 10k webhooks: {elapsed * 1000:.1f} ms")
+        finally:
+            db.close()
+
+
 class TestWebhookEndpoints:
     """Tests for webhook API endpoints."""
 
@@ -338,6 +490,33 @@ class TestWebhookEndpoints:
         assert data["events"] == ["reservation.created"]
         assert data["is_active"] is True
 
+    def test_create_and_disable_batched_webhook(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """Test opting a webhook into batched delivery and back out."""
+        response = client.post(
+            "/api/v1/webhooks/",
+            headers=auth_headers,
+            json={
+                "url": "https://example.com/bulk",
+                "events": ["reservation.created"],
+                "batch_max_items": 50,
+                "batch_window_ms": 500,
+            },
+        )
+        assert response.status_code == 201
+        data = response.json()
+        assert data["batch_max_items"] == 50
+        assert data["batch_window_ms"] == 500
+
+        response = client.patch(
+            f"/api/v1/webhooks/{data['id']}",
+            headers=auth_headers,
+            json={"batch_max_items": 0},
+        )
+        assert response.status_code == 200
+        assert response.json()["batch_max_items"] is None
+
     def test_create_webhook_invalid_event(self, client: TestClient, auth_headers: dict):
         """Test creating webhook with invalid event type."""
         response = client.post(
@@ -1,9 +1,20 @@
 """WebSocket endpoint tests."""
 
+import asyncio
+import json
+
 import anyio
 import pytest
+from starlette import status
 from starlette.websockets import WebSocketDisconnect
 
+from app.core.metrics import metrics
+from app.websocket import (
+    BroadcastBus,
+    ConnectionManager,
+    InMemoryBroadcastBus,
+    RedisBroadcastBus,
+)
 from app.websocket import manager as ws_manager
 
 
@@ -31,3 +42,308 @@ def test_websocket_broadcast_to_user(client, test_user):
         message = websocket.receive_json()
         assert message["type"] == "test_event"
         assert message["payload"] == "hello"
+
+
+class FakeWebSocket:
+    """Records sent frames; optionally blocks or fails on send."""
+
+    def __init__(self, fail: bool = False, block: asyncio.Event | None = None):
+        self.sent: list[str] = []
+        self.fail = fail
+        self.block = block
+        self.closed_with: int | None = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.fail:
+            raise RuntimeError("socket is gone")
+        if self.block is not None:
+            await self.block.wait()
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+class TestConnectionManager:
+    """Tests for per-connection send queues."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_all_serializes_once_per_message(self):
+        manager = ConnectionManager(queue_size=8, send_timeout=1)
+        sockets = [FakeWebSocket() for _ in range(3)]
+        for user_id, socket in enumerate(sockets, start=1):
+            await manager.connect(socket, user_id)
+
+        await manager.broadcast_all({"type": "ping", "n": 1})
+        await asyncio.sleep(0.01)
+
+        assert all(s.sent == ['{"type":"ping","n":1}'] for s in sockets)
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_does_not_stall_others(self):
+        manager = ConnectionManager(queue_size=2, send_timeout=1)
+        slow = FakeWebSocket(block=asyncio.Event())
+        fast = FakeWebSocket()
+        await manager.connect(slow, 1)
+        await manager.connect(fast, 2)
+
+        for n in range(10):
+            await manager.broadcast_all({"n": n})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+
+        assert len(fast.sent) == 10
+        assert slow.closed_with == status.WS_1013_TRY_AGAIN_LATER
+        assert 1 not in manager.active_connections
+        assert manager.connection_count == 1
+
+    @pytest.mark.asyncio
+    async def test_burst_over_queue_size_keeps_healthy_client(self):
+        manager = ConnectionManager(queue_size=2, send_timeout=1)
+        socket = FakeWebSocket()
+        await manager.connect(socket, 1)
+
+        for n in range(5):
+            await manager.broadcast_all({"n": n})
+        await asyncio.sleep(0.01)
+
+        assert len(socket.sent) == 5
+        assert socket.closed_with is None
+        assert manager.connection_count == 1
+
+    @pytest.mark.asyncio
+    async def test_sustained_overflow_drops_client(self):
+        manager = ConnectionManager(queue_size=2, send_timeout=0.05)
+        slow = FakeWebSocket(block=asyncio.Event())
+        await manager.connect(slow, 1)
+        conn = manager.active_connections[1][slow]
+
+        for n in range(4):
+            await manager.broadcast_all({"n": n})
+        conn.full_since -= 0.05
+        await manager.broadcast_all({"n": 4})
+
+        await asyncio.sleep(0.01)
+
+        assert slow.closed_with == status.WS_1013_TRY_AGAIN_LATER
+        assert manager.connection_count == 0
+
+    @pytest.mark.asyncio
+    async def test_dead_socket_is_pruned(self):
+        manager = ConnectionManager(queue_size=8, send_timeout=1)
+        dead = FakeWebSocket(fail=True)
+        alive = FakeWebSocket()
+        await manager.connect(dead, 1)
+        await manager.connect(alive, 1)
+
+        await manager.broadcast_to_user(1, {"type": "hello"})
+        await asyncio.sleep(0.01)
+
+        assert alive.sent == ['{"type":"hello"}']
+        assert list(manager.active_connections[1]) == [alive]
+
+    def test_disconnect_outside_event_loop(self):
+        manager = ConnectionManager(queue_size=8, send_timeout=1)
+        socket = FakeWebSocket()
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(manager.connect(socket, 1))
+
+            manager.disconnect(socket, 1)
+
+            assert manager.connection_count == 0
+            loop.run_until_complete(asyncio.sleep(0))
+        finally:
+            loop.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_metrics(self):
+        metrics.reset()
+        manager = ConnectionManager(queue_size=8, send_timeout=1)
+        socket = FakeWebSocket(block=asyncio.Event())
+        await manager.connect(socket, 1)
+
+        await manager.broadcast_to_user(1, {"n": 1})
+        await manager.broadcast_to_user(1, {"n": 2})
+        await asyncio.sleep(0.01)
+
+        assert metrics.websocket.active_connections == 1
+        assert metrics.websocket.queued_messages == 1
+
+        manager.disconnect(socket, 1)
+
+        assert metrics.websocket.active_connections == 0
+        assert metrics.websocket.queued_messages == 0
+
+
+class TestBroadcastBus:
+    """Tests for broadcasting across workers."""
+
+    def test_incomplete_bus_cannot_be_instantiated(self):
+        class PublishOnly(BroadcastBus):
+            async def publish(self, envelope):
+                self._dispatch(envelope)
+
+        with pytest.raises(TypeError):
+            PublishOnly()
+
+    @pytest.mark.asyncio
+    async def test_shared_bus_reaches_other_workers(self):
+        bus = InMemoryBroadcastBus()
+        worker_a = ConnectionManager(queue_size=8, send_timeout=1, bus=bus)
+        worker_b = ConnectionManager(queue_size=8, send_timeout=1, bus=bus)
+        socket = FakeWebSocket()
+        await worker_b.connect(socket, 7)
+
+        await worker_a.broadcast_to_user(7, {"type": "reservation_created"})
+        await worker_a.broadcast_to_user(8, {"type": "not_for_7"})
+        await asyncio.sleep(0.01)
+
+        assert socket.sent == ['{"type":"reservation_created"}']
+
+    @pytest.mark.asyncio
+    async def test_redis_bus_routes_between_workers(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+
+        def make_worker():
+            client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+            bus = RedisBroadcastBus(client=client)
+            return ConnectionManager(queue_size=8, send_timeout=1, bus=bus)
+
+        worker_a, worker_b = make_worker(), make_worker()
+        await worker_a.start()
+        await worker_b.start()
+        socket_a, socket_b = FakeWebSocket(), FakeWebSocket()
+        await worker_a.connect(socket_a, 1)
+        await worker_b.connect(socket_b, 2)
+
+        try:
+            await worker_a.broadcast_all({"type": "resource_status_changed"})
+            for _ in range(50):
+                if socket_a.sent and socket_b.sent:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await worker_a.close()
+            await worker_b.close()
+
+        assert socket_a.sent == ['{"type":"resource_status_changed"}']
+        assert socket_b.sent == ['{"type":"resource_status_changed"}']
+
+    @pytest.mark.asyncio
+    async def test_redis_bus_delivers_locally_before_start(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        bus = RedisBroadcastBus(client=fakeredis.FakeAsyncRedis(decode_responses=True))
+        manager = ConnectionManager(queue_size=8, send_timeout=1, bus=bus)
+        socket = FakeWebSocket()
+        await manager.connect(socket, 1)
+
+        await manager.broadcast_to_user(1, {"n": 1})
+        await asyncio.sleep(0.01)
+
+        assert socket.sent == ['{"n":1}']
+
+
+class TestTopicSubscriptions:
+    """Tests for topic subscriptions and availability deltas."""
+
+    @staticmethod
+    def _decode(socket):
+        return [json.loads(text) for text in socket.sent]
+
+    @pytest.mark.asyncio
+    async def test_availability_delta_reaches_topic_subscribers_once(self):
+        manager = ConnectionManager(queue_size=8, send_timeout=1)
+        watcher, dashboard, other = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        for user_id, socket in enumerate((watcher, dashboard, other), start=1):
+            await manager.connect(socket, user_id)
+        manager.subscribe(watcher, 1, ["resource:5", "group:2"])
+        manager.subscribe(dashboard, 2, ["availability:summary"])
+        manager.subscribe(other, 3, ["resource:6"])
+
+        await manager.publish_availability(
+            [
+                {
+                    "resource_id": 5,
+                    "group_id": 2,
+                    "status": "in_use",
+                    "previous_status": "available",
+                    "available": True,
+                    "reason": "reservation_started",
+                }
+            ]
+        )
+        await asyncio.sleep(0.01)
+
+        assert len(watcher.sent) == 1
+        assert self._decode(dashboard)[0]["type"] == "availability_changed"
+        assert self._decode(dashboard)[0]["changes"][0]["status"] == "in_use"
+        assert other.sent == []
+
+    @pytest.mark.asyncio
+    async def test_availability_batch_is_one_message_per_subscriber(self):
+        manager = ConnectionManager(queue_size=2, send_timeout=1)
+        watcher, dashboard = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(watcher, 1)
+        await manager.connect(dashboard, 2)
+        manager.subscribe(watcher, 1, ["resource:3", "group:1"])
+        manager.subscribe(dashboard, 2, ["availability:summary"])
+
+        changes = [
+            {
+                "resource_id": resource_id,
+                "group_id": 1 if resource_id < 5 else None,
+                "status": "available",
+                "previous_status": "in_use",
+                "available": True,
+                "reason": "reservation_ended",
+            }
+            for resource_id in range(1, 21)
+        ]
+        await manager.publish_availability(changes)
+        await asyncio.sleep(0.01)
+
+        assert manager.connection_count == 2
+        [summary] = self._decode(dashboard)
+        assert len(summary["changes"]) == 20
+        [delta] = self._decode(watcher)
+        assert [c["resource_id"] for c in delta["changes"]] == [1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_client_subscribe_messages(self):
+        manager = ConnectionManager(queue_size=8, send_timeout=1)
+        socket = FakeWebSocket()
+        await manager.connect(socket, 1)
+
+        manager.handle_client_message(
+            socket, 1, '{"action": "subscribe", "topics": ["resource:1"]}'
+        )
+        manager.handle_client_message(
+            socket, 1, '{"action": "subscribe", "topics": ["user:2"]}'
+        )
+        manager.handle_client_message(socket, 1, "ping")
+        manager.handle_client_message(
+            socket, 1, '{"action": "unsubscribe", "topics": ["resource:1"]}'
+        )
+        await asyncio.sleep(0.01)
+
+        replies = self._decode(socket)
+        assert replies[0] == {"type": "subscribed", "topics": ["resource:1"]}
+        assert replies[1]["type"] == "error"
+        assert replies[2] == {"type": "subscribed", "topics": []}
+        assert manager.topic_subscribers == {}
+
+    @pytest.mark.asyncio
+    async def test_disconnect_clears_subscriptions(self):
+        manager = ConnectionManager(queue_size=8, send_timeout=1)
+        socket = FakeWebSocket()
+        await manager.connect(socket, 1)
+        manager.subscribe(socket, 1, ["availability:summary"])
+
+        manager.disconnect(socket, 1)
+
+        assert manager.topic_subscribers == {}